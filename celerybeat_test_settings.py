@@ -14,8 +14,24 @@ CELERYBEAT_SCHEDULE = {
         'task' : 'pr_services.tasks.remove_old_auth_tokens',
         'schedule' : timedelta(seconds=1),
     },
+    'flush_auth_token_activity': {
+        'task' : 'pr_services.tasks.flush_auth_token_activity',
+        'schedule' : timedelta(seconds=1),
+    },
+    'persist_cached_cookies': {
+        'task' : 'pr_services.tasks.persist_cached_cookies',
+        'schedule' : timedelta(seconds=1),
+    },
     'process_completed_sessions': {
         'task' : 'pr_services.tasks.process_completed_sessions',
         'schedule' : timedelta(seconds=1),
     },
+    'process_session_reminders': {
+        'task' : 'pr_services.tasks.process_session_reminders',
+        'schedule' : timedelta(seconds=1),
+    },
+    'send_message_digests': {
+        'task' : 'pr_messaging.tasks.send_digests',
+        'schedule' : timedelta(seconds=1),
+    },
 }
@@ -0,0 +1,181 @@
+"""
+Denormalized forum activity
+
+Forum index pages show how many topics and posts each forum and topic has
+and which post came last, and list topics by their latest activity.
+Counting and sorting posts for every page gets slow on busy forums, so Forum
+and ForumTopic keep counters and last-post columns, which the models' save()
+and delete() methods update through the functions here as posts and topics
+come, go and move.
+
+Counters are changed by UPDATE statements that add to the stored value, in
+the same transaction as the change that caused them, so concurrent posts
+don't lose counts.  Changes made with QuerySet.update() or QuerySet.delete()
+bypass the models' methods; run the rebuild_forum_activity management
+command after making any.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from django.db.models import F
+import facade
+
+#: the columns of each model that are maintained here
+_counter_fields = {
+    'Forum': ('topic_count', 'post_count', 'last_post', 'last_activity'),
+    'ForumTopic': ('post_count', 'last_post', 'last_activity'),
+}
+
+def refresh_counters(obj):
+    """
+    Copy the stored counters of a Forum or ForumTopic onto the instance, so
+    that saving it doesn't overwrite changes made since it was loaded.
+
+    :param obj:     Forum or ForumTopic instance with a primary key
+    :return:        dictionary of the stored values of the counters, and of
+                    the forum for a ForumTopic, or None if there is no stored row
+    """
+
+    model = type(obj)
+    field_names = _counter_fields[model.__name__]
+    if model is facade.models.ForumTopic:
+        field_names += ('forum',)
+    stored = list(model.objects.filter(pk=obj.pk).values(*field_names))
+    if not stored:
+        return None
+    for field_name in _counter_fields[model.__name__]:
+        setattr(obj, model._meta.get_field(field_name).attname, stored[0][field_name])
+    return stored[0]
+
+def post_created(post):
+    """ count a new post and make it the last one of its topic and forum """
+
+    facade.models.ForumTopic.objects.filter(id=post.topic_id).update(
+        post_count=F('post_count') + 1, last_post=post,
+        last_activity=post.create_timestamp)
+    facade.models.Forum.objects.filter(id=post.topic.forum_id).update(
+        post_count=F('post_count') + 1, last_post=post,
+        last_activity=post.create_timestamp)
+
+def post_deleted(topic_id):
+    """ uncount a deleted post of a topic """
+
+    forum_id = _forum_id(topic_id)
+    facade.models.ForumTopic.objects.filter(id=topic_id).update(
+        post_count=F('post_count') - 1)
+    facade.models.Forum.objects.filter(id=forum_id).update(
+        post_count=F('post_count') - 1)
+    _refresh_last_posts([topic_id], [forum_id])
+
+def post_moved(post, old_topic_id):
+    """ count a post in its new topic rather than the one it was in """
+
+    old_forum_id = _forum_id(old_topic_id)
+    new_forum_id = post.topic.forum_id
+    facade.models.ForumTopic.objects.filter(id=old_topic_id).update(
+        post_count=F('post_count') - 1)
+    facade.models.ForumTopic.objects.filter(id=post.topic_id).update(
+        post_count=F('post_count') + 1)
+    if old_forum_id != new_forum_id:
+        facade.models.Forum.objects.filter(id=old_forum_id).update(
+            post_count=F('post_count') - 1)
+        facade.models.Forum.objects.filter(id=new_forum_id).update(
+            post_count=F('post_count') + 1)
+    _refresh_last_posts([old_topic_id, post.topic_id],
+        set([old_forum_id, new_forum_id]))
+
+def topic_created(topic):
+    """ count a new topic, whose activity starts when it was created """
+
+    topic.last_activity = topic.create_timestamp
+    facade.models.ForumTopic.objects.filter(id=topic.id).update(
+        last_activity=topic.create_timestamp)
+    facade.models.Forum.objects.filter(id=topic.forum_id).update(
+        topic_count=F('topic_count') + 1)
+
+def topic_deleted(forum_id):
+    """
+    uncount a deleted topic, which can't have had posts since they protect
+    their topic from deletion
+    """
+
+    facade.models.Forum.objects.filter(id=forum_id).update(
+        topic_count=F('topic_count') - 1)
+
+def topic_moved(topic, old_forum_id):
+    """ count a topic and its posts in its new forum rather than the old one """
+
+    facade.models.Forum.objects.filter(id=old_forum_id).update(
+        topic_count=F('topic_count') - 1, post_count=F('post_count') - topic.post_count)
+    facade.models.Forum.objects.filter(id=topic.forum_id).update(
+        topic_count=F('topic_count') + 1, post_count=F('post_count') + topic.post_count)
+    _refresh_last_posts([], [old_forum_id, topic.forum_id])
+
+def _forum_id(topic_id):
+    return facade.models.ForumTopic.objects.filter(id=topic_id).values_list(
+        'forum', flat=True)[0]
+
+def _refresh_last_posts(topic_ids, forum_ids):
+    """
+    Find the last posts of some topics again, then those of some forums from
+    the last posts of their topics.
+    """
+
+    Topic = facade.models.ForumTopic
+    for topic_id in topic_ids:
+        last = facade.models.ForumPost.objects.filter(topic__id=topic_id).order_by(
+            '-create_timestamp', '-id').values('id', 'create_timestamp')[:1]
+        if last:
+            Topic.objects.filter(id=topic_id).update(last_post=last[0]['id'],
+                last_activity=last[0]['create_timestamp'])
+        else:
+            Topic.objects.filter(id=topic_id).update(last_post=None,
+                last_activity=F('create_timestamp'))
+    for forum_id in forum_ids:
+        last = Topic.objects.filter(forum__id=forum_id, last_post__isnull=False).order_by(
+            '-last_activity', '-last_post').values('last_post', 'last_activity')[:1]
+        if last:
+            facade.models.Forum.objects.filter(id=forum_id).update(
+                last_post=last[0]['last_post'], last_activity=last[0]['last_activity'])
+        else:
+            facade.models.Forum.objects.filter(id=forum_id).update(last_post=None,
+                last_activity=None)
+
+def rebuild():
+    """
+    Recalculate the counters and last posts of every topic and forum from
+    the posts, reading each table once.
+    """
+
+    Forum = facade.models.Forum
+    Topic = facade.models.ForumTopic
+    # topic ID -> [post count, last post ID, last post's timestamp]
+    topics = {}
+    for post_id, topic_id, create_timestamp in facade.models.ForumPost.objects.order_by(
+            'topic', 'create_timestamp', 'id').values_list('id', 'topic',
+            'create_timestamp').iterator():
+        topic = topics.setdefault(topic_id, [0, None, None])
+        topic[0] += 1
+        topic[1] = post_id
+        topic[2] = create_timestamp
+    # forum ID -> [topic count, post count, last post ID, last post's timestamp]
+    forums = dict((forum_id, [0, 0, None, None]) for forum_id in
+        Forum.objects.values_list('id', flat=True))
+    for topic_id, forum_id, create_timestamp in Topic.objects.values_list('id', 'forum',
+            'create_timestamp').iterator():
+        post_count, last_post_id, last_activity = topics.get(topic_id,
+            (0, None, create_timestamp))
+        Topic.objects.filter(id=topic_id).update(post_count=post_count,
+            last_post=last_post_id, last_activity=last_activity)
+        forum = forums[forum_id]
+        forum[0] += 1
+        forum[1] += post_count
+        if last_post_id is not None and (forum[2] is None or
+                (last_activity, last_post_id) > (forum[3], forum[2])):
+            forum[2] = last_post_id
+            forum[3] = last_activity
+    for forum_id, (topic_count, post_count, last_post_id, last_activity) in forums.iteritems():
+        Forum.objects.filter(id=forum_id).update(topic_count=topic_count,
+            post_count=post_count, last_post=last_post_id, last_activity=last_activity)
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,180 @@
+"""
+Forum attachment pipeline
+
+Uploads are streamed to a temporary file on disk in chunks while their
+SHA-256 hash is computed, so no attachment is ever held in memory.  An
+upload whose content is already stored for another attachment shares that
+file; others are handed to the upload_queue, which stores them in the
+background once the request's transaction has been committed.
+
+Downloads are handed to the web server with an X-Sendfile or
+X-Accel-Redirect header when settings.FORUM_ATTACHMENT_SENDFILE says the
+server supports one, and otherwise streamed in chunks, either way with
+support for byte ranges so that large attachments can be resumed.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from __future__ import with_statement
+import hashlib
+import mimetypes
+import os.path
+import re
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import HttpResponse, HttpResponseNotFound, HttpResponseRedirect
+from upload_queue import prepare_upload
+from upload_queue.models import UploadTask
+import facade
+
+#: size of the pieces in which downloads are streamed
+CHUNK_SIZE = 64 * 1024
+
+_range_pattern = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Writes each uploaded file to a temporary file as it arrives, whatever its
+    size, and sets its content_hash attribute to the hex SHA-256 digest of
+    its content.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super(HashingUploadHandler, self).new_file(*args, **kwargs)
+        self.hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hash.update(raw_data)
+        return super(HashingUploadHandler, self).receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super(HashingUploadHandler, self).file_complete(file_size)
+        uploaded_file.content_hash = self.hash.hexdigest()
+        return uploaded_file
+
+def store(attachment, uploaded_file):
+    """
+    Record an uploaded file's metadata on an unsaved attachment and arrange
+    for its content to be stored.  If another attachment already has the same
+    content, the stored file is shared and nothing needs to be uploaded.
+
+    :param attachment:      the ForumPostAttachment, which is saved
+    :param uploaded_file:   file received through a HashingUploadHandler
+    :return:                an upload_queue.tasks.PendingUpload to queue once
+                            the current transaction has been committed, or
+                            None if the content is already stored
+    """
+
+    attachment.content_hash = uploaded_file.content_hash
+    attachment.size = uploaded_file.size
+    attachment.mime_type = uploaded_file.content_type or \
+        mimetypes.guess_type(uploaded_file.name)[0] or 'application/octet-stream'
+    stored_names = facade.models.ForumPostAttachment.objects.filter(
+        content_hash=attachment.content_hash).exclude(attachment='').values_list(
+        'attachment', flat=True)[:1]
+    if stored_names:
+        attachment.attachment = stored_names[0]
+        attachment.save()
+        return None
+    attachment.save()
+    return prepare_upload(attachment, 'attachment',
+        'forum/%s' % attachment.content_hash, uploaded_file)
+
+def serve(request, attachment):
+    """
+    Respond to a request for an attachment's content, from the upload queue
+    if it hasn't been stored yet.
+    """
+
+    if attachment.attachment.name:
+        try:
+            path = attachment.attachment.path
+        except NotImplementedError:
+            # not on a local file system, so let the client fetch it from
+            # wherever it is
+            return HttpResponseRedirect(attachment.attachment.url)
+    else:
+        pending = UploadTask.objects.filter(object_id=attachment.id,
+            content_type__app_label='forum', content_type__model='forumpostattachment')
+        if not pending:
+            return HttpResponseNotFound()
+        path = pending[0].local_file.path
+    if not os.path.exists(path):
+        return HttpResponseNotFound()
+    response = serve_file(request, path, attachment.mime_type or 'application/octet-stream')
+    response['Content-Disposition'] = 'attachment; filename="%s"' % \
+        attachment.name.encode('utf-8').replace('"', '')
+    return response
+
+def serve_file(request, path, mime_type):
+    """
+    Respond with the content of a local file, or the range of it that the
+    request asks for.
+    """
+
+    sendfile = getattr(settings, 'FORUM_ATTACHMENT_SENDFILE', None)
+    if sendfile == 'X-Sendfile':
+        response = HttpResponse(mimetype=mime_type)
+        response['X-Sendfile'] = path.encode('utf-8')
+        return response
+    media_root = os.path.join(os.path.abspath(settings.MEDIA_ROOT), '')
+    if sendfile == 'X-Accel-Redirect' and os.path.abspath(path).startswith(media_root):
+        response = HttpResponse(mimetype=mime_type)
+        response['X-Accel-Redirect'] = (settings.FORUM_ATTACHMENT_ACCEL_REDIRECT_PREFIX +
+            os.path.abspath(path)[len(media_root):]).encode('utf-8')
+        return response
+
+    size = os.path.getsize(path)
+    start, end = 0, size - 1
+    status = 200
+    byte_range = _parse_range(request.META.get('HTTP_RANGE', ''), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */%d' % size
+        return response
+    elif byte_range is not None:
+        start, end = byte_range
+        status = 206
+    response = HttpResponse(_read(path, start, end - start + 1), mimetype=mime_type,
+        status=status)
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Length'] = str(end - start + 1)
+    if status == 206:
+        response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, size)
+    return response
+
+def _parse_range(header, size):
+    """
+    :return:    (first byte, last byte) tuple for a satisfiable single range,
+                False for an unsatisfiable one, or None if the whole file
+                should be sent, as it is for missing, malformed and
+                multiple ranges
+    """
+
+    match = _range_pattern.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # the last bytes of the file
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = size - 1 if last == '' else min(int(last), size - 1)
+    if first >= size or first > last:
+        return False
+    return first, last
+
+def _read(path, offset, length):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while length > 0:
+            data = f.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+# vim:tabstop=4 shiftwidth=4 expandtab
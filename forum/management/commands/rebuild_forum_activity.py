@@ -0,0 +1,14 @@
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+from forum import activity
+
+class Command(NoArgsCommand):
+    help = ('Recalculates the post and topic counts and the last posts of every '
+        'forum and topic.  Run it after changing posts or topics in bulk.')
+
+    @transaction.commit_on_success
+    def handle_noargs(self, **options):
+        activity.rebuild()
+        print 'Rebuilt the activity counters of all forums and topics'
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -14,7 +14,11 @@ class ForumManager(ObjectManager):
         self.getters.update({
             'category' : 'get_many_to_many',
             'description' : 'get_general',
+            'last_activity' : 'get_time',
+            'last_post' : 'get_foreign_key',
             'name' : 'get_general',
+            'post_count' : 'get_general',
+            'topic_count' : 'get_general',
             'topics' : 'get_many_to_many',
         })
         self.setters.update({
@@ -1,5 +1,12 @@
+from __future__ import absolute_import
+from django.db import transaction
+from django.http import HttpResponse
+from forum import attachments
+from pr_services import exceptions
 from pr_services.object_manager import ObjectManager
 from pr_services.rpc.service import service_method
+from pr_services.utils import upload
+from pr_services.utils import Utils
 import facade
 
 class ForumPostAttachmentManager(ObjectManager):
@@ -12,9 +19,12 @@ class ForumPostAttachmentManager(ObjectManager):
 
         ObjectManager.__init__(self)
         self.getters.update({
+            'content_hash' : 'get_general',
             'description' : 'get_general',
+            'mime_type' : 'get_general',
             'name' : 'get_general',
             'post' : 'get_foreign_key',
+            'size' : 'get_general',
         })
         self.setters.update({
             'description' : 'set_general',
@@ -47,4 +57,68 @@ class ForumPostAttachmentManager(ObjectManager):
         self.authorizer.check_create_permissions(auth_token, new_attachment)
         return new_attachment
 
+    def upload_attachment(self, request):
+        """Handle attachment file uploads
+
+        The request must be a POST with exactly one file, and variables named
+        'auth_token', 'post' and 'name', and optionally 'description'.  The
+        file is streamed to disk rather than read into memory, and stored in
+        the background unless an attachment with the same content exists.
+
+        :param request: HttpRequest object from Django
+        :type request:  HttpRequest
+        :return:        HttpResponse with the new attachment's ID
+        """
+        # must be set before the request body is read
+        request.upload_handlers = [upload.UploadProgressCachedHandler(request),
+            attachments.HashingUploadHandler(request)]
+        if request.method != 'POST' or len(request.FILES) != 1 or not \
+                all(request.POST.get(v) for v in ('auth_token', 'post', 'name')):
+            return upload._render_response_bad_request(request,
+                msg='Your request must be a POST with exactly one file and ' +\
+                'variables named \'auth_token\', \'post\' and \'name\'.')
+        try:
+            new_attachment, pending = self._create_from_upload(request)
+        except exceptions.PrException, p:
+            return upload._render_response_forbidden(request, msg=p.get_error_msg())
+        # The attachment has been committed, so the upload task can find it.
+        if pending is not None:
+            pending.queue()
+        return HttpResponse(str(new_attachment.id))
+
+    @transaction.commit_on_success
+    def _create_from_upload(self, request):
+        auth_token = Utils.get_auth_token_object(request.POST['auth_token'])
+        new_attachment = self.my_django_model(name=request.POST['name'],
+            description=request.POST.get('description', ''))
+        new_attachment.post = self._find_by_id(request.POST['post'],
+            facade.models.ForumPost)
+        pending = attachments.store(new_attachment, request.FILES.values()[0])
+        self.authorizer.check_create_permissions(auth_token, new_attachment)
+        return new_attachment, pending
+
+    def download_attachment(self, request, auth_token, attachment_id):
+        """Send an attachment's content, or the byte range of it that the
+        request asks for.
+
+        :param request:         HttpRequest object from Django
+        :type request:          HttpRequest
+        :param auth_token:      session ID of the actor's auth token
+        :type auth_token:       string
+        :param attachment_id:   primary key of the attachment
+        :type attachment_id:    string
+        """
+        try:
+            auth_token = Utils.get_auth_token_object(auth_token)
+            attachment = self._find_by_id(int(attachment_id))
+            # the content is what content_hash digests, so reading one means
+            # being allowed to read the other
+            self.authorizer.check_read_permissions(auth_token, attachment,
+                ['content_hash'])
+        except exceptions.ObjectNotFoundException, e:
+            return upload._render_response_not_found(request, msg=e.get_error_msg())
+        except exceptions.PrException, p:
+            return upload._render_response_forbidden(request, msg=p.get_error_msg())
+        return attachments.serve(request, attachment)
+
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -14,8 +14,12 @@ class ForumTopicManager(ObjectManager):
         self.getters.update({
             'closed' : 'get_general',
             'forum' : 'get_foreign_key',
+            'last_activity' : 'get_time',
+            'last_post' : 'get_foreign_key',
             'name' : 'get_general',
+            'post_count' : 'get_general',
             'posts' : 'get_many_to_many',
+            'reply_count' : 'get_general',
             'sticky' : 'get_general',
         })
         self.setters.update({
@@ -53,4 +57,30 @@ class ForumTopicManager(ObjectManager):
         self.authorizer.check_create_permissions(auth_token, new_topic)
         return new_topic
 
+    @service_method
+    def get_by_last_activity(self, auth_token, forum, field_names=None, offset=0, limit=20):
+        """
+        Get a page of a Forum's Topics, sticky ones first and then the rest
+        by their most recent post, newest first.  Topics without posts are
+        placed by when they were created.
+
+        @param forum                forum FK
+        @type  forum                int
+        @param field_names          names of the fields to return, as for
+                                    get_filtered()
+        @type  field_names          list
+        @param offset               number of Topics to skip
+        @type  offset               int
+        @param limit                maximum number of Topics to return
+        @type  limit                int
+        @return                     list of dictionaries of the Topics' fields
+        """
+        ordering = ('-sticky', '-last_activity', '-id')
+        topics = self.authorizer.filter_readable(auth_token,
+            self.my_django_model.objects.filter(forum__id=forum), ['id'])
+        page = list(topics.order_by(*ordering).values_list('id', flat=True)[
+            offset:offset + limit])
+        query_set = self.my_django_model.objects.filter(id__in=page).order_by(*ordering)
+        return facade.subsystems.Getter(auth_token, self, query_set, field_names).results
+
 # vim:tabstop=4 shiftwidth=4 expandtab
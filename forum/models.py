@@ -1,11 +1,27 @@
 from django.db import models
 from pr_services import models as pr_models
+from forum import activity
 
 class Forum(models.Model):
     categories = models.ManyToManyField('ForumCategory', related_name='forums')
     name = models.CharField(max_length=127, unique=True)
     description = models.TextField()
     blame = pr_models.PRForeignKey(pr_models.Blame)
+    #: number of topics in the forum, maintained by forum.activity
+    topic_count = models.PositiveIntegerField(default=0)
+    #: number of posts in all of the forum's topics, maintained by forum.activity
+    post_count = models.PositiveIntegerField(default=0)
+    #: the most recent post in the forum, maintained by forum.activity
+    last_post = pr_models.PRForeignKey('ForumPost', null=True, related_name='+')
+    #: when the most recent post was written, maintained by forum.activity
+    last_activity = models.DateTimeField(null=True)
+
+    def save(self, *args, **kwargs):
+        # the counters are maintained in the database, so don't overwrite
+        # them with what we loaded
+        if self.pk is not None:
+            activity.refresh_counters(self)
+        super(Forum, self).save(*args, **kwargs)
 
 class ForumTopic(models.Model):
     forum = pr_models.PRForeignKey('Forum', related_name='topics')
@@ -13,18 +29,64 @@ class ForumTopic(models.Model):
     sticky = pr_models.PRBooleanField(default=False)
     closed = pr_models.PRBooleanField(default=False)
     blame = pr_models.PRForeignKey(pr_models.Blame)
+    create_timestamp = models.DateTimeField(auto_now_add=True)
+    #: number of posts in the topic, maintained by forum.activity
+    post_count = models.PositiveIntegerField(default=0)
+    #: the most recent post in the topic, maintained by forum.activity
+    last_post = pr_models.PRForeignKey('ForumPost', null=True, related_name='+')
+    #: when the most recent post was written, or when the topic was created
+    #: if it has no posts, maintained by forum.activity
+    last_activity = models.DateTimeField(null=True)
+
+    @property
+    def reply_count(self):
+        """ number of posts after the first """
+        return max(self.post_count - 1, 0)
+
+    def save(self, *args, **kwargs):
+        stored = None if self.pk is None else activity.refresh_counters(self)
+        super(ForumTopic, self).save(*args, **kwargs)
+        if stored is None:
+            activity.topic_created(self)
+        elif stored['forum'] != self.forum_id:
+            activity.topic_moved(self, stored['forum'])
+
+    def delete(self, *args, **kwargs):
+        forum_id = self.forum_id
+        super(ForumTopic, self).delete(*args, **kwargs)
+        activity.topic_deleted(forum_id)
 
 class ForumPost(models.Model):
     user = pr_models.PRForeignKey(pr_models.User, related_name='posts')
     topic = pr_models.PRForeignKey('ForumTopic', related_name='posts')
     body = models.TextField()
     blame = pr_models.PRForeignKey(pr_models.Blame)
+    create_timestamp = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        stored = [] if self.pk is None else list(ForumPost.objects.filter(
+            pk=self.pk).values_list('topic', flat=True))
+        super(ForumPost, self).save(*args, **kwargs)
+        if not stored:
+            activity.post_created(self)
+        elif stored[0] != self.topic_id:
+            activity.post_moved(self, stored[0])
+
+    def delete(self, *args, **kwargs):
+        topic_id = self.topic_id
+        super(ForumPost, self).delete(*args, **kwargs)
+        activity.post_deleted(topic_id)
 
 class ForumPostAttachment(models.Model):
     post = pr_models.PRForeignKey('ForumPost', related_name='attachments')
     name = models.CharField(max_length=255)
     description = models.TextField()
     attachment = models.FileField(upload_to='forum')
+    #: hex SHA-256 digest of the content, shared by attachments with the same file
+    content_hash = models.CharField(max_length=64, db_index=True, blank=True)
+    #: size of the content in bytes
+    size = models.PositiveIntegerField(null=True)
+    mime_type = models.CharField(max_length=127, blank=True)
 
 class ForumCategory(models.Model):
     name = models.CharField(max_length=127, unique=True)
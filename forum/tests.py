@@ -6,9 +6,14 @@ non-RPC unit tests for Forums
 @copyright Copyright 2010 American Research Institute, Inc.
 """
 
+from StringIO import StringIO
+from celery import conf
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from forum import activity
 from pr_services.initial_setup import InitialSetupMachine
 import django.test
-import settings
+import hashlib
 import facade
 
 class TestCase(django.test.TransactionTestCase):
@@ -55,3 +60,153 @@ Thanks!"""
         post = self.post_manager.create(self.admin_token, body, topic.id)
 
         attachment = self.attachment_manager.create(self.admin_token, 'World Map', post.id)
+
+    def test_search(self):
+        category = self.category_manager.create(self.admin_token, 'Stuff')
+        forum = self.forum_manager.create(self.admin_token, 'Interesting Matters', [category.id])
+        topic = self.topic_manager.create(self.admin_token, 'Power Tools', forum.id)
+        post = self.post_manager.create(self.admin_token, 'Which power drill should I buy?', topic.id)
+        search_manager = facade.managers.SearchManager()
+        ret = search_manager.search(self.admin_token, 'power', ['ForumPost', 'ForumTopic'])
+        self.assertEquals([(r['type'], r['id']) for r in ret['results']],
+            [('ForumTopic', topic.id), ('ForumPost', post.id)])
+        post.body = 'Never mind'
+        post.save()
+        ret = search_manager.search(self.admin_token, 'power', ['ForumPost', 'ForumTopic'])
+        self.assertEquals([(r['type'], r['id']) for r in ret['results']],
+            [('ForumTopic', topic.id)])
+
+    def test_activity_counters(self):
+        category = self.category_manager.create(self.admin_token, 'Stuff')
+        forum1 = self.forum_manager.create(self.admin_token, 'Forum 1', [category.id])
+        forum2 = self.forum_manager.create(self.admin_token, 'Forum 2', [category.id])
+        topic1 = self.topic_manager.create(self.admin_token, 'Topic 1', forum1.id)
+        topic2 = self.topic_manager.create(self.admin_token, 'Topic 2', forum1.id)
+        topic3 = self.topic_manager.create(self.admin_token, 'Topic 3', forum1.id,
+            {'sticky': True})
+        post1 = self.post_manager.create(self.admin_token, 'First', topic1.id)
+        post2 = self.post_manager.create(self.admin_token, 'Second', topic2.id)
+        post3 = self.post_manager.create(self.admin_token, 'Third', topic1.id)
+
+        def check(model, pk, **expected):
+            obj = model.objects.get(pk=pk)
+            for name, value in expected.iteritems():
+                self.assertEquals(getattr(obj, name), value, '%s %s' % (model.__name__, name))
+        Forum = facade.models.Forum
+        Topic = facade.models.ForumTopic
+        check(Forum, forum1.id, topic_count=3, post_count=3, last_post_id=post3.id)
+        check(Topic, topic1.id, post_count=2, reply_count=1, last_post_id=post3.id)
+        check(Topic, topic2.id, post_count=1, reply_count=0, last_post_id=post2.id)
+
+        # sticky topics first, then the one with the latest post
+        ret = self.topic_manager.get_by_last_activity(self.admin_token, forum1.id,
+            ['name', 'post_count', 'last_post'])
+        self.assertEquals([(t['id'], t['post_count'], t['last_post']) for t in ret],
+            [(topic3.id, 0, None), (topic1.id, 2, post3.id), (topic2.id, 1, post2.id)])
+        ret = self.topic_manager.get_by_last_activity(self.admin_token, forum1.id, None, 1, 1)
+        self.assertEquals([t['id'] for t in ret], [topic1.id])
+
+        # saving a stale instance doesn't undo the counts
+        topic1.name = 'Renamed'
+        topic1.save()
+        check(Topic, topic1.id, post_count=2, last_post_id=post3.id)
+
+        # moving a post to a topic in another forum
+        topic4 = self.topic_manager.create(self.admin_token, 'Topic 4', forum2.id)
+        post3 = facade.models.ForumPost.objects.get(id=post3.id)
+        post3.topic = topic4
+        post3.save()
+        check(Forum, forum1.id, topic_count=3, post_count=2, last_post_id=post2.id)
+        check(Forum, forum2.id, topic_count=1, post_count=1, last_post_id=post3.id)
+        check(Topic, topic1.id, post_count=1, last_post_id=post1.id)
+        check(Topic, topic4.id, post_count=1, last_post_id=post3.id)
+
+        # moving a topic to another forum
+        topic1 = Topic.objects.get(id=topic1.id)
+        topic1.forum = forum2
+        topic1.save()
+        check(Forum, forum1.id, topic_count=2, post_count=1, last_post_id=post2.id)
+        check(Forum, forum2.id, topic_count=2, post_count=2, last_post_id=post3.id)
+
+        # deleting the last post of a forum and a topic
+        facade.models.ForumPost.objects.get(id=post2.id).delete()
+        check(Forum, forum1.id, topic_count=2, post_count=0, last_post_id=None,
+            last_activity=None)
+        check(Topic, topic2.id, post_count=0, last_post_id=None,
+            last_activity=Topic.objects.get(id=topic2.id).create_timestamp)
+        Topic.objects.get(id=topic2.id).delete()
+        check(Forum, forum1.id, topic_count=1)
+
+        # the rebuild gets the same answers
+        def snapshot():
+            return (list(Forum.objects.order_by('id').values_list('id', 'topic_count',
+                    'post_count', 'last_post', 'last_activity')),
+                list(Topic.objects.order_by('id').values_list('id', 'post_count',
+                    'last_post', 'last_activity')))
+        before = snapshot()
+        Topic.objects.update(post_count=0, last_post=None)
+        Forum.objects.update(topic_count=0, post_count=0)
+        activity.rebuild()
+        self.assertEquals(snapshot(), before)
+
+class TestAttachments(TestCase):
+    def setUp(self):
+        super(TestAttachments, self).setUp()
+        self._always_eager = conf.ALWAYS_EAGER
+        conf.ALWAYS_EAGER = True
+        self._sendfile = getattr(settings, 'FORUM_ATTACHMENT_SENDFILE', None)
+        category = self.category_manager.create(self.admin_token, 'Stuff')
+        forum = self.forum_manager.create(self.admin_token, 'Forum', [category.id])
+        topic = self.topic_manager.create(self.admin_token, 'Topic', forum.id)
+        self.post = self.post_manager.create(self.admin_token, 'Post', topic.id)
+
+    def tearDown(self):
+        conf.ALWAYS_EAGER = self._always_eager
+        settings.FORUM_ATTACHMENT_SENDFILE = self._sendfile
+
+    def _upload(self, content, name='Notes'):
+        uploaded_file = StringIO(content)
+        uploaded_file.name = 'notes.txt'
+        response = self.client.post(reverse('forum:upload_attachment'),
+            {'auth_token': self.admin_token.session_id, 'post': self.post.id,
+             'name': name, 'file': uploaded_file})
+        self.assertEquals(response.status_code, 200)
+        return facade.models.ForumPostAttachment.objects.get(id=int(response.content))
+
+    def _download(self, attachment, **headers):
+        return self.client.get(reverse('forum:download_attachment',
+            kwargs={'auth_token': self.admin_token.session_id,
+                'attachment_id': attachment.id}), **headers)
+
+    def test_upload_and_download(self):
+        content = ''.join(chr(i % 256) for i in xrange(200000))
+        attachment1 = self._upload(content)
+        self.assertEquals(attachment1.content_hash, hashlib.sha256(content).hexdigest())
+        self.assertEquals(attachment1.size, len(content))
+        self.assertEquals(attachment1.mime_type, 'text/plain')
+        self.assertTrue(attachment1.attachment.name)
+        self.assertEquals(attachment1.attachment.read(), content)
+        # the same content is stored once
+        attachment2 = self._upload(content, 'Copy')
+        self.assertEquals(attachment2.attachment.name, attachment1.attachment.name)
+
+        response = self._download(attachment2)
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.content, content)
+        self.assertEquals(response['Accept-Ranges'], 'bytes')
+        self.assertTrue('filename="Copy"' in response['Content-Disposition'])
+        response = self._download(attachment2, HTTP_RANGE='bytes=100-199')
+        self.assertEquals(response.status_code, 206)
+        self.assertEquals(response.content, content[100:200])
+        self.assertEquals(response['Content-Range'], 'bytes 100-199/%d' % len(content))
+        response = self._download(attachment2, HTTP_RANGE='bytes=-10')
+        self.assertEquals(response.content, content[-10:])
+        response = self._download(attachment2, HTTP_RANGE='bytes=199990-')
+        self.assertEquals(response.content, content[199990:])
+        response = self._download(attachment2, HTTP_RANGE='bytes=200000-')
+        self.assertEquals(response.status_code, 416)
+
+        settings.FORUM_ATTACHMENT_SENDFILE = 'X-Sendfile'
+        response = self._download(attachment2)
+        self.assertEquals(response['X-Sendfile'], attachment1.attachment.path)
+        self.assertEquals(response.content, '')
@@ -0,0 +1,14 @@
+from django.conf.urls.defaults import patterns, url
+import facade
+
+urlpatterns = patterns('',
+    # Attachment upload entry point
+    url(r'^upload_attachment$',
+        facade.managers.ForumPostAttachmentManager().upload_attachment,
+        name='upload_attachment'),
+
+    # Attachment downloads
+    url(r'^(?P<auth_token>[A-Za-z0-9]+)/attachment/(?P<attachment_id>\d+)$',
+        facade.managers.ForumPostAttachmentManager().download_attachment,
+        name='download_attachment'),
+)
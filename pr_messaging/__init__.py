@@ -25,3 +25,20 @@ def message_managers(**kwargs):
 def enable_messages(**kwargs):
     responses = _signals.message_flags_update.send(enable_messages, **kwargs)
     return any([r[1] for r in responses])
+
+def batch_messages():
+    """
+    Return a context manager that queues the messages sent within it and hands
+    them to Celery in batches when it exits, as happens during a request.  Use
+    it in Celery tasks and management commands that send many messages.
+    """
+    from .queue import queue
+    return queue.batch()
+
+def flush_messages():
+    """
+    Hand any queued messages to Celery right away, returning how many there
+    were.
+    """
+    from .queue import queue
+    return queue.flush()
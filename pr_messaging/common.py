@@ -4,7 +4,7 @@ import copy
 import re
 from django.db import models
 from django.contrib.contenttypes.models import ContentType
-from .signals import participant_instance_requested
+from .signals import participant_instance_requested, participant_instances_requested
 
 class Immutable(object):
     """
@@ -23,14 +23,24 @@ class Immutable(object):
     __delattr__ = __setattr__
 
     def __init__(self, **kwargs):
+        self._set_attributes(kwargs)
+
+    def _set_attributes(self, kwargs):
+        # Only mutable containers need copying so that the caller can't change
+        # them behind our back; everything else can be shared as is.
         for key, value in kwargs.iteritems():
-            super(Immutable, self).__setattr__(key, copy.copy(value))
+            if isinstance(value, (list, dict, set)):
+                value = copy.copy(value)
+            self.__dict__[key] = value
 
     def updated(self, **kwargs):
         """Return a copy of this instance with modified attributes."""
-        for key, value in self.__dict__.iteritems():
-            kwargs.setdefault(key, value)
-        return type(self)(**kwargs)
+        # Unchanged attributes are shared with this instance rather than
+        # copied, since neither instance can change them.
+        new_instance = object.__new__(type(self))
+        new_instance.__dict__.update(self.__dict__)
+        new_instance._set_attributes(kwargs)
+        return new_instance
 
     def clone(self):
         """Return an exact copy of this instance."""
@@ -39,7 +49,7 @@ class Immutable(object):
     def __repr__(self):
         attrs = []
         for key, value in self.__dict__.iteritems():
-            if value:
+            if value and not key.startswith('_'):
                 attrs.append(u'%s=%s' % (key, repr(value)))
         return u'<%s %s>' % (type(self).__name__, ' '.join(attrs))
 
@@ -66,7 +76,7 @@ class Participant(Immutable):
     use the "system" account for the corresponding message type.
     """
 
-    def _init_with_participant(self, participant, **kwargs):
+    def _init_with_participant(self, participant, defer_instance_check=False, **kwargs):
         instance = None
         username = None
         fullname = None
@@ -100,36 +110,121 @@ class Participant(Immutable):
         kwargs['fullname'] = fullname
         kwargs['email'] = email
         # If an instance wasn't given, try to find a corresponding model
-        # instance based on the information provided so far by dispatching the
-        # participant_instance_requested signal.
-        if instance is None and not kwargs.get('skip_instance_check', False):
-            p = type(self)(**kwargs)
-            responses = participant_instance_requested.send_robust(None, participant=p)
+        # instance based on the information provided so far, unless the caller
+        # will look for the instances of many participants at once with
+        # resolve_instances().
+        if instance is None and not kwargs.get('skip_instance_check', False) \
+                and not defer_instance_check:
+            instance = self.find_instances([type(self)(**kwargs)])[0]
+        if instance is not None:
+            kwargs.update(self._instance_attributes(instance, kwargs))
+        return kwargs
+
+    @staticmethod
+    def _instance_attributes(instance, attributes):
+        """
+        Return the attributes of a participant that is associated with a model
+        instance: its username and email attributes, and the result of its
+        get_full_name() method (assuming the model is similar to
+        django.contrib.auth.models.User), unless given in attributes, and a
+        reference to the instance.
+        """
+        ret = {'_instance': instance}
+        if attributes.get('username') is None and hasattr(instance, 'username'):
+            ret['username'] = instance.username
+        if attributes.get('email') is None and hasattr(instance, 'email'):
+            ret['email'] = instance.email
+        if attributes.get('fullname') is None and \
+                callable(getattr(instance, 'get_full_name', None)):
+            ret['fullname'] = instance.get_full_name()
+        # get_for_model() caches content types, so this doesn't hit the
+        # database after the first time
+        ct = ContentType.objects.get_for_model(instance)
+        ret['content_type'] = '%s.%s' % (ct.app_label, ct.model)
+        ret['instance_pk'] = instance.pk
+        return ret
+
+    @classmethod
+    def find_instances(cls, participants):
+        """
+        Find the model instances that correspond to a list of participants.
+
+        The participant_instances_requested signal is dispatched once for the
+        whole list, so that its handlers can look the instances up with one
+        query.  For any participant that remains unresolved, the
+        participant_instance_requested signal is dispatched on its own.
+
+        Returns a list with a model instance or None for each participant.
+        """
+        instances = [None] * len(participants)
+        responses = participant_instances_requested.send_robust(None, participants=participants)
+        for receiver, response in responses:
+            if isinstance(response, (list, tuple)):
+                for i, instance in enumerate(response[:len(instances)]):
+                    if instances[i] is None and isinstance(instance, models.Model):
+                        instances[i] = instance
+        for i, participant in enumerate(participants):
+            if instances[i] is not None:
+                continue
+            responses = participant_instance_requested.send_robust(None, participant=participant)
             for receiver, response in responses:
                 if isinstance(response, models.Model):
-                    instance = response
+                    instances[i] = response
                     break
-                else:
-                    continue
-        # If an instance has been associated with this participant, look for
-        # its username and email attributes, and a get_full_name() method,
-        # assuming the model is an instance of django.contrib.auth.models.User.
-        if instance is not None:
-            if kwargs['username'] is None and hasattr(instance, 'username'):
-                kwargs['username'] = instance.username
-            if kwargs['email'] is None and hasattr(instance, 'email'):
-                kwargs['email'] = instance.email
-            if kwargs['fullname'] is None and \
-                    callable(getattr(instance, 'get_full_name', None)):
-                kwargs['fullname'] = instance.get_full_name()
-            ct = ContentType.objects.get_for_model(instance)
-            kwargs['content_type'] = '%s.%s' % (ct.app_label, ct.model)
-            kwargs['instance_pk'] = instance.pk
-        return kwargs
+        return instances
+
+    @classmethod
+    def resolve_instances(cls, participants):
+        """
+        Return a list of the given participants, with those that were created
+        with defer_instance_check=True associated with their model instances,
+        which are all looked up at once.
+        """
+        pending = [p for p in participants if p.instance_pk is None and
+            (p.username or p.email) and not getattr(p, 'skip_instance_check', False)]
+        if not pending:
+            return list(participants)
+        found = dict(zip([id(p) for p in pending], cls.find_instances(pending)))
+        ret = []
+        for p in participants:
+            instance = found.get(id(p))
+            if instance is not None:
+                p = p.updated(**cls._instance_attributes(instance, p.__dict__))
+            ret.append(p)
+        return ret
+
+    @staticmethod
+    def _model_class(content_type):
+        app_label, model = content_type.split('.', 1)
+        return models.get_model(app_label, model)
+
+    @classmethod
+    def load_instances(cls, participants):
+        """
+        Fetch the model instances associated with a list of participants, with
+        one query per content type, so that reading their instance attributes
+        doesn't query the database for each one.
+        """
+        by_content_type = {}
+        for p in participants:
+            if '_instance' not in p.__dict__ and p.content_type and p.instance_pk:
+                by_content_type.setdefault(p.content_type, []).append(p)
+        for content_type, group in by_content_type.iteritems():
+            model_class = cls._model_class(content_type)
+            if model_class is None:
+                found = {}
+            else:
+                found = model_class._default_manager.in_bulk([p.instance_pk for p in group])
+            for p in group:
+                # This only caches the instance; the participant's public
+                # attributes never change.
+                p.__dict__['_instance'] = found.get(p.instance_pk)
 
     def __init__(self, participant=None, **kwargs):
+        defer_instance_check = kwargs.pop('defer_instance_check', False)
         if participant is not None:
-            kwargs.update(self._init_with_participant(participant, **kwargs))
+            kwargs.update(self._init_with_participant(participant,
+                defer_instance_check=defer_instance_check, **kwargs))
         kwargs.setdefault('username', None)
         kwargs.setdefault('fullname', None)
         kwargs.setdefault('email', None)
@@ -139,23 +234,35 @@ class Participant(Immutable):
         kwargs.setdefault('contact_info', None)
         super(Participant, self).__init__(**kwargs)
 
+    def updated(self, **kwargs):
+        new_instance = super(Participant, self).updated(**kwargs)
+        if ('content_type' in kwargs or 'instance_pk' in kwargs) and '_instance' not in kwargs:
+            new_instance.__dict__.pop('_instance', None)
+        return new_instance
+
+    def __getstate__(self):
+        # Don't send model instances through the message broker; they are
+        # fetched again when needed.
+        state = self.__dict__.copy()
+        state.pop('_instance', None)
+        return state
+
+    @property
+    def digest_key(self):
+        """Return a string that identifies this participant among others."""
+        if self.content_type and self.instance_pk:
+            return u'%s:%s' % (self.content_type, self.instance_pk)
+        return self.email or self.username or u''
+
     @property
     def is_sender(self):
         return bool(getattr(self, 'role', None) == 'from')
 
     @property
     def instance(self):
-        if self.content_type and self.instance_pk:
-            app_label, model = self.content_type.split('.', 1)
-            try:
-                ct = ContentType.objects.get(app_label=app_label, model=model)
-                model_class = ct.model_class()
-                try:
-                    return ct.get_object_for_this_type(pk=self.instance_pk)
-                except model_class.DoesNotExist:
-                    pass
-            except ContentType.DoesNotExist:
-                pass
+        if '_instance' not in self.__dict__:
+            self.load_instances([self])
+        return self.__dict__.get('_instance')
 
 class Message(Immutable):
     """
@@ -167,7 +274,10 @@ class Message(Immutable):
         kwargs['message_type'] = message_type
         kwargs['context'] = context or {}
         pkwds = {}
-        pkwds['skip_instance_check'] = kwargs.pop('skip_instance_check', False)
+        skip_instance_check = kwargs.pop('skip_instance_check', False)
+        pkwds['skip_instance_check'] = skip_instance_check
+        # Look for the model instances of all participants at once below.
+        pkwds['defer_instance_check'] = True
         if kwargs.get('participants', None) is None:
             participants = [Participant(sender, role='from', **pkwds)]
             if 'recipient' in kwargs:
@@ -180,6 +290,8 @@ class Message(Immutable):
                 participants.append(Participant(recipient, role='cc', **pkwds))
             for recipient in kwargs.pop('bcc', []):
                 participants.append(Participant(recipient, role='bcc', **pkwds))
+            if not skip_instance_check:
+                participants = Participant.resolve_instances(participants)
             kwargs['participants'] = participants
         kwargs.setdefault('message_format', None)
         kwargs.setdefault('subject', None)
@@ -4,9 +4,12 @@ import logging
 import uuid as uuid
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
+from django.db.models import Q
 import django.core.signals
-from .models import MessageTemplate, SentMessage, SentMessageParticipant
+from .common import Participant
+from .models import SentMessage, SentMessageParticipant
 from .queue import queue
+from .registry import registry
 from . import signals
 
 logger = logging.getLogger('pr_messaging.handlers')
@@ -31,22 +34,36 @@ def message_ready_to_send(sender, **kwargs):
 def message_flags_update(sender, **kwargs):
     return queue.enable_messages(sender, **kwargs)
 
-def participant_instance_requested(sender, **kwargs):
-    logger.trace('participant_instance_requested sender=%r kwargs=%r', sender, kwargs)
+def participant_instances_requested(sender, **kwargs):
+    logger.trace('participant_instances_requested sender=%r kwargs=%r', sender, kwargs)
     if getattr(settings, 'MESSAGING_PARTICIPANT_INSTANCE_HANDLER', True):
-        return default_participant_instance_handler(sender, **kwargs)
+        return default_participant_instances_handler(sender, **kwargs)
 
-def default_participant_instance_handler(sender, **kwargs):
-    participant = kwargs.get('participant', None)
-    if participant and 'django.contrib.auth' in settings.INSTALLED_APPS:
+def default_participant_instances_handler(sender, **kwargs):
+    participants = kwargs.get('participants', None)
+    if participants and 'django.contrib.auth' in settings.INSTALLED_APPS:
         from django.contrib.auth.models import User
-        try:
-            if participant.username:
-                return User.objects.get(username=participant.username)
-            elif participant.email:
-                return User.objects.get(email=participant.email)
-        except (User.DoesNotExist, User.MultipleObjectsReturned):
-            pass
+        usernames = set(p.username for p in participants if p.username)
+        emails = set(p.email for p in participants if p.email and not p.username)
+        by_username = {}
+        by_email = {}
+        if usernames or emails:
+            for user in User.objects.filter(Q(username__in=usernames) | Q(email__in=emails)):
+                by_username[user.username] = user
+                # Addresses that more than one user has don't identify anyone.
+                if user.email in by_email:
+                    by_email[user.email] = None
+                else:
+                    by_email[user.email] = user
+        ret = []
+        for p in participants:
+            if p.username:
+                ret.append(by_username.get(p.username))
+            elif p.email:
+                ret.append(by_email.get(p.email))
+            else:
+                ret.append(None)
+        return ret
 
 def participant_contact_requested(sender, **kwargs):
     logger.trace('participant_contact_requested sender=%r kwargs=%r', sender, kwargs)
@@ -90,10 +107,8 @@ def message_template_requested(sender, **kwargs):
 
 def default_template_handler(sender, **kwargs):
     message = kwargs.get('message', None)
-    try:
-        mt = MessageTemplate.objects.get(message_type__slug=message.message_type,
-                                         message_format__slug=message.message_format)
-    except MessageTemplate.DoesNotExist:
+    mt = registry.get_message_template(message.message_type, message.message_format)
+    if mt is None:
         logger.error('no template found for given message type and format')
     else:
         return mt
@@ -106,7 +121,7 @@ def message_ready_for_delivery(sender, **kwargs):
 def default_delivery_handler(sender, **kwargs):
     message = kwargs.get('message', None)
     if message and 'email' in message.message_format:
-        msg = EmailMultiAlternatives()
+        msg = EmailMultiAlternatives(connection=kwargs.get('connection', None))
         msg.subject = message.subject
         msg.body = message.body
         if message.sender():
@@ -136,6 +151,7 @@ def default_delivered_handler(sender, **kwargs):
     message_template_pk = getattr(message, 'message_template_pk', None)
     if message and message_template_pk:
         sent_message = SentMessage.objects.create(message_template_id=message_template_pk)
+        Participant.load_instances(message.participants)
         for participant in message.participants:
             sent_message_participant = SentMessageParticipant(sent_message=sent_message)
             sent_message_participant.role = participant.role
@@ -155,7 +171,7 @@ _connect(django.core.signals.got_request_exception, got_request_exception)
 # Connect handlers to our own internal signals.
 _connect(signals.message_ready_to_send, message_ready_to_send)
 _connect(signals.message_flags_update, message_flags_update)
-_connect(signals.participant_instance_requested, participant_instance_requested)
+_connect(signals.participant_instances_requested, participant_instances_requested)
 _connect(signals.participant_contact_requested, participant_contact_requested)
 _connect(signals.participant_contact_requested, participant_contact_handler_filter)
 _connect(signals.message_template_requested, message_template_requested)
@@ -0,0 +1,107 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding model 'DigestItem'
+        db.create_table('pr_messaging_digestitem', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('message_type', self.gf('django.db.models.fields.related.ForeignKey')(related_name='digest_items', to=orm['pr_messaging.MessageType'])),
+            ('recipient', self.gf('django.db.models.fields.CharField')(max_length=255, db_index=True)),
+            ('message', self.gf('django.db.models.fields.TextField')()),
+            ('timestamp', self.gf('django.db.models.fields.DateTimeField')(auto_now_add=True, db_index=True, blank=True)),
+        ))
+        db.send_create_signal('pr_messaging', ['DigestItem'])
+
+        # Adding field 'MessageType.digest'
+        db.add_column('pr_messaging_messagetype', 'digest', self.gf('django.db.models.fields.BooleanField')(default=False), keep_default=False)
+
+        # Adding field 'MessageTemplate.digest_subject'
+        db.add_column('pr_messaging_messagetemplate', 'digest_subject', self.gf('django.db.models.fields.CharField')(default='', max_length=255, blank=True), keep_default=False)
+
+        # Adding field 'MessageTemplate.digest_body'
+        db.add_column('pr_messaging_messagetemplate', 'digest_body', self.gf('django.db.models.fields.TextField')(default='', blank=True), keep_default=False)
+
+
+    def backwards(self, orm):
+        
+        # Deleting model 'DigestItem'
+        db.delete_table('pr_messaging_digestitem')
+
+        # Deleting field 'MessageType.digest'
+        db.delete_column('pr_messaging_messagetype', 'digest')
+
+        # Deleting field 'MessageTemplate.digest_subject'
+        db.delete_column('pr_messaging_messagetemplate', 'digest_subject')
+
+        # Deleting field 'MessageTemplate.digest_body'
+        db.delete_column('pr_messaging_messagetemplate', 'digest_body')
+
+
+    models = {
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'pr_messaging.digestitem': {
+            'Meta': {'object_name': 'DigestItem'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'message': ('django.db.models.fields.TextField', [], {}),
+            'message_type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'digest_items'", 'to': "orm['pr_messaging.MessageType']"}),
+            'recipient': ('django.db.models.fields.CharField', [], {'max_length': '255', 'db_index': 'True'}),
+            'timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'db_index': 'True', 'blank': 'True'})
+        },
+        'pr_messaging.messageformat': {
+            'Meta': {'object_name': 'MessageFormat'},
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'enabled': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32', 'db_index': 'True'})
+        },
+        'pr_messaging.messagetemplate': {
+            'Meta': {'unique_together': "(('message_type', 'message_format'),)", 'object_name': 'MessageTemplate'},
+            'body': ('django.db.models.fields.TextField', [], {}),
+            'digest_body': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'}),
+            'digest_subject': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'message_format': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'message_templates'", 'to': "orm['pr_messaging.MessageFormat']"}),
+            'message_type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'message_templates'", 'to': "orm['pr_messaging.MessageType']"}),
+            'subject': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        'pr_messaging.messagetype': {
+            'Meta': {'object_name': 'MessageType'},
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'digest': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'enabled': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'multiple_recipients': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '50', 'db_index': 'True'})
+        },
+        'pr_messaging.sentmessage': {
+            'Meta': {'object_name': 'SentMessage'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'message_template': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'sent_messages'", 'to': "orm['pr_messaging.MessageTemplate']"}),
+            'timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'})
+        },
+        'pr_messaging.sentmessageparticipant': {
+            'Meta': {'object_name': 'SentMessageParticipant'},
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'default': 'None', 'to': "orm['contenttypes.ContentType']", 'null': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'participant_contact': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'participant_id': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None', 'null': 'True'}),
+            'role': ('django.db.models.fields.CharField', [], {'max_length': '8'}),
+            'sent_message': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'participants'", 'to': "orm['pr_messaging.SentMessage']"})
+        }
+    }
+
+    complete_apps = ['pr_messaging']
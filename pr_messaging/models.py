@@ -49,6 +49,12 @@ class MessageType(models.Model):
     # False, the template(s) must be rendered once for EACH recipient.
     multiple_recipients = models.BooleanField(default=False)
 
+    # Are messages of this type sent as digests?  If True, messages are
+    # collected for each recipient for MESSAGING_DIGEST_WINDOW seconds and then
+    # rendered together as a single message, using the digest_subject and
+    # digest_body of the corresponding template(s).
+    digest = models.BooleanField(default=False)
+
     # FIXME: Does this type support aggregation of multiple signals?
     # for example, if a user gets added to three different groups all at once,
     # it would be a shame to send three emails. If multiple_contexts == True,
@@ -71,29 +77,87 @@ class MessageTemplate(models.Model):
     subject = models.CharField(max_length=255)
     body = models.TextField()
 
+    # Templates for digests, which are rendered with a context containing
+    # "items", a list of the contexts of the messages in the digest.  If they
+    # are blank, the subject of the first message is used and the bodies of
+    # all messages are joined together.
+    digest_subject = models.CharField(max_length=255, blank=True, default='')
+    digest_body = models.TextField(blank=True, default='')
+
     class Meta:
         unique_together = ('message_type', 'message_format')
 
     def __unicode__(self):
         return u'%s template for %s messages' % (self.message_format.name, self.message_type.name)
 
+    def compiled(self, field_name):
+        """
+        Return the Template for the subject or body, compiling it only once
+        per instance, since the registry keeps instances around.
+        """
+        key = '_compiled_%s' % field_name
+        if key not in self.__dict__:
+            self.__dict__[key] = Template(getattr(self, field_name))
+        return self.__dict__[key]
+
+    def _render_body(self, context):
+        message = context.get('message', None)
+        if not getattr(message, 'digest', False):
+            return self.compiled('body').render(context)
+        if self.digest_body:
+            return self.compiled('digest_body').render(context)
+        bodies = []
+        for item in context['items']:
+            context.update(item)
+            try:
+                bodies.append(self.compiled('body').render(context))
+            finally:
+                context.pop()
+        return u'\n\n'.join(bodies)
+
+    def _render_subject(self, context):
+        message = context.get('message', None)
+        if not getattr(message, 'digest', False):
+            return self.compiled('subject').render(context)
+        if self.digest_subject:
+            return self.compiled('digest_subject').render(context)
+        context.update(context['items'][0])
+        try:
+            return self.compiled('subject').render(context)
+        finally:
+            context.pop()
+
     def render(self, context):
-        subject = Template(self.subject).render(context)
-        body = Template(self.body).render(context)
+        from .registry import registry
+        subject = self._render_subject(context)
+        body = self._render_body(context)
         # Tries to render a plain text format as well for HTML emails.
         # FIXME: Should really find a more generic way to add attachments and
         # alternate content types.
         if 'email' in self.message_format.slug and 'html' in self.message_format.slug:
-            try:
-                mt = MessageTemplate.objects.get(message_format__slug='email',
-                                                 message_type=self.message_type)
-                plain_text_body = Template(mt.body).render(context)
-            except MessageTemplate.DoesNotExist:
-                pass
-            else:
+            mt = registry.get_message_template(self.message_type.slug, 'email')
+            if mt is not None:
+                plain_text_body = mt._render_body(context)
                 return subject, plain_text_body, (None, body, 'text/html')
         return subject, body
 
+class DigestItem(models.Model):
+    """
+    A message waiting to be sent to one recipient as part of a digest.
+    """
+
+    message_type = models.ForeignKey(MessageType, related_name='digest_items')
+    # identifies the recipient; see Participant.digest_key
+    recipient = models.CharField(max_length=255, db_index=True)
+    # the pickled Message, which has only this recipient
+    message = models.TextField()
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # identifies the run of send_digests that claimed this item
+    claim_key = models.CharField(max_length=32, null=True, db_index=True)
+
+    def __unicode__(self):
+        return u'%s for %s @ %s' % (self.message_type, self.recipient, self.timestamp)
+
 class SentMessage(models.Model):
     """
     Records info about a message that was sent successfully.
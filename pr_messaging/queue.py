@@ -1,31 +1,49 @@
 """Thread-safe queue to store messages during a request."""
 
+from __future__ import with_statement
+from contextlib import contextmanager
 from threading import local
+from django.conf import settings
 from .tasks import process_messages
 from .common import Message
 
 class MessageQueue(local):
-    """Internal thread local queue to store messages during a request."""
+    """
+    Internal thread local queue to store messages during a request, or within
+    a batch() block in code that runs outside of requests.
+
+    Queued messages are grouped by message type and handed to Celery in tasks
+    of at most MESSAGING_BATCH_SIZE messages each, so that a bulk operation
+    creates a handful of tasks rather than one per message.  Once more than
+    MESSAGING_QUEUE_MAX_PENDING messages are waiting, the queue is flushed
+    early, which keeps both memory use and task payloads bounded.
+    """
 
     def __init__(self):
+        self.batch_depth = 0
         self.reset()
 
     def reset(self):
-        self.messages = []
+        self.messages = {}
+        self.pending = 0
         self.in_request = False
         self.send_to_admins = True
         self.send_to_managers = True
         self.send_to_all = True
 
+    @property
+    def is_queuing(self):
+        return self.in_request or self.batch_depth > 0
+
     def request_started(self, sender, **kwargs):
         self.reset()
         self.in_request = True
 
     def request_finished(self, sender, **kwargs):
         self.in_request = False
-        if self.messages:
-            process_messages.delay(self.messages)
-        self.reset()
+        if self.batch_depth == 0:
+            self.flush()
+            self.reset()
 
     def got_request_exception(self, sender, **kwargs):
         self.in_request = False
@@ -33,11 +51,15 @@ class MessageQueue(local):
 
     def send_message(self, sender, **kwargs):
         kwargs['sender'] = kwargs.pop('sender_', None)
-        if self.in_request:
+        if self.is_queuing:
             kwargs['send_to_admins'] = self.send_to_admins
             kwargs['send_to_managers'] = self.send_to_managers
             kwargs['send_to_all'] = self.send_to_all
-            self.messages.append(Message(**kwargs))
+            message = Message(**kwargs)
+            self.messages.setdefault(message.message_type, []).append(message)
+            self.pending += 1
+            if self.pending >= getattr(settings, 'MESSAGING_QUEUE_MAX_PENDING', 1000):
+                self.flush()
         else:
             process_messages.delay([Message(**kwargs)])
 
@@ -46,6 +68,41 @@ class MessageQueue(local):
         self.send_to_managers = kwargs.get('managers', self.send_to_managers)
         self.send_to_all = kwargs.get('all', self.send_to_all)
 
+    def flush(self):
+        """
+        Hand all queued messages to Celery now, grouped by message type.
+        Returns the number of messages that were queued.
+        """
+        messages, count = self.messages, self.pending
+        self.messages = {}
+        self.pending = 0
+        batch_size = getattr(settings, 'MESSAGING_BATCH_SIZE', 100)
+        for message_type in sorted(messages):
+            group = messages[message_type]
+            for i in xrange(0, len(group), batch_size):
+                process_messages.delay(group[i:i + batch_size])
+        return count
+
+    @contextmanager
+    def batch(self):
+        """
+        Queue the messages sent within the block, as if it were a request, and
+        flush them when the outermost block exits.  Messages are discarded if
+        the block raises an exception.
+        """
+        self.batch_depth += 1
+        try:
+            yield self
+        except:
+            self.batch_depth -= 1
+            if self.batch_depth == 0 and not self.in_request:
+                self.reset()
+            raise
+        self.batch_depth -= 1
+        if self.batch_depth == 0 and not self.in_request:
+            self.flush()
+            self.reset()
+
 # This queue instance can be used by multiple threads without a problem, since
 # it inherits from threading.local.
 queue = MessageQueue()
@@ -0,0 +1,107 @@
+"""In-process registry of message types, formats and templates."""
+
+from __future__ import with_statement
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from pr_services.middleware import run_after_commit
+from .models import MessageFormat, MessageType, MessageTemplate
+
+logger = logging.getLogger('pr_messaging.registry')
+
+class Registry(object):
+    """
+    Keeps every message type, format and template in memory, so that queuing
+    and rendering messages doesn't have to look them up in the database.
+
+    The registry is loaded the first time it is used.  Saving or deleting any
+    of the models increments a generation stamp kept in the Django cache once
+    the transaction commits, and each process reloads its registry when it
+    sees that the stamp has changed.
+    The stamp is checked at most once every MESSAGING_REGISTRY_CHECK_INTERVAL
+    seconds; changes made in this process take effect immediately.
+    """
+
+    generation_key = 'pr_messaging:registry:generation'
+    #: seconds to keep the stamp; a timeout of 0 would make it expire at once
+    #: with most cache backends, and None means the default of CACHE_BACKEND
+    generation_timeout = 60 * 60 * 24 * 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = None
+        self._generation = None
+        self._checked = 0
+
+    def invalidate(self, **kwargs):
+        """Forget the registry here and tell other processes to do the same."""
+        self._data = None
+        # Reload at the next check even if the change is rolled back and the
+        # stamp never moves.
+        self._generation = None
+        # Bumping the stamp before the commit would let another process
+        # reload the old rows and keep them under the new stamp.
+        run_after_commit(self._increment_generation)
+
+    def _increment_generation(self):
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            cache.set(self.generation_key, int(time.time() * 1000), self.generation_timeout)
+
+    def _current_generation(self):
+        generation = cache.get(self.generation_key)
+        if generation is None:
+            # Start from the current time so that a lost stamp can't match the
+            # one we loaded with.
+            cache.add(self.generation_key, int(time.time() * 1000), self.generation_timeout)
+            generation = cache.get(self.generation_key)
+        return generation
+
+    def _get_data(self):
+        now = time.time()
+        interval = getattr(settings, 'MESSAGING_REGISTRY_CHECK_INTERVAL', 10)
+        data = self._data
+        if data is not None and now - self._checked < interval:
+            return data
+        with self._lock:
+            generation = self._current_generation()
+            self._checked = now
+            if self._data is None or generation is None or generation != self._generation:
+                logger.debug('loading message types, formats and templates')
+                templates = {}
+                for template in MessageTemplate.objects.select_related('message_type', 'message_format'):
+                    templates[(template.message_type.slug, template.message_format.slug)] = template
+                self._data = {
+                    'types': dict((mt.slug, mt) for mt in MessageType.objects.all()),
+                    'formats': list(MessageFormat.objects.filter(enabled=True).order_by('id')),
+                    'templates': templates,
+                }
+                self._generation = generation
+            return self._data
+
+    def get_message_type(self, slug):
+        """Return the enabled MessageType with the given slug, or None."""
+        message_type = self._get_data()['types'].get(slug)
+        if message_type is not None and message_type.enabled:
+            return message_type
+
+    def get_message_formats(self):
+        """Return a list of the enabled MessageFormats."""
+        return list(self._get_data()['formats'])
+
+    def get_message_template(self, message_type, message_format):
+        """
+        Return the MessageTemplate for the given message type and format slugs,
+        or None.
+        """
+        return self._get_data()['templates'].get((message_type, message_format))
+
+registry = Registry()
+
+for _model in (MessageFormat, MessageType, MessageTemplate):
+    post_save.connect(registry.invalidate, sender=_model, dispatch_uid='pr_messaging.registry.%s.save' % _model.__name__)
+    post_delete.connect(registry.invalidate, sender=_model, dispatch_uid='pr_messaging.registry.%s.delete' % _model.__name__)
@@ -16,6 +16,15 @@ message_flags_update = Signal(providing_args=['admins', 'managers', 'all'])
 # or None if no instance can be found.
 participant_instance_requested = Signal(providing_args=['participant'])
 
+# Signal dispatched by the pr_messaging app to retrieve the Django model
+# instances for a list of participants at once.
+#
+# Handlers for this signal should return a list with an instance of
+# django.db.models.Model or None for each participant, in the same order, and
+# should use as few queries as possible.  The participant_instance_requested
+# signal is still dispatched for each participant that no handler resolves.
+participant_instances_requested = Signal(providing_args=['participants'])
+
 # Signal dispatched by the pr_messaging app to retrieve contact information for
 # a given participant and message.
 #
@@ -50,8 +59,9 @@ message_template_requested = Signal(providing_args=['message'])
 #
 # Handlers for this signal should return True if they delivered the message
 # successfully, False if they did not, and None if they did nothing with the
-# message.
-message_ready_for_delivery = Signal(providing_args=['message'])
+# message.  The connection argument is an open Django email connection that is
+# shared by all of the messages delivered together, or None.
+message_ready_for_delivery = Signal(providing_args=['message', 'connection'])
 
 # Signal dispatched by the pr_messaging app when a message has been delivered.
 message_delivered = Signal(providing_args=['message'])
@@ -1,10 +1,19 @@
 """Celery tasks for processing messages."""
 
+import base64
+import cPickle
+from datetime import datetime, timedelta
 import logging
+import uuid
 from django.conf import settings
+from django.core.mail import get_connection
+from django.db.models import Min
 from django.template import Context
 from celery.decorators import task
-from .models import MessageTemplate, MessageFormat, MessageType
+from pr_services.utils import Utils
+from .common import Message, Participant
+from .models import DigestItem, MessageTemplate
+from .registry import registry
 from . import signals
 
 logger = logging.getLogger('pr_messaging.tasks')
@@ -23,6 +32,27 @@ logger = logging.getLogger('pr_messaging.tasks')
 # GenericForeignKey field.
 
 
+def _batches(messages):
+    """
+    Group messages by message type and format, which determine the template,
+    and yield lists of at most MESSAGING_BATCH_SIZE messages.
+    """
+    groups = {}
+    for message in messages:
+        groups.setdefault((message.message_type, message.message_format), []).append(message)
+    batch_size = getattr(settings, 'MESSAGING_BATCH_SIZE', 100)
+    for key in sorted(groups):
+        group = groups[key]
+        for i in xrange(0, len(group), batch_size):
+            yield group[i:i + batch_size]
+
+def _as_list(messages):
+    # The tasks below used to take a single message; accept one in case any
+    # are still queued.
+    if isinstance(messages, Message):
+        return [messages]
+    return messages
+
 @task(ignore_result=True)
 def process_messages(messages=[]):
     """
@@ -30,32 +60,96 @@ def process_messages(messages=[]):
     """
     logger.trace('process_messages %r', messages)
     # FIXME: Handle multiple messages with the same type by aggregating the context.
+    formatted_messages = []
+    message_formats = registry.get_message_formats()
     for message in messages:
         # Retrieve the corresponding message type for this message.
-        try:
-            message_type = MessageType.objects.get(slug=message.message_type, enabled=True)
-        except MessageType.DoesNotExist:
+        message_type = registry.get_message_type(message.message_type)
+        if message_type is None:
             logger.error('no enabled message type found for %r', message)
             continue
+        # Messages of digest types are held until send_digests() combines them.
+        if message_type.digest and not getattr(message, 'digest', False):
+            _hold_for_digest(message_type, message)
+            continue
         # If this message type supports rendering once for multiple recipients,
         # don't split it. Otherwise, split it into separate message instances
         # for each recipient.
         if len(message.recipients()) == 0:
             logger.warning('skipping message with no recipients')
+            continue
         elif len(message.recipients()) == 1 or message_type.multiple_recipients:
-            for message_format in MessageFormat.objects.filter(enabled=True):
-                new_message = message.updated(message_format=message_format.slug)
-                update_message_participants.delay(new_message)
+            split_messages = [message]
         else:
-            process_messages.delay(message.split_by_recipient())
+            split_messages = message.split_by_recipient()
+        for message_format in message_formats:
+            for split_message in split_messages:
+                formatted_messages.append(split_message.updated(message_format=message_format.slug))
+    for batch in _batches(formatted_messages):
+        update_message_participants.delay(batch)
+
+def _hold_for_digest(message_type, message):
+    """Store a DigestItem for each recipient of a message, in one INSERT."""
+    if len(message.recipients()) == 1:
+        split_messages = [message]
+    else:
+        split_messages = message.split_by_recipient()
+    timestamp = datetime.utcnow()
+    Utils.bulk_insert(DigestItem, ({'message_type': message_type,
+        'recipient': split_message.recipients()[0].digest_key,
+        'message': base64.b64encode(cPickle.dumps(split_message, cPickle.HIGHEST_PROTOCOL)),
+        'timestamp': timestamp} for split_message in split_messages))
 
 @task(ignore_result=True)
-def update_message_participants(message):
+def send_digests(now=None):
+    """
+    Celery task that combines the messages held for each recipient into one
+    message per message type, once the oldest of them has been waiting for
+    MESSAGING_DIGEST_WINDOW seconds, and sends those messages.
+
+    Each batch of items is claimed with one UPDATE that stamps them with a key
+    unique to this run, so two runs that overlap can't both send the same
+    items.  If sending fails, the claim is released so that the next run
+    tries again.
+    """
+    if now is None:
+        now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=getattr(settings, 'MESSAGING_DIGEST_WINDOW', 3600))
+    recipients = list(DigestItem.objects.filter(claim_key=None).values('recipient').annotate(
+        first_timestamp=Min('timestamp')).filter(first_timestamp__lte=cutoff).values_list(
+        'recipient', flat=True))
+    logger.trace('send_digests for %d recipients', len(recipients))
+    batch_size = getattr(settings, 'MESSAGING_BATCH_SIZE', 100)
+    for i in xrange(0, len(recipients), batch_size):
+        claim_key = uuid.uuid4().hex
+        claimed = DigestItem.objects.filter(recipient__in=recipients[i:i + batch_size],
+            timestamp__lte=now, claim_key=None).update(claim_key=claim_key)
+        if not claimed:
+            continue
+        items = DigestItem.objects.filter(claim_key=claim_key)
+        try:
+            groups = {}
+            for item in items.order_by('timestamp', 'id'):
+                message = cPickle.loads(base64.b64decode(item.message))
+                groups.setdefault((item.recipient, item.message_type_id), []).append(message)
+            digests = []
+            for key in sorted(groups):
+                group = groups[key]
+                digests.append(group[0].updated(digest=True, context={
+                    'items': [m.context for m in group],
+                    'count': len(group),
+                }))
+            process_messages.delay(digests)
+        except:
+            items.update(claim_key=None)
+            raise
+        items.delete()
+
+def _update_participants(message):
     """
-    Celery task to retrieve contact info for each participant in a message and
-    determine whether the message should be sent to each participant.
+    Retrieve contact info for each participant in a message and determine
+    whether the message should be sent to each participant.
     """
-    logger.trace('update_message_participants %r', message)
     default_send = True
     new_participants = []
     for p in message.participants:
@@ -83,17 +177,33 @@ def update_message_participants(message):
             should_send = all(should_send) and any(should_send)
         if should_send and contact_info:
             new_participants.append(p.updated(contact_info=contact_info))
-    new_message = message.updated(participants=new_participants)
-    if new_message.recipients():
-        render_message.delay(new_message)
+    return message.updated(participants=new_participants)
 
 @task(ignore_result=True)
-def render_message(message):
+def update_message_participants(messages):
     """
-    Celery task for rendering the message subject and body with the appropriate
-    template based on the message type and format.
+    Celery task to retrieve contact info for the participants in a list of
+    messages and determine whether each message should be sent to each
+    participant.
+    """
+    logger.trace('update_message_participants %r', messages)
+    messages = _as_list(messages)
+    # Handlers usually need the participants' model instances, so fetch them
+    # all together.
+    Participant.load_instances([p for message in messages for p in message.participants])
+    new_messages = []
+    for message in messages:
+        new_message = _update_participants(message)
+        if new_message.recipients():
+            new_messages.append(new_message)
+    for batch in _batches(new_messages):
+        render_message.delay(batch)
+
+def _render(message):
+    """
+    Render the message subject and body with the appropriate template based on
+    the message type and format.  Returns the rendered message, or None.
     """
-    logger.trace('render_message %r', message)
     # Send the message_template_requested signal to find appropriate subject
     # and body templates for the given message.
     responses = signals.message_template_requested.send_robust(None, message=message)
@@ -115,6 +225,7 @@ def render_message(message):
         context['message'] = message
         context['frontend_url'] = getattr(settings, 'FRONTEND_URL', '').rstrip('/')
         context['backend_url'] = getattr(settings, 'BACKEND_URL', '').rstrip('/')
+        result = None
         try:
             result = template.render(context)
         except:
@@ -126,27 +237,55 @@ def render_message(message):
         else:
             logger.error('unable to handle render() result %r', result)
             return
-        new_message = message.updated(subject=subject, body=body,
-                                      attachments=attachments)
-        deliver_message.delay(new_message)
+        return message.updated(subject=subject, body=body, attachments=attachments)
     else:
         logger.error('no template found for given message type and format')
 
 @task(ignore_result=True)
-def deliver_message(message):
+def render_message(messages):
     """
-    Celery task for performing the actual message delivery.
+    Celery task for rendering the subjects and bodies of a list of messages.
     """
-    logger.trace('deliver_message %r', message)
-    responses = signals.message_ready_for_delivery.send_robust(None, message=message)
-    for receiver, response in responses:
-        if response is None:
-            continue
-        elif isinstance(response, Exception):
-            logger.error('received exception %r from %r', response, receiver)
-            continue
-        elif response:
-            # Currently we don't care about the responses from this signal.
-            signals.message_delivered.send_robust(receiver, message=message)
-        else:
-            logger.error('receiver %r failed to send message %r', receiver, message)
+    logger.trace('render_message %r', messages)
+    new_messages = []
+    for message in _as_list(messages):
+        new_message = _render(message)
+        if new_message is not None:
+            new_messages.append(new_message)
+    for batch in _batches(new_messages):
+        deliver_message.delay(batch)
+
+@task(ignore_result=True)
+def deliver_message(messages):
+    """
+    Celery task for performing the actual delivery of a list of messages.
+    """
+    logger.trace('deliver_message %r', messages)
+    messages = _as_list(messages)
+    # Send all of the email with one connection to the mail server.
+    connection = None
+    if [m for m in messages if 'email' in (m.message_format or '')]:
+        try:
+            connection = get_connection()
+            connection.open()
+        except Exception:
+            logger.exception('unable to open a mail connection')
+            connection = None
+    try:
+        for message in messages:
+            responses = signals.message_ready_for_delivery.send_robust(None,
+                message=message, connection=connection)
+            for receiver, response in responses:
+                if response is None:
+                    continue
+                elif isinstance(response, Exception):
+                    logger.error('received exception %r from %r', response, receiver)
+                    continue
+                elif response:
+                    # Currently we don't care about the responses from this signal.
+                    signals.message_delivered.send_robust(receiver, message=message)
+                else:
+                    logger.error('receiver %r failed to send message %r', receiver, message)
+    finally:
+        if connection is not None:
+            connection.close()
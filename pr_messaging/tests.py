@@ -1,12 +1,22 @@
+from __future__ import with_statement
+import cPickle
+from datetime import datetime, timedelta
 import logging
 from django.test import TestCase
 from django.conf import settings
 from django.core import mail
+from django.db import connection
+from django.http import HttpRequest
 from celery import conf
 from .handlers import request_started, request_finished, got_request_exception
-from .models import MessageFormat, MessageType, MessageTemplate, SentMessage
+from .models import DigestItem, MessageFormat, MessageType, MessageTemplate, SentMessage
 from .common import Immutable, Participant, Message
+from .registry import Registry, registry
+from .tasks import send_digests
 from . import send_message, message_admins, message_managers, enable_messages
+from . import batch_messages, flush_messages
+from . import queue as queue_module
+from pr_services import middleware
 
 if 'django.contrib.auth' in settings.INSTALLED_APPS:
     from django.contrib.auth.models import User
@@ -47,6 +57,12 @@ class TestImmutables(TestCase):
         self.assertFalse(hasattr(i1, 'description'))
         self.assertEqual(i4.description, 'this is really something')
         self.assertTrue(repr(i4))
+        items = ['a']
+        i5 = Immutable(items=items)
+        items.append('b')
+        self.assertEqual(i5.items, ['a'])
+        # unchanged attributes are shared rather than copied
+        self.assertTrue(i5.updated(name='something').items is i5.items)
 
     def test_participant(self):
         p = Participant(None)
@@ -74,11 +90,42 @@ class TestImmutables(TestCase):
             self.assertEqual(p.instance, u)
             p = Participant(u.username)
             self.assertEqual(p.instance, u)
+            p2 = cPickle.loads(cPickle.dumps(p))
+            self.assertFalse('_instance' in p2.__dict__)
+            self.assertEqual(p2.instance, u)
         p2 = p.updated(content_type='someapp.notamodel')
         self.assertEqual(p2.instance, None)
         p2 = p.updated(instance_pk=99999)
         self.assertEqual(p2.instance, None)
 
+    def _count_queries(self, func, *args, **kwargs):
+        use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        start = len(connection.queries)
+        try:
+            func(*args, **kwargs)
+        finally:
+            connection.use_debug_cursor = use_debug_cursor
+        return len(connection.queries) - start
+
+    def test_participant_batch(self):
+        if not User:
+            return
+        emails = ['user%d@americanri.com' % i for i in range(5)]
+        users = [User.objects.create(username='user%d' % i, email=email)
+            for i, email in enumerate(emails)]
+        # the number of queries doesn't depend on the number of participants
+        num_queries = self._count_queries(Message, sender=emails[0], recipients=emails[1:2])
+        with self.assertNumQueries(num_queries):
+            m = Message(sender=emails[0], recipients=emails[1:] + ['nobody@americanri.com'])
+        self.assertEqual(m.sender().instance, users[0])
+        self.assertEqual([p.instance for p in m.recipients()], users[1:] + [None])
+        # one query per content type to fetch the instances again
+        participants = [p.updated(contact_info='x') for p in cPickle.loads(cPickle.dumps(m.participants))]
+        with self.assertNumQueries(1):
+            Participant.load_instances(participants)
+            self.assertEqual([p.instance for p in participants[:-1]], users)
+
     def test_message(self):
         m = Message()
         self.assertEqual(m.message_type, None)
@@ -111,6 +158,49 @@ class TestMessaging(TestCase):
     def tearDown(self):
         super(TestMessaging, self).tearDown()
 
+    def test_registry(self):
+        self.assertEqual(registry.get_message_type('foo').name, 'Foo')
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_message_type('foo').name, 'Foo')
+            self.assertEqual([mf.slug for mf in registry.get_message_formats()],
+                ['email', 'html-email'])
+            self.assertEqual(registry.get_message_template('foo', 'email').subject, 'Foo Message')
+            self.assertEqual(registry.get_message_template('foo', 'sms'), None)
+        # changes take effect right away in this process
+        mt = MessageType.objects.create(slug='bar', name='Bar')
+        self.assertEqual(registry.get_message_type('bar'), mt)
+        mt.enabled = False
+        mt.save()
+        self.assertEqual(registry.get_message_type('bar'), None)
+
+    def test_registry_generation(self):
+        # another process only reloads when the generation stamp changes
+        check_interval = settings.MESSAGING_REGISTRY_CHECK_INTERVAL
+        settings.MESSAGING_REGISTRY_CHECK_INTERVAL = 0
+        try:
+            other = Registry()
+            self.assertEqual(other.get_message_type('foo').name, 'Foo')
+            with self.assertNumQueries(0):
+                self.assertEqual(other.get_message_type('foo').name, 'Foo')
+            MessageType.objects.filter(slug='foo').update(name='Renamed')
+            with self.assertNumQueries(0):
+                self.assertEqual(other.get_message_type('foo').name, 'Foo')
+            registry.invalidate()
+            self.assertEqual(other.get_message_type('foo').name, 'Renamed')
+            # within a request the stamp only changes once it has finished
+            MessageType.objects.filter(slug='foo').update(name='Again')
+            request = middleware._thread_locals.request = HttpRequest()
+            try:
+                registry.invalidate()
+            finally:
+                del middleware._thread_locals.request
+            with self.assertNumQueries(0):
+                self.assertEqual(other.get_message_type('foo').name, 'Renamed')
+            middleware.AfterCommit().process_response(request, None)
+            self.assertEqual(other.get_message_type('foo').name, 'Again')
+        finally:
+            settings.MESSAGING_REGISTRY_CHECK_INTERVAL = check_interval
+
     def test_basic_send(self):
         send_message(message_type='foo', context={'something': 'This is something!'},
             sender=('Chris', 'cchurch@americanri.com'), recipients=['testing@americanri.com'])
@@ -134,6 +224,85 @@ class TestMessaging(TestCase):
         request_finished(None) # Fake it for the test case.
         self.assertEqual(len(mail.outbox), 2)
 
+    def test_batch(self):
+        real_process_messages = queue_module.process_messages
+        batch_sizes = []
+        class RecordingTask(object):
+            def delay(self, messages):
+                batch_sizes.append(len(messages))
+                return real_process_messages.delay(messages)
+        queue_module.process_messages = RecordingTask()
+        old_settings = settings.MESSAGING_BATCH_SIZE, settings.MESSAGING_QUEUE_MAX_PENDING
+        settings.MESSAGING_BATCH_SIZE = 2
+        try:
+            with batch_messages():
+                for i in range(5):
+                    send_message(message_type='foo', context={},
+                        recipients=['user%d@americanri.com' % i])
+                self.assertEqual(len(mail.outbox), 0)
+            self.assertEqual(batch_sizes, [2, 2, 1])
+            self.assertEqual(len(mail.outbox), 10)
+            # the queue is flushed early when too many messages are waiting
+            settings.MESSAGING_QUEUE_MAX_PENDING = 3
+            del batch_sizes[:]
+            with batch_messages():
+                for i in range(4):
+                    send_message(message_type='foo', context={},
+                        recipients=['user%d@americanri.com' % i])
+                self.assertEqual(batch_sizes, [2, 1])
+                self.assertEqual(flush_messages(), 1)
+            self.assertEqual(batch_sizes, [2, 1, 1])
+            # messages are discarded if the block raises an exception
+            del batch_sizes[:]
+            try:
+                with batch_messages():
+                    send_message(message_type='foo', context={}, recipients=['user@americanri.com'])
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertEqual(batch_sizes, [])
+        finally:
+            queue_module.process_messages = real_process_messages
+            settings.MESSAGING_BATCH_SIZE, settings.MESSAGING_QUEUE_MAX_PENDING = old_settings
+
+    def test_digest(self):
+        mt = MessageType.objects.get(slug='foo')
+        mt.digest = True
+        mt.save()
+        mtp = MessageTemplate.objects.get(message_type=mt, message_format__slug='email')
+        mtp.digest_subject = '{{ count }} Foo Messages'
+        mtp.digest_body = '{% for item in items %}{{ item.something }}\n{% endfor %}'
+        mtp.save()
+        for i in range(3):
+            send_message(message_type='foo', context={'something': 'item %d' % i},
+                recipients=['user@americanri.com', 'other@americanri.com'])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(DigestItem.objects.count(), 6)
+        # nothing is sent until the window has passed
+        send_digests()
+        self.assertEqual(len(mail.outbox), 0)
+        later = datetime.utcnow() + timedelta(seconds=settings.MESSAGING_DIGEST_WINDOW + 1)
+        # items claimed by another run are left to it
+        DigestItem.objects.filter(recipient='other@americanri.com').update(claim_key='another run')
+        send_digests(later)
+        self.assertEqual(DigestItem.objects.count(), 3)
+        self.assertEqual(len(mail.outbox), 2)
+        DigestItem.objects.update(claim_key=None)
+        send_digests(later)
+        self.assertEqual(DigestItem.objects.count(), 0)
+        # one message for each recipient and format
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox),
+            ['other@americanri.com'] * 2 + ['user@americanri.com'] * 2)
+        digests = [m for m in mail.outbox if m.subject == '3 Foo Messages']
+        self.assertEqual(len(digests), 2)
+        self.assertEqual(digests[0].body, 'item 0\nitem 1\nitem 2\n')
+        # without digest templates, the bodies of the messages are joined
+        html_digest = [m for m in mail.outbox if m.subject == 'Foo Message'][0]
+        self.assertEqual(html_digest.body, 'item 0\nitem 1\nitem 2\n')
+        self.assertEqual(html_digest.alternatives[0][0], '\n\n'.join(
+            '<h1>Text message:<h1><p>item %d</p>' % i for i in range(3)))
+
     def test_send_with_request_exception(self):
         request_started(None) # Fake it for the test case.
         send_message(message_type='foo', context={}, recipients=['user@americanri.com'])
@@ -1,14 +1,24 @@
 import uuid as _uuid
+from django.db.models import signals as _model_signals
 from pr_messaging import signals as _signals
 from . import handlers as _handlers
+from . import search_index as _search_index
+from .credential_system import prerequisite_graph as _prerequisite_graph
 
 # Add the dispatch_uid when connecting a signal.
 _connect = lambda x, y: x.connect(y, dispatch_uid=str(_uuid.uuid4()))
 
 # Connect handlers to messaging app signals.
-_connect(_signals.participant_instance_requested, _handlers.pr_user_instance_requested)
+_connect(_signals.participant_instances_requested, _handlers.pr_user_instances_requested)
 _connect(_signals.participant_contact_requested, _handlers.pr_user_contact_requested)
 
+# Keep the full-text search index up to date.
+_connect(_model_signals.post_save, _search_index.update_search_index)
+_connect(_model_signals.post_delete, _search_index.remove_from_search_index)
+
+# Forget cached prerequisite edges when they change.
+_connect(_model_signals.m2m_changed, _prerequisite_graph.prerequisites_changed)
+
 # Python
 import unittest
 
@@ -14,6 +14,8 @@ import cPickle
 from datetime import datetime, timedelta
 import threading
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.fields import FieldDoesNotExist
+from django.db.models import Q
 from authorizer_decorators import *
 import exceptions
 import facade
@@ -21,6 +23,30 @@ import pr_models
 import logging
 from utils import Utils
 
+def _q_and(a, b):
+    """
+    AND two conditions together, where each is either a Q object or a bool
+    that stands for a condition that every object (True) or no object
+    (False) meets.
+    """
+    if a is False or b is False:
+        return False
+    if a is True:
+        return b
+    if b is True:
+        return a
+    return a & b
+
+def _q_or(a, b):
+    """ OR two conditions together, as described in _q_and() """
+    if a is True or b is True:
+        return True
+    if a is False:
+        return b
+    if b is False:
+        return a
+    return a | b
+
 class Authorizer(object):
     # Store a single instance of an Authorizer object, so we can manage the ACL cache effectively
     singleton_instance = None
@@ -195,7 +221,8 @@ class Authorizer(object):
             # If all the checks have passed, we need to grant permissions to the user from the
             # ACL 
             if self._acl_checks_pass(auth_token, actee, acl):
-                permission_granted = acl['acl'][actee_type]['d']
+                permission_granted = acl['acl'].get(actee_type,
+                    acl['acl'].get('%s.%s' % (namespace, actee_type)))['d']
                 if permission_granted:
                     return
         if not permission_granted:
@@ -235,7 +262,9 @@ class Authorizer(object):
             checks_pass = self._acl_checks_pass(auth_token, actee, potential_acl_dict, update_dict)
             self.logger.commit()
             if checks_pass:
-                attributes_granted = potential_acl_dict['acl'][actee_type][access_type]
+                acl = potential_acl_dict['acl']
+                attributes_granted = acl.get(actee_type,
+                    acl.get('%s.%s' % (namespace, actee_type)))[access_type]
                 all_requested_fields_granted = True
                 # If the user has requested fields, we can perform some optimizations
                 if len(requested_fields) != 0: 
@@ -436,6 +465,547 @@ class Authorizer(object):
             return True
         return False
 
+    #################################################################
+    #
+    # Query-time authorization
+    #
+    # Rather than loading every object and running the ACL checks on
+    # each of them, the checks can often be expressed as conditions
+    # on a QuerySet, so that the database only returns the objects
+    # the actor may see.  Each entry in query_translators maps the
+    # name of an ac_check_method to the name of a method that takes
+    # the auth_token, the model class being queried and the check's
+    # parameters, and returns a Q object or a bool describing the
+    # objects for which the check passes.  Like the check methods,
+    # translators raise InvalidActeeTypeException for models that the
+    # check does not apply to, and they may return None when the
+    # check has no SQL equivalent for the given parameters.  Checks
+    # that do not use the actee need no translator, since their
+    # result is the same for every object.
+    #
+    #################################################################
+
+    query_translators = {
+        'actees_attribute_is_set_to' : 'actees_attribute_is_set_to_query',
+        'actees_foreign_key_object_has_attribute_set_to' : 'actees_foreign_key_object_has_attribute_set_to_query',
+        'actor_has_completed_assignment_prerequisites' : 'assignment_check_query',
+        'actor_has_completed_task_prerequisites' : 'actor_has_completed_task_prerequisites_query',
+        'actor_is_acting_upon_themselves' : 'actor_is_acting_upon_themselves_query',
+        'actor_is_group_manager' : 'actor_is_group_manager_query',
+        'actor_is_in_actee_which_is_a_group' : 'actor_is_in_actee_which_is_a_group_query',
+        'actor_is_in_actee_which_is_an_organization' : 'actor_is_in_actee_which_is_an_organization_query',
+        'actor_is_instructor_manager_of_actee' : 'actor_is_instructor_manager_of_actee_query',
+        'actor_is_product_line_manager_of_product_line' : 'actor_is_product_line_manager_of_product_line_query',
+        'actor_is_product_line_manager_of_session' : 'actor_is_product_line_manager_of_session_query',
+        'actor_is_product_line_manager_of_session_template' : 'actor_is_product_line_manager_of_session_template_query',
+        'actor_is_product_line_manager_of_user' : 'actor_is_product_line_manager_of_user_query',
+        'actor_is_venue_creator' : 'actor_is_venue_creator_query',
+        'actor_owns_address' : 'actor_owns_address_query',
+        'actor_owns_assignment' : 'actor_owns_assignment_query',
+        'actor_owns_assignment_attempt' : 'actor_owns_assignment_attempt_query',
+        'actor_owns_assignment_or_is_guest' : 'actor_owns_assignment_or_is_guest_query',
+        'actor_owns_credential' : 'actor_owns_credential_query',
+        'actor_owns_event' : 'actor_owns_event_query',
+        'actor_owns_payment' : 'actor_owns_payment_query',
+        'actor_owns_prmodel' : 'actor_owns_prmodel_query',
+        'actor_owns_purchase_order' : 'actor_owns_purchase_order_query',
+        'actor_owns_session' : 'actor_owns_session_query',
+        'actor_owns_session_user_role_requirement' : 'actor_owns_session_user_role_requirement_query',
+        'actor_owns_training_unit_authorization' : 'actor_owns_training_unit_authorization_query',
+        'actor_related_to_domain_affiliation' : 'actor_related_to_domain_affiliation_query',
+        'assignment_attempt_meets_date_restrictions' : 'assignment_attempt_check_query',
+        'assignment_attempt_prerequisites_met' : 'assignment_attempt_check_query',
+        'assignment_prerequisites_met' : 'assignment_check_query',
+        'assignment_venue_matches_actor_preferred_venue' : 'assignment_check_query',
+        'populated_exam_session_is_finished' : 'populated_exam_session_is_finished_query',
+        'purchase_order_has_no_payments' : 'purchase_order_has_no_payments_query',
+        'purchase_order_has_payments' : 'purchase_order_has_payments_query',
+        'refund_does_not_exceed_payment' : 'refund_does_not_exceed_payment_query',
+        'surr_is_of_a_particular_sur' : 'surr_is_of_a_particular_sur_query',
+    }
+
+    def filter_readable(self, auth_token, query_set, requested_attributes):
+        """
+        Narrow a QuerySet down to the objects on which the actor may read
+        all of the requested attributes, as check_read_permissions() would
+        decide for each of them.  As much of the decision as possible is
+        made by the database; only objects that depend on a check without
+        a query translator are loaded and checked one at a time.
+
+        @param query_set            The QuerySet to narrow
+        @type query_set             django.db.models.query.QuerySet
+        @param requested_attributes The list of fields that the user is attempting to read
+        @type requested_attributes  list
+        @return                     A QuerySet of the readable objects
+        """
+
+        if not requested_attributes:
+            return query_set
+        certain, possible = self._compile_read_filter(auth_token, query_set.model,
+            requested_attributes)
+        if possible is False:
+            return query_set.none()
+        candidates = query_set if possible is True else query_set.filter(possible).distinct()
+        if certain is possible:
+            return candidates
+        if certain is False:
+            granted = set()
+        else:
+            granted = set(candidates.filter(certain).values_list('id', flat=True))
+        for actee in candidates.exclude(id__in=granted):
+            authorized_attributes = self.get_authorized_attributes(auth_token, actee,
+                requested_attributes, 'r')
+            if not [f for f in requested_attributes if f not in authorized_attributes]:
+                granted.add(actee.id)
+        return query_set.filter(id__in=granted)
+
+    def get_read_access(self, auth_token, query_set, requested_fields):
+        """
+        Decide, with one query per relevant ACL rather than one set of checks
+        per object, which of the requested fields the actor may read on each
+        object of a QuerySet.  This is the bulk counterpart of
+        get_authorized_attributes(), for callers like the Getter that read
+        many objects at once.
+
+        @param query_set        The QuerySet whose objects are to be read
+        @type query_set         django.db.models.query.QuerySet
+        @param requested_fields A list of the fields that the user would like to read
+        @type requested_fields  list of string
+        @return                 A ReadAccess, whose query_set attribute holds the QuerySet
+                                narrowed to the objects on which the actor may be able to
+                                read at least one of the requested fields
+        """
+
+        return ReadAccess(self, auth_token, query_set, requested_fields)
+
+    def check_create_permissions_for_set(self, auth_token, query_set):
+        """
+        This is the bulk counterpart of check_create_permissions(), for
+        objects that have just been saved together.  It raises an exception
+        unless the actor may create every object in the QuerySet.
+
+        @param query_set    QuerySet of the newly created objects
+        @type query_set     django.db.models.query.QuerySet
+        """
+
+        self._check_cd_permissions_for_set(auth_token, query_set, 'c')
+
+    def check_delete_permissions_for_set(self, auth_token, query_set):
+        """
+        This is the bulk counterpart of check_delete_permissions().  It raises
+        an exception unless the actor may delete every object in the
+        QuerySet.
+
+        @param query_set    QuerySet of the objects the actor wishes to delete
+        @type query_set     django.db.models.query.QuerySet
+        """
+
+        self._check_cd_permissions_for_set(auth_token, query_set, 'd')
+
+    def _check_cd_permissions_for_set(self, auth_token, query_set, access_type):
+        """
+        Decide create ('c') or delete ('d') permissions for all of the objects
+        in a QuerySet with one query per condition, checking one object at a
+        time only those that depend on a check without a query translator.
+        """
+
+        model = query_set.model
+        actee_type = model._meta.object_name
+        namespace = model._meta.app_label
+        certain = possible = False
+        exact = True
+        for acl_dict in self._get_relevant_acls_for_cd(actee_type, namespace, access_type):
+            acl = acl_dict['acl']
+            if not acl.get(actee_type, acl.get('%s.%s' % (namespace, actee_type)))[access_type]:
+                continue
+            acl_certain, acl_possible = self._compile_acl(auth_token, model, acl_dict)
+            certain = _q_or(certain, acl_certain)
+            possible = _q_or(possible, acl_possible)
+            exact = exact and acl_certain is acl_possible
+        if certain is True:
+            return
+        undecided = set(query_set.values_list('id', flat=True))
+        if undecided and certain is not False:
+            undecided -= set(query_set.filter(certain).values_list('id', flat=True))
+        if not undecided:
+            return
+        if exact or possible is False:
+            raise exceptions.PermissionDeniedException()
+        if possible is not True and len(undecided) != model.objects.filter(
+                possible, id__in=undecided).distinct().count():
+            raise exceptions.PermissionDeniedException()
+        check = {'c': self.check_create_permissions,
+            'd': self.check_delete_permissions}[access_type]
+        for actee in model.objects.filter(id__in=undecided):
+            check(auth_token, actee)
+
+    def _compile_read_acls(self, auth_token, model, requested_attributes):
+        """
+        Translate the ACLs that grant any of the requested attributes of a
+        model into conditions on that model.
+
+        @param model                The model class being queried
+        @param requested_attributes The list of fields that the user is attempting to read
+        @return                     A list of tuples of the requested attributes that an ACL
+                                    grants and the two conditions returned by _compile_acl().
+                                    ACLs that can't pass for any object are left out.
+        """
+
+        actee_type = model._meta.object_name
+        namespace = model._meta.app_label
+        ret = []
+        for acl_dict in self._get_relevant_acls_for_attributes(actee_type, namespace,
+                requested_attributes, 'r'):
+            acl = acl_dict['acl']
+            granted = acl.get(actee_type, acl.get('%s.%s' % (namespace, actee_type)))['r']
+            certain, possible = self._compile_acl(auth_token, model, acl_dict)
+            if possible is not False:
+                ret.append(([f for f in requested_attributes if f in granted], certain, possible))
+        return ret
+
+    def _compile_read_filter(self, auth_token, model, requested_attributes):
+        """
+        Build the conditions under which all of the requested attributes of
+        objects of a model are readable.
+
+        @param model                The model class being queried
+        @param requested_attributes The list of fields that the user is attempting to read
+        @return                     A tuple of two conditions, each a Q object or a bool.  Objects
+                                    that meet the first are certainly readable, and objects that
+                                    don't meet the second certainly are not.  When no check lacks
+                                    a translator, both are the same object.
+        """
+
+        compiled = self._compile_read_acls(auth_token, model, requested_attributes)
+        certain = possible = True
+        for field in requested_attributes:
+            field_certain = field_possible = False
+            for fields, acl_certain, acl_possible in compiled:
+                if field in fields:
+                    field_certain = _q_or(field_certain, acl_certain)
+                    field_possible = _q_or(field_possible, acl_possible)
+            certain = _q_and(certain, field_certain)
+            possible = _q_and(possible, field_possible)
+        if not [acl_certain for fields, acl_certain, acl_possible in compiled
+                if acl_certain is not acl_possible]:
+            return possible, possible
+        return certain, possible
+
+    def _compile_acl(self, auth_token, model, acl_dict):
+        """
+        Translate the checks of an ACL into conditions on a model, following
+        the rules of _acl_checks_pass().
+
+        @param model        The model class being queried
+        @param acl_dict     The ACL whose checks are being translated
+        @type acl_dict      dict
+        @return             A tuple of two conditions, as returned by _compile_read_filter()
+        """
+
+        if not isinstance(auth_token, facade.models.AuthToken):
+            if not (auth_token is None or auth_token == ''):
+                raise exceptions.NotLoggedInException
+            cache_key = ''
+        else:
+            cache_key = auth_token.session_id
+        condition = True
+        applicable_checks = 0
+        untranslated_checks = 0
+        for ac_method_call_dict in acl_dict['ac_method_calls']:
+            method_to_run = getattr(self, ac_method_call_dict['method_to_run'])
+            if not hasattr(method_to_run, 'allow_guests') and self.actor_is_guest(auth_token):
+                return False, False
+            if getattr(method_to_run, 'uses_update_dict', False):
+                # reads never carry an update dictionary
+                continue
+            # _acl_checks_pass() leaves the actor and actee in the cached parameters
+            method_parameters = dict((k, v) for k, v in
+                ac_method_call_dict.get('parameters', {}).iteritems()
+                if k not in ('actee', 'auth_token'))
+            try:
+                if getattr(method_to_run, 'does_not_use_actee', False):
+                    try:
+                        check = ac_method_call_dict['check_passed'][cache_key]
+                    except KeyError:
+                        check = method_to_run(auth_token=auth_token, actee=None,
+                            **method_parameters)
+                        ac_method_call_dict['check_passed'][cache_key] = check
+                    check = bool(check)
+                elif ac_method_call_dict['method_to_run'] in self.query_translators:
+                    translator = getattr(self,
+                        self.query_translators[ac_method_call_dict['method_to_run']])
+                    check = translator(auth_token, model, **method_parameters)
+                else:
+                    check = None
+            except exceptions.InvalidActeeTypeException:
+                continue
+            if check is None:
+                untranslated_checks += 1
+                continue
+            applicable_checks += 1
+            condition = _q_and(condition, check)
+            if condition is False:
+                return False, False
+        if untranslated_checks:
+            # Whether the remaining checks apply and pass can only be
+            # decided one object at a time.
+            return False, condition
+        if applicable_checks == 0:
+            return False, False
+        return condition, condition
+
+    def actor_owns_prmodel_query(self, auth_token, model):
+        """ query translator for actor_owns_prmodel() """
+        if not issubclass(model, pr_models.OwnedPRModel):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(owner__isnull=True) | Q(owner__id=auth_token.user.id)
+
+    def actor_owns_assignment_query(self, auth_token, model):
+        """ query translator for actor_owns_assignment() """
+        if not issubclass(model, facade.models.Assignment):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(user__id=auth_token.user.id)
+
+    def actor_owns_credential_query(self, auth_token, model):
+        """ query translator for actor_owns_credential() """
+        if not issubclass(model, facade.models.Credential):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(user__id=auth_token.user.id)
+
+    def actor_owns_event_query(self, auth_token, model):
+        """ query translator for actor_owns_event() """
+        if not issubclass(model, facade.models.Event):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(owner__id=auth_token.user.id)
+
+    def actor_owns_session_query(self, auth_token, model):
+        """ query translator for actor_owns_session() """
+        if not issubclass(model, facade.models.Session):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(event__owner__id=auth_token.user.id)
+
+    def actor_is_product_line_manager_of_session_query(self, auth_token, model):
+        """ query translator for actor_is_product_line_manager_of_session() """
+        if not issubclass(model, facade.models.Session):
+            raise exceptions.InvalidActeeTypeException()
+        # Sessions have no product_line of their own; only the one of their
+        # session_template counts
+        return Q(session_template__product_line__managers__id=auth_token.user.id)
+
+    def refund_does_not_exceed_payment_query(self, auth_token, model):
+        """
+        query translator for refund_does_not_exceed_payment(), which has no SQL
+        equivalent but only applies to Refunds
+        """
+        if not issubclass(model, facade.models.Refund):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
+    def surr_is_of_a_particular_sur_query(self, auth_token, model, session_user_role_id):
+        """ query translator for surr_is_of_a_particular_sur() """
+        if not issubclass(model, facade.models.SessionUserRoleRequirement):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(session_user_role__id=int(session_user_role_id))
+
+    def actor_owns_session_user_role_requirement_query(self, auth_token, model):
+        """ query translator for actor_owns_session_user_role_requirement() """
+        if not issubclass(model, facade.models.SessionUserRoleRequirement):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(session__event__owner__id=auth_token.user.id)
+
+    def actor_is_group_manager_query(self, auth_token, model):
+        """ query translator for actor_is_group_manager() """
+        if not issubclass(model, facade.models.Group):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(managers__id=auth_token.user.id)
+
+    def actor_is_in_actee_which_is_a_group_query(self, auth_token, model):
+        """ query translator for actor_is_in_actee_which_is_a_group() """
+        if not issubclass(model, facade.models.Group):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(users__id=auth_token.user.id)
+
+    def actor_is_in_actee_which_is_an_organization_query(self, auth_token, model):
+        """ query translator for actor_is_in_actee_which_is_an_organization() """
+        if not issubclass(model, facade.models.Organization):
+            raise exceptions.InvalidActeeTypeException()
+        if not isinstance(auth_token, facade.models.AuthToken):
+            return False
+        return Q(users__id=auth_token.user.id)
+
+    def actor_owns_payment_query(self, auth_token, model):
+        """ query translator for actor_owns_payment() """
+        if not issubclass(model, facade.models.Payment):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(purchase_order__user__id=auth_token.user.id)
+
+    def actor_owns_purchase_order_query(self, auth_token, model):
+        """ query translator for actor_owns_purchase_order() """
+        if not issubclass(model, facade.models.PurchaseOrder):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(user__id=auth_token.user.id)
+
+    def actor_related_to_domain_affiliation_query(self, auth_token, model):
+        """ query translator for actor_related_to_domain_affiliation() """
+        if not issubclass(model, facade.models.DomainAffiliation):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(user__id=auth_token.user.id)
+
+    def actor_owns_training_unit_authorization_query(self, auth_token, model):
+        """ query translator for actor_owns_training_unit_authorization() """
+        if not issubclass(model, facade.models.TrainingUnitAuthorization):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(user__id=auth_token.user.id)
+
+    def actor_owns_address_query(self, auth_token, model):
+        """ query translator for actor_owns_address() """
+        if not issubclass(model, facade.models.Address):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(users_billing__id=auth_token.user.id) | Q(users_shipping__id=auth_token.user.id)
+
+    def actor_owns_assignment_attempt_query(self, auth_token, model):
+        """ query translator for actor_owns_assignment_attempt() """
+        if not issubclass(model, facade.models.AssignmentAttempt):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(assignment__user__id=auth_token.user.id)
+
+    def actor_owns_assignment_or_is_guest_query(self, auth_token, model):
+        """ query translator for actor_owns_assignment_or_is_guest() """
+        if not issubclass(model, facade.models.Assignment):
+            raise exceptions.InvalidActeeTypeException()
+        if self.actor_is_guest(auth_token):
+            return Q(user__isnull=True)
+        return Q(user__id=auth_token.user.id)
+
+    def assignment_check_query(self, auth_token, model):
+        """
+        query translator for checks on Assignments that have no SQL equivalent,
+        so that they are only run for Assignments
+        """
+        if not issubclass(model, facade.models.Assignment):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
+    def assignment_attempt_check_query(self, auth_token, model):
+        """
+        query translator for checks on AssignmentAttempts that have no SQL
+        equivalent, so that they are only run for AssignmentAttempts
+        """
+        if not issubclass(model, facade.models.AssignmentAttempt):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
+    def populated_exam_session_is_finished_query(self, auth_token, model):
+        """
+        query translator for populated_exam_session_is_finished(), which has no
+        SQL equivalent but only applies to ExamSessions
+        """
+        if not issubclass(model, facade.models.ExamSession):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
+    def actor_has_completed_task_prerequisites_query(self, auth_token, model):
+        """ query translator for actor_has_completed_task_prerequisites() """
+        if not issubclass(model, facade.models.Task):
+            raise exceptions.InvalidActeeTypeException()
+        return facade.subsystems.PrerequisiteGraph().unlocked_query(auth_token.user)
+
+    def actor_is_product_line_manager_of_session_template_query(self, auth_token, model):
+        """ query translator for actor_is_product_line_manager_of_session_template() """
+        if not issubclass(model, facade.models.SessionTemplate):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(product_line__managers__id=auth_token.user.id)
+
+    def actor_is_product_line_manager_of_product_line_query(self, auth_token, model):
+        """ query translator for actor_is_product_line_manager_of_product_line() """
+        if not issubclass(model, facade.models.ProductLine):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(managers__id=auth_token.user.id)
+
+    def purchase_order_has_payments_query(self, auth_token, model):
+        """ query translator for purchase_order_has_payments() """
+        if not issubclass(model, facade.models.PurchaseOrder):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(payments__isnull=False)
+
+    def purchase_order_has_no_payments_query(self, auth_token, model):
+        """ query translator for purchase_order_has_no_payments() """
+        if not issubclass(model, facade.models.PurchaseOrder):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(payments__isnull=True)
+
+    def actor_is_acting_upon_themselves_query(self, auth_token, model):
+        """ query translator for actor_is_acting_upon_themselves() """
+        if not issubclass(model, facade.models.User):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(id=auth_token.user.id)
+
+    def actor_is_instructor_manager_of_actee_query(self, auth_token, model):
+        """ query translator for actor_is_instructor_manager_of_actee() """
+        if not issubclass(model, facade.models.User):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(product_lines_instructor_for__instructor_managers__id=auth_token.user.id)
+
+    def actor_is_product_line_manager_of_user_query(self, auth_token, model):
+        """ query translator for actor_is_product_line_manager_of_user() """
+        if not issubclass(model, facade.models.User):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(product_lines_instructor_for__managers__id=auth_token.user.id)
+
+    def actor_is_venue_creator_query(self, auth_token, model):
+        """ query translator for actor_is_venue_creator() """
+        if not issubclass(model, facade.models.Venue):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(blame__user__id=auth_token.user.id)
+
+    def _get_plain_field(self, model, field_name):
+        """
+        @return the field of a model with the given name, or None if there
+                isn't one or it refers to other objects
+        """
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        if field.rel is not None:
+            return None
+        return field
+
+    def actees_attribute_is_set_to_query(self, auth_token, model, actee_model_name,
+            attribute_name, attribute_value):
+        """
+        query translator for actees_attribute_is_set_to(), for attributes that
+        are plain database fields
+        """
+        if not hasattr(facade.models, actee_model_name):
+            return False
+        if not issubclass(model, getattr(facade.models, actee_model_name)):
+            raise exceptions.InvalidActeeTypeException()
+        if self._get_plain_field(model, attribute_name) is None:
+            return None
+        return Q(**{attribute_name : attribute_value})
+
+    def actees_foreign_key_object_has_attribute_set_to_query(self, auth_token, model,
+            actee_model_name, attribute_name, foreign_object_attribute_name,
+            foreign_object_attribute_value):
+        """
+        query translator for actees_foreign_key_object_has_attribute_set_to(),
+        for foreign keys whose attribute is a plain database field
+        """
+        if not hasattr(facade.models, actee_model_name):
+            return False
+        if not issubclass(model, getattr(facade.models, actee_model_name)):
+            raise exceptions.InvalidActeeTypeException()
+        try:
+            field = model._meta.get_field(attribute_name)
+        except FieldDoesNotExist:
+            return None
+        if field.rel is None or not hasattr(facade.models, field.rel.to.__name__) or \
+                self._get_plain_field(field.rel.to, foreign_object_attribute_name) is None:
+            return None
+        return Q(**{'%s__%s' % (attribute_name, foreign_object_attribute_name) :
+            foreign_object_attribute_value})
+
     #################################################################
     #
     # Below this block are where the methods that we use for the
@@ -1402,4 +1972,61 @@ class Authorizer(object):
             pass
         return False
 
+class ReadAccess(object):
+    """
+    Which of some requested fields an actor may read on each object of a
+    QuerySet, as returned by Authorizer.get_read_access().  Objects that
+    depend on a check without a query translator are handed to
+    Authorizer.get_authorized_attributes() one at a time.
+    """
+
+    def __init__(self, authorizer, auth_token, query_set, requested_fields):
+        self.authorizer = authorizer
+        self.auth_token = auth_token
+        self.requested_fields = requested_fields
+        #: list of tuples of the fields an ACL grants and the PKs of the
+        #: objects it grants them on, or None for every object
+        self.grants = []
+        #: the same, for ACLs that may grant their fields on the listed
+        #: objects, but only get_authorized_attributes() can tell
+        self.undecided = []
+        compiled = authorizer._compile_read_acls(auth_token, query_set.model,
+            requested_fields)
+        possible = False
+        for fields, certain, acl_possible in compiled:
+            possible = _q_or(possible, acl_possible)
+        if possible is False:
+            self.query_set = query_set.none()
+            return
+        elif possible is not True:
+            query_set = query_set.filter(possible).distinct()
+        self.query_set = query_set
+        for fields, certain, acl_possible in compiled:
+            if certain is not False:
+                self.grants.append((fields, self._object_ids(certain)))
+            if certain is not acl_possible:
+                self.undecided.append((fields, self._object_ids(acl_possible)))
+
+    def _object_ids(self, condition):
+        if condition is True:
+            return None
+        return set(self.query_set.filter(condition).values_list('id', flat=True))
+
+    def get_authorized_attributes(self, actee):
+        """
+        @param actee    An object from query_set
+        @return         A list of the requested fields that the actor may read on actee
+        """
+
+        authorized_attributes = set()
+        for fields, object_ids in self.grants:
+            if object_ids is None or actee.id in object_ids:
+                authorized_attributes.update(fields)
+        for fields, object_ids in self.undecided:
+            if (object_ids is None or actee.id in object_ids) and \
+                    not authorized_attributes.issuperset(fields):
+                return self.authorizer.get_authorized_attributes(self.auth_token,
+                    actee, self.requested_fields, 'r')
+        return [f for f in self.requested_fields if f in authorized_attributes]
+
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -16,13 +16,22 @@ class ModelsFacade(LazyImporter):
 
 # On with the imports! (but later because these are all lazy object proxies)
 subsystems = SubsystemsFacade()
+subsystems.add_import('AuthTokenActivity', 'pr_services.user_system.auth_token_activity')
 subsystems.add_import('Authorizer', 'pr_services.authorizer')
+subsystems.add_import('ConditionTestEngine', 'pr_services.condition_test_engine')
+subsystems.add_import('CurriculumEnrollmentMaterializer', 'pr_services.credential_system.curriculum_enrollment_materializer')
+subsystems.add_import('EvaluationAggregator', 'pr_services.exam_system.evaluation_aggregator')
 subsystems.add_import('Getter', 'pr_services.gettersetter')
+subsystems.add_import('IdentityResolver', 'pr_services.user_system.identity_resolver')
 subsystems.add_import('InitialSetupMachine', 'pr_services.initial_setup')
 subsystems.add_import('Logger', 'pr_services.logger')
+subsystems.add_import('PrerequisiteGraph', 'pr_services.credential_system.prerequisite_graph')
 subsystems.add_import('ScormServer', 'pr_services.scorm_system.scorm_server')
+subsystems.add_import('SearchIndex', 'pr_services.search_index')
+subsystems.add_import('SessionCompleter', 'pr_services.event_system.session_completer')
 subsystems.add_import('Setter', 'pr_services.gettersetter')
 subsystems.add_import('TableData', 'pr_services.utils')
+subsystems.add_import('UserProvisioner', 'pr_services.user_system.user_provisioner')
 subsystems.add_import('Utils', 'pr_services.utils')
 
 managers = ManagersFacade()
@@ -72,6 +81,7 @@ managers.add_import('RoleManager', 'pr_services.role_manager')
 managers.add_import('RoomManager', 'pr_services.resource_system.room_manager')
 managers.add_import('ScoManager', 'pr_services.scorm_system.sco_manager')
 managers.add_import('ScoSessionManager', 'pr_services.scorm_system.sco_session_manager')
+managers.add_import('SearchManager', 'pr_services.search_manager')
 managers.add_import('SessionManager', 'pr_services.event_system.session_manager')
 managers.add_import('SessionResourceTypeRequirementManager', 'pr_services.event_system.session_resource_type_requirement_manager')
 managers.add_import('SessionTemplateManager', 'pr_services.event_system.session_template_manager')
@@ -146,10 +156,12 @@ models.add_import('Region', 'pr_services.models')
 models.add_import('Resource', 'pr_services.models')
 models.add_import('ResourceType', 'pr_services.models')
 models.add_import('Response', 'pr_services.models')
+models.add_import('ResponseAggregate', 'pr_services.models')
 models.add_import('Role', 'pr_services.models')
 models.add_import('Room', 'pr_services.models')
 models.add_import('Sco', 'pr_services.models')
 models.add_import('ScoSession', 'pr_services.models')
+models.add_import('SearchIndexEntry', 'pr_services.models')
 models.add_import('Session', 'pr_services.models')
 models.add_import('SessionResourceTypeRequirement', 'pr_services.models')
 models.add_import('SessionTemplate', 'pr_services.models')
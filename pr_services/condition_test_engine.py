@@ -0,0 +1,264 @@
+"""
+Set-based evaluation of ConditionTestCollections
+
+A ConditionTestCollection applies to a User if any of its ConditionTests
+applies.  A ConditionTest defines zero or more conditions: membership in one
+of its Groups or Organizations, holding one of its Credentials, being assigned
+to one of its Events, Sessions or SessionUserRoleRequirements, and the current
+time being after its start or before its end.  If match_all_defined_parameters
+is True every defined condition must hold, otherwise at least one must.  A
+ConditionTest with no conditions never applies.
+
+Rather than asking those questions one user and one test at a time, this
+module compiles a collection into a single predicate over Users, or evaluates
+every collection against one User's memberships in memory.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import datetime
+from django.db.models import Q
+import facade
+
+#: the many-to-many attributes of ConditionTest, in evaluation order
+CATEGORIES = ('groups', 'organizations', 'credentials', 'events', 'sessions',
+    'session_user_role_requirements')
+
+class CompiledConditionTest(object):
+    """
+    The conditions of one ConditionTest, loaded into memory
+    """
+
+    def __init__(self, id, collection_id, sequence, match_all, start, end):
+        self.id = id
+        self.collection_id = collection_id
+        self.sequence = sequence
+        self.match_all = match_all
+        self.start = start
+        self.end = end
+        #: sets of related object PKs, indexed by category
+        self.ids = dict((category, set()) for category in CATEGORIES)
+
+    def _time_terms(self, now):
+        terms = []
+        if isinstance(self.start, datetime):
+            terms.append(self.start < now)
+        if isinstance(self.end, datetime):
+            terms.append(self.end > now)
+        return terms
+
+    def _combine(self, terms):
+        if not terms:
+            return False
+        if self.match_all:
+            return _and(terms)
+        return _or(terms)
+
+    def evaluate(self, memberships, now):
+        """
+        :param memberships: sets of related object PKs that the user is
+                            associated with, indexed by category
+        :param now:         the current time
+        :return:            True iff the test applies to the user
+        """
+
+        terms = [bool(self.ids[category] & memberships[category])
+            for category in CATEGORIES if self.ids[category]]
+        return self._combine(terms + self._time_terms(now))
+
+    def predicate(self, now):
+        """
+        :param now: the current time
+        :return:    Q object over User, or a boolean if the outcome does
+                    not depend on the user
+        """
+
+        terms = [Q(pk__in=_USER_SUBQUERIES[category](list(self.ids[category])))
+            for category in CATEGORIES if self.ids[category]]
+        return self._combine(terms + self._time_terms(now))
+
+
+def _and(terms):
+    if False in terms:
+        return False
+    terms = [term for term in terms if term is not True]
+    if not terms:
+        return True
+    return reduce(lambda a, b: a & b, terms)
+
+def _or(terms):
+    if True in terms:
+        return True
+    terms = [term for term in terms if term is not False]
+    if not terms:
+        return False
+    return reduce(lambda a, b: a | b, terms)
+
+def _session_user_role_requirement_ids(**kwargs):
+    return facade.models.SessionUserRoleRequirement.objects.filter(**kwargs).values('id')
+
+#: For each category, a function that takes a list of related object PKs and
+#: returns a values() queryset of the PKs of the Users associated with any of them
+_USER_SUBQUERIES = {
+    'groups': lambda ids: facade.models.User.groups.through.objects.filter(
+        group__id__in=ids).values('user'),
+    'organizations': lambda ids: facade.models.UserOrgRole.objects.filter(
+        organization__id__in=ids).values('owner'),
+    'credentials': lambda ids: facade.models.Credential.objects.filter(
+        id__in=ids).values('user'),
+    'events': lambda ids: facade.models.Assignment.objects.filter(
+        task__id__in=_session_user_role_requirement_ids(session__event__id__in=ids)).values('user'),
+    'sessions': lambda ids: facade.models.Assignment.objects.filter(
+        task__id__in=_session_user_role_requirement_ids(session__id__in=ids)).values('user'),
+    'session_user_role_requirements': lambda ids: facade.models.Assignment.objects.filter(
+        task__id__in=ids).values('user'),
+}
+
+
+class ConditionTestEngine(object):
+    """
+    Evaluate ConditionTestCollections over many users, or many
+    ConditionTestCollections for one user, with a fixed number of queries.
+    """
+
+    def __init__(self, now=None):
+        """
+        :param now: time against which start and end conditions are checked,
+                    defaults to the current UTC time
+        """
+
+        self.now = now if now is not None else datetime.utcnow()
+
+    def compile(self, collections=None):
+        """
+        Load the ConditionTests of some collections along with all of their
+        conditions.  This takes one query for the tests plus one per category.
+
+        :param collections: ConditionTestCollections or their PKs.  None
+                            means all collections.
+        :return:            dictionary of lists of CompiledConditionTests
+                            sorted by sequence, indexed by collection PK
+        """
+
+        ConditionTest = facade.models.ConditionTest
+        tests = ConditionTest.objects.all()
+        if collections is not None:
+            collection_ids = set(getattr(c, 'id', c) for c in collections)
+            tests = tests.filter(condition_test_collection__id__in=collection_ids)
+        else:
+            collection_ids = set()
+        compiled = {}
+        for row in tests.values_list('id', 'condition_test_collection', 'sequence',
+                'match_all_defined_parameters', 'start', 'end'):
+            compiled[row[0]] = CompiledConditionTest(*row)
+        if compiled:
+            for category in CATEGORIES:
+                field = ConditionTest._meta.get_field(category)
+                source = field.m2m_field_name()
+                target = field.m2m_reverse_field_name()
+                for test_id, related_id in field.rel.through.objects.filter(
+                        **{'%s__in' % source: compiled.keys()}).values_list(source, target):
+                    compiled[test_id].ids[category].add(related_id)
+        ret = dict((collection_id, []) for collection_id in collection_ids)
+        for test in compiled.itervalues():
+            ret.setdefault(test.collection_id, []).append(test)
+        for tests in ret.itervalues():
+            tests.sort(key=lambda test: test.sequence)
+        return ret
+
+    def predicate(self, collection):
+        """
+        Compile a collection into one predicate over Users.
+
+        :param collection:  ConditionTestCollection or its PK
+        :return:            Q object, True if every user satisfies the
+                            collection, or False if none does
+        """
+
+        tests = self.compile([collection]).get(getattr(collection, 'id', collection), [])
+        return _or([test.predicate(self.now) for test in tests])
+
+    def users(self, collection, users=None):
+        """
+        Find the users that satisfy a collection with a single query.
+
+        :param collection:  ConditionTestCollection or its PK
+        :param users:       optional Users or PKs to limit the answer to
+        :return:            set of User PKs
+        """
+
+        predicate = self.predicate(collection)
+        if predicate is False:
+            return set()
+        queryset = facade.models.User.objects.all()
+        if predicate is not True:
+            queryset = queryset.filter(predicate)
+        if users is not None:
+            queryset = queryset.filter(id__in=[getattr(u, 'id', u) for u in users])
+        return set(queryset.values_list('id', flat=True))
+
+    def applies_to_user(self, collection, user):
+        """
+        :return:    True iff the collection applies to the user
+        """
+
+        user_id = getattr(user, 'id', user)
+        return user_id in self.users(collection, [user_id])
+
+    def memberships(self, user):
+        """
+        Load everything a user is associated with that a ConditionTest can
+        refer to.
+
+        :param user:    User or PK
+        :return:        sets of related object PKs, indexed by category
+        """
+
+        user_id = getattr(user, 'id', user)
+        models = facade.models
+        ret = {
+            'groups': set(models.User.groups.through.objects.filter(
+                user__id=user_id).values_list('group', flat=True)),
+            'organizations': set(models.UserOrgRole.objects.filter(
+                owner__id=user_id).values_list('organization', flat=True)),
+            'credentials': set(models.Credential.objects.filter(
+                user__id=user_id).values_list('id', flat=True)),
+            'events': set(),
+            'sessions': set(),
+            'session_user_role_requirements': set(),
+        }
+        for surr_id, session_id, event_id in models.SessionUserRoleRequirement.objects.filter(
+                id__in=models.Assignment.objects.filter(user__id=user_id).values('task')
+                ).values_list('id', 'session', 'session__event'):
+            ret['session_user_role_requirements'].add(surr_id)
+            ret['sessions'].add(session_id)
+            ret['events'].add(event_id)
+        return ret
+
+    def collections_for_user(self, user, collections=None):
+        """
+        Find the collections that apply to a user.
+
+        :param user:        User or PK
+        :param collections: ConditionTestCollections or PKs to consider.  None
+                            means all collections.
+        :return:            set of ConditionTestCollection PKs
+        """
+
+        memberships = self.memberships(user)
+        return set(collection_id for collection_id, tests
+            in self.compile(collections).iteritems()
+            if any(test.evaluate(memberships, self.now) for test in tests))
+
+    def test_applies_to_user(self, condition_test, user):
+        """
+        :return:    True iff the single ConditionTest applies to the user
+        """
+
+        for tests in self.compile([condition_test.condition_test_collection_id]).itervalues():
+            for test in tests:
+                if test.id == condition_test.id:
+                    return test.evaluate(self.memberships(user), self.now)
+        return False
+
+# vim:tabstop=4 shiftwidth=4 expandtab
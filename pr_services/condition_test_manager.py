@@ -15,7 +15,7 @@ class ConditionTestManager(ObjectManager):
             'condition_test_collection' : 'get_foreign_key',
             'match_all_defined_parameters' : 'get_general',
             'groups' : 'get_many_to_many',
-            'companies' : 'get_many_to_many',
+            'organizations' : 'get_many_to_many',
             'credentials' : 'get_many_to_many',
             'events' : 'get_many_to_many',
             'sessions' : 'get_many_to_many',
@@ -28,7 +28,7 @@ class ConditionTestManager(ObjectManager):
             'condition_test_collection' : 'set_foreign_key',
             'match_all_defined_parameters' : 'set_general',
             'groups' : 'set_many',
-            'companies' : 'set_many',
+            'organizations' : 'set_many',
             'credentials' : 'set_many',
             'events' : 'set_many',
             'sessions' : 'set_many',
@@ -2,14 +2,65 @@
 Manage authorization data that is stored in memcache,
 as well as in the database.
 
+memcached is the primary store; the CachedCookie table only serves cache
+misses.  With COOKIECACHE_WRITE_BEHIND enabled, saves write to memcached
+right away and the database copies are brought up to date in batches by the
+persist_cached_cookies task.
+
 @copyright 2009 American Research Institute, Inc.
 """
 
 from django.conf import settings
+from django.db import transaction
 
-import memcache
+from pr_services.utils import Utils, memcached
 import facade
 
+def _write_behind_log():
+    return memcached.WriteBehindLog('pr_cookiecache',
+        settings.COOKIECACHE_FLUSH_INTERVAL)
+
+def get_cached_value(key):
+    """
+    Look up a cookie's value, trying memcached before the database.
+
+    @param key  the session ID of an auth token
+    @return     the value, or None if there isn't one
+    """
+    value = memcached.get_client().get(str(key))
+    if value is None:
+        try:
+            value = facade.models.CachedCookie.objects.get(key=key).value
+        except facade.models.CachedCookie.DoesNotExist:
+            pass
+    return value
+
+def persist_cached_cookies(keys=None):
+    """
+    Copy cookies from memcached to the CachedCookie table, using one query
+    to find the existing rows and one multi-row insert for the new ones.
+
+    @param keys the keys to persist, defaulting to those saved during
+                write-behind periods that have ended
+    @return     the number of cookies found in memcached and written
+    """
+    if keys is None:
+        keys = _write_behind_log().drain()
+    keys = [str(key) for key in keys]
+    if not keys:
+        return 0
+    values = memcached.get_client().get_multi(keys)
+    count = len(values)
+    for cached_cookie in facade.models.CachedCookie.objects.filter(key__in=values.keys()):
+        new_value = values.pop(cached_cookie.key)
+        if cached_cookie.value != new_value:
+            cached_cookie.value = new_value
+            cached_cookie.save()
+    Utils.bulk_insert(facade.models.CachedCookie,
+        [{'key' : key, 'value' : value} for key, value in values.iteritems()])
+    transaction.commit_unless_managed()
+    return count
+
 class CookieCache(object):
     """A proxy object designed to ease managing authorization data 
     stored in memcached
@@ -39,23 +90,14 @@ class CookieCache(object):
         self._session_id = str(auth_token.session_id)
 
         #: Our Client object; MEMCACHED_ADDRS must be a list of host:port entries
-        self._memcache_client = memcache.Client(settings.MEMCACHED_ADDRS)
+        self._memcache_client = memcached.get_client()
 
         self.update()
 
     def _get_memcache_string(self):
         """Shortens the memcache get line considerably"""
-        memcache_string = self._memcache_client.get(self._session_id)
-        
-        # try the database if we didn't find what we wanted in memcache
-        if memcache_string is None:
-            try:
-                cached_cookie = facade.models.CachedCookie.objects.get(key=self._session_id)
-                memcache_string = cached_cookie.value
-            except facade.models.CachedCookie.DoesNotExist:
-                pass
-        
-        return memcache_string
+        # the database is only consulted if memcache doesn't have the value
+        return get_cached_value(self._session_id)
 
     def _memcache_string_as_dict(self, memcache_string=None):
         """returns the memcache string as python dict"""
@@ -76,14 +118,9 @@ class CookieCache(object):
         return memcache_dict
 
     def _memcache_dict_as_string(self, memcache_dict):
-        memcache_string = ''
-        for key, value_list in memcache_dict.items():
-            # list(set(listobj)) for uniqueness, prevents repeats in cache
-            uniq_value_list = list(set(value_list))
-            item_string = '%s=%s\r\n' % (key, ':'.join(uniq_value_list))
-            memcache_string = '%s%s' % (memcache_string, item_string)
-
-        return str(memcache_string)
+        # set(value_list) for uniqueness, prevents repeats in cache
+        return str(''.join(['%s=%s\r\n' % (key, ':'.join(set(value_list)))
+            for key, value_list in memcache_dict.items()]))
 
     def save(self):
         """Writes the current object's state to memcached
@@ -96,15 +133,17 @@ class CookieCache(object):
         key = self._session_id
         value = self._memcache_dict_as_string(memcache_dict)
         
-        try:
-            cached_cookie = facade.models.CachedCookie.objects.get(key=key)
-            cached_cookie.value = value
-            cached_cookie.save()
-        except facade.models.CachedCookie.DoesNotExist:
-            facade.models.CachedCookie.objects.create(key=key, value=value)
-        
         # memcache set() will return True on success, and 0 on failure. Nice.
-        if self._memcache_client.set(key, value) == 0:
+        stored = self._memcache_client.set(key, value) != 0
+        if not (stored and settings.COOKIECACHE_WRITE_BEHIND and
+                _write_behind_log().add(key)):
+            try:
+                cached_cookie = facade.models.CachedCookie.objects.get(key=key)
+                cached_cookie.value = value
+                cached_cookie.save()
+            except facade.models.CachedCookie.DoesNotExist:
+                facade.models.CachedCookie.objects.create(key=key, value=value)
+        if not stored:
             raise RuntimeWarning, 'memcache set failed. Is memcached running?'
         
     def update(self):
@@ -120,12 +159,9 @@ class CookieCache(object):
             self.paths = memcache_dict['paths']
 
     def delete(self):
-        try:
-            cached_cookie = facade.models.CachedCookie.objects.get(key=self._session_id)
-            cached_cookie.delete()
-        except facade.models.CachedCookie.DoesNotExist:
-            pass
-        
+        # Remove it from memcache first, so that a pending write-behind
+        # doesn't put the database row back.
         self._memcache_client.delete(self._session_id)
+        facade.models.CachedCookie.objects.filter(key=self._session_id).delete()
 
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -37,7 +37,7 @@ class AssignmentManager(ObjectManager):
             'task_content_type' : 'get_general',
             'authority' : 'get_general',
             'serial_number' : 'get_general',
-            'prerequisites_met' : 'get_general',
+            'prerequisites_met' : 'get_prerequisites_met_from_assignment',
             'assignment_attempts': 'get_many_to_one',
         })
         self.setters.update({
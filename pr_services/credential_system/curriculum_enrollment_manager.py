@@ -4,8 +4,11 @@ curriculum_enrollment manager class
 @copyright Copyright 2009 American Research Institute, Inc.
 """
 
+from django.conf import settings
+from pr_services.middleware import run_after_commit
 from pr_services.object_manager import ObjectManager
 from pr_services.rpc.service import service_method
+from pr_services.tasks import materialize_curriculum_enrollment
 import facade
 from pr_services import pr_time
 
@@ -53,10 +56,44 @@ class CurriculumEnrollmentManager(ObjectManager):
         c = self.my_django_model(start=start_date, end=end_date)
         c.curriculum = self._find_by_id(curriculum, facade.models.Curriculum)
         c.save()
-        if users is not None:
-            for user in facade.models.User.objects.filter(id__in=users):
-                facade.models.CurriculumEnrollmentUserAssociation.objects.create(user=user, curriculum_enrollment=c)
         self.authorizer.check_create_permissions(auth_token, c)
+        if users is not None:
+            self._enroll(c, users)
         return c
 
+    @service_method
+    def enroll_users(self, auth_token, curriculum_enrollment, users):
+        """
+        Enroll users in an existing curriculum_enrollment, creating their
+        assignments in bulk.  Users who are already enrolled are skipped.
+
+        Enrollments of more than settings.CURRICULUM_ENROLLMENT_ASYNC_THRESHOLD
+        users have their assignments created asynchronously.
+
+        :param  curriculum_enrollment:  FK for a curriculum_enrollment
+        :param  users:                  list of FKs for users
+        :return:                        None
+        """
+
+        c = self._find_by_id(curriculum_enrollment)
+        self.authorizer.check_update_permissions(auth_token, c, {'users' : users})
+        self._enroll(c, users)
+
+    def _enroll(self, curriculum_enrollment, users):
+        """
+        Associate users with a curriculum_enrollment and create their
+        assignments, deferring the assignments to a celery task if there are
+        many users.  The task is queued once the request's transaction has
+        been committed, so that it sees the new associations.
+        """
+
+        materializer = facade.subsystems.CurriculumEnrollmentMaterializer(curriculum_enrollment)
+        user_ids = set(int(user_id) for user_id in users)
+        materializer.add_users(user_ids)
+        if len(user_ids) > settings.CURRICULUM_ENROLLMENT_ASYNC_THRESHOLD:
+            run_after_commit(materialize_curriculum_enrollment.delay,
+                curriculum_enrollment.id, list(user_ids))
+        else:
+            materializer.materialize(user_ids)
+
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,224 @@
+"""
+Set-based creation of the Assignments implied by a CurriculumEnrollment
+
+Enrolling a user in a curriculum means creating one Assignment per Task in the
+Curriculum.  Doing that one user and one task at a time with get_or_create()
+does not scale to enrolling a whole organization, so this module computes the
+missing rows with an anti-join and inserts them in bulk.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import datetime, time, timedelta
+import logging
+from django.db import connection
+import facade
+
+class CurriculumEnrollmentMaterializer(object):
+    """
+    Create the users and assignments of a CurriculumEnrollment in bulk, and
+    compute completion statuses for all of its users at once.
+    """
+
+    #: number of user primary keys to put in a single IN clause
+    chunk_size = 500
+
+    def __init__(self, curriculum_enrollment):
+        """
+        :param curriculum_enrollment:   the enrollment to materialize
+        :type curriculum_enrollment:    facade.models.CurriculumEnrollment
+        """
+
+        self.curriculum_enrollment = curriculum_enrollment
+        self.logger = logging.getLogger('pr_services.curriculum_enrollment_materializer')
+
+    def enroll(self, user_ids):
+        """
+        Associate users with the enrollment and create their assignments.
+
+        Users who are already enrolled are skipped.
+
+        :param user_ids:    primary keys of the users to enroll
+        :type user_ids:     iterable
+        :return:            number of assignments created
+        """
+
+        user_ids = set(int(user_id) for user_id in user_ids)
+        self.add_users(user_ids)
+        return self.materialize(user_ids)
+
+    def add_users(self, user_ids):
+        """
+        Create the CurriculumEnrollmentUserAssociation rows that do not exist
+        yet for the given users.
+
+        :param user_ids:    primary keys of the users to enroll
+        :type user_ids:     set
+        :return:            number of associations created
+        """
+
+        CEUA = facade.models.CurriculumEnrollmentUserAssociation
+        enrolled = set()
+        for chunk in self._chunks(user_ids):
+            enrolled.update(CEUA.objects.filter(
+                curriculum_enrollment__id=self.curriculum_enrollment.id,
+                user__id__in=chunk).values_list('user_id', flat=True))
+        # only enroll users that actually exist
+        new_user_ids = set()
+        for chunk in self._chunks(user_ids - enrolled):
+            new_user_ids.update(facade.models.User.objects.filter(
+                id__in=chunk).values_list('id', flat=True))
+        return facade.subsystems.Utils.bulk_insert(CEUA,
+            ({'curriculum_enrollment': self.curriculum_enrollment.id, 'user': user_id}
+                for user_id in sorted(new_user_ids)))
+
+    def materialize(self, user_ids=None):
+        """
+        Create every Assignment implied by the enrollment that does not exist
+        yet.
+
+        :param user_ids:    optional primary keys of users to limit the work
+                            to.  None means all enrolled users.
+        :type user_ids:     set or None
+        :return:            number of assignments created
+        """
+
+        associations = self._task_associations()
+        if not associations:
+            return 0
+        fee_task_ids = set(facade.models.TaskFee.objects.filter(
+            task__id__in=associations.keys()).values_list('task_id', flat=True))
+        missing = []
+        if user_ids is None:
+            missing.extend(self._missing_assignments())
+        else:
+            for chunk in self._chunks(user_ids):
+                missing.extend(self._missing_assignments(chunk))
+        rows = (self._assignment_row(user_id, associations[task_id],
+                    task_id in fee_task_ids)
+                for user_id, task_id in missing)
+        created = facade.subsystems.Utils.bulk_insert(facade.models.Assignment, rows)
+        self.logger.debug('created %d assignments for curriculum enrollment %d' %
+            (created, self.curriculum_enrollment.id))
+        return created
+
+    def completion_statuses(self):
+        """
+        Compute the completion status of every enrolled user with one grouped
+        aggregate query.
+
+        :return:    dictionary of booleans, indexed by user PK.  True iff the
+                    user has completed this CurriculumEnrollment, else False
+        """
+
+        number_of_tasks = self.curriculum_enrollment.number_of_tasks
+        assignment = facade.models.Assignment._meta
+        ceua = facade.models.CurriculumEnrollmentUserAssociation._meta
+        qn = connection.ops.quote_name
+        sql = ('SELECT ceua.%(ceua_user)s, COUNT(a.%(a_id)s), '
+            'SUM(CASE WHEN a.%(a_status)s = %%s THEN 1 ELSE 0 END) '
+            'FROM %(ceua)s ceua LEFT OUTER JOIN %(a)s a '
+            'ON a.%(a_user)s = ceua.%(ceua_user)s '
+            'AND a.%(a_enrollment)s = ceua.%(ceua_enrollment)s '
+            'WHERE ceua.%(ceua_enrollment)s = %%s '
+            'GROUP BY ceua.%(ceua_user)s') % {
+                'ceua': qn(ceua.db_table),
+                'ceua_user': qn(ceua.get_field('user').column),
+                'ceua_enrollment': qn(ceua.get_field('curriculum_enrollment').column),
+                'a': qn(assignment.db_table),
+                'a_id': qn(assignment.pk.column),
+                'a_status': qn(assignment.get_field('status').column),
+                'a_user': qn(assignment.get_field('user').column),
+                'a_enrollment': qn(assignment.get_field('curriculum_enrollment').column),
+            }
+        cursor = connection.cursor()
+        cursor.execute(sql, ['completed', self.curriculum_enrollment.id])
+        ret = {}
+        for user_id, total, completed in cursor.fetchall():
+            completed = completed or 0
+            ret[user_id] = bool(total and total == number_of_tasks and completed == total)
+        return ret
+
+    def _task_associations(self):
+        """
+        :return:    CurriculumTaskAssociations for the enrollment's curriculum,
+                    indexed by task PK
+        """
+
+        ret = {}
+        for cta in facade.models.CurriculumTaskAssociation.objects.filter(
+                curriculum__id=self.curriculum_enrollment.curriculum_id):
+            ret.setdefault(cta.task_id, cta)
+        return ret
+
+    def _missing_assignments(self, user_ids=None):
+        """
+        Find the (user, task) pairs that should have an assignment under this
+        enrollment but do not, using a single anti-join.
+
+        :param user_ids:    optional list of user PKs to restrict the query to
+        :return:            list of (user PK, task PK) tuples
+        """
+
+        assignment = facade.models.Assignment._meta
+        cta = facade.models.CurriculumTaskAssociation._meta
+        ceua = facade.models.CurriculumEnrollmentUserAssociation._meta
+        qn = connection.ops.quote_name
+        sql = ('SELECT DISTINCT ceua.%(ceua_user)s, cta.%(cta_task)s '
+            'FROM %(ceua)s ceua INNER JOIN %(cta)s cta ON cta.%(cta_curriculum)s = %%s '
+            'LEFT OUTER JOIN %(a)s a ON a.%(a_user)s = ceua.%(ceua_user)s '
+            'AND a.%(a_task)s = cta.%(cta_task)s '
+            'AND a.%(a_enrollment)s = ceua.%(ceua_enrollment)s '
+            'WHERE ceua.%(ceua_enrollment)s = %%s AND a.%(a_id)s IS NULL') % {
+                'ceua': qn(ceua.db_table),
+                'ceua_user': qn(ceua.get_field('user').column),
+                'ceua_enrollment': qn(ceua.get_field('curriculum_enrollment').column),
+                'cta': qn(cta.db_table),
+                'cta_task': qn(cta.get_field('task').column),
+                'cta_curriculum': qn(cta.get_field('curriculum').column),
+                'a': qn(assignment.db_table),
+                'a_id': qn(assignment.pk.column),
+                'a_user': qn(assignment.get_field('user').column),
+                'a_task': qn(assignment.get_field('task').column),
+                'a_enrollment': qn(assignment.get_field('curriculum_enrollment').column),
+            }
+        params = [self.curriculum_enrollment.curriculum_id, self.curriculum_enrollment.id]
+        if user_ids is not None:
+            if not user_ids:
+                return []
+            sql += ' AND ceua.%s IN (%s)' % (qn(ceua.get_field('user').column),
+                ', '.join(['%s'] * len(user_ids)))
+            params.extend(user_ids)
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    def _assignment_row(self, user_id, cta, payment_required):
+        """
+        Build the values for a new Assignment the same way
+        CurriculumEnrollmentUserAssociation.save() and Assignment.save() would.
+        """
+
+        start = datetime.combine(self.curriculum_enrollment.start, time())
+        effective_date_assigned = start + timedelta(days=cta.days_before_start)
+        if cta.days_to_complete > 0:
+            due_date = effective_date_assigned + timedelta(days=cta.days_to_complete)
+        else:
+            due_date = datetime.combine(self.curriculum_enrollment.end, time())
+        return {
+            'user': user_id,
+            'task': cta.task_id,
+            'curriculum_enrollment': self.curriculum_enrollment.id,
+            'status': 'unpaid' if payment_required else 'assigned',
+            'effective_date_assigned': effective_date_assigned,
+            'due_date': due_date,
+        }
+
+    def _chunks(self, ids):
+        """ split a collection of primary keys into lists of chunk_size """
+
+        ids = list(ids)
+        for index in xrange(0, len(ids), self.chunk_size):
+            yield ids[index:index + self.chunk_size]
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,141 @@
+"""
+Batched evaluation of Task prerequisites
+
+Checking prerequisites one Task at a time costs one query per prerequisite
+edge plus one per prerequisite Task.  This module loads the edges for a whole
+set of Tasks at once, loads the Tasks a User has completed with a single query,
+and answers which Tasks are unlocked with plain set operations.  For filtering
+Tasks in the database, such as in ACL checks, it offers the same answer as a
+condition with a subquery over the prerequisite edges.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from django.db.models import Q
+import facade
+from pr_services import middleware
+
+class PrerequisiteGraph(object):
+    """
+    Answers "which of these tasks are unlocked for this user" for any number
+    of tasks with two queries.  Both the prerequisite edges and each user's
+    completed tasks are cached for the duration of the current request.
+    """
+
+    #: namespace used for the per-request cache
+    cache_namespace = 'prerequisite_graph'
+
+    def __init__(self):
+        cache = middleware.get_request_cache(self.cache_namespace)
+        #: prerequisite task PKs, indexed by task PK
+        self._edges = cache.setdefault('edges', {})
+        #: completed task PKs, indexed by user PK
+        self._completed = cache.setdefault('completed', {})
+
+    def prerequisites(self, task_ids):
+        """
+        Load the prerequisite edges for a set of tasks.  Edges that are
+        already cached are not fetched again.
+
+        :param task_ids:    primary keys of the tasks in question
+        :type task_ids:     iterable
+        :return:            dictionary of sets of prerequisite task PKs,
+                            indexed by task PK
+        """
+
+        task_ids = set(int(task_id) for task_id in task_ids)
+        missing = task_ids.difference(self._edges)
+        if missing:
+            for task_id in missing:
+                self._edges[task_id] = set()
+            through = facade.models.Task.prerequisite_tasks.through
+            for from_task_id, to_task_id in through.objects.filter(
+                    from_task__id__in=missing).values_list('from_task', 'to_task'):
+                self._edges[from_task_id].add(to_task_id)
+        return dict((task_id, self._edges[task_id]) for task_id in task_ids)
+
+    def completed_task_ids(self, user):
+        """
+        :param user:    the user in question
+        :type user:     User or int
+        :return:        set of PKs of tasks for which the user has at least one
+                        completed Assignment
+        """
+
+        user_id = getattr(user, 'id', user)
+        if user_id not in self._completed:
+            self._completed[user_id] = set(facade.models.Assignment.objects.filter(
+                user__id=user_id, status='completed').values_list('task_id', flat=True))
+        return self._completed[user_id]
+
+    def unlocked_task_ids(self, user, task_ids):
+        """
+        Determine which of the given tasks the user is allowed to attempt.
+
+        :param user:        the user in question
+        :type user:         User or int
+        :param task_ids:    primary keys of the tasks in question
+        :type task_ids:     iterable
+        :return:            set of PKs of the tasks whose prerequisites have
+                            all been completed by the user
+        """
+
+        edges = self.prerequisites(task_ids)
+        if not any(edges.itervalues()):
+            return set(edges)
+        completed = self.completed_task_ids(user)
+        return set(task_id for task_id, prerequisites in edges.iteritems()
+            if prerequisites <= completed)
+
+    def unlocked_query(self, user):
+        """
+        A condition matching the Tasks whose prerequisites the user has all
+        completed, for filtering any number of Tasks in the database.
+
+        :param user:    the user in question
+        :type user:     User or int
+        :return:        django.db.models.Q
+        """
+
+        edges = facade.models.Task.prerequisite_tasks.through.objects.all()
+        completed = self.completed_task_ids(user)
+        if completed:
+            edges = edges.exclude(to_task__id__in=completed)
+        return ~Q(id__in=edges.values('from_task'))
+
+    def prerequisites_met(self, user, task_id):
+        """
+        :return:    True iff the user has completed every prerequisite of the
+                    task
+        """
+
+        task_id = int(task_id)
+        return task_id in self.unlocked_task_ids(user, [task_id])
+
+    def invalidate_user(self, user):
+        """
+        Forget the cached completed tasks of a user.  Call this when one of
+        the user's Assignments changes status.
+        """
+
+        self._completed.pop(getattr(user, 'id', user), None)
+
+    def invalidate_edges(self):
+        """
+        Forget the cached prerequisite edges.  Call this when prerequisites
+        are added or removed.
+        """
+
+        self._edges.clear()
+
+def prerequisites_changed(sender, action, **kwargs):
+    """
+    m2m_changed handler that drops the edges cached for the current request
+    when a Task's prerequisites change
+    """
+
+    if sender is facade.models.Task.prerequisite_tasks.through and \
+            action.startswith('post_'):
+        PrerequisiteGraph().invalidate_edges()
+
+# vim:tabstop=4 shiftwidth=4 expandtab
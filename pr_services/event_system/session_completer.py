@@ -0,0 +1,237 @@
+"""
+Set-based completion of finished Sessions
+
+Once a Session has ended and its Event's lag_time has passed, the Session is
+marked completed, with one UPDATE per chunk of Sessions.
+
+Being assigned to a Session doesn't mean a User attended it, so its
+Assignments are left alone unless settings.SESSION_COMPLETION_COMPLETES_ATTENDEES
+is True.  Then the open Assignments for which an AssignmentAttempt records
+attendance are completed too.  Completing an Assignment awards the
+Achievements of its Task, and those may in turn grant Credentials.  Doing all
+of that one row at a time through save() costs several queries per
+Assignment, so this module updates the Assignments with one UPDATE per chunk,
+inserts the AchievementAwards in bulk, and decides which Credentials to grant
+with a handful of queries for the whole batch.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import datetime, timedelta
+import logging
+from django.conf import settings
+import facade
+from pr_services.utils import read_cache
+
+class SessionCompleter(object):
+    """
+    Complete every finished Session, optionally along with the Assignments of
+    the Users who attended it, and award the Achievements and Credentials that
+    follow from them.
+    """
+
+    #: number of primary keys to put in a single IN clause
+    chunk_size = 500
+
+    #: statuses of attended Assignments that are changed to 'completed' when
+    #: their Session is completed
+    completable_statuses = ('assigned', 'pending')
+
+    def __init__(self, now=None):
+        """
+        :param now: the time against which Sessions are judged finished.
+                    Defaults to the current UTC time.
+        :type now:  datetime or None
+        """
+
+        self.now = now or datetime.utcnow()
+        self.logger = logging.getLogger('pr_services.session_completer')
+
+    def finished_session_ids(self):
+        """
+        Find the active Sessions whose end plus their Event's lag_time has
+        passed, with a single query that loads no model instances.
+
+        :return:    list of Session PKs
+        """
+
+        ret = []
+        for session_id, end, lag_time in facade.models.Session.objects.filter(
+                status='active', end__lt=self.now).values_list('id', 'end',
+                'event__lag_time'):
+            if lag_time is None or end + timedelta(seconds=lag_time) < self.now:
+                ret.append(session_id)
+        return ret
+
+    def complete(self, session_ids=None):
+        """
+        Mark Sessions completed.  If settings.SESSION_COMPLETION_COMPLETES_ATTENDEES
+        is True, also mark their attended Assignments completed, then award
+        the resulting Achievements and Credentials.
+
+        :param session_ids: PKs of the Sessions to complete.  None means every
+                            finished Session.
+        :type session_ids:  iterable or None
+        :return:            tuple of the number of Sessions and the number of
+                            Assignments that were completed
+        """
+
+        if session_ids is None:
+            session_ids = self.finished_session_ids()
+        complete_attendees = getattr(settings, 'SESSION_COMPLETION_COMPLETES_ATTENDEES', False)
+        session_count = 0
+        completed = []
+        for chunk in self._chunks(session_ids):
+            claimed = list(facade.models.Session.objects.filter(id__in=chunk,
+                status='active').values_list('id', flat=True))
+            claimed_count = facade.models.Session.objects.filter(id__in=claimed,
+                status='active').update(status='completed', save_timestamp=self.now)
+            if not claimed_count:
+                continue
+            session_count += claimed_count
+            if complete_attendees:
+                completed.extend(self._complete_assignments(claimed))
+        if session_count:
+            read_cache.bump(facade.models.Session)
+        if completed:
+            read_cache.bump(facade.models.Assignment)
+            awards = self._award_achievements(completed)
+            self._grant_credentials(awards)
+            graph = facade.subsystems.PrerequisiteGraph()
+            for user_id in set(user_id for assignment_id, user_id, task_id in completed):
+                graph.invalidate_user(user_id)
+        self.logger.debug('completed %d sessions and %d assignments' %
+            (session_count, len(completed)))
+        return session_count, len(completed)
+
+    def _complete_assignments(self, session_ids):
+        """
+        Mark the open Assignments for the given Sessions completed, if an
+        AssignmentAttempt records that their Users attended.
+
+        :param session_ids: PKs of Sessions that were just completed
+        :return:            list of (assignment PK, user PK, task PK) tuples
+        """
+
+        assignments = facade.models.Assignment.objects.filter(
+            task__sessionuserrolerequirement__session__id__in=session_ids,
+            status__in=self.completable_statuses, assignment_attempts__isnull=False)
+        ret = list(assignments.values_list('id', 'user', 'task').distinct())
+        for chunk in self._chunks([row[0] for row in ret]):
+            facade.models.Assignment.objects.filter(id__in=chunk).update(
+                status='completed', date_completed=self.now,
+                save_timestamp=self.now)
+        return ret
+
+    def _award_achievements(self, completed):
+        """
+        Award the Achievements of each completed Assignment's Task, as
+        Assignment.mark_completed() would.
+
+        :param completed:   list of (assignment PK, user PK, task PK) tuples
+        :return:            set of (user PK, achievement PK) tuples awarded
+        """
+
+        through = facade.models.Task.achievements.through
+        achievements = {}
+        for chunk in self._chunks(set(row[2] for row in completed)):
+            for task_id, achievement_id in through.objects.filter(
+                    task__id__in=chunk).values_list('task', 'achievement'):
+                achievements.setdefault(task_id, []).append(achievement_id)
+        rows = []
+        awards = set()
+        for assignment_id, user_id, task_id in completed:
+            for achievement_id in achievements.get(task_id, []):
+                rows.append({'user': user_id, 'achievement': achievement_id,
+                    'assignment': assignment_id, 'date': self.now})
+                awards.add((user_id, achievement_id))
+        if rows:
+            facade.subsystems.Utils.bulk_insert(facade.models.AchievementAward, rows)
+            read_cache.bump(facade.models.AchievementAward)
+        return awards
+
+    def _grant_credentials(self, awards):
+        """
+        Grant the Credentials that the new AchievementAwards complete, as
+        AchievementAward.save() would: pending Credentials are marked granted,
+        and new granted Credentials are created where none is pending.
+
+        :param awards:  set of (user PK, achievement PK) tuples just awarded
+        :return:        number of Credentials granted
+        """
+
+        if not awards:
+            return 0
+        CredentialType = facade.models.CredentialType
+        credential_types = {}
+        for credential_type_id, achievement_id in CredentialType.required_achievements.through.objects.filter(
+                achievement__id__in=set(a for u, a in awards)).values_list(
+                'credentialtype', 'achievement'):
+            credential_types.setdefault(achievement_id, set()).add(credential_type_id)
+        candidates = set()
+        for user_id, achievement_id in awards:
+            for credential_type_id in credential_types.get(achievement_id, ()):
+                candidates.add((user_id, credential_type_id))
+        if not candidates:
+            return 0
+        user_ids = set(u for u, c in candidates)
+        credential_type_ids = set(c for u, c in candidates)
+
+        # what each candidate CredentialType requires
+        required_achievements = {}
+        for credential_type_id, achievement_id in CredentialType.required_achievements.through.objects.filter(
+                credentialtype__id__in=credential_type_ids).values_list(
+                'credentialtype', 'achievement'):
+            required_achievements.setdefault(credential_type_id, set()).add(achievement_id)
+        required_credential_types = {}
+        for from_id, to_id in CredentialType.prerequisite_credential_types.through.objects.filter(
+                from_credentialtype__id__in=credential_type_ids).values_list(
+                'from_credentialtype', 'to_credentialtype'):
+            required_credential_types.setdefault(from_id, set()).add(to_id)
+
+        # what each candidate User has
+        user_achievements = {}
+        granted_credential_types = {}
+        pending = {}
+        for chunk in self._chunks(user_ids):
+            for user_id, achievement_id in facade.models.AchievementAward.objects.filter(
+                    user__id__in=chunk).values_list('user', 'achievement'):
+                user_achievements.setdefault(user_id, set()).add(achievement_id)
+            for credential_id, user_id, credential_type_id, status in facade.models.Credential.objects.filter(
+                    user__id__in=chunk, status__in=('granted', 'pending')).values_list(
+                    'id', 'user', 'credential_type', 'status'):
+                if status == 'granted':
+                    granted_credential_types.setdefault(user_id, set()).add(credential_type_id)
+                else:
+                    pending.setdefault((user_id, credential_type_id), credential_id)
+
+        to_update = []
+        to_create = []
+        for user_id, credential_type_id in sorted(candidates):
+            if not required_achievements.get(credential_type_id, set()) <= user_achievements.get(user_id, set()):
+                continue
+            if not required_credential_types.get(credential_type_id, set()) <= granted_credential_types.get(user_id, set()):
+                continue
+            if (user_id, credential_type_id) in pending:
+                to_update.append(pending[(user_id, credential_type_id)])
+            else:
+                to_create.append({'user': user_id, 'credential_type': credential_type_id,
+                    'status': 'granted', 'date_granted': self.now,
+                    'date_assigned': self.now})
+        for chunk in self._chunks(to_update):
+            facade.models.Credential.objects.filter(id__in=chunk).update(
+                status='granted', date_granted=self.now, save_timestamp=self.now)
+        if to_create:
+            facade.subsystems.Utils.bulk_insert(facade.models.Credential, to_create)
+        if to_update or to_create:
+            read_cache.bump(facade.models.Credential)
+        return len(to_update) + len(to_create)
+
+    def _chunks(self, ids):
+        """ split a collection of primary keys into lists of chunk_size """
+
+        ids = list(ids)
+        for index in xrange(0, len(ids), self.chunk_size):
+            yield ids[index:index + self.chunk_size]
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -5,7 +5,7 @@ Session manager class
 @copyright Copyright 2009 American Research Institute, Inc.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from django.core.mail import EmailMessage
 from django.db import IntegrityError
 from django.template import Template, Context
@@ -14,8 +14,10 @@ from pr_services import pr_time
 from pr_services import exceptions
 from pr_services.object_manager import ObjectManager
 from pr_services.rpc.service import service_method
+from pr_services.utils import read_cache
 import facade
 import logging
+import uuid
 from pr_messaging import send_message
 
 class SessionManager(ObjectManager):
@@ -164,21 +166,15 @@ class SessionManager(ObjectManager):
         
         @param user_id                user primary key
         @param session_user_role_id   SessionUserRole primary key
-        @return                       array of Session primary keys
+        @return                       array of Session primary keys, omitting
+                                      those the actor may not read
         """
 
-        try:
-            e = facade.models.SessionUserRoleRequirement.objects.filter(users__id__exact=user_id,
-                session_user_role__id__exact = session_user_role_id)
-        except ObjectDoesNotExist:
-            raise exceptions.SessionUserRoleRequirementNotFoundException()
-        else:
-            ids = []
-            auth = self.authorizer
-            for pr_object in e.iterator():
-                auth.check_read_permissions(auth_token, pr_object, ['id'])
-                ids.append(str(pr_object.id))
-        return ids
+        surrs = facade.models.SessionUserRoleRequirement.objects.filter(users__id__exact=user_id,
+            session_user_role__id__exact=session_user_role_id)
+        # only fetch the rows that the actor may read
+        surrs = self.authorizer.filter_readable(auth_token, surrs, ['id'])
+        return [str(surr_id) for surr_id in surrs.values_list('id', flat=True)]
 
     @service_method
     def get_user_filtered(self, auth_token, user_id, filters):
@@ -198,44 +194,71 @@ class SessionManager(ObjectManager):
 
     def _get_sessions_needing_reminders(self):
         """
-        get a list of events that need reminders sent through
-        lead time expiry
+        get a QuerySet of active Sessions that haven't started yet, haven't
+        had reminders sent, and whose reminder due time has passed
+
+        Reminder due times are precomputed from the Event's lead_time when a
+        Session or Event is saved, so this is a single indexed comparison.
         """
 
-        res = []
-        # search through all events where reminders haven't
-        # been sent, sending our reminders for the ones where
-        # the lead time has expired
         current_time = datetime.utcnow()
-        sessions = self.my_django_model.objects.filter(sent_reminders=False,
+        return self.my_django_model.objects.filter(sent_reminders=False,
+                status='active', reminder_due__lte=current_time,
                 start__gte=current_time)
-        for session in sessions:
-            if session.event.lead_time == None:
-                continue
-            expiration_time = datetime.fromordinal(session.start.toordinal()) -\
-                timedelta(seconds=session.event.lead_time)
-            if current_time >= expiration_time and session.status == 'active':
-                res.append(session)
-                
-        return res
+
+    def _get_invitees(self, sessions):
+        """
+        find the Users filling any role in each of the given Sessions
+
+        @param sessions     QuerySet of Sessions
+        @return             dictionary of sets of Users indexed by Session primary key
+        """
+
+        pairs = facade.models.Assignment.objects.filter(
+            task__sessionuserrolerequirement__session__in=sessions).values_list(
+            'task__sessionuserrolerequirement__session', 'user').distinct()
+        invitee_ids = {}
+        for session_id, user_id in pairs:
+            invitee_ids.setdefault(session_id, set()).add(user_id)
+        users = facade.models.User.objects.in_bulk(
+            set(user_id for ids in invitee_ids.values() for user_id in ids))
+        ret = {}
+        for session_id, user_ids in invitee_ids.iteritems():
+            ret[session_id] = set(users[user_id] for user_id in user_ids if user_id in users)
+        return ret
 
     def _process_session_reminders(self):
         """
         send Session reminders for all eligible Sessions
 
+        The due Sessions are claimed with one UPDATE that marks their
+        reminders sent and stamps them with a key unique to this run, so two
+        runs that overlap can't both send reminders for the same Session.  If
+        sending fails, the claim is released so that the next run tries again.
+
         This is not available via RPC.
+
+        @return     number of Sessions for which reminders were sent
         """
 
-        sessions_to_process = self._get_sessions_needing_reminders()
-        for session in sessions_to_process:
-            recipients = set()
-            for surr in session.session_user_role_requirements.all():
-                for user in surr.users.all():
-                    recipients.add(user)
-            send_message(message_type='session-reminder',
-                         context={'session': session}, recipients=recipients)
-            session.sent_reminders = True
-            session.save()
+        key = uuid.uuid4().hex
+        claimed = self._get_sessions_needing_reminders().update(
+            sent_reminders=True, reminder_key=key)
+        if not claimed:
+            return 0
+        read_cache.bump(self.my_django_model)
+        sessions = self.my_django_model.objects.filter(reminder_key=key)
+        try:
+            invitees = self._get_invitees(sessions)
+            for session in sessions.select_related('event'):
+                send_message(message_type='session-reminder',
+                             context={'session': session},
+                             recipients=invitees.get(session.id, set()))
+        except:
+            sessions.update(sent_reminders=False, reminder_key=None)
+            read_cache.bump(self.my_django_model)
+            raise
+        return claimed
 
     @service_method
     def remind_invitees(self, auth_token, session_id):
@@ -256,12 +279,10 @@ class SessionManager(ObjectManager):
         """
 
         session = self._find_by_id(session_id)
-        recipients = set()
-        for surr in session.session_user_role_requirements.all():
-            for user in surr.users.all():
-                recipients.add(user)
+        invitees = self._get_invitees(self.my_django_model.objects.filter(id=session.id))
         send_message(message_type='session-reminder',
-                     context={'session': session}, recipients=recipients)
+                     context={'session': session},
+                     recipients=invitees.get(session.id, set()))
 
     @service_method
     def get_evaluation_results(self, auth_token, session):
@@ -298,24 +319,39 @@ class SessionManager(ObjectManager):
         if not isinstance(s.evaluation, facade.models.Exam):
             raise exceptions.ObjectNotFoundException('Evaluation')
 
-        evals = []
-        for assignment in s.evaluation.assignments.all():
-            try:
-                evaluation = assignment.assignment_attempts.get(date_completed__isnull=False).downcast_completely()
-            except (facade.models.AssignmentAttempt.DoesNotExist, facade.models.AssignmentAttempt.MultipleObjectsReturned):
-                continue
-
-            eval_dict = {'id': evaluation.id, 'questions': []}
-
-            for q in evaluation.response_questions.all():
-                q_dict = {'id': q.id, 'question_type': q.question_type,
-                          'label': q.label}
-                r = q.responses.get(exam_session=evaluation)
-                r_dict = {'value': r.value, 'text': r.text, 'valid': r.valid}
-                eval_dict['questions'].append({'question': q_dict,
-                                               'response': r_dict})
-            evals.append(eval_dict)
-        return evals
+        return facade.subsystems.EvaluationAggregator().individual_results(
+            s.evaluation.id)
+
+    @service_method
+    def get_evaluation_summaries(self, auth_token, sessions):
+        """
+        Get summaries of the feedback that users provide through evaluations,
+        for any number of Sessions at once
+
+        @param sessions     List of primary keys for Sessions.
+        @return             Struct of lists indexed by Session primary key.
+                            Sessions without an evaluation are omitted.  Each
+                            list has a struct for every question of the
+                            evaluation, containing the question's 'id',
+                            'label' and 'question_type', the number of
+                            responses as 'count', the mean response as
+                            'average' (None unless the question is numeric),
+                            a 'distribution' list of structs, each with a
+                            'count' and either an 'answer' primary key (for
+                            choice questions) or a 'value' (for bool and
+                            rating questions), and the free-text responses as
+                            'text_responses'.
+        """
+
+        session_objects = self.my_django_model.objects.filter(id__in=sessions)
+        if len(session_objects) != len(set(sessions)):
+            raise exceptions.ObjectNotFoundException('Session')
+        for s in session_objects:
+            self.authorizer.check_read_permissions(auth_token, s, ['evaluation'])
+        summaries = facade.subsystems.EvaluationAggregator().summarize_sessions(
+            [s.id for s in session_objects])
+        return dict((str(session_id), summary) for session_id, summary in
+            summaries.iteritems())
 
 
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,289 @@
+"""
+Grouped reporting on evaluation responses
+
+Session evaluations are Exams, and building a report one ExamSession and one
+Question at a time costs a query per response.  This module computes answer
+distributions, averages and free-text collections for every question of any
+number of Exams with a few grouped queries over Response and its answers.
+
+When settings.EXAM_INCREMENTAL_AGGREGATES is True, the counts, sums and
+distributions are also kept in ResponseAggregate rows, which are updated as
+each exam session is finished, so summaries don't have to scan the responses
+at all.  Free-text responses are always read from the responses themselves.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from django.conf import settings
+from django.db.models import Avg, Count
+import facade
+
+class EvaluationAggregator(object):
+    """
+    Summarizes the responses to Exams, typically the evaluations of Sessions.
+    Only responses from finished exam sessions that passed validation are
+    counted.
+    """
+
+    #: question types whose responses are averaged
+    numeric_types = ('decimal', 'float', 'int', 'rating')
+    #: question types whose responses are counted by value
+    value_types = ('bool', 'rating')
+
+    def summarize_sessions(self, session_ids, use_aggregates=None):
+        """
+        Summarize the evaluations of Sessions.
+
+        :param session_ids:     primary keys of the Sessions
+        :param use_aggregates:  read counts from the incrementally maintained
+                                ResponseAggregate rows instead of the responses.
+                                Defaults to settings.EXAM_INCREMENTAL_AGGREGATES.
+        :return:                dictionary of lists of question summaries (see
+                                summarize_exams()), indexed by Session PK.
+                                Sessions without an evaluation are omitted.
+        """
+
+        evaluations = dict(facade.models.Session.objects.filter(
+            id__in=session_ids, evaluation__isnull=False).values_list(
+            'id', 'evaluation'))
+        summaries = self.summarize_exams(evaluations.values(), use_aggregates)
+        return dict((session_id, summaries.get(exam_id, []))
+            for session_id, exam_id in evaluations.iteritems())
+
+    def summarize_exams(self, exam_ids, use_aggregates=None):
+        """
+        Summarize the responses to every question of some Exams.
+
+        :param exam_ids:        primary keys of the Exams
+        :param use_aggregates:  see summarize_sessions()
+        :return:                dictionary of lists of question summaries,
+                                indexed by Exam PK.  Each summary is a struct
+                                with the question's 'id', 'label' and
+                                'question_type', the number of responses as
+                                'count', the mean value as 'average' (None for
+                                questions that aren't numeric), a
+                                'distribution' list of structs with either an
+                                'answer' PK or a 'value', and a 'count', and a
+                                'text_responses' list of strings.
+        """
+
+        if use_aggregates is None:
+            use_aggregates = getattr(settings, 'EXAM_INCREMENTAL_AGGREGATES', False)
+        exam_ids = set(exam_ids)
+        ret = dict((exam_id, []) for exam_id in exam_ids)
+        if not exam_ids:
+            return ret
+        questions = {}
+        for question in facade.models.Question.objects.filter(
+                question_pool__exam__id__in=exam_ids).order_by(
+                'question_pool__order', 'order', 'id').values('id', 'label',
+                'question_type', 'question_pool__exam'):
+            summary = {'id': question['id'], 'label': question['label'],
+                'question_type': question['question_type'], 'count': 0,
+                'average': None, 'distribution': [], 'text_responses': []}
+            questions[question['id']] = summary
+            ret[question['question_pool__exam']].append(summary)
+        if not questions:
+            return ret
+        if use_aggregates:
+            self._load_aggregates(questions)
+        else:
+            self._load_counts(questions)
+        self._load_text(questions)
+        return ret
+
+    def _responses(self, question_ids):
+        """ the counted responses to some questions """
+
+        return facade.models.Response.objects.filter(question__id__in=question_ids,
+            valid=True, exam_session__date_completed__isnull=False)
+
+    def _load_counts(self, questions):
+        """
+        Fill in counts, averages and distributions with grouped queries over
+        the responses.
+        """
+
+        responses = self._responses(questions.keys())
+        for row in responses.order_by().values('question').annotate(
+                count=Count('id'), decimal=Avg('decimal_value'),
+                float=Avg('float_value'), int=Avg('int_value'),
+                rating=Avg('rating_value')):
+            summary = questions[row['question']]
+            summary['count'] = row['count']
+            if summary['question_type'] in self.numeric_types:
+                average = row[summary['question_type']]
+                summary['average'] = None if average is None else float(average)
+        value_question_ids = [q['id'] for q in questions.itervalues()
+            if q['question_type'] in self.value_types]
+        if value_question_ids:
+            for row in responses.filter(question__id__in=value_question_ids).order_by(
+                    ).values('question', 'bool_value', 'rating_value').annotate(
+                    count=Count('id')):
+                summary = questions[row['question']]
+                value = row['%s_value' % summary['question_type']]
+                if value is not None:
+                    summary['distribution'].append({'count': row['count'],
+                        'value': value})
+        through = facade.models.Response.answers.through
+        for row in through.objects.filter(response__in=responses,
+                response__question__question_type='choice').order_by().values(
+                'response__question', 'answer').annotate(count=Count('id')):
+            questions[row['response__question']]['distribution'].append(
+                {'answer': row['answer'], 'count': row['count']})
+        for summary in questions.itervalues():
+            summary['distribution'].sort(key=lambda d: (d.get('answer'), d.get('value')))
+
+    def _load_aggregates(self, questions):
+        """
+        Fill in counts, averages and distributions from the ResponseAggregate
+        rows.
+        """
+
+        for row in facade.models.ResponseAggregate.objects.filter(
+                question__id__in=questions.keys()).values('question', 'answer',
+                'value', 'count', 'total', 'total_count'):
+            summary = questions[row['question']]
+            if row['answer'] is not None:
+                summary['distribution'].append({'answer': row['answer'],
+                    'count': row['count']})
+            elif row['value'] is not None:
+                summary['distribution'].append({'count': row['count'],
+                    'value': self._parse_value(summary['question_type'], row['value'])})
+            else:
+                summary['count'] = row['count']
+                if summary['question_type'] in self.numeric_types and \
+                        row['total'] is not None and row['total_count']:
+                    summary['average'] = row['total'] / row['total_count']
+        for summary in questions.itervalues():
+            summary['distribution'].sort(key=lambda d: (d.get('answer'), d.get('value')))
+
+    def _load_text(self, questions):
+        """ collect the free-text responses with one query """
+
+        for question_id, char_value, text_value in self._responses(
+                questions.keys()).order_by('id').values_list('question',
+                'char_value', 'text_value'):
+            text = char_value if questions[question_id]['question_type'] == 'char' else text_value
+            if text:
+                questions[question_id]['text_responses'].append(text)
+
+    def _parse_value(self, question_type, value):
+        """ turn a value stored in a ResponseAggregate back into a python value """
+
+        if question_type == 'bool':
+            return value == 'True'
+        return int(value)
+
+    def individual_results(self, exam_id):
+        """
+        Collect every finished exam session's responses to an Exam with a
+        fixed number of queries.  Assignments with more than one finished
+        exam session are skipped.
+
+        :param exam_id: primary key of the Exam
+        :return:        list of structs in the format returned by
+                        SessionManager.get_evaluation_results()
+        """
+
+        exam_sessions = {}
+        for exam_session_id, assignment_id in facade.models.ExamSession.objects.filter(
+                assignment__task__id=exam_id, date_completed__isnull=False).order_by(
+                'assignment', 'id').values_list('id', 'assignment'):
+            exam_sessions.setdefault(assignment_id, []).append(exam_session_id)
+        exam_session_ids = [ids[0] for assignment_id, ids in
+            sorted(exam_sessions.iteritems()) if len(ids) == 1]
+        if not exam_session_ids:
+            return []
+        responses = facade.models.Response.objects.filter(
+            exam_session__id__in=exam_session_ids).select_related('question').order_by(
+            'question__order', 'question', 'id')
+        choices = {}
+        through = facade.models.Response.answers.through
+        for response_id, answer_id in through.objects.filter(
+                response__exam_session__id__in=exam_session_ids,
+                response__question__question_type='choice').values_list(
+                'response', 'answer'):
+            choices.setdefault(response_id, set()).add(answer_id)
+        questions = dict((exam_session_id, []) for exam_session_id in exam_session_ids)
+        for r in responses:
+            q = r.question
+            if q.question_type == 'choice':
+                value = choices.get(r.id, set())
+            else:
+                value = getattr(r, '%s_value' % q.question_type)
+            if q.question_type in ('char', 'password', 'text'):
+                text = None
+            else:
+                text = r.text_value
+            questions[r.exam_session_id].append({
+                'question': {'id': q.id, 'question_type': q.question_type,
+                    'label': q.label},
+                'response': {'value': value, 'text': text, 'valid': r.valid}})
+        return [{'id': exam_session_id, 'questions': questions[exam_session_id]}
+            for exam_session_id in exam_session_ids]
+
+    def rebuild(self, exam_ids):
+        """
+        Recompute the ResponseAggregate rows for the questions of some Exams
+        from their finished exam sessions.
+
+        :param exam_ids:    primary keys of the Exams
+        """
+
+        facade.models.ResponseAggregate.objects.filter(
+            question__question_pool__exam__id__in=exam_ids).delete()
+        for exam_session_id in facade.models.ExamSession.objects.filter(
+                assignment__task__id__in=exam_ids,
+                date_completed__isnull=False).values_list('id', flat=True):
+            self.record(exam_session_id)
+
+    def record(self, exam_session):
+        """
+        Add the responses of a finished exam session to the ResponseAggregate
+        rows of its questions.  ExamSessionManager calls this when an exam
+        session is finished; calling it again for the same exam session
+        counts its responses twice.
+
+        :param exam_session:    the finished exam session
+        :type exam_session:     facade.models.ExamSession or int
+        """
+
+        ResponseAggregate = facade.models.ResponseAggregate
+        exam_session_id = getattr(exam_session, 'id', exam_session)
+        responses = facade.models.Response.objects.filter(
+            exam_session__id=exam_session_id, valid=True)
+        deltas = {}
+        for response_id, question_id, question_type, decimal_value, float_value, int_value, \
+                rating_value, bool_value in responses.values_list('id', 'question',
+                'question__question_type', 'decimal_value', 'float_value',
+                'int_value', 'rating_value', 'bool_value'):
+            values = {'decimal': decimal_value, 'float': float_value,
+                'int': int_value, 'rating': rating_value, 'bool': bool_value}
+            delta = deltas.setdefault((question_id, None, None), [0, 0, None])
+            delta[0] += 1
+            if question_type in self.numeric_types:
+                # numeric rows always have a total, since adding to NULL
+                # yields NULL
+                delta[2] = delta[2] or 0.0
+                if values[question_type] is not None:
+                    delta[1] += 1
+                    delta[2] += float(values[question_type])
+            if question_type in self.value_types and values[question_type] is not None:
+                deltas.setdefault((question_id, None, unicode(values[question_type])),
+                    [0, 0, None])[0] += 1
+        through = facade.models.Response.answers.through
+        for question_id, answer_id in through.objects.filter(response__in=responses,
+                response__question__question_type='choice').values_list(
+                'response__question', 'answer'):
+            deltas.setdefault((question_id, answer_id, None), [0, 0, None])[0] += 1
+        for (question_id, answer_id, value), (count, total_count, total) in deltas.iteritems():
+            increments = {'count': count}
+            if total is not None:
+                increments['total'] = total
+                increments['total_count'] = total_count
+            facade.subsystems.Utils.increment_counters(ResponseAggregate,
+                {'question': question_id, 'key': ResponseAggregate.make_key(answer_id, value)},
+                increments, {'answer': answer_id, 'value': value})
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -12,6 +12,9 @@ __docformat__ = "restructuredtext en"
 from datetime import datetime
 from decimal import Decimal, ROUND_UP
 
+# Django
+from django.conf import settings
+
 # PowerReg
 from pr_services import exceptions
 from pr_services import pr_time
@@ -49,6 +52,13 @@ class ExamSessionManager(AssignmentAttemptManager):
         })
         self.my_django_model = facade.models.ExamSession
         self.post_exam_session_hooks = []
+        if getattr(settings, 'EXAM_INCREMENTAL_AGGREGATES', False):
+            self.post_exam_session_hooks.append(self._record_response_aggregates)
+
+    def _record_response_aggregates(self, auth_token, exam_session):
+        """Add the responses of a finished exam session to the running tallies."""
+
+        facade.subsystems.EvaluationAggregator().record(exam_session)
 
     @service_method
     def create(self, auth_token, assignment, fetch_all=True, resume=True):
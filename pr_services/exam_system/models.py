@@ -23,7 +23,7 @@ import exceptions
 from pr_services import storage
 
 __all__ = ['Exam', 'QuestionPool', 'Question', 'Answer', 'ExamSession',
-           'Response', 'FormPage', 'FormWidget']
+           'Response', 'ResponseAggregate', 'FormPage', 'FormWidget']
 
 def _update_order_field(instance, query_set, field_name='order'):
     """Updates the order field when creating/modifying ordered items."""
@@ -966,6 +966,50 @@ class Response(pr_models.OwnedPRModel):
                 self.answers = answers
         return correct
 
+class ResponseAggregate(models.Model):
+    """Running tally of the valid responses to a question."""
+
+    # EvaluationAggregator.record() adds each finished exam session's
+    # responses to these rows.  Each question has a row with neither an
+    # answer nor a value, which holds the number of responses and, for
+    # numeric questions, the sum and number of their values.  Choice
+    # questions also have a row per answer given, and bool and rating
+    # questions a row per value given.
+
+    class Meta:
+        app_label = 'pr_services'
+        unique_together = (('question', 'key'),)
+
+    #: The question whose responses are counted.
+    question = pr_models.PRForeignKey('Question', related_name='response_aggregates')
+    #: What this row counts among the responses to its question, as made by
+    #: make_key().  answer and value can be null, and unique constraints don't
+    #: compare nulls, so this column is what keeps the rows unique.
+    key = models.CharField(max_length=255)
+    #: The answer counted by this row, for choice questions.
+    answer = pr_models.PRForeignKey('Answer', null=True, related_name='response_aggregates')
+    #: The value counted by this row, for bool and rating questions.
+    value = models.CharField(max_length=255, default=None, null=True)
+    #: Number of responses counted.
+    count = models.PositiveIntegerField(default=0)
+    #: Sum of the values of the responses counted, for numeric questions.
+    total = models.FloatField(default=None, null=True)
+    #: Number of responses whose values are included in total.
+    total_count = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def make_key(answer_id=None, value=None):
+        """
+        Return the key of the row that counts an answer or a value, or of the
+        row that counts every response if neither is given.
+        """
+
+        if answer_id is not None:
+            return u'answer:%s' % answer_id
+        if value is not None:
+            return u'value:%s' % value
+        return u''
+
 class FormPage(models.Model):
     exam = pr_models.PRForeignKey(Exam, related_name='form_pages')
     number = models.PositiveIntegerField()
@@ -1228,4 +1228,84 @@ class TestEvaluations(pr_tests.TestCase):
         self.assertEquals(response['questions'][1]['question']['label'], 'Pick a number')
         self.assertEquals(response['questions'][1]['question']['id'], r1.id)
 
+    def test_summaries(self):
+        evaluation = facade.models.Exam.objects.create(name='eval',
+            title='Eval')
+        qp = facade.models.QuestionPool.objects.create(exam=evaluation,
+            title='Evaluation')
+        q1 = facade.models.Question.objects.create(question_pool=qp,
+            question_type='char', label='How do you feel?')
+        r1 = facade.models.Question.objects.create(question_pool=qp,
+            question_type='rating', label='Pick a number', text_response=True,
+            min_value=1, max_value=4)
+        c1 = facade.models.Question.objects.create(question_pool=qp,
+            question_type='choice', label='Pick a color')
+        red = facade.models.Answer.objects.create(question=c1, label='Red')
+        blue = facade.models.Answer.objects.create(question=c1, label='Blue')
+
+        event1 = self.event_manager.create(self.admin_token, 'Event 1',
+            'Event 1', 'Event 1', self.right_now.isoformat(),
+            (self.right_now+self.one_day).isoformat(), self.organization1.id,
+            self.product_line1.id, {'venue' : self.venue1.id})
+        session1 = self.session_manager.create(self.admin_token,
+            self.right_now.isoformat(), (self.right_now+self.one_day).isoformat(),
+            'active', True, 10000, event1.id)
+        session1.evaluation = evaluation
+        session1.save()
+
+        def take_evaluation(exam_session_manager, first_name, feeling, rating, color):
+            student, student_at = self.create_student(first_name=first_name)
+            assignment = self.assignment_manager.create(self.admin_token,
+                evaluation.id, student.id)
+            exam_session = exam_session_manager.create(student_at, assignment.id, False)
+            exam_session_manager.finish(student_at, exam_session.id)
+            exam_session_manager.add_response(student_at, exam_session.id,
+                q1.id, {'value': feeling})
+            exam_session_manager.add_response(student_at, exam_session.id,
+                r1.id, {'value': rating, 'text': 'because'})
+            exam_session_manager.add_response(student_at, exam_session.id,
+                c1.id, {'value': [color.id]})
+            exam_session_manager.finish(student_at, exam_session.id)
+
+        take_evaluation(self.exam_session_manager, 'Alice', 'great', 4, red)
+        take_evaluation(self.exam_session_manager, 'Bob', 'fine', 2, red)
+
+        ret = self.session_manager.get_evaluation_summaries(self.admin_token,
+            [session1.id])
+        summary = ret[str(session1.id)]
+        self.assertEquals([q['id'] for q in summary], [q1.id, r1.id, c1.id])
+        self.assertEquals([q['count'] for q in summary], [2, 2, 2])
+        self.assertEquals(summary[0]['text_responses'], ['great', 'fine'])
+        self.assertEquals(summary[0]['average'], None)
+        self.assertEquals(summary[1]['average'], 3.0)
+        self.assertEquals(summary[1]['distribution'], [{'value': 2, 'count': 1},
+            {'value': 4, 'count': 1}])
+        self.assertEquals(summary[1]['text_responses'], ['because', 'because'])
+        self.assertEquals(summary[2]['distribution'], [{'answer': red.id, 'count': 2}])
+
+        # the running tallies agree with the responses
+        aggregator = facade.subsystems.EvaluationAggregator()
+        aggregator.rebuild([evaluation.id])
+        self.assertEquals(aggregator.summarize_sessions([session1.id], True),
+            aggregator.summarize_sessions([session1.id], False))
+
+        # and are kept up to date as evaluations are finished
+        incremental = settings.EXAM_INCREMENTAL_AGGREGATES
+        settings.EXAM_INCREMENTAL_AGGREGATES = True
+        try:
+            take_evaluation(facade.managers.ExamSessionManager(), 'Carol', 'meh', 3, blue)
+        finally:
+            settings.EXAM_INCREMENTAL_AGGREGATES = incremental
+        summaries = aggregator.summarize_sessions([session1.id], True)
+        self.assertEquals(summaries, aggregator.summarize_sessions([session1.id], False))
+        summary = summaries[session1.id]
+        self.assertEquals(summary[1]['count'], 3)
+        self.assertEquals(summary[1]['average'], 3.0)
+        self.assertEquals(summary[2]['distribution'], [{'answer': red.id, 'count': 2},
+            {'answer': blue.id, 'count': 1}])
+        # with one row for each thing counted
+        self.assertEquals(sorted(facade.models.ResponseAggregate.objects.filter(
+            question__id=c1.id).values_list('key', 'count')),
+            sorted([(u'', 3), (u'answer:%d' % red.id, 2), (u'answer:%d' % blue.id, 1)]))
+
 # vim:tabstop=4 shiftwidth=4 expandtab
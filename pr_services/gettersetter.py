@@ -14,6 +14,7 @@ import warnings
 from django.conf import settings
 from django.db import IntegrityError, connection
 from django.db.models.fields import FieldDoesNotExist
+from django.db.models.query import ValuesQuerySet
 from storage import UserPhotoStorage
 import django.db
 import django.db.backends.util
@@ -23,7 +24,7 @@ import exceptions
 import facade
 import pr_models
 import pr_time
-import tagging.models
+from pr_services.utils import read_cache, relation_writer, tag_query
 
 def is_for_derived_attribute(func):
     """
@@ -42,9 +43,8 @@ class Getter(object):
     def __init__(self, auth_token, object_manager, django_query_set, requested_fields=None):
         if requested_fields is None:
             requested_fields = list()
-        self.django_query_set = django_query_set
         self.object_manager = object_manager
-        self.results = []
+        self._results = None
         # if 'id' isn't in the requested fields, it really should be!
         if 'id' not in requested_fields:
             requested_fields.append('id')
@@ -52,6 +52,12 @@ class Getter(object):
             if field not in object_manager.getters:
                 raise exceptions.FieldNameNotFoundException(field)
         self.authorizer = facade.subsystems.Authorizer()
+        # Let the database leave out the objects on which the actor may not
+        # read any of the requested fields, rather than loading and checking
+        # every one of them.
+        self.read_access = self.authorizer.get_read_access(auth_token, django_query_set,
+            requested_fields)
+        self.django_query_set = self.read_access.query_set
         self.cache = {}
         # Create a dictionary of field names with method references to the appropriate getters
         self.getters = {}
@@ -69,21 +75,39 @@ class Getter(object):
                 foreign_keys.append(field_name)
         if foreign_keys:
             self.django_query_set = self.django_query_set.select_related(*foreign_keys)
+        if object_manager.cache_reads:
+            self.django_query_set = read_cache.CachedQuerySet(self.django_query_set)
 
-        self.process(auth_token, requested_fields)
+    @property
+    def results(self):
+        """
+        A list of the result rows, assembled the first time it is used
+        """
+        if self._results is None:
+            self._results = list(self)
+        return self._results
 
-    def process(self, auth_token, requested_fields):
-        for item in self.django_query_set:
-            # Get the list of fields the the user is authorized to read from the authorizer
-            authorized_fields = self.authorizer.get_authorized_attributes(auth_token, item, requested_fields, 'r')
-            ret = {}
+    def __iter__(self):
+        """
+        Yield the result rows one at a time, building each one once.  Objects
+        on which the actor may not read any of the requested fields are
+        skipped, and many-ended values are turned into lists as they are read,
+        so the rows can be handed to an RPC encoder as they are.  Objects are
+        read from the database without QuerySet's result cache, so memory use
+        doesn't grow with the size of the result unless the rows are kept.
+        """
+        for item in self.django_query_set.iterator():
+            # Get the list of fields the the user is authorized to read
+            authorized_fields = self.read_access.get_authorized_attributes(item)
+            if not authorized_fields:
+                continue
+            row = {}
             for f in authorized_fields:
-                ret[f] = self.getters[f](item, f)
-            self.results.append(ret)
-
-        # Trim empty dictionaries from the result set
-        while {} in self.results:
-            self.results.remove({})
+                value = self.getters[f](item, f)
+                if isinstance(value, ValuesQuerySet):
+                    value = list(value)
+                row[f] = value
+            yield row
 
     def get_general(self, result_object, field_name):
         try:
@@ -403,13 +427,34 @@ class Getter(object):
 
     @is_for_derived_attribute
     def get_tags(self, result_object, field_name):
-        """ Gets the names of all the tags for an object. """
-        tags = tagging.models.Tag.objects.get_for_object(result_object)
-        tag_list = list()
-        for tag in tags:
-            tag_list.append(tag.name)
-        return tag_list
+        """
+        Gets the names of all the tags for an object.  The tags of every
+        object in the result set are read with one query the first time.
+        """
+        if 'tags' not in self.cache:
+            self.cache['tags'] = tag_query.tags_for_objects(
+                self.object_manager.my_django_model, self.read_access.query_set)
+        return self.cache['tags'].get(result_object.id, [])
     
+    @is_for_derived_attribute
+    def get_prerequisites_met_from_assignment(self, result_object, field_name):
+        """
+        Gets whether an Assignment's user has completed the prerequisites of
+        its task.  Every Assignment in the result set is decided the first
+        time, with one PrerequisiteGraph.unlocked_task_ids() call per user.
+        """
+        if 'prerequisites_met' not in self.cache:
+            task_ids = {}
+            for user_id, task_id in self.read_access.query_set.order_by().values_list(
+                    'user', 'task'):
+                task_ids.setdefault(user_id, set()).add(task_id)
+            graph = facade.subsystems.PrerequisiteGraph()
+            self.cache['prerequisites_met'] = dict((user_id,
+                graph.unlocked_task_ids(user_id, user_task_ids))
+                for user_id, user_task_ids in task_ids.iteritems())
+        return result_object.task_id in self.cache['prerequisites_met'].get(
+            result_object.user_id, ())
+
     def get_tasks_from_task_bundle(self, result_object, field_name):
         """
         Returns an ordered list of dictionaries describing tasks in a
@@ -490,16 +535,21 @@ class Setter(object):
             self.setters[field](field, self.setter_dict[field])
 
     def set_address(self, field_name, address_value_dictionary):
-        if hasattr(self.django_object, field_name): 
-            a = getattr(self.django_object, field_name)
-            if isinstance(a, facade.models.Address):
-                setattr(self.django_object, field_name, None)
-                self.django_object.save()
-                a.delete()
         new_addr_dict = {}
         for key, value in address_value_dictionary.items():
             new_addr_dict[str(key)] = value if value is not None else u''
         new_a = facade.models.Address(**new_addr_dict)
+        if hasattr(self.django_object, field_name): 
+            a = getattr(self.django_object, field_name)
+            if isinstance(a, facade.models.Address):
+                # Overwrite the current address in place rather than deleting
+                # it and creating another.  Attributes that weren't given are
+                # reset, just as they would be on a new address.
+                for field in new_a._meta.local_fields:
+                    if field.name not in ('id', 'final_type', 'create_timestamp'):
+                        setattr(a, field.attname, getattr(new_a, field.attname))
+                a.save()
+                return
         new_a.save()
         self.set_foreign_key(field_name, new_a.id)
 
@@ -579,42 +629,6 @@ class Setter(object):
 
         attribute = getattr(self.django_object, field_name)
 
-        through_model = None
-        # If this relationship uses a custom through table, the add() method will be missing
-        if not hasattr(attribute, 'add'):
-            through_model_name_or_reference = attribute.through
-            if isinstance(through_model_name_or_reference, basestring):
-                if through_model_name_or_reference == django.db.models.related.RECURSIVE_RELATIONSHIP_CONSTANT:
-                    through_model = self.django_object.__class__    
-                elif through_model_name_or_reference.find('.') != -1:
-                    app_label, model_name = through_model_name_or_reference.split('.')
-                else:
-                    app_label = self.django_object.__class__._meta.app_label
-                    model_name = attribute.through
-                if through_model is None:
-                    through_model = django.db.models.get_model(app_label, model_name, False)
-            else:
-                through_model = through_model_name_or_reference
-            
-            this_model = self.django_object.__class__
-            other_model = attribute.model
-            
-            this_model_field_name = None
-            other_model_field_name = None
-            
-            for field in through_model._meta.fields:
-                if isinstance(field, django.db.models.fields.related.ForeignKey):
-                    if issubclass(this_model, field.rel.to):
-                        this_model_field_name = field.name
-                    elif issubclass(other_model, field.rel.to):
-                        other_model_field_name = field.name
-            
-            
-            assert this_model_field_name is not None
-            assert other_model_field_name is not None
-
-        # Add things
-
         # We have to treat a many-to-one relationship differently, because the add() method
         # isn't as fancy (won't take foreign keys- only actual objects)
         if not hasattr(attribute, 'through'):
@@ -623,63 +637,25 @@ class Setter(object):
             if len(add_objects) != len(add_keys):
                 raise exceptions.ObjectNotFoundException(attribute.model)
             attribute.add(*add_objects)
-        else:
-            # this is a many-to-many relationship
-            if through_model is None:
-                attribute.add(*add_keys)
-            else:
-                for item in add_keys:
-                    if isinstance(item, dict):
-                        other_model_pk = item['id']
-                    else:
-                        other_model_pk = item
-                    through_model_instance = through_model()
-                    setattr(through_model_instance, this_model_field_name, self.django_object)
-                    try:
-                        foreign_object = other_model.objects.get(pk=other_model_pk)
-                    except other_model.DoesNotExist:
-                        raise exceptions.ObjectNotFoundException(other_model, other_model_pk)
-                    # Set foreign end of glue table.django_object.id)
-                    setattr(through_model_instance, other_model_field_name, other_model.objects.get(pk=other_model_pk))
-                    # Now set the extra attributes of the relationship
-                    if isinstance(item, dict):
-                        extras = item.copy()
-                        del extras['id']
-                        self.authorizer.check_update_permissions(
-                            self.auth_token, through_model_instance, extras)
-                        for extra_attribute, extra_value in extras.iteritems():
-                            if extra_attribute not in dir(through_model_instance):
-                                raise exceptions.AttributeNotFoundException(extra_attribute)
-                            field = through_model_instance._meta.get_field(extra_attribute)
-                            # handle the case where we are updating a foreign key relationship and have a primary key
-                            if isinstance(field, django.db.models.related.ForeignKey) and isinstance(extra_value, (int,long)):
-                                setattr(through_model_instance, field.attname, extra_value)
-                            # This handles most general types of relationships, plus a ForeignKey if the value we have is a Model instance
-                            else:
-                                setattr(through_model_instance, extra_attribute, extra_value)
-                    through_model_instance.save()
-                    self.authorizer.check_create_permissions(self.auth_token,
-                        through_model_instance)
-                    
-        # Remove things
-        if through_model is None:
+            attribute.remove(*remove_keys)
+        elif getattr(attribute, 'symmetrical', False):
+            # django keeps both directions of a symmetrical relationship in step
+            attribute.add(*add_keys)
             attribute.remove(*remove_keys)
         else:
-            # we have a through table
-            for key in remove_keys:
-                try:
-                    other_model_instance = other_model.objects.get(pk=key)
-                    get_args = { this_model_field_name : self.django_object,
-                                 other_model_field_name : other_model_instance, }
-                    through_model_instance = through_model.objects.get(**get_args)
-                    self.authorizer.check_delete_permissions(self.auth_token,
-                        through_model_instance)
-                    through_model_instance.delete()
-                except other_model.DoesNotExist:
-                    raise exceptions.ObjectNotFoundException(other_model, key)
-                except through_model.DoesNotExist:
-                    self.logger.debug('failed to find through table instance of model %s using parameters %s' % (through_model, get_args))
-                    continue
+            # this is a many-to-many relationship, which we write as a diff
+            # against the rows of its through table
+            add_items = []
+            for item in add_keys:
+                if isinstance(item, dict):
+                    extras = item.copy()
+                    del extras['id']
+                    add_items.append((item['id'], extras))
+                else:
+                    add_items.append((item, None))
+            remove_pks = [key['id'] if isinstance(key, dict) else key for key in remove_keys]
+            relation_writer.RelationWriter(self.auth_token, attribute).update(
+                add_items, remove_pks)
 
     def set_time(self, field_name, new_value):
         if new_value:
@@ -745,20 +721,9 @@ class Setter(object):
                     tags_to_remove = new_value['remove']
                 else:
                     raise exceptions.InvalidDataException('expected a list of tags to remove')
-            if tags_to_add is not None:
-                for tag in tags_to_add:
-                    # for #1922, add quotes to tag name to handle multi-word tags.
-                    tagging.models.Tag.objects.add_tag(self.django_object, '"%s"' % tag)
-            if tags_to_remove is not None:
-                current_tags = tagging.models.Tag.objects.get_for_object(self.django_object)
-                new_tag_names = list()
-                for tag in current_tags:
-                    if tag.name not in tags_to_remove:
-                        new_tag_names.append(tag.name)
-                tagging.models.Tag.objects.update_tags(self.django_object, '')
-                for tag_name in new_tag_names:
-                    # for #1922, add quotes to tag name to handle multi-word tags.
-                    tagging.models.Tag.objects.add_tag(self.django_object, '"%s"' % tag_name)
+            # for #1922, tag names are quoted, so multi-word tags stay whole
+            tag_query.update_tags(self.django_object, tags_to_add or [],
+                tags_to_remove or [])
         else:
             raise exceptions.InvalidDataException(
                 'input to the set_tags() setter must be a dictionary')
@@ -797,16 +762,19 @@ class Setter(object):
             
         """
         
-        self.django_object.tasks.clear()
+        items = []
         for association in new_value:
             if (not isinstance(association, dict) or 'id' not in association or
                 'presentation_order' not in association):
                 raise exceptions.InvalidDataException('expected a list of dictionaries, each with "id" and ' +\
                     '"presentation_order" keys')
             continue_automatically = association.get('continue_automatically', False)
-            facade.models.TaskBundleTaskAssociation.objects.create(
-                task_id=association['id'], task_bundle=self.django_object,
-                presentation_order=association['presentation_order'],
-                continue_automatically=continue_automatically)
+            items.append((int(association['id']),
+                {'presentation_order': association['presentation_order'],
+                 'continue_automatically': continue_automatically}))
+        # Associations that are already present are kept, so only the
+        # differences are written.
+        relation_writer.RelationWriter(self.auth_token, self.django_object.tasks,
+            authorize=False).replace(items)
 
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -4,17 +4,23 @@ import facade
 
 logger = logging.getLogger('pr_services.handlers')
 
-def pr_user_instance_requested(sender, **kwargs):
-    logger.debug('pr_user_instance_requested sender=%r kwargs=%r', sender, kwargs)
-    participant = kwargs.get('participant', None)
-    if participant:
+def pr_user_instances_requested(sender, **kwargs):
+    logger.debug('pr_user_instances_requested sender=%r kwargs=%r', sender, kwargs)
+    participants = kwargs.get('participants', None)
+    if participants:
         User = facade.models.User
-        try:
-            if participant.email:
-                return User.objects.get(Q(email=participant.email) |
-                                        Q(email2=participant.email))
-        except (User.DoesNotExist, User.MultipleObjectsReturned):
-            pass
+        emails = set(p.email for p in participants if p.email)
+        # users indexed by each of their addresses, or None for addresses
+        # that more than one user has
+        by_email = {}
+        if emails:
+            for user in User.objects.filter(Q(email__in=emails) | Q(email2__in=emails)):
+                for email in set([user.email, user.email2]):
+                    if email in by_email:
+                        by_email[email] = None
+                    elif email in emails:
+                        by_email[email] = user
+        return [by_email.get(p.email) if p.email else None for p in participants]
 
 def pr_user_contact_requested(sender, **kwargs):
     logger.debug('pr_user_contact_requested sender=%r kwargs=%r', sender, kwargs)
@@ -1,5 +1,6 @@
 import facade
 from pr_services.utils import Utils
+from pr_services.utils import password_hashing
 from decorators import authz
 
 @authz
@@ -13,7 +14,7 @@ def setup(machine):
         else:
             password = 'admin'
         salt = machine.user_manager._generate_password_salt()
-        password_hash = Utils._hash(password + salt, 'SHA-512')
+        password_hash_type, password_hash = password_hashing.hash_password(password, salt)
 
         user = facade.models.User.objects.create(first_name="admin",
             last_name="user", status='active', email='admin@admin.org')
@@ -22,7 +23,8 @@ def setup(machine):
         local_domain = facade.models.Domain.objects.get(name='local')
         da = facade.models.DomainAffiliation.objects.create(user=user,
             username='admin', domain=local_domain, default=True,
-            password_hash=password_hash, password_salt=salt)
+            password_hash=password_hash, password_hash_type=password_hash_type,
+            password_salt=salt)
 
     methods = [
         {'name' : 'actor_member_of_group', 'params' : {'group_id' : group.id}},
@@ -161,7 +163,7 @@ def setup(machine):
         },
         'forum.ForumPostAttachment' : {
             'c' : True,
-            'r' : ['description', 'name', 'post'],
+            'r' : ['content_hash', 'description', 'mime_type', 'name', 'post', 'size'],
             'u' : ['description', 'name', 'post'],
             'd' : True,
         },
@@ -173,19 +175,21 @@ def setup(machine):
         },
         'forum.Forum' : {
             'c' : True,
-            'r' : ['category', 'description', 'name', 'topics'],
+            'r' : ['category', 'description', 'last_activity', 'last_post', 'name',
+                    'post_count', 'topic_count', 'topics'],
             'u' : ['category', 'description', 'name'],
             'd' : True,
         },
         'forum.ForumPost' : {
             'c' : True,
-            'r' : ['topic', 'body', 'attachments'],
+            'r' : ['topic', 'body', 'attachments', 'create_timestamp'],
             'u' : ['topic', 'body'],
             'd' : True,
         },
         'forum.ForumTopic' : {
             'c' : True,
-            'r' : ['closed', 'forum', 'name', 'posts', 'sticky'],
+            'r' : ['closed', 'create_timestamp', 'forum', 'last_activity', 'last_post', 'name',
+                    'post_count', 'posts', 'reply_count', 'sticky'],
             'u' : ['closed', 'forum', 'name', 'sticky'],
             'd' : True,
         },
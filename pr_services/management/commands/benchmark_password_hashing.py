@@ -0,0 +1,80 @@
+import time
+from optparse import make_option
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from pr_services import exceptions
+from pr_services.utils import password_hashing
+
+class Command(BaseCommand):
+    requires_model_validation = False
+    option_list = BaseCommand.option_list + (
+        make_option('-t', '--hash-type', dest='hash_type', type='string',
+            help='hash type to benchmark (defaults to PASSWORD_HASH_TYPE)'),
+        make_option('-l', '--target-latency', dest='target_latency', type='float',
+            default=250.0,
+            help='longest acceptable time to verify one password, in milliseconds'),
+        make_option('-s', '--samples', dest='samples', type='int', default=5,
+            help='number of hashes to time for each cost'),
+        )
+    help = ('Measures how long password hashing takes on this machine and '
+        'recommends the highest cost that verifies a password within the '
+        'target latency.')
+
+    def handle(self, *args, **options):
+        hash_type = options.get('hash_type') or settings.PASSWORD_HASH_TYPE
+        target = options['target_latency'] / 1000.0
+        samples = max(1, options['samples'])
+        try:
+            hasher = password_hashing.get_hasher(hash_type)
+        except exceptions.InvalidUsageException, e:
+            raise CommandError(e.get_error_msg())
+        if hasher.cost is None:
+            raise CommandError('The %s hash type has no cost to tune.' % hash_type)
+
+        if isinstance(hasher, password_hashing.BCryptHasher):
+            # the time doubles with every step, so try them in order
+            cost = 4
+            best = None
+            while True:
+                elapsed = self._time(hash_type, cost, samples)
+                self._report(cost, elapsed)
+                if elapsed > target or cost >= 31:
+                    break
+                best = cost
+                cost += 1
+            if best is None:
+                raise CommandError('Even the lowest cost takes longer than the target.')
+        else:
+            # the time is proportional to the number of iterations, so
+            # measure once and scale, then check the result
+            cost = 1000
+            elapsed = self._time(hash_type, cost, samples)
+            self._report(cost, elapsed)
+            while elapsed < 0.01:
+                cost *= 10
+                elapsed = self._time(hash_type, cost, samples)
+                self._report(cost, elapsed)
+            best = max(1000, int(cost * target / elapsed) // 1000 * 1000)
+            elapsed = self._time(hash_type, best, samples)
+            self._report(best, elapsed)
+            while elapsed > target and best > 1000:
+                best -= 1000
+                elapsed = self._time(hash_type, best, samples)
+                self._report(best, elapsed)
+
+        print 'Current cost for %s: %s' % (hash_type, hasher.cost)
+        print 'Recommended setting for a %.0f ms target:' % (target * 1000)
+        print "PASSWORD_HASH_COSTS = {'%s' : %d}" % (hash_type, best)
+
+    def _time(self, hash_type, cost, samples):
+        """ return the average time it takes to hash a password, in seconds """
+        hasher = password_hashing.get_hasher(hash_type, cost)
+        start = time.time()
+        for i in xrange(samples):
+            hasher.encode('benchmark password %d' % i, 'saltsalt')
+        return (time.time() - start) / samples
+
+    def _report(self, cost, elapsed):
+        print '%8d  %8.1f ms' % (cost, elapsed * 1000)
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -1,3 +1,4 @@
+from __future__ import with_statement
 import codecs
 import getpass
 from optparse import make_option
@@ -5,6 +6,7 @@ import sys
 from django.db import transaction
 from django.core.management.base import BaseCommand
 import facade
+from pr_messaging import batch_messages
 from pr_services import exceptions
 
 class Command(BaseCommand):
@@ -66,20 +68,23 @@ class Command(BaseCommand):
             print >> sys.stderr, "error: You must specify a model name."
             sys.exit(1)
         
-        for filename in args:
-            input_file = codecs.open(filename, 'r', encoding="utf-8")
-            csv_data = facade.models.CSVData(text=input_file.read(), user=auth_token.user)
-            f = getattr(import_manager, 'import_%ss' % model_name, None)
-            if f and callable(f):
-                try:
-                    f(auth_token, csv_data, interactive=True)
-                except exceptions.InvalidDataException, e:
-                    if interactive:
-                        print >> sys.stdout, (
-                            "file [%s] ERROR: code [%d] message [%s] details [%s]" % (
-                            filename, e.error_code, e.error_msg, unicode(e.details)))
+        # Users created by the import are sent messages, so queue them and
+        # hand them to Celery in batches.
+        with batch_messages():
+            for filename in args:
+                input_file = codecs.open(filename, 'r', encoding="utf-8")
+                csv_data = facade.models.CSVData(text=input_file.read(), user=auth_token.user)
+                f = getattr(import_manager, 'import_%ss' % model_name, None)
+                if f and callable(f):
+                    try:
+                        f(auth_token, csv_data, interactive=True)
+                    except exceptions.InvalidDataException, e:
+                        if interactive:
+                            print >> sys.stdout, (
+                                "file [%s] ERROR: code [%d] message [%s] details [%s]" % (
+                                filename, e.error_code, e.error_msg, unicode(e.details)))
                     
-            else:
-                print >> sys.stderr, "error: Unrecognized model name [%s]" % model_name
-                sys.exit(1)
+                else:
+                    print >> sys.stderr, "error: Unrecognized model name [%s]" % model_name
+                    sys.exit(1)
             
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+import facade
+
+class Command(BaseCommand):
+    args = '[model name ...]'
+    help = ('Rebuilds the full-text search index for the named models, or for '
+        'all of the models in SEARCH_INDEX_FIELDS.  Run it after changing that '
+        'setting or loading data without signals.')
+
+    def handle(self, *args, **options):
+        search_index = facade.subsystems.SearchIndex()
+        indexed = [model_name for model_name, model, fields in
+            search_index.indexed_models()]
+        for model_name in args:
+            if model_name not in indexed:
+                raise CommandError('%s is not an indexed model.' % model_name)
+        search_index.rebuild(args or None)
+        for model_name in (args or indexed):
+            print 'Rebuilt the search index for %s' % model_name
+
+# vim:tabstop=4 shiftwidth=4 expandtab
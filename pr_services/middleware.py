@@ -18,6 +18,41 @@ def get_current_request():
     """
     return getattr(_thread_locals, 'request', None)
 
+def get_request_cache(namespace):
+    """
+    Return a dictionary for caching values for the duration of the current
+    request.  The dictionary is stored on the request object, so it goes away
+    with the request.  If there is no current request (management commands,
+    celery tasks, unit tests) a new empty dictionary is returned each time,
+    which effectively disables caching.
+
+    @param namespace    name used to keep unrelated caches apart
+    @type namespace     string
+    @return             dictionary
+    """
+    request = get_current_request()
+    if request is None:
+        return {}
+    caches = request.__dict__.setdefault('_pr_request_caches', {})
+    return caches.setdefault(namespace, {})
+
+def run_after_commit(func, *args, **kwargs):
+    """
+    Call a function once the current request's transaction has been
+    committed, for work such as queueing a celery task that must be able to
+    see what the request wrote.  The call is dropped if the request fails.
+    If there is no current request (management commands, celery tasks, unit
+    tests) the function is called right away.
+
+    @param func     the callable, which is given the remaining arguments
+    """
+    request = get_current_request()
+    if request is None:
+        func(*args, **kwargs)
+    else:
+        request.__dict__.setdefault('_pr_after_commit', []).append(
+            (func, args, kwargs))
+
 class ThreadLocal(object):
     """
     Middleware that stores the request object to thread local storage.
@@ -36,3 +71,25 @@ class ThreadLocal(object):
         if hasattr(_thread_locals, 'request'):
             del _thread_locals.request
         return response
+
+class AfterCommit(object):
+    """
+    Middleware that makes the calls deferred with run_after_commit().  It must
+    come before TransactionMiddleware in MIDDLEWARE_CLASSES, so that its
+    process_response() runs after the transaction has been committed.
+    """
+
+    def process_exception(self, request, exception):
+        """
+        Forget the deferred calls of a request whose transaction is being
+        rolled back.
+        """
+        request.__dict__.pop('_pr_after_commit', None)
+
+    def process_response(self, request, response):
+        """
+        Make the deferred calls, in the order they were deferred.
+        """
+        for func, args, kwargs in request.__dict__.pop('_pr_after_commit', []):
+            func(*args, **kwargs)
+        return response
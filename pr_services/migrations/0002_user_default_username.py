@@ -0,0 +1,1125 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        
+        # Adding field 'User.default_username'
+        db.add_column('pr_services_user', 'default_username', self.gf('django.db.models.fields.CharField')(max_length=31, null=True), keep_default=False)
+
+        # Adding field 'User.default_domain'
+        db.add_column('pr_services_user', 'default_domain', self.gf('django.db.models.fields.CharField')(max_length=255, null=True), keep_default=False)
+
+
+    def backwards(self, orm):
+        
+        # Deleting field 'User.default_username'
+        db.delete_column('pr_services_user', 'default_username')
+
+        # Deleting field 'User.default_domain'
+        db.delete_column('pr_services_user', 'default_domain')
+
+
+    models = {
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'pr_services.accheckmethod': {
+            'Meta': {'object_name': 'ACCheckMethod'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_accheckmethods'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '128'})
+        },
+        'pr_services.achievement': {
+            'Meta': {'object_name': 'Achievement'},
+            'component_achievements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'yielded_achievements'", 'symmetrical': 'False', 'to': "orm['pr_services.Achievement']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'achievements'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_achievements'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'users': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'achievements'", 'symmetrical': 'False', 'through': "orm['pr_services.AchievementAward']", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.achievementaward': {
+            'Meta': {'object_name': 'AchievementAward'},
+            'achievement': ('pr_services.fields.PRForeignKey', [], {'related_name': "'achievement_awards'", 'to': "orm['pr_services.Achievement']"}),
+            'assignment': ('pr_services.fields.PRForeignKey', [], {'related_name': "'achievement_awards'", 'null': 'True', 'to': "orm['pr_services.Assignment']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'date': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'achievement_awards'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.acl': {
+            'Meta': {'object_name': 'ACL'},
+            'ac_check_methods': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'acls'", 'symmetrical': 'False', 'through': "orm['pr_services.ACMethodCall']", 'to': "orm['pr_services.ACCheckMethod']"}),
+            'acl': ('django.db.models.fields.TextField', [], {}),
+            'arbitrary_perm_list': ('django.db.models.fields.TextField', [], {}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_acls'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'role': ('pr_services.fields.PRForeignKey', [], {'related_name': "'acls'", 'to': "orm['pr_services.Role']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.acmethodcall': {
+            'Meta': {'object_name': 'ACMethodCall'},
+            'ac_check_method': ('pr_services.fields.PRForeignKey', [], {'related_name': "'ac_method_calls'", 'to': "orm['pr_services.ACCheckMethod']"}),
+            'ac_check_parameters': ('django.db.models.fields.TextField', [], {}),
+            'acl': ('pr_services.fields.PRForeignKey', [], {'related_name': "'ac_method_calls'", 'to': "orm['pr_services.ACL']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_acmethodcalls'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.address': {
+            'Meta': {'object_name': 'Address'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'country': ('django.db.models.fields.CharField', [], {'max_length': '2'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'label': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'locality': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '31', 'null': 'True', 'blank': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_addresss'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'postal_code': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '16', 'null': 'True', 'blank': 'True'}),
+            'region': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '31', 'null': 'True', 'blank': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.answer': {
+            'Meta': {'ordering': "['order']", 'object_name': 'Answer'},
+            'correct': ('django.db.models.fields.NullBooleanField', [], {'default': 'None', 'null': 'True', 'blank': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'end_exam': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'end_question_pool': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'label': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '255', 'null': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'next_question_pool': ('pr_services.fields.PRForeignKey', [], {'default': 'None', 'to': "orm['pr_services.QuestionPool']", 'null': 'True'}),
+            'order': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_answers'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'question': ('pr_services.fields.PRForeignKey', [], {'related_name': "'answers'", 'to': "orm['pr_services.Question']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'text_response': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'value': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '255', 'null': 'True'})
+        },
+        'pr_services.assignment': {
+            'Meta': {'object_name': 'Assignment'},
+            'authority': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignments'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'curriculum_enrollment': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignments'", 'null': 'True', 'to': "orm['pr_services.CurriculumEnrollment']"}),
+            'date_completed': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'date_started': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'due_date': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'effective_date_assigned': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'product_claim': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignments'", 'null': 'True', 'to': "orm['pr_services.ProductClaim']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'sent_confirmation': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'sent_late_notice': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'sent_pre_reminder': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'sent_reminder': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'serial_number': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'status': ('django.db.models.fields.CharField', [], {'default': "'assigned'", 'max_length': '16', 'db_index': 'True'}),
+            'task': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignments'", 'to': "orm['pr_services.Task']"}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignments'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.assignmentattempt': {
+            'Meta': {'object_name': 'AssignmentAttempt'},
+            'assignment': ('pr_services.fields.PRForeignKey', [], {'related_name': "'assignment_attempts'", 'to': "orm['pr_services.Assignment']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'date_completed': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'date_started': ('django.db.models.fields.DateTimeField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_assignmentattempts'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.authtoken': {
+            'Meta': {'object_name': 'AuthToken'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'domain_affiliation': ('pr_services.fields.PRForeignKey', [], {'related_name': "'auth_tokens'", 'to': "orm['pr_services.DomainAffiliation']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'ip': ('django.db.models.fields.IPAddressField', [], {'default': "'0.0.0.0'", 'max_length': '15'}),
+            'issue_timestamp': ('django.db.models.fields.DateTimeField', [], {}),
+            'number_of_renewals': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_authtokens'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'renewal_timestamp': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session_id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32', 'db_index': 'True'}),
+            'time_of_expiration': ('django.db.models.fields.DateTimeField', [], {})
+        },
+        'pr_services.authtokenvoucher': {
+            'Meta': {'object_name': 'AuthTokenVoucher'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'domain_affiliation': ('pr_services.fields.PRForeignKey', [], {'related_name': "'auth_token_vouchers'", 'to': "orm['pr_services.DomainAffiliation']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'issue_timestamp': ('django.db.models.fields.DateTimeField', [], {}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_authtokenvouchers'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session_id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'time_of_expiration': ('django.db.models.fields.DateTimeField', [], {})
+        },
+        'pr_services.blame': {
+            'Meta': {'object_name': 'Blame'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'ip': ('django.db.models.fields.IPAddressField', [], {'max_length': '15'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_blames'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'time': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'blamed_user'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.cachedcookie': {
+            'Meta': {'object_name': 'CachedCookie'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'key': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_cachedcookies'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'value': ('django.db.models.fields.TextField', [], {})
+        },
+        'pr_services.claimproductoffers': {
+            'Meta': {'object_name': 'ClaimProductOffers'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'discounts': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_claim'", 'symmetrical': 'False', 'to': "orm['pr_services.ProductDiscount']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_claimproductofferss'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'price_paid': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'product_offer': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.ProductOffer']"}),
+            'purchase_order': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.PurchaseOrder']"}),
+            'quantity': ('django.db.models.fields.PositiveIntegerField', [], {'default': '1'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'training_units_paid': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'})
+        },
+        'pr_services.conditiontest': {
+            'Meta': {'object_name': 'ConditionTest'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'condition_tests'", 'to': "orm['pr_services.Blame']"}),
+            'condition_test_collection': ('pr_services.fields.PRForeignKey', [], {'related_name': "'condition_tests'", 'to': "orm['pr_services.ConditionTestCollection']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'credentials': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.Credential']"}),
+            'end': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'events': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.Event']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.Group']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'match_all_defined_parameters': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'organizations': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.Organization']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'sequence': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'session_user_role_requirements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.SessionUserRoleRequirement']"}),
+            'sessions': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'condition_tests'", 'symmetrical': 'False', 'to': "orm['pr_services.Session']"}),
+            'start': ('django.db.models.fields.DateTimeField', [], {'null': 'True'})
+        },
+        'pr_services.conditiontestcollection': {
+            'Meta': {'object_name': 'ConditionTestCollection'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'condition_test_collections'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.course': {
+            'Meta': {'object_name': 'Course'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_courses'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.credential': {
+            'Meta': {'object_name': 'Credential'},
+            'authority': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'credential_type': ('pr_services.fields.PRForeignKey', [], {'related_name': "'credentials'", 'to': "orm['pr_services.CredentialType']"}),
+            'date_assigned': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'date_expires': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'date_granted': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'date_started': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'credentials'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_credentials'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'serial_number': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'status': ('django.db.models.fields.CharField', [], {'default': "'pending'", 'max_length': '8'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'credentials'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.credentialtype': {
+            'Meta': {'object_name': 'CredentialType'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'credential_types'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_credentialtypes'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'prerequisite_credential_types': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'requisite_credential_types'", 'symmetrical': 'False', 'to': "orm['pr_services.CredentialType']"}),
+            'required_achievements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'credential_types'", 'symmetrical': 'False', 'to': "orm['pr_services.Achievement']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.csvdata': {
+            'Meta': {'object_name': 'CSVData'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_csvdatas'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'text': ('django.db.models.fields.TextField', [], {}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.User']"})
+        },
+        'pr_services.curriculum': {
+            'Meta': {'object_name': 'Curriculum'},
+            'achievements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'curriculums'", 'symmetrical': 'False', 'to': "orm['pr_services.Achievement']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculums'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'tasks': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'curriculums'", 'symmetrical': 'False', 'through': "orm['pr_services.CurriculumTaskAssociation']", 'to': "orm['pr_services.Task']"})
+        },
+        'pr_services.curriculumenrollment': {
+            'Meta': {'object_name': 'CurriculumEnrollment'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'curriculum': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_enrollments'", 'to': "orm['pr_services.Curriculum']"}),
+            'end': ('django.db.models.fields.DateField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'start': ('django.db.models.fields.DateField', [], {}),
+            'users': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'curriculum_enrollments'", 'symmetrical': 'False', 'through': "orm['pr_services.CurriculumEnrollmentUserAssociation']", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.curriculumenrollmentuserassociation': {
+            'Meta': {'object_name': 'CurriculumEnrollmentUserAssociation'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'curriculum_enrollment': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_enrollment_user_associations'", 'to': "orm['pr_services.CurriculumEnrollment']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_enrollment_user_associations'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.curriculumtaskassociation': {
+            'Meta': {'object_name': 'CurriculumTaskAssociation'},
+            'continue_automatically': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'curriculum': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_task_associations'", 'to': "orm['pr_services.Curriculum']"}),
+            'days_before_start': ('django.db.models.fields.PositiveSmallIntegerField', [], {'default': '0'}),
+            'days_to_complete': ('django.db.models.fields.PositiveSmallIntegerField', [], {'default': '0'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'presentation_order': ('django.db.models.fields.PositiveSmallIntegerField', [], {'default': '0'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'task': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_task_associations'", 'to': "orm['pr_services.Task']"}),
+            'task_bundle': ('pr_services.fields.PRForeignKey', [], {'related_name': "'curriculum_task_associations'", 'null': 'True', 'to': "orm['pr_services.TaskBundle']"})
+        },
+        'pr_services.customaction': {
+            'Meta': {'object_name': 'CustomAction'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'custom_actions'", 'to': "orm['pr_services.Blame']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'function_name': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '65'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.domain': {
+            'Meta': {'object_name': 'Domain'},
+            'authentication_ip': ('django.db.models.fields.IPAddressField', [], {'max_length': '15', 'null': 'True'}),
+            'authentication_password_hash': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'password_hash_type': ('django.db.models.fields.CharField', [], {'default': "'SHA-512'", 'max_length': '8'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.domainaffiliation': {
+            'Meta': {'unique_together': "(('username', 'domain'),)", 'object_name': 'DomainAffiliation'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'domain': ('pr_services.fields.PRForeignKey', [], {'related_name': "'domain_affiliations'", 'to': "orm['pr_services.Domain']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'may_log_me_in': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'password_hash': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'password_hash_type': ('django.db.models.fields.CharField', [], {'default': "'SHA-512'", 'max_length': '8'}),
+            'password_salt': ('django.db.models.fields.CharField', [], {'max_length': '8', 'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'domain_affiliations'", 'to': "orm['pr_services.User']"}),
+            'username': ('django.db.models.fields.CharField', [], {'max_length': '31', 'db_index': 'True'})
+        },
+        'pr_services.event': {
+            'Meta': {'object_name': 'Event'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'end': ('django.db.models.fields.DateField', [], {}),
+            'event_template': ('pr_services.fields.PRForeignKey', [], {'related_name': "'events'", 'null': 'True', 'to': "orm['pr_services.EventTemplate']"}),
+            'external_reference': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'facebook_template': ('django.db.models.fields.CharField', [], {'default': "'I just signed up for {{event}}! Click the link to join me.'", 'max_length': '255'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'lag_time': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'lead_time': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'events'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'events'", 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_events'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'product_line': ('pr_services.fields.PRForeignKey', [], {'related_name': "'events'", 'to': "orm['pr_services.ProductLine']"}),
+            'region': ('pr_services.fields.PRForeignKey', [], {'related_name': "'events'", 'null': 'True', 'to': "orm['pr_services.Region']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'start': ('django.db.models.fields.DateField', [], {}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '127', 'null': 'True'}),
+            'twitter_template': ('django.db.models.fields.CharField', [], {'default': "'I just signed up for {{event}}! Join me! {{url}}'", 'max_length': '255'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '255', 'null': 'True'}),
+            'venue': ('pr_services.fields.PRForeignKey', [], {'related_name': "'events'", 'null': 'True', 'to': "orm['pr_services.Venue']"})
+        },
+        'pr_services.eventtemplate': {
+            'Meta': {'object_name': 'EventTemplate'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'external_reference': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'facebook_template': ('django.db.models.fields.CharField', [], {'default': "'I just signed up for {{event}}! Click the link to join me.'", 'max_length': '255'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'lag_time': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'lead_time': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'name_prefix': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'event_templates'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'event_templates'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_eventtemplates'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'product_line': ('pr_services.fields.PRForeignKey', [], {'related_name': "'event_templates'", 'null': 'True', 'to': "orm['pr_services.ProductLine']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '127', 'null': 'True'}),
+            'twitter_template': ('django.db.models.fields.CharField', [], {'default': "'I just signed up for {{event}}! Join me! {{url}}'", 'max_length': '255'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '255', 'null': 'True'})
+        },
+        'pr_services.exam': {
+            'Meta': {'object_name': 'Exam', '_ormbases': ['pr_services.Task']},
+            'passing_score': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'task_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.Task']", 'unique': 'True', 'primary_key': 'True'})
+        },
+        'pr_services.examsession': {
+            'Meta': {'object_name': 'ExamSession', '_ormbases': ['pr_services.AssignmentAttempt']},
+            'assignmentattempt_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.AssignmentAttempt']", 'unique': 'True', 'primary_key': 'True'}),
+            'number_correct': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None', 'null': 'True'}),
+            'passed': ('django.db.models.fields.NullBooleanField', [], {'null': 'True', 'blank': 'True'}),
+            'response_questions': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Question']", 'through': "orm['pr_services.Response']", 'symmetrical': 'False'}),
+            'score': ('django.db.models.fields.DecimalField', [], {'default': 'None', 'null': 'True', 'max_digits': '5', 'decimal_places': '2'})
+        },
+        'pr_services.formpage': {
+            'Meta': {'unique_together': "(('exam', 'number'),)", 'object_name': 'FormPage'},
+            'exam': ('pr_services.fields.PRForeignKey', [], {'related_name': "'form_pages'", 'to': "orm['pr_services.Exam']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'number': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'photo': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True'})
+        },
+        'pr_services.formwidget': {
+            'Meta': {'object_name': 'FormWidget'},
+            'answer': ('pr_services.fields.PRForeignKey', [], {'related_name': "'form_widgets'", 'null': 'True', 'to': "orm['pr_services.Answer']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'form_page': ('pr_services.fields.PRForeignKey', [], {'related_name': "'form_widgets'", 'to': "orm['pr_services.FormPage']"}),
+            'height': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_formwidgets'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'question': ('pr_services.fields.PRForeignKey', [], {'related_name': "'form_widgets'", 'to': "orm['pr_services.Question']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'width': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'x': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'y': ('django.db.models.fields.PositiveIntegerField', [], {})
+        },
+        'pr_services.group': {
+            'Meta': {'ordering': "('name',)", 'object_name': 'Group'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'managers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'groups_managed'", 'symmetrical': 'False', 'to': "orm['pr_services.User']"}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'groups'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_groups'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.note': {
+            'Meta': {'object_name': 'Note'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_notes'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'text': ('django.db.models.fields.TextField', [], {})
+        },
+        'pr_services.organization': {
+            'Meta': {'unique_together': "(('name', 'parent'),)", 'object_name': 'Organization'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'address': ('pr_services.fields.PRForeignKey', [], {'related_name': "'organizations'", 'null': 'True', 'to': "orm['pr_services.Address']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'department': ('django.db.models.fields.CharField', [], {'max_length': '127', 'null': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75'}),
+            'fax': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'organizations'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_organizations'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'parent': ('pr_services.fields.PRForeignKey', [], {'related_name': "'children'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'phone': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'photo': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True'}),
+            'primary_contact_cell_phone': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'primary_contact_email': ('django.db.models.fields.EmailField', [], {'max_length': '75'}),
+            'primary_contact_first_name': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'primary_contact_last_name': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'primary_contact_office_phone': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'primary_contact_other_phone': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'roles': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'organizations'", 'symmetrical': 'False', 'through': "orm['pr_services.UserOrgRole']", 'to': "orm['pr_services.OrgRole']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '200', 'null': 'True'})
+        },
+        'pr_services.orgemaildomain': {
+            'Meta': {'unique_together': "(('email_domain', 'organization', 'role'),)", 'object_name': 'OrgEmailDomain'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'email_domain': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'org_email_domains'", 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_orgemaildomains'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'role': ('pr_services.fields.PRForeignKey', [], {'related_name': "'org_email_domains'", 'null': 'True', 'to': "orm['pr_services.OrgRole']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.orgrole': {
+            'Meta': {'object_name': 'OrgRole'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.payment': {
+            'Meta': {'object_name': 'Payment'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'address_label': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'amount': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'card_number': ('django.db.models.fields.CharField', [], {'max_length': '16'}),
+            'card_type': ('django.db.models.fields.CharField', [], {'max_length': '10'}),
+            'city': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'country': ('django.db.models.fields.CharField', [], {'max_length': '2'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'exp_date': ('django.db.models.fields.CharField', [], {'max_length': '4'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'invoice_number': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'payments'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_payments'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'purchase_order': ('pr_services.fields.PRForeignKey', [], {'related_name': "'payments'", 'to': "orm['pr_services.PurchaseOrder']"}),
+            'result_message': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'sales_tax': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'state': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'transaction_id': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'zip': ('django.db.models.fields.CharField', [], {'max_length': '15'})
+        },
+        'pr_services.product': {
+            'Meta': {'object_name': 'Product'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'products'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'cost': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'custom_actions': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'products'", 'symmetrical': 'False', 'to': "orm['pr_services.CustomAction']"}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'display_order': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None', 'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '127'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'products'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_products'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'price': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'sku': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'starting_quantity': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'training_units': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'visibility_condition_test_collection': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.ConditionTestCollection']", 'null': 'True'})
+        },
+        'pr_services.productclaim': {
+            'Meta': {'object_name': 'ProductClaim'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_claims'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'discounts': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_claims'", 'symmetrical': 'False', 'to': "orm['pr_services.ProductDiscount']"}),
+            'discounts_searched': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_productclaims'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'price_paid': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'product': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_claims'", 'to': "orm['pr_services.Product']"}),
+            'purchase_order': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_claims'", 'to': "orm['pr_services.PurchaseOrder']"}),
+            'quantity': ('django.db.models.fields.PositiveIntegerField', [], {'default': '1'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'training_units_paid': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'})
+        },
+        'pr_services.productdiscount': {
+            'Meta': {'object_name': 'ProductDiscount'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_discounts'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'condition_test_collection': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_discounts'", 'null': 'True', 'to': "orm['pr_services.ConditionTestCollection']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'cumulative': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'currency': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '63', 'null': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Note']", 'symmetrical': 'False'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_productdiscounts'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'percentage': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'product_offers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_discounts'", 'symmetrical': 'False', 'to': "orm['pr_services.ProductOffer']"}),
+            'products': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_discounts'", 'symmetrical': 'False', 'to': "orm['pr_services.Product']"}),
+            'promo_code': ('django.db.models.fields.CharField', [], {'max_length': '15', 'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'training_units': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'})
+        },
+        'pr_services.productline': {
+            'Meta': {'object_name': 'ProductLine'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'instructor_managers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_lines_instructor_manager_for'", 'symmetrical': 'False', 'to': "orm['pr_services.User']"}),
+            'instructors': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_lines_instructor_for'", 'symmetrical': 'False', 'to': "orm['pr_services.User']"}),
+            'managers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_lines_managed'", 'symmetrical': 'False', 'to': "orm['pr_services.User']"}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'product_lines'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_productlines'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.productoffer': {
+            'Meta': {'object_name': 'ProductOffer'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_offers'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Note']", 'symmetrical': 'False'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_productoffers'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'price': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'product': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_offers'", 'to': "orm['pr_services.Product']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'seller': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_offers'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.producttransaction': {
+            'Meta': {'object_name': 'ProductTransaction'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_transactions'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'change': ('django.db.models.fields.IntegerField', [], {}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_producttransactions'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'product': ('pr_services.fields.PRForeignKey', [], {'related_name': "'product_transactions'", 'to': "orm['pr_services.Product']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.purchaseorder': {
+            'Meta': {'object_name': 'PurchaseOrder'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'expiration': ('django.db.models.fields.DateTimeField', [], {'null': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'purchase_orders'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'purchase_orders'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_purchaseorders'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'product_discounts': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'purchase_orders'", 'symmetrical': 'False', 'to': "orm['pr_services.ProductDiscount']"}),
+            'product_offers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'purchase_orders'", 'symmetrical': 'False', 'through': "orm['pr_services.ClaimProductOffers']", 'to': "orm['pr_services.ProductOffer']"}),
+            'products': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'purchase_orders'", 'symmetrical': 'False', 'through': "orm['pr_services.ProductClaim']", 'to': "orm['pr_services.Product']"}),
+            'promo_code': ('django.db.models.fields.CharField', [], {'max_length': '15', 'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'training_units_price': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'training_units_purchased': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.User']", 'null': 'True'})
+        },
+        'pr_services.question': {
+            'Meta': {'ordering': "['order']", 'object_name': 'Question'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'help_text': ('django.db.models.fields.TextField', [], {'default': 'None', 'null': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'label': ('django.db.models.fields.TextField', [], {}),
+            'max_answers': ('django.db.models.fields.PositiveIntegerField', [], {'default': '1', 'null': 'True'}),
+            'max_length': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None', 'null': 'True'}),
+            'max_value': ('django.db.models.fields.DecimalField', [], {'default': 'None', 'null': 'True', 'max_digits': '24', 'decimal_places': '10'}),
+            'min_answers': ('django.db.models.fields.PositiveIntegerField', [], {'default': '1'}),
+            'min_length': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'min_value': ('django.db.models.fields.DecimalField', [], {'default': 'None', 'null': 'True', 'max_digits': '24', 'decimal_places': '10'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'order': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_questions'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'question_pool': ('pr_services.fields.PRForeignKey', [], {'related_name': "'questions'", 'to': "orm['pr_services.QuestionPool']"}),
+            'question_type': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'rejoinder': ('django.db.models.fields.TextField', [], {'default': 'None', 'null': 'True'}),
+            'required': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'text_regex': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '255', 'null': 'True'}),
+            'text_response': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'text_response_label': ('django.db.models.fields.TextField', [], {'default': 'None', 'null': 'True'}),
+            'widget': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '31'})
+        },
+        'pr_services.questionpool': {
+            'Meta': {'ordering': "['order']", 'object_name': 'QuestionPool'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'exam': ('pr_services.fields.PRForeignKey', [], {'related_name': "'question_pools'", 'to': "orm['pr_services.Exam']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'next_question_pool': ('pr_services.fields.PRForeignKey', [], {'default': 'None', 'to': "orm['pr_services.QuestionPool']", 'null': 'True'}),
+            'number_to_answer': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'order': ('django.db.models.fields.PositiveIntegerField', [], {'default': 'None'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_questionpools'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'randomize_questions': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'})
+        },
+        'pr_services.refund': {
+            'Meta': {'object_name': 'Refund'},
+            'amount': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_refunds'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'payment': ('pr_services.fields.PRForeignKey', [], {'related_name': "'refunds'", 'to': "orm['pr_services.Payment']"}),
+            'result_message': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'transaction_id': ('django.db.models.fields.CharField', [], {'max_length': '63'})
+        },
+        'pr_services.region': {
+            'Meta': {'object_name': 'Region'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'regions'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_regions'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.resource': {
+            'Meta': {'object_name': 'Resource'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'resources'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_resources'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.resourcetype': {
+            'Meta': {'object_name': 'ResourceType'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'resource_types'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_resourcetypes'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'resources': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'resource_types'", 'symmetrical': 'False', 'to': "orm['pr_services.Resource']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.response': {
+            'Meta': {'ordering': "['order']", 'unique_together': "(('exam_session', 'question'),)", 'object_name': 'Response'},
+            'answers': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'responses'", 'symmetrical': 'False', 'to': "orm['pr_services.Answer']"}),
+            'bool_value': ('django.db.models.fields.NullBooleanField', [], {'default': 'None', 'null': 'True', 'blank': 'True'}),
+            'char_value': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '255', 'null': 'True'}),
+            'correct': ('django.db.models.fields.NullBooleanField', [], {'default': 'None', 'null': 'True', 'blank': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'date_value': ('django.db.models.fields.DateField', [], {'default': 'None', 'null': 'True'}),
+            'datetime_value': ('django.db.models.fields.DateTimeField', [], {'default': 'None', 'null': 'True'}),
+            'decimal_value': ('django.db.models.fields.DecimalField', [], {'default': 'None', 'null': 'True', 'max_digits': '24', 'decimal_places': '10'}),
+            'exam_session': ('pr_services.fields.PRForeignKey', [], {'related_name': "'responses'", 'to': "orm['pr_services.ExamSession']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'float_value': ('django.db.models.fields.FloatField', [], {'default': 'None', 'null': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'int_value': ('django.db.models.fields.IntegerField', [], {'default': 'None', 'null': 'True'}),
+            'order': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_responses'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'password_value': ('django.db.models.fields.CharField', [], {'default': 'None', 'max_length': '255', 'null': 'True'}),
+            'question': ('pr_services.fields.PRForeignKey', [], {'related_name': "'responses'", 'to': "orm['pr_services.Question']"}),
+            'rating_value': ('django.db.models.fields.PositiveSmallIntegerField', [], {'default': 'None', 'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'text_value': ('django.db.models.fields.TextField', [], {'default': 'None', 'null': 'True'}),
+            'time_value': ('django.db.models.fields.TimeField', [], {'default': 'None', 'null': 'True'}),
+            'valid': ('django.db.models.fields.NullBooleanField', [], {'default': 'None', 'null': 'True', 'blank': 'True'})
+        },
+        'pr_services.role': {
+            'Meta': {'object_name': 'Role'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'roles'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_roles'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.room': {
+            'Meta': {'object_name': 'Room'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'capacity': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'rooms'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_rooms'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'room_number': ('django.db.models.fields.CharField', [], {'max_length': '15'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'venue': ('pr_services.fields.PRForeignKey', [], {'related_name': "'rooms'", 'to': "orm['pr_services.Venue']"})
+        },
+        'pr_services.sco': {
+            'Meta': {'object_name': 'Sco', '_ormbases': ['pr_services.Task']},
+            'completion_requirement': ('django.db.models.fields.CharField', [], {'default': "'visit_sco'", 'max_length': '64'}),
+            'course': ('pr_services.fields.PRForeignKey', [], {'related_name': "'scos'", 'to': "orm['pr_services.Course']"}),
+            'data': ('django.db.models.fields.CharField', [], {'max_length': '1024'}),
+            'task_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.Task']", 'unique': 'True', 'primary_key': 'True'}),
+            'url': ('django.db.models.fields.CharField', [], {'max_length': '1024'})
+        },
+        'pr_services.scosession': {
+            'Meta': {'object_name': 'ScoSession', '_ormbases': ['pr_services.AssignmentAttempt']},
+            'assignmentattempt_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.AssignmentAttempt']", 'unique': 'True', 'primary_key': 'True'}),
+            'cmi_core_lesson_location': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'cmi_core_lesson_status': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True'}),
+            'cmi_core_score_max': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'cmi_core_score_min': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'shared_object': ('django.db.models.fields.TextField', [], {})
+        },
+        'pr_services.session': {
+            'Meta': {'object_name': 'Session'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'audience': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'confirmed': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default_price': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'description': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'end': ('django.db.models.fields.DateTimeField', [], {}),
+            'evaluation': ('pr_services.fields.PROneToOneField', [], {'related_name': "'session'", 'unique': 'True', 'null': 'True', 'to': "orm['pr_services.Exam']"}),
+            'event': ('pr_services.fields.PRForeignKey', [], {'related_name': "'sessions'", 'to': "orm['pr_services.Event']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'graphic': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modality': ('django.db.models.fields.CharField', [], {'default': "'Generic'", 'max_length': '31'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'sessions'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessions'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'room': ('pr_services.fields.PRForeignKey', [], {'related_name': "'sessions'", 'null': 'True', 'to': "orm['pr_services.Room']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'sent_reminders': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'session_template': ('pr_services.fields.PRForeignKey', [], {'related_name': "'sessions'", 'null': 'True', 'to': "orm['pr_services.SessionTemplate']"}),
+            'start': ('django.db.models.fields.DateTimeField', [], {}),
+            'status': ('django.db.models.fields.CharField', [], {'max_length': '63'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '127', 'null': 'True'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '255', 'null': 'True'})
+        },
+        'pr_services.sessionresourcetyperequirement': {
+            'Meta': {'object_name': 'SessionResourceTypeRequirement'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'min': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_resource_type_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessionresourcetyperequirements'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'resource_type': ('pr_services.fields.PRForeignKey', [], {'related_name': "'sessionresourcetyperequirements'", 'to': "orm['pr_services.ResourceType']"}),
+            'resources': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_resource_type_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.Resource']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Session']"})
+        },
+        'pr_services.sessiontemplate': {
+            'Meta': {'object_name': 'SessionTemplate'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'audience': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'duration': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'event_template': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_templates'", 'null': 'True', 'to': "orm['pr_services.EventTemplate']"}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'fullname': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'lead_time': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'modality': ('django.db.models.fields.CharField', [], {'default': "'Generic'", 'max_length': '31'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_templates'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessiontemplates'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'price': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'product_line': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.ProductLine']", 'null': 'True'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'sequence': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'shortname': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '31'}),
+            'version': ('django.db.models.fields.CharField', [], {'max_length': '15'})
+        },
+        'pr_services.sessiontemplateresourcetypereq': {
+            'Meta': {'object_name': 'SessionTemplateResourceTypeReq'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'min': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_template_resource_type_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessiontemplateresourcetypereqs'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'resource_type': ('pr_services.fields.PRForeignKey', [], {'related_name': "'sessiontemplateresourcetypereqs'", 'to': "orm['pr_services.ResourceType']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session_template': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_template_resource_type_requirements'", 'to': "orm['pr_services.SessionTemplate']"})
+        },
+        'pr_services.sessiontemplateuserrolereq': {
+            'Meta': {'object_name': 'SessionTemplateUserRoleReq'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'min': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_template_user_role_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessiontemplateuserrolereqs'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session_template': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_template_user_role_requirements'", 'to': "orm['pr_services.SessionTemplate']"}),
+            'session_user_role': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.SessionUserRole']"})
+        },
+        'pr_services.sessionuserrole': {
+            'Meta': {'object_name': 'SessionUserRole'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_user_roles'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_sessionuserroles'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.sessionuserrolerequirement': {
+            'Meta': {'object_name': 'SessionUserRoleRequirement', '_ormbases': ['pr_services.Task']},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'credential_types': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_user_role_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.CredentialType']"}),
+            'enrollment_status_test': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_user_role_requirements'", 'null': 'True', 'to': "orm['pr_services.ConditionTestCollection']"}),
+            'ignore_room_capacity': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'session_user_role_requirements'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'session': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_user_role_requirements'", 'to': "orm['pr_services.Session']"}),
+            'session_user_role': ('pr_services.fields.PRForeignKey', [], {'related_name': "'session_user_role_requirements'", 'to': "orm['pr_services.SessionUserRole']"}),
+            'task_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.Task']", 'unique': 'True', 'primary_key': 'True'})
+        },
+        'pr_services.singleuseauthtoken': {
+            'Meta': {'object_name': 'SingleUseAuthToken', '_ormbases': ['pr_services.AuthToken']},
+            'authtoken_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.AuthToken']", 'unique': 'True', 'primary_key': 'True'}),
+            'used': ('pr_services.fields.PRBooleanField', [], {'default': 'False'})
+        },
+        'pr_services.task': {
+            'Meta': {'object_name': 'Task'},
+            'achievements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'tasks'", 'symmetrical': 'False', 'to': "orm['pr_services.Achievement']"}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'min': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_tasks'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'prerequisite_achievements': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'yielded_tasks'", 'symmetrical': 'False', 'to': "orm['pr_services.Achievement']"}),
+            'prerequisite_tasks': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'yielded_tasks'", 'symmetrical': 'False', 'to': "orm['pr_services.Task']"}),
+            'prevent_duplicate_assignments': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'public': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '191', 'null': 'True'}),
+            'users': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'tasks'", 'symmetrical': 'False', 'through': "orm['pr_services.Assignment']", 'to': "orm['pr_services.User']"}),
+            'version_comment': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'blank': 'True'}),
+            'version_id': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True'}),
+            'version_label': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'blank': 'True'})
+        },
+        'pr_services.taskbundle': {
+            'Meta': {'object_name': 'TaskBundle'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'task_bundles'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'tasks': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'task_bundles'", 'symmetrical': 'False', 'through': "orm['pr_services.TaskBundleTaskAssociation']", 'to': "orm['pr_services.Task']"})
+        },
+        'pr_services.taskbundletaskassociation': {
+            'Meta': {'object_name': 'TaskBundleTaskAssociation'},
+            'continue_automatically': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'presentation_order': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'task': ('pr_services.fields.PRForeignKey', [], {'related_name': "'task_bundle_task_associations'", 'to': "orm['pr_services.Task']"}),
+            'task_bundle': ('pr_services.fields.PRForeignKey', [], {'related_name': "'task_bundle_task_associations'", 'to': "orm['pr_services.TaskBundle']"})
+        },
+        'pr_services.taskfee': {
+            'Meta': {'object_name': 'TaskFee', '_ormbases': ['pr_services.Product']},
+            'product_ptr': ('django.db.models.fields.related.OneToOneField', [], {'to': "orm['pr_services.Product']", 'unique': 'True', 'primary_key': 'True'}),
+            'task': ('pr_services.fields.PRForeignKey', [], {'related_name': "'task_fees'", 'to': "orm['pr_services.Task']"})
+        },
+        'pr_services.trainingunitaccount': {
+            'Meta': {'object_name': 'TrainingUnitAccount'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Note']", 'symmetrical': 'False'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'trainingunitaccounts'", 'null': 'True', 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_trainingunitaccounts'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'starting_value': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.User']", 'null': 'True'})
+        },
+        'pr_services.trainingunitauthorization': {
+            'Meta': {'object_name': 'TrainingUnitAuthorization'},
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'end': ('django.db.models.fields.DateTimeField', [], {}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'max_value': ('django.db.models.fields.PositiveIntegerField', [], {}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Note']", 'symmetrical': 'False'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_trainingunitauthorizations'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'start': ('django.db.models.fields.DateTimeField', [], {}),
+            'training_unit_account': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_unit_authorizations'", 'to': "orm['pr_services.TrainingUnitAccount']"}),
+            'transactions': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'training_unit_authorizations'", 'symmetrical': 'False', 'to': "orm['pr_services.TrainingUnitTransaction']"}),
+            'user': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_unit_authorizations'", 'to': "orm['pr_services.User']"})
+        },
+        'pr_services.trainingunittransaction': {
+            'Meta': {'object_name': 'TrainingUnitTransaction'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['pr_services.Note']", 'symmetrical': 'False'}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_trainingunittransactions'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'purchase_order': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_unit_transactions'", 'to': "orm['pr_services.PurchaseOrder']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'training_unit_account': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_unit_transactions'", 'to': "orm['pr_services.TrainingUnitAccount']"}),
+            'value': ('django.db.models.fields.IntegerField', [], {})
+        },
+        'pr_services.trainingvoucher': {
+            'Meta': {'object_name': 'TrainingVoucher'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'code': ('django.db.models.fields.CharField', [], {'max_length': '10'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'training_vouchers'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_trainingvouchers'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'purchase_order': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_vouchers'", 'null': 'True', 'to': "orm['pr_services.PurchaseOrder']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'session_user_role_requirement': ('pr_services.fields.PRForeignKey', [], {'related_name': "'training_vouchers'", 'to': "orm['pr_services.SessionUserRoleRequirement']"})
+        },
+        'pr_services.user': {
+            'Meta': {'object_name': 'User'},
+            'alleged_organization': ('django.db.models.fields.CharField', [], {'max_length': '100', 'null': 'True'}),
+            'billing_address': ('pr_services.fields.PRForeignKey', [], {'related_name': "'users_billing'", 'null': 'True', 'to': "orm['pr_services.Address']"}),
+            'biography': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'related_name': "'created_users'", 'null': 'True', 'to': "orm['pr_services.Blame']"}),
+            'color_code': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'confirmation_code': ('django.db.models.fields.CharField', [], {'max_length': '40', 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'default_domain': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True'}),
+            'default_username': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'domains': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'users'", 'symmetrical': 'False', 'through': "orm['pr_services.DomainAffiliation']", 'to': "orm['pr_services.Domain']"}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75'}),
+            'email2': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'null': 'True'}),
+            'enable_paypal': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'users'", 'symmetrical': 'False', 'to': "orm['pr_services.Group']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_staff': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'middle_name': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '31'}),
+            'name_suffix': ('django.db.models.fields.CharField', [], {'max_length': '15', 'null': 'True'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'users'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'organizations': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'users'", 'symmetrical': 'False', 'through': "orm['pr_services.UserOrgRole']", 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_users'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'paypal_address': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'null': 'True'}),
+            'phone': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'phone2': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'phone3': ('django.db.models.fields.CharField', [], {'max_length': '31', 'null': 'True'}),
+            'photo': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True'}),
+            'preferred_venues': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'users_who_prefer_this_venue'", 'null': 'True', 'to': "orm['pr_services.Venue']"}),
+            'roles': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'users'", 'symmetrical': 'False', 'through': "orm['pr_services.UserOrgRole']", 'to': "orm['pr_services.OrgRole']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'}),
+            'shipping_address': ('pr_services.fields.PRForeignKey', [], {'related_name': "'users_shipping'", 'null': 'True', 'to': "orm['pr_services.Address']"}),
+            'status': ('django.db.models.fields.CharField', [], {'max_length': '15', 'null': 'True'}),
+            'suppress_emails': ('pr_services.fields.PRBooleanField', [], {'default': 'False'}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '15', 'null': 'True'}),
+            'url': ('django.db.models.fields.URLField', [], {'max_length': '200', 'null': 'True'})
+        },
+        'pr_services.userorgrole': {
+            'Meta': {'unique_together': "(('owner', 'organization', 'role'),)", 'object_name': 'UserOrgRole'},
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'organization': ('pr_services.fields.PRForeignKey', [], {'related_name': "'user_org_roles'", 'to': "orm['pr_services.Organization']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_userorgroles'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'parent': ('pr_services.fields.PRForeignKey', [], {'related_name': "'children'", 'null': 'True', 'to': "orm['pr_services.UserOrgRole']"}),
+            'role': ('pr_services.fields.PRForeignKey', [], {'related_name': "'user_org_roles'", 'to': "orm['pr_services.OrgRole']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        },
+        'pr_services.venue': {
+            'Meta': {'object_name': 'Venue'},
+            'active': ('pr_services.fields.PRBooleanField', [], {'default': 'True'}),
+            'address': ('pr_services.fields.PRForeignKey', [], {'related_name': "'venues'", 'null': 'True', 'to': "orm['pr_services.Address']"}),
+            'blame': ('pr_services.fields.PRForeignKey', [], {'to': "orm['pr_services.Blame']", 'null': 'True'}),
+            'contact': ('django.db.models.fields.CharField', [], {'max_length': '63', 'null': 'True'}),
+            'create_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'final_type': ('pr_services.fields.PRForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'hours_of_operation': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'notes': ('django.db.models.fields.related.ManyToManyField', [], {'related_name': "'venue'", 'symmetrical': 'False', 'to': "orm['pr_services.Note']"}),
+            'owner': ('pr_services.fields.PRForeignKey', [], {'related_name': "'owned_venues'", 'null': 'True', 'to': "orm['pr_services.User']"}),
+            'phone': ('django.db.models.fields.CharField', [], {'max_length': '31'}),
+            'region': ('pr_services.fields.PRForeignKey', [], {'related_name': "'venues'", 'to': "orm['pr_services.Region']"}),
+            'save_timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now': 'True', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['pr_services']
@@ -13,15 +13,14 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from django.db.models.fields import FieldDoesNotExist
 from django.db.models.fields.related import RelatedField, RelatedObject
-from django.db.models.query import ValuesQuerySet
 from utils import Utils
 import django
 import exceptions
 import facade
 import logging
 import pr_time
-import tagging.models
 from pr_services.rpc.service import service_method
+from pr_services.utils import tag_query
 
 class ObjectManager(object):
     """Manage Power Reg persistent objects.
@@ -30,6 +29,12 @@ class ObjectManager(object):
     Power Reg 2 system.
 
     """
+
+    #: Set to True in managers of reference data that is read far more often
+    #: than it changes, so that get_filtered() loads objects through the
+    #: read cache (see pr_services.utils.read_cache).
+    cache_reads = False
+
     def __init__(self):
         """ constructor """
         #: Dictionary of attribute names and the names of functions used to set them
@@ -154,14 +159,20 @@ class ObjectManager(object):
         
         :type field_names: list
         """
-        result = self.Filter(self)._filter_common(auth_token, filters, field_names)
-        # Convert any instances of a ValuesQuerySet in the result dictionaries
-        # into a normal Python list so it can be marshalled for RPC.
-        for row in result:
-            for key in row.keys():
-                if isinstance(row[key], ValuesQuerySet):
-                    row[key] = list(row[key])
-        return result
+        return self.Filter(self)._filter_common(auth_token, filters, field_names).results
+
+    def iter_filtered(self, auth_token, filters, field_names=None):
+        """
+        Like get_filtered(), but yields the result rows one at a time as they
+        are assembled, so that callers which process or encode rows one by one
+        never hold the whole result in memory.
+
+        :param auth_token:  as for get_filtered()
+        :param filters:     as for get_filtered()
+        :param field_names: as for get_filtered()
+        :return:            iterator of result dictionaries
+        """
+        return iter(self.Filter(self)._filter_common(auth_token, filters, field_names))
 
     class Filter:
         """
@@ -222,6 +233,9 @@ class ObjectManager(object):
         def _filter_common(self, auth_token, filters, field_names=None):
             """
             Get objects filtered by various limits
+
+            :return: a Getter, which yields the result rows when iterated
+                     and lists them as its results attribute
             """
             
             if field_names is None:
@@ -230,7 +244,7 @@ class ObjectManager(object):
             query = self.construct_query(filters)
             query_set = self.my_manager.my_django_model.objects.filter(query)
             
-            return facade.subsystems.Getter(auth_token, self.my_manager, query_set, field_names).results
+            return facade.subsystems.Getter(auth_token, self.my_manager, query_set, field_names)
         
         def validate_field_name_path(self, filter_dict, field_name_path):
             """
@@ -328,24 +342,14 @@ class ObjectManager(object):
                     raise exceptions.InvalidFilterException(
                         'No other filters are allowed with a tag operation.  You should' +\
                         ' probably use Boolean expressions.')
-                tag_union_operand = None
-                tag_intersection_operand = None
+                # the matching objects are found with a subquery over the
+                # tagged items, so the database does the join
                 if 'tag_union' in filter_dict:
-                    tag_union_operand = filter_dict['tag_union']
-                elif 'tag_intersection' in filter_dict:
-                    tag_intersection_operand = filter_dict['tag_intersection']
-                if tag_union_operand is not None:
-                    query_set = tagging.models.TaggedItem.objects.get_union_by_model(
-                        self.my_manager.my_django_model,
-                        tag_union_operand)
-                elif tag_intersection_operand is not None:
-                    query_set = tagging.models.TaggedItem.objects.get_by_model(
-                        self.my_manager.my_django_model,
-                        tag_intersection_operand)
-                pk_list = list()
-                for obj in query_set:
-                    pk_list.append(obj.id)
-                return Q(id__in=pk_list)
+                    return tag_query.union_query(self.my_manager.my_django_model,
+                        filter_dict['tag_union'])
+                else:
+                    return tag_query.intersection_query(self.my_manager.my_django_model,
+                        filter_dict['tag_intersection'])
                     
             # recursion base case -- no boolean operator present in top-level of operators
             
@@ -30,6 +30,7 @@ import facade
 import pr_time
 import storage
 from fields import *
+from pr_services.utils import read_cache
 
 def queryset_empty(queryset):
     """
@@ -200,6 +201,8 @@ class PRModel(models.Model):
           that it's possible to get an instance of the most specific
           model class possible for a given instance (via the
           dynamic_cast method).
+      (3) Saving or deleting an instance invalidates cached queries
+          that involve its model (see pr_services.utils.read_cache).
     """
 
     def _ensure_logger_availability(self):
@@ -359,6 +362,7 @@ class PRModel(models.Model):
             super(PRModel, self).delete()
         except django.db.models.ProtectedError, e:
             raise exceptions.CascadingDeleteException(*e.args)
+        read_cache.bump(type(self))
 
     @alters_data
     def save(self, *args, **kw_args):
@@ -387,6 +391,7 @@ class PRModel(models.Model):
         if not self.id:
             self.final_type = ContentType.objects.get_for_model(type(self))
         models.Model.save(self, *args, **kw_args)
+        read_cache.bump(type(self))
         
     def downcast_completely(self):
         """
@@ -806,14 +811,8 @@ class Task(OwnedPRModel, Versionable):
         @type user  User
         @return     True iff the User has satisfied all the prerequisites for this Task.
         """
-        # Make sure the User has at least one completed Assignment for each prerequisite Task
-        for prerequisite_task in self.prerequisite_tasks.all():
-            prerequisite_task = prerequisite_task.downcast_completely()
-            if not prerequisite_task.completed(user):
-                return False
-        # We've checked all the prerequisite Tasks, and haven't found the User to be
-        # ineligible, so let's return True
-        return True
+        # The User needs at least one completed Assignment for each prerequisite Task
+        return facade.subsystems.PrerequisiteGraph().prerequisites_met(user, self.id)
 
     def save(self, *args, **kwargs):
         # Create a name based on the title if present, otherwise use the content
@@ -895,27 +894,13 @@ class CurriculumEnrollment(PRModel):
     def user_completion_statuses(self):
         """
         get the completion statuses for all users associated with this
-        CurriculumEnrollment
-
-        This probably won't perform well if there is a large number of users
-        and assignments.
+        CurriculumEnrollment, computed with a single grouped query
 
         :returns    dictionary of booleans, indexed by user PK. True iff the
                     user has completed this CurriculumEnrollment, else False
         """
 
-        assignments = self.assignments.all()
-        # group by user
-        sorted_assignments = {}
-        for assignment in assignments:
-            if assignment.user.id in sorted_assignments:
-                sorted_assignments[assignment.user.id].append(assignment)
-            else:
-                sorted_assignments[assignment.user.id] = [assignment]
-        ret = {}
-        for user in self.users.all():
-            ret[user.id] = self.get_user_completion_status(user, sorted_assignments[user.id])
-        return ret
+        return facade.subsystems.CurriculumEnrollmentMaterializer(self).completion_statuses()
 
     @property
     def number_of_tasks(self):
@@ -964,19 +949,9 @@ class CurriculumEnrollmentUserAssociation(PRModel):
 
     def save(self, *args, **kwargs):
         ret = super(CurriculumEnrollmentUserAssociation, self).save(*args, **kwargs)
-        
         # make assignments automatically if they don't already exist
-        for task in self.curriculum_enrollment.curriculum.tasks.all():
-            assignment, created = Assignment.objects.get_or_create(user=self.user, task=task, curriculum_enrollment=self.curriculum_enrollment)
-            if created:
-                # set dates
-                cta = CurriculumTaskAssociation.objects.get(curriculum=self.curriculum_enrollment.curriculum, task=task)
-                assignment.effective_date_assigned = self.curriculum_enrollment.start + timedelta(days=cta.days_before_start)
-                if cta.days_to_complete > 0:
-                    assignment.due_date = assignment.effective_date_assigned + timedelta(days=cta.days_to_complete)
-                else:
-                    assignment.due_date = self.curriculum_enrollment.end
-                assignment.save()
+        facade.subsystems.CurriculumEnrollmentMaterializer(
+            self.curriculum_enrollment).materialize([self.user_id])
         return ret
         
 
@@ -1039,10 +1014,8 @@ class Assignment(PRModel):
     def prerequisites_met(self):
         """Return True iff all prerequiseties have been met"""
 
-        for task in self.task.prerequisite_tasks.all():
-            if task.assignments.filter(status='completed', user=self.user).count() == 0:
-                return False
-        return True
+        return facade.subsystems.PrerequisiteGraph().prerequisites_met(
+            self.user_id, self.task_id)
 
     def mark_completed(self):
         """
@@ -1099,6 +1072,7 @@ class Assignment(PRModel):
                     self.status = 'assigned'
 
         super(Assignment, self).save(*args, **kwargs)
+        facade.subsystems.PrerequisiteGraph().invalidate_user(self.user_id)
 
     def __unicode__(self):
         return u'(Assignment for %s, id=%d, user=%s)' % \
@@ -1463,9 +1437,19 @@ class Domain(PRModel):
     PASSWORD_HASH_TYPE_CHOICES = (
         ('SHA-1', 'SHA-1'),
         ('SHA-512', 'SHA-512'),
+        ('PBKDF2', 'PBKDF2'),
+        ('BCRYPT', 'BCRYPT'),
     )
     password_hash_type = models.CharField(max_length=8, choices=PASSWORD_HASH_TYPE_CHOICES,
             default='SHA-512')
+
+    def save(self, *args, **kwargs):
+        ret = super(Domain, self).save(*args, **kwargs)
+        # keep the denormalized domain name on Users current
+        User.objects.filter(domain_affiliations__domain__id=self.id,
+            domain_affiliations__default=True).exclude(default_domain=self.name).update(
+            default_domain=self.name)
+        return ret
     
     
 class DomainAffiliation(PRModel):
@@ -1475,11 +1459,13 @@ class DomainAffiliation(PRModel):
     #: cryptographic hash of the User's password
     # leave enough room for a SHA-512 hash in hex
     password_hash = models.CharField(max_length=128)
-    #: type of cryptographic hash used for the password_hash field
-    #: currently only 'SHA-1' is supported
+    #: type of cryptographic hash used for the password_hash field; see
+    #: pr_services.utils.password_hashing
     PASSWORD_HASH_TYPE_CHOICES = (
         ('SHA-1', 'SHA-1'),
         ('SHA-512', 'SHA-512'),
+        ('PBKDF2', 'PBKDF2'),
+        ('BCRYPT', 'BCRYPT'),
     )
     password_hash_type = models.CharField(max_length=8, choices=PASSWORD_HASH_TYPE_CHOICES,
             default='SHA-512')
@@ -1510,20 +1496,48 @@ class DomainAffiliation(PRModel):
         except self.__class__.DoesNotExist:
             pass
         
-        if len(self.username) < 1:
-            add_validation_error(validation_errors, 'username', u"Username must be at least one character long.")
+        for message in self.check_username(self.username, self.domain.name):
+            add_validation_error(validation_errors, 'username', message)
+
+        return validation_errors
+
+    @classmethod
+    def check_username(cls, username, domain_name):
+        """
+        Check a username against the rules that don't require a database
+        query.
+
+        @param username     the proposed username
+        @param domain_name  name of the Domain the username is for
+        @return             list of validation error messages, empty if the
+                            username is acceptable
+        """
+        messages = []
+        if len(username) < 1:
+            messages.append(u"Username must be at least one character long.")
         
-        if self.username.strip() != self.username:
-            add_validation_error(validation_errors, 'username', u"Usernames may not begin or end in whitespace.")
+        if username.strip() != username:
+            messages.append(u"Usernames may not begin or end in whitespace.")
 
-        if self.domain.name == 'local':
+        if domain_name == 'local':
             # Check for additional illegal characters
-            for c in self.username:
-                if (c in self.__class__.USERNAME_ILLEGAL_CHARACTERS):
-                    add_validation_error(validation_errors, 'username', u"You have used an invalid character in the username field.  We do not allow the following characters: " +\
-                        self.__class__.USERNAME_ILLEGAL_CHARACTERS)
+            for c in username:
+                if (c in cls.USERNAME_ILLEGAL_CHARACTERS):
+                    messages.append(u"You have used an invalid character in the username field.  We do not allow the following characters: " +\
+                        cls.USERNAME_ILLEGAL_CHARACTERS)
 
-        return validation_errors
+        return messages
+
+    def save(self, *args, **kwargs):
+        ret = super(DomainAffiliation, self).save(*args, **kwargs)
+        self.user.update_default_username()
+        return ret
+
+    def delete(self):
+        user = self.user
+        ret = super(DomainAffiliation, self).delete()
+        user.update_default_username()
+        return ret
     
 
 class User(OwnedPRModel):
@@ -1614,6 +1628,11 @@ class User(OwnedPRModel):
     confirmation_code = models.CharField(max_length=40, null=True)
     #: organization name provided by a user when self-registering.
     alleged_organization = models.CharField(max_length=100, null=True)
+    #: denormalized username and domain name of the default DomainAffiliation,
+    #: kept current by DomainAffiliation.save() and delete().  Both are null if
+    #: there isn't exactly one default DomainAffiliation.
+    default_username = models.CharField(max_length=31, null=True)
+    default_domain = models.CharField(max_length=255, null=True)
 
     def __str__(self):
         return ('%s %s %s %s' % (self.title, self.first_name, self.last_name,
@@ -1626,13 +1645,14 @@ class User(OwnedPRModel):
         self.status = new_status
 
     def _get_username(self):
+        if self.default_username is not None:
+            return '%s:%s' % (self.default_domain, self.default_username)
         try:
-            da = self.domain_affiliations.get(default=True)
-            return '%s:%s' % (da.domain.name, da.username)
-        except DomainAffiliation.DoesNotExist:
-            pass
-        except DomainAffiliation.MultipleObjectsReturned:
-            pass
+            ud = facade.subsystems.IdentityResolver().default_username_and_domain(self.id)
+        except exceptions.InternalErrorException:
+            ud = None
+        if ud is not None:
+            return '%s:%s' % (ud['domain'], ud['username'])
         return '(no default username)'
 
     #: derived property that will produce a string of the form 'domain:username'
@@ -1642,20 +1662,31 @@ class User(OwnedPRModel):
     username = property(_get_username)
 
     def _get_default_username_and_domain(self):
-        try:
-            da = self.domain_affiliations.get(default=True)
-            return {'username': da.username, 'domain': da.domain.name}
-        except DomainAffiliation.DoesNotExist:
-            return None
-        except DomainAffiliation.MultipleObjectsReturned:
-            raise exceptions.InternalErrorException('more than one default domain for user with pk %d' %
-                self.pk)
+        if self.default_username is not None:
+            return {'username': self.default_username, 'domain': self.default_domain}
+        return facade.subsystems.IdentityResolver().default_username_and_domain(self.id)
 
     #: derived property that returns a dictionary with 'username' and 'domain'
     #: keys based on the default domain affiliation if one exists.  Returns
     #: None if no default domain association exists.
     default_username_and_domain = property(_get_default_username_and_domain)
 
+    def update_default_username(self):
+        """
+        Recompute the denormalized default_username and default_domain
+        columns from this User's default DomainAffiliation.
+        """
+
+        defaults = list(self.domain_affiliations.filter(default=True).values_list(
+            'username', 'domain__name')[:2])
+        if len(defaults) == 1:
+            self.default_username, self.default_domain = defaults[0]
+        else:
+            self.default_username = self.default_domain = None
+        User.objects.filter(id=self.id).update(default_username=self.default_username,
+            default_domain=self.default_domain)
+        facade.subsystems.IdentityResolver().invalidate_user(self.id)
+
     def assign_org_roles_from_email(self):
         # Assign user to organizations and roles based on the domain portion of
         # their email addresses.
@@ -1679,6 +1710,14 @@ class User(OwnedPRModel):
                     email = email.encode('utf-8')
                 confirmation_code = sha_constructor(salt + email).hexdigest()
                 self.confirmation_code = confirmation_code
+        # default_username and default_domain are maintained by
+        # update_default_username(), so don't overwrite them with what we loaded
+        if not new_user:
+            stored = list(User.objects.filter(pk=self.pk).values('default_username',
+                'default_domain'))
+            if stored:
+                self.default_username = stored[0]['default_username']
+                self.default_domain = stored[0]['default_domain']
         super(User, self).save(*args, **kwargs)
 
     def delete(self):
@@ -1899,6 +1938,11 @@ class Session(OwnedPRModel):
     description = models.TextField(null = True)
     event = PRForeignKey('Event', related_name = 'sessions')
     sent_reminders = PRBooleanField(default=False)
+    #: when reminders become due, derived from start and the Event's lead_time
+    #: so that due Sessions can be found with one indexed comparison
+    reminder_due = models.DateTimeField(null=True, db_index=True)
+    #: identifies the run of the reminder task that claimed this Session
+    reminder_key = models.CharField(max_length=32, null=True, db_index=True)
 
     def __unicode__(self):
         if self.session_template:
@@ -1907,6 +1951,24 @@ class Session(OwnedPRModel):
         else:
             return u'name: %s, event name: %s' % (self.name, self.event.name)
 
+    @staticmethod
+    def compute_reminder_due(start, lead_time):
+        """
+        Reminders are due lead_time seconds before midnight of the day on
+        which the Session starts.
+
+        @param start        start time of the Session
+        @param lead_time    lead time of the Event in seconds, or None
+        @return             datetime, or None if no reminders should be sent
+        """
+        if start is None or lead_time is None:
+            return None
+        return datetime.fromordinal(start.toordinal()) - timedelta(seconds=lead_time)
+
+    def save(self, *args, **kwargs):
+        self.reminder_due = self.compute_reminder_due(self.start, self.event.lead_time)
+        super(Session, self).save(*args, **kwargs)
+
     @staticmethod
     def mangle_id(id):
         return '%04X' % (id + 37)
@@ -2025,6 +2087,18 @@ class Event(OwnedPRModel):
 
     def __unicode__(self):
         return unicode(self.title)
+
+    def save(self, *args, **kwargs):
+        super(Event, self).save(*args, **kwargs)
+        # keep the reminder due times of our Sessions in step with lead_time
+        changed = False
+        for session_id, start, reminder_due in self.sessions.values_list('id', 'start', 'reminder_due'):
+            new_due = Session.compute_reminder_due(start, self.lead_time)
+            if new_due != reminder_due:
+                Session.objects.filter(id=session_id).update(reminder_due=new_due)
+                changed = True
+        if changed:
+            read_cache.bump(Session)
     
     def get_status(self):
         """
@@ -2249,7 +2323,7 @@ class AuthToken(OwnedPRModel):
     renewal_timestamp = models.DateTimeField(null=True)
     number_of_renewals = models.PositiveIntegerField()
     #: The tokens may be renewed any number of times.
-    time_of_expiration = models.DateTimeField()
+    time_of_expiration = models.DateTimeField(db_index=True)
 
     #: The ip address gets corrected by the rpc.amf.PRGateway class
     ip = models.IPAddressField(default = '0.0.0.0')
@@ -2262,7 +2336,8 @@ class AuthToken(OwnedPRModel):
         return u'%s' % (self.session_id)
 
     def _get_user(self):
-        return self.domain_affiliation.user
+        return facade.subsystems.IdentityResolver().user_for_domain_affiliation(
+            self.domain_affiliation_id)
 
     user = property(_get_user)
 
@@ -2761,6 +2836,12 @@ class ProductClaim(OwnedPRModel):
         discounts.extend(self.product.product_discounts.filter(active=True))
         self._debug('found %d discounts' % (len(discounts)))
         ret = []
+        # evaluate every condition test collection for the owner at once
+        collection_ids = set(discount.condition_test_collection_id for discount in discounts
+            if discount.condition_test_collection_id is not None)
+        if collection_ids:
+            applicable_collection_ids = facade.subsystems.ConditionTestEngine().collections_for_user(
+                self.purchase_order.owner, collection_ids)
 
         for discount in discounts:
             self._debug('considering discount %s' % (discount.name))
@@ -2771,8 +2852,8 @@ class ProductClaim(OwnedPRModel):
                 else:
                     self._debug('promo code "%s" does not match' % (discount.promo_code))
                     continue
-            if isinstance(discount.condition_test_collection, ConditionTestCollection):
-                if discount.condition_test_collection.get_result(self.purchase_order.owner) is True:
+            if discount.condition_test_collection_id is not None:
+                if discount.condition_test_collection_id in applicable_collection_ids:
                     something_matched = True
                 else:
                     self._debug('condition test collection does not match')
@@ -2864,10 +2945,7 @@ class ConditionTestCollection(PRModel):
 
     def get_result(self, user):
         self._debug('get_result()')
-        for test in self.condition_tests.all().order_by('sequence'):
-            if test.applies_to_user(user):
-                return True
-        return False
+        return facade.subsystems.ConditionTestEngine().applies_to_user(self, user)
 
 class ConditionTest(PRModel):
     """
@@ -2890,74 +2968,11 @@ class ConditionTest(PRModel):
         """
         If one of the attributes is true (i.e. the user has a relationship with
         one of the related objects, or the current time is within a specified
-        temportal boundary), return True.
+        temportal boundary), return True.  If match_all_defined_parameters is
+        True, all of the defined attributes must be true.
         """
         self._debug('applies_to_user() called with user of id %d' % (user.id))
-        at_least_one_test_ran = False
-        if (self.groups.all().count()>0):
-            at_least_one_test_ran = True
-            if Group.objects.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                self._debug('group membership matches')
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if (self.organizations.all().count()>0):
-            at_least_one_test_ran = True
-            if Organization.object.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if (self.credentials.all().count()>0):
-            at_least_one_test_ran = True
-            if Credential.object.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if (self.events.all().count()>0):
-            at_least_one_test_ran = True
-            if Event.object.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if (self.sessions.all().count()>0):
-            at_least_one_test_ran = True
-            if Session.object.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if (self.session_user_role_requirements.all().count()>0):
-            at_least_one_test_ran = True
-            if SessionUserRoleRequirement.object.filter(users__id=user.id).filter(condition_tests__id=self.id).count()>0:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-
-        right_now = datetime.utcnow()
-        if isinstance(self.start, datetime):
-            at_least_one_test_ran = True
-            if self.start < right_now:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-        if isinstance(self.end, datetime):
-            at_least_one_test_ran = True
-            if self.end > right_now:
-                if not self.match_all_defined_parameters:
-                    return True
-            else:
-                return False
-
-        if not at_least_one_test_ran:
-            self._debug('no tests ran because no conditions are defined')
-
-        return (self.match_all_defined_parameters and at_least_one_test_ran)
+        return facade.subsystems.ConditionTestEngine().test_applies_to_user(self, user)
 
 
 class Course(OwnedPRModel):
@@ -3070,4 +3085,19 @@ class CustomAction(PRModel):
     function_name = models.CharField(max_length=127)
     blame = PRForeignKey(Blame, related_name='custom_actions')
 
+class SearchIndexEntry(models.Model):
+    """
+    One term of the full-text search index, maintained by the SearchIndex
+    subsystem.  There is at most one entry per object and term.
+    """
+
+    #: type of the indexed object, as configured in settings.SEARCH_INDEX_FIELDS
+    content_type = PRForeignKey(ContentType)
+    #: primary key of the indexed object
+    object_id = models.PositiveIntegerField(db_index=True)
+    #: a word from the indexed fields of the object, in lower case
+    term = models.CharField(max_length=64, db_index=True)
+    #: number of times the term occurs, each multiplied by the weight of its field
+    weight = models.PositiveIntegerField(default=1)
+
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -14,34 +14,65 @@ from __future__ import with_statement
 import cPickle
 import cStringIO
 from datetime import datetime, date, timedelta
-import hashlib
 import inspect
 import os
 import sys
 import time
 import urllib2
+import django.http
 import django.test.client
 from django.utils import simplejson as json
 import django.utils.dateformat
 from celery import conf
 
 from cookiecache import CookieCache
+from pr_services import cookiecache
 from django.conf import settings
 from django.core import mail
 from django.core.urlresolvers import reverse
+from django.db.models import Q
 from initial_setup import InitialSetupMachine, default_read_fields
 from pr_services import exceptions
+from pr_services import middleware
 from pr_services import pr_time
 from pr_services.utils import UnicodeCsvWriter
+from pr_services.utils import memcached, password_hashing, read_cache
 from pr_services.rpc.service import service_method, wrap_service_method, RpcService, create_rpc_service
 from pr_services.object_manager import ObjectManager
-from pr_services.gettersetter import Getter, Setter
 
 import facade
 
 # make stdout and stderr use UTF-8 encoding so that printing out
 # UTF-8 data while debugging doesn't choke
 
+class DictMemcacheClient(dict):
+    """Just enough of memcache.Client to test code that uses memcached."""
+
+    def set(self, key, value, time=0):
+        self[key] = value
+        return True
+
+    def add(self, key, value, time=0):
+        return self.setdefault(key, value) is value
+
+    def append(self, key, value):
+        if key in self:
+            self[key] += value
+            return True
+        return False
+
+    def delete(self, key):
+        self.pop(key, None)
+        return True
+
+    def get_multi(self, keys):
+        return dict((key, self[key]) for key in keys if key in self)
+
+    def delete_multi(self, keys):
+        for key in keys:
+            self.pop(key, None)
+        return True
+
 class TestCase(django.test.TestCase):
     """Super-class used to do basic setup for almost all power reg test cases.
 
@@ -52,6 +83,9 @@ class TestCase(django.test.TestCase):
     def setUp(self):
         # Save all configuration settings so they can be restored following the test.
         self._settings = dict((x, getattr(settings, x)) for x in dir(settings) if x == x.upper())
+        # The database is rolled back after each test, so cached reads are
+        # not valid in the next one.
+        read_cache.reset()
         initial_setup_args = getattr(self, 'initial_setup_args', [])
         initial_setup_kwargs = getattr(self, 'initial_setup_kwargs', {})
         InitialSetupMachine().initial_setup(*initial_setup_args, **initial_setup_kwargs)
@@ -210,6 +244,62 @@ class TestAuthorizer(TestCase):
         self.assertEquals(len(acl_dict['Beer']['u']), 0)
         self.assertTrue(acl_dict['Beer']['c'])
 
+    def test_read_access(self):
+        tu = TestUtils()
+        tu.setup_test_sessions()
+        student, student_at = self.create_student()
+        group = self.group_manager.create(self.admin_token, 'The group!')
+        self.group_manager.update(self.admin_token, group.id, {'users' : {'add' : [student.id]}})
+        authorizer = facade.subsystems.Authorizer()
+        # the database should agree with the checks run on each object
+        for model, fields in ((facade.models.Assignment, ['status', 'user', 'task']),
+                (facade.models.Event, ['name', 'owner', 'sessions']),
+                (facade.models.Group, ['name', 'managers', 'users']),
+                (facade.models.Session, ['name', 'status', 'event']),
+                (facade.models.SessionUserRoleRequirement, ['session', 'users']),
+                (facade.models.User, ['first_name', 'email', 'groups'])):
+            for auth_token in (self.admin_token, self.auth_token, student_at, None):
+                requested_fields = ['id'] + fields
+                access = authorizer.get_read_access(auth_token, model.objects.all(),
+                    requested_fields)
+                readable = {}
+                for actee in access.query_set:
+                    authorized_attributes = access.get_authorized_attributes(actee)
+                    if authorized_attributes:
+                        readable[actee.id] = sorted(authorized_attributes)
+                expected = {}
+                for actee in model.objects.all():
+                    authorized_attributes = authorizer.get_authorized_attributes(auth_token,
+                        actee, requested_fields, 'r')
+                    if authorized_attributes:
+                        expected[actee.id] = sorted(set(authorized_attributes))
+                self.assertEquals(readable, expected)
+        # a student's assignments are found without loading anybody else's
+        access = authorizer.get_read_access(student_at, facade.models.Assignment.objects.all(),
+            ['id', 'status'])
+        self.failUnless(facade.models.Assignment.objects.exclude(user__id=student.id).exists())
+        self.failIf(access.query_set.exclude(user__id=student.id).exists())
+
+    def test_permissions_for_set(self):
+        authorizer = facade.subsystems.Authorizer()
+        student, student_at = self.create_student()
+        groups = [self.group_manager.create(self.admin_token, name) for name in ('one', 'two')]
+        query_set = facade.models.Group.objects.filter(id__in=[g.id for g in groups])
+        for auth_token in (self.admin_token, student_at):
+            for set_check, check in ((authorizer.check_create_permissions_for_set,
+                    authorizer.check_create_permissions), (authorizer.check_delete_permissions_for_set,
+                    authorizer.check_delete_permissions)):
+                try:
+                    for group in groups:
+                        check(auth_token, group)
+                except exceptions.PermissionDeniedException:
+                    self.assertRaises(exceptions.PermissionDeniedException, set_check,
+                        auth_token, query_set)
+                else:
+                    set_check(auth_token, query_set)
+        # an empty set is always allowed
+        authorizer.check_delete_permissions_for_set(student_at, query_set.none())
+
 class TestAuthToken(TestCase):
     def test_user_related_name(self):
         da = facade.models.DomainAffiliation.objects.get(username='admin', domain__name='local')
@@ -276,6 +366,38 @@ class TestCookiecache(TestCase):
         # Clean up
         mc.delete()
     
+    def test_write_behind(self):
+        settings.COOKIECACHE_WRITE_BEHIND = True
+        servers = tuple(settings.MEMCACHED_ADDRS)
+        original_client = memcached._clients.get(servers)
+        client = memcached._clients[servers] = DictMemcacheClient()
+        key = str(self.auth_token.session_id)
+        try:
+            mc = CookieCache(self.auth_token)
+            mc.paths.append('/path1')
+            mc.save()
+            self.assertFalse(facade.models.CachedCookie.objects.filter(key=key).exists())
+            # the view is served from memcached alone
+            with self.assertNumQueries(0):
+                response = self.client.get('/cookiecache/%s/' % key)
+            self.assertTrue('paths=/path1' in response.content)
+            self.assertEquals(cookiecache.persist_cached_cookies([key]), 1)
+            self.assertEquals(facade.models.CachedCookie.objects.get(key=key).value, client[key])
+            mc.paths.append('/path2')
+            mc.save()
+            self.assertEquals(cookiecache.persist_cached_cookies([key]), 1)
+            self.assertEquals(facade.models.CachedCookie.objects.get(key=key).value, client[key])
+            # the database is used when memcached loses the entry
+            del client[key]
+            self.assertEquals(sorted(CookieCache(self.auth_token).paths), ['/path1', '/path2'])
+            mc.delete()
+            self.assertFalse(facade.models.CachedCookie.objects.filter(key=key).exists())
+        finally:
+            if original_client is None:
+                del memcached._clients[servers]
+            else:
+                memcached._clients[servers] = original_client
+
     def test_cookiecache_view(self):
         facade.models.CachedCookie.objects.create(key='foo', value='line 1\r\nline 2\r\n')
         response = self.client.get('/cookiecache/foo/')
@@ -302,6 +424,55 @@ class TestTask(TestCase):
         exam3 = facade.models.Exam.objects.create(name='my_exam')
         self.assertEqual(exam3.name, 'my_exam')
 
+    def test_prerequisite_graph(self):
+        task1 = facade.models.Task.objects.create(title='Task 1')
+        task2 = facade.models.Task.objects.create(title='Task 2')
+        task3 = facade.models.Task.objects.create(title='Task 3')
+        task3.prerequisite_tasks.add(task1, task2)
+        graph = facade.subsystems.PrerequisiteGraph()
+        task_ids = [task1.id, task2.id, task3.id]
+        self.assertEquals(graph.unlocked_task_ids(self.user1, task_ids),
+            set([task1.id, task2.id]))
+        self.assertFalse(task3.prerequisites_met(self.user1))
+        facade.models.Assignment.objects.create(task=task1, user=self.user1,
+            status='completed')
+        assignment = facade.models.Assignment.objects.create(task=task2,
+            user=self.user1)
+        self.assertFalse(task3.prerequisites_met(self.user1))
+        assignment.status = 'completed'
+        assignment.save()
+        self.assertTrue(task3.prerequisites_met(self.user1))
+        # outside of a request each graph keeps its own cache
+        graph = facade.subsystems.PrerequisiteGraph()
+        self.assertEquals(graph.unlocked_task_ids(self.user1.id, task_ids),
+            set(task_ids))
+        # the same, for every task in the database at once
+        self.assertEquals(set(facade.models.Task.objects.filter(id__in=task_ids).filter(
+            graph.unlocked_query(self.user1)).values_list('id', flat=True)), set(task_ids))
+        self.assertEquals(set(facade.models.Task.objects.filter(id__in=task_ids).filter(
+            graph.unlocked_query(self.user2)).values_list('id', flat=True)),
+            set([task1.id, task2.id]))
+        # and for a list of assignments
+        assignment3 = facade.models.Assignment.objects.create(task=task3, user=self.user1)
+        assignment4 = facade.models.Assignment.objects.create(task=task3, user=self.user2)
+        results = self.assignment_manager.get_filtered(self.admin_token,
+            {'member' : {'id' : [assignment3.id, assignment4.id]}}, ['prerequisites_met'])
+        self.assertEquals(dict((r['id'], r['prerequisites_met']) for r in results),
+            {assignment3.id : True, assignment4.id : False})
+
+        # within a request, edges are cached until prerequisites change
+        middleware._thread_locals.request = django.http.HttpRequest()
+        try:
+            self.assertTrue(task3.prerequisites_met(self.user1))
+            task4 = facade.models.Task.objects.create(title='Task 4')
+            task3.prerequisite_tasks.add(task4)
+            self.assertFalse(task3.prerequisites_met(self.user1))
+            self.task_manager.update(self.admin_token, task3.id,
+                {'prerequisite_tasks' : {'remove' : [task4.id]}})
+            self.assertTrue(task3.prerequisites_met(self.user1))
+        finally:
+            del middleware._thread_locals.request
+
 
 class TestAssignment(TestCase):
     def test_create_multiple_types(self):
@@ -842,6 +1013,25 @@ class TestGroupManager(TestCase):
         self.assertEquals(len(cool_group_dict['users']), 1)
         self.assertEquals(cool_group_dict['users'][0], sweep_it_up.id)
 
+    def test_add_and_remove_users(self):
+        cool_group = self.group_manager.create(self.admin_token, 'cool_group')
+        users = [self.user_manager.create(self.admin_token, 'user_%d' % i, 'password',
+            '', '', '', '', '', 'active') for i in range(4)]
+        self.group_manager.update(self.admin_token, cool_group.id,
+            {'users' : {'add' : [u.id for u in users[:3]]}})
+        # members already present are left alone, and a member both added
+        # and removed ends up removed
+        self.group_manager.update(self.admin_token, cool_group.id,
+            {'users' : {'add' : [users[0].id, users[3].id, users[1].id],
+                        'remove' : [users[1].id, users[2].id]}})
+        group = self.group_manager.get_filtered(self.admin_token,
+            {'exact' : {'id' : cool_group.id}}, ['users'])[0]
+        self.assertEquals(sorted(group['users']), [users[0].id, users[3].id])
+        self.assertEquals(facade.models.User.groups.through.objects.filter(
+            group__id=cool_group.id).count(), 2)
+        self.assertRaises(exceptions.ObjectNotFoundException, self.group_manager.update,
+            self.admin_token, cool_group.id, {'users' : {'add' : [users[1].id, 999999]}})
+
 class TestLogging(TestCase):
     def test_log(self):
         self.log_manager.critical(self.admin_token, 'this is a critical test')
@@ -1032,6 +1222,32 @@ class TestProductManager(TestCase):
         self.assertTrue('total_price' in ret2[0])
         self.assertEquals(ret2[0]['total_price'], (500 * 2))
 
+    def test_condition_test_engine(self):
+        admin = self.admin_token.user
+        ctc1 = self.condition_test_collection_manager.create(self.admin_token, 'test CTC 1')
+        ctc2 = self.condition_test_collection_manager.create(self.admin_token, 'test CTC 2')
+        ctc3 = self.condition_test_collection_manager.create(self.admin_token, 'test CTC 3')
+        # any of the groups, or a start date in the past
+        self.condition_test_manager.create(self.admin_token, 10, ctc1.id, False,
+            {'groups' : {'add' : [self.group1.id, self.group2.id]}})
+        self.condition_test_manager.create(self.admin_token, 20, ctc2.id, False,
+            {'groups' : {'add' : [self.group2.id]}, 'start' : '2000-01-01T00:00:00Z'})
+        # all of the defined parameters
+        ct3 = self.condition_test_manager.create(self.admin_token, 10, ctc3.id, True,
+            {'groups' : {'add' : [self.group1.id]}})
+        ct3.organizations.add(self.organization1)
+        engine = facade.subsystems.ConditionTestEngine()
+        self.assertEquals(engine.users(ctc1, [admin.id, self.user1.id]), set([admin.id]))
+        self.assertEquals(engine.users(ctc2, [admin.id, self.user1.id]), set([admin.id, self.user1.id]))
+        self.assertEquals(engine.users(ctc3), set())
+        self.assertEquals(engine.collections_for_user(admin, [ctc1, ctc2, ctc3]),
+            set([ctc1.id, ctc2.id]))
+        self.assertEquals(engine.collections_for_user(self.user1, [ctc1, ctc2, ctc3]),
+            set([ctc2.id]))
+        self.assertTrue(ctc1.get_result(admin))
+        self.assertFalse(ctc1.get_result(self.user1))
+        self.assertTrue(ctc1.condition_tests.all()[0].applies_to_user(admin))
+
     def test_inventory(self):
         self.p1.starting_quantity = 10
         self.p1.save()
@@ -1253,6 +1469,74 @@ class TestEventTemplateManager(TestCase):
         self.assertTrue(e[0]['id'] in et[0]['events'])
         self.assertEquals(e[0]['name'], '%s%d' % (event_template.name_prefix, event.id))
 
+class TestSearchManager(TestCase):
+    def setUp(self):
+        super(TestSearchManager, self).setUp()
+        self.search_manager = facade.managers.SearchManager()
+
+    def test_search(self):
+        task1 = facade.models.Task.objects.create(name='welding_basics',
+            title='Welding Basics', description='An introduction to welding')
+        task2 = facade.models.Task.objects.create(name='advanced_course',
+            title='Advanced Course', description='More welding, welding and welding')
+        task3 = facade.models.Task.objects.create(name='soldering',
+            title='Soldering', description='Not the same as Welding')
+        ret = self.search_manager.search(self.admin_token, 'WELDING', ['Task'])
+        self.assertEquals(ret['total'], 3)
+        # the title counts three times as much as the description
+        self.assertEquals([(r['type'], r['id'], r['score']) for r in ret['results']],
+            [('Task', task1.id, 7), ('Task', task2.id, 3), ('Task', task3.id, 1)])
+        ret = self.search_manager.search(self.admin_token, 'welding', ['Task'], 1, 1)
+        self.assertEquals(ret['total'], 3)
+        self.assertEquals([r['id'] for r in ret['results']], [task2.id])
+        # every word has to match
+        ret = self.search_manager.search(self.admin_token, 'welding introduction', ['Task'])
+        self.assertEquals([r['id'] for r in ret['results']], [task1.id])
+        self.assertEquals(self.search_manager.search(self.admin_token, 'a', ['Task']),
+            {'total': 0, 'results': []})
+
+        # the index follows changes and deletions
+        task1.name = 'brazing'
+        task1.title = 'Brazing'
+        task1.description = 'Brazing for beginners'
+        task1.save()
+        ret = self.search_manager.search(self.admin_token, 'welding', ['Task'])
+        self.assertEquals([r['id'] for r in ret['results']], [task2.id, task3.id])
+        task2.delete()
+        ret = self.search_manager.search(self.admin_token, 'welding', ['Task'])
+        self.assertEquals([r['id'] for r in ret['results']], [task3.id])
+        self.assertEquals(facade.models.SearchIndexEntry.objects.filter(
+            object_id=task2.id, content_type__model='task').count(), 0)
+
+        # only the entries of changed terms are rewritten
+        entries = facade.models.SearchIndexEntry.objects.filter(object_id=task3.id,
+            content_type__model='task')
+        entry_ids = dict(entries.values_list('term', 'id'))
+        with self.assertNumQueries(1):
+            facade.subsystems.SearchIndex().index(task3)
+        task3.description = 'Welding, not soldering'
+        task3.save()
+        self.assertEquals(sorted(entries.values_list('term', 'weight')),
+            [('not', 1), ('soldering', 7), ('welding', 1)])
+        self.assertEquals(entries.get(term='soldering').id, entry_ids['soldering'])
+        self.assertEquals(entries.get(term='welding').id, entry_ids['welding'])
+
+        # rebuilding gives the same index
+        before = set(facade.models.SearchIndexEntry.objects.values_list(
+            'content_type', 'object_id', 'term', 'weight'))
+        facade.subsystems.SearchIndex().rebuild()
+        self.assertEquals(set(facade.models.SearchIndexEntry.objects.values_list(
+            'content_type', 'object_id', 'term', 'weight')), before)
+
+    def test_search_authorization(self):
+        ret = self.search_manager.search(self.admin_token, 'primo uomo', ['User'])
+        self.assertEquals([r['id'] for r in ret['results']], [self.user1.id])
+        # users may not read each other's names
+        ret = self.search_manager.search(self.auth_token2, 'primo uomo', ['User'])
+        self.assertEquals(ret, {'total': 0, 'results': []})
+        ret = self.search_manager.search(self.auth_token, 'primo uomo', ['User'])
+        self.assertEquals([r['id'] for r in ret['results']], [self.user1.id])
+
 class TestSessionManager(TestCase):
     def setUp(self):
         TestCase.setUp(self)
@@ -1481,6 +1765,113 @@ class TestSessionManager(TestCase):
         session3 = facade.models.Session.objects.get(name=tu.s3.name)
         self.failUnless(session2 in sessions)
         self.failUnless(session3 in sessions)
+
+    def test_process_session_reminders(self):
+        tu = TestUtils()
+        tu.setup_test_sessions()
+        invitees = self.session_manager._get_invitees(
+            self.session_manager._get_sessions_needing_reminders())
+        self.assertEquals(sorted(invitees.keys()), sorted([tu.s2.id, tu.s3.id]))
+        self.assertEquals(sorted(u.first_name for u in invitees[tu.s2.id]),
+            ['Jon', 'Luella', 'Sally'])
+        self.assertEquals(sorted(u.first_name for u in invitees[tu.s3.id]),
+            ['David', 'Luella', 'Sally'])
+
+        self.assertEquals(self.session_manager._process_session_reminders(), 2)
+        # a second run finds nothing left to claim
+        self.assertEquals(self.session_manager._process_session_reminders(), 0)
+        self.assertEquals(len(self.session_manager._get_sessions_needing_reminders()), 0)
+        session2 = facade.models.Session.objects.get(id=tu.s2.id)
+        session3 = facade.models.Session.objects.get(id=tu.s3.id)
+        self.failUnless(session2.sent_reminders)
+        self.failUnless(session2.reminder_key)
+        self.assertEquals(session2.reminder_key, session3.reminder_key)
+
+    def test_process_completed_sessions(self):
+        start = self.right_now + self.one_day
+        end = start + timedelta(hours=2)
+        event = self.event_manager.create(self.admin_token, 'Event 1', 'Event 1', 'Event 1',
+            start.isoformat(), end.isoformat(), self.organization1.id,
+            self.product_line1.id, {'lag_time' : 3600})
+        finished = self.session_manager.create(self.admin_token, start.isoformat(),
+            end.isoformat(), 'active', True, 100, event.id)
+        # this one will have ended too, but its lag time won't have passed
+        lagging_event = self.event_manager.create(self.admin_token, 'Event 2', 'Event 2', 'Event 2',
+            start.isoformat(), end.isoformat(), self.organization1.id,
+            self.product_line1.id, {'lag_time' : 86400})
+        lagging = self.session_manager.create(self.admin_token, start.isoformat(),
+            end.isoformat(), 'active', True, 100, lagging_event.id)
+        later = (end + timedelta(hours=2)).replace(tzinfo=None)
+
+        achievement = self.achievement_manager.create(self.admin_token, 'Attended', 'Attended a session')
+        credential_type = self.credential_type_manager.create(self.admin_token, 'Attendee', 'Attendee')
+        self.credential_type_manager.update(self.admin_token, credential_type.id,
+            {'required_achievements': [achievement.id]})
+        student_role = facade.models.SessionUserRole.objects.get(name__exact='Student')
+        surrs = []
+        for session in (finished, lagging):
+            surr = self.session_user_role_requirement_manager.create(self.admin_token,
+                str(session.id), str(student_role.id), 1, 30, False)
+            facade.models.SessionUserRoleRequirement.objects.get(id=surr.id).achievements.add(achievement)
+            surrs.append(surr)
+        learner1, learner1_at = self.create_student(first_name='Learner1')
+        learner2, learner2_at = self.create_student(first_name='Learner2')
+        learner3, learner3_at = self.create_student(first_name='Learner3')
+        learner4, learner4_at = self.create_student(first_name='Learner4')
+        pending = self.credential_manager.create(self.admin_token, learner2.id, credential_type.id)
+        for surr in surrs:
+            self.assignment_manager.bulk_create(self.admin_token, surr.id,
+                [learner1.id, learner2.id, learner3.id, learner4.id])
+        # attendance is recorded for everyone but learner4
+        for assignment in facade.models.Assignment.objects.filter(task__id__in=[s.id for s in surrs],
+                user__id__in=[learner1.id, learner2.id, learner3.id]):
+            facade.models.AssignmentAttempt.objects.create(assignment=assignment, date_started=start)
+        withdrawn = facade.models.Assignment.objects.get(task__id=surrs[0].id, user__id=learner3.id)
+        withdrawn.status = 'withdrawn'
+        withdrawn.save()
+
+        settings.SESSION_COMPLETION_COMPLETES_ATTENDEES = True
+        self.assertEquals(facade.subsystems.SessionCompleter().finished_session_ids(), [])
+        completer = facade.subsystems.SessionCompleter(later)
+        self.assertEquals(completer.finished_session_ids(), [finished.id])
+        self.assertEquals(completer.complete(), (1, 2))
+        self.assertEquals(facade.models.Session.objects.get(id=finished.id).status, 'completed')
+        self.assertEquals(facade.models.Session.objects.get(id=lagging.id).status, 'active')
+        statuses = dict(facade.models.Assignment.objects.filter(
+            task__id=surrs[0].id).values_list('user', 'status'))
+        # the absent learner4 is not completed
+        self.assertEquals(statuses, {learner1.id: 'completed',
+            learner2.id: 'completed', learner3.id: 'withdrawn', learner4.id: 'assigned'})
+        self.failIf(facade.models.Assignment.objects.filter(task__id=surrs[1].id,
+            status='completed').exists())
+        self.assertEquals(facade.models.AchievementAward.objects.filter(
+            achievement__id=achievement.id).count(), 2)
+        # learner2's pending credential is granted, learner1 gets a new one
+        self.assertEquals(facade.models.Credential.objects.get(id=pending.id).status, 'granted')
+        self.assertEquals(list(facade.models.Credential.objects.filter(user__id=learner1.id,
+            credential_type__id=credential_type.id).values_list('status', flat=True)), ['granted'])
+        self.failIf(facade.models.Credential.objects.filter(user__id=learner3.id).exists())
+        self.failIf(facade.models.Credential.objects.filter(user__id=learner4.id).exists())
+        # nothing is left to do on a second run
+        self.assertEquals(facade.subsystems.SessionCompleter(later).complete(), (0, 0))
+        # by default, only the Session is completed
+        settings.SESSION_COMPLETION_COMPLETES_ATTENDEES = False
+        much_later = later + timedelta(days=1)
+        self.assertEquals(facade.subsystems.SessionCompleter(much_later).complete(), (1, 0))
+        self.assertEquals(facade.models.Session.objects.get(id=lagging.id).status, 'completed')
+        self.failIf(facade.models.Assignment.objects.filter(task__id=surrs[1].id,
+            status='completed').exists())
+
+    def test_reminder_due_follows_lead_time(self):
+        tu = TestUtils()
+        tu.setup_test_sessions()
+        session = facade.models.Session.objects.get(id=tu.s3.id)
+        self.failUnless(session in self.session_manager._get_sessions_needing_reminders())
+        self.event_manager.update(self.admin_token, session.event.id, {'lead_time' : 3600})
+        session = facade.models.Session.objects.get(id=tu.s3.id)
+        self.assertEquals(session.reminder_due,
+            datetime.fromordinal(session.start.toordinal()) - timedelta(seconds=3600))
+        self.failIf(session in self.session_manager._get_sessions_needing_reminders())
         
     def test_enrollment_auth_by_venue(self):
         # Create a proctor role with a user
@@ -1534,6 +1925,82 @@ class TestSessionManager(TestCase):
         ret = self.user_manager.get_filtered(self.admin_token, {'exact' : {'id' : learner1.id}}, ['id', 'session_user_role_requirements'])
         self.assertRaises(exceptions.PermissionDeniedException, self.assignment_manager.update, proctor_token, assignment_ret[learner1.id]['id'], {'status' : 'canceled'})
 
+    def test_get_sessions_by_user_role(self):
+        student_role = facade.models.SessionUserRole.objects.get(name__exact='Student')
+        instructor_role = facade.models.SessionUserRole.objects.get(name__exact='Instructor')
+        # event owners may see the student role requirements of their events
+        acl = {
+            'SessionUserRoleRequirement' : {
+                'c' : False,
+                'r' : ['id', 'session'],
+                'u' : [],
+                'd' : False,
+            },
+        }
+        event_owner_role = facade.models.Role.objects.create(name='Event Owner')
+        event_owner_acl = facade.models.ACL.objects.create(acl=cPickle.dumps(acl), role=event_owner_role)
+        for name, parameters in (('actor_owns_session_user_role_requirement', {}),
+                ('surr_is_of_a_particular_sur', {'session_user_role_id' : student_role.id})):
+            facade.models.ACMethodCall.objects.create(acl=event_owner_acl,
+                ac_check_method=facade.models.ACCheckMethod.objects.get(name=name),
+                ac_check_parameters=cPickle.dumps(parameters))
+        facade.subsystems.Authorizer._load_acls()
+
+        owner, owner_at = self.create_student(first_name='Owner')
+        learner, learner_at = self.create_student(first_name='Learner')
+        start = self.right_now + self.one_day
+        end = start + self.one_day
+        surrs = []
+        for name in ('Event 1', 'Event 2'):
+            event = self.event_manager.create(self.admin_token, name, name, name,
+                start.isoformat(), end.isoformat(), self.organization1.id,
+                self.product_line1.id)
+            session = self.session_manager.create(self.admin_token, start.isoformat(),
+                end.isoformat(), 'active', True, 100, event.id)
+            for role in (student_role, instructor_role):
+                surr = self.session_user_role_requirement_manager.create(self.admin_token,
+                    str(session.id), str(role.id), 1, 30, False)
+                self.assignment_manager.bulk_create(self.admin_token, surr.id, [learner.id])
+                surrs.append(surr)
+            if name == 'Event 1':
+                event = facade.models.Event.objects.get(id=event.id)
+                event.owner = owner
+                event.save()
+
+        self.assertEquals(sorted(self.session_manager.get_sessions_by_user_role(
+            self.admin_token, learner.id, student_role.id)),
+            sorted([str(surrs[0].id), str(surrs[2].id)]))
+        # every authenticated user may read their ids
+        for auth_token in (self.admin_token, owner_at):
+            self.assertEquals(sorted(self.session_manager.get_sessions_by_user_role(
+                auth_token, learner.id, student_role.id)),
+                sorted([str(surrs[0].id), str(surrs[2].id)]))
+        self.assertEquals(self.session_manager.get_sessions_by_user_role(
+            '', learner.id, student_role.id), [])
+
+        authorizer = facade.subsystems.Authorizer()
+        learner_surrs = facade.models.SessionUserRoleRequirement.objects.filter(
+            users__id__exact=learner.id)
+        readable = authorizer.filter_readable(owner_at, learner_surrs, ['session'])
+        self.assertEquals(list(readable.values_list('id', flat=True)), [surrs[0].id])
+        readable = authorizer.filter_readable(learner_at, learner_surrs, ['session'])
+        self.assertEquals(list(readable.values_list('id', flat=True)), [])
+        readable = authorizer.filter_readable(self.admin_token, learner_surrs, ['session'])
+        self.assertEquals(sorted(readable.values_list('id', flat=True)),
+            sorted(surr.id for surr in surrs))
+
+        # the prerequisite check is compiled into the query too
+        facade.models.ACMethodCall.objects.create(acl=event_owner_acl,
+            ac_check_method=facade.models.ACCheckMethod.objects.get(
+            name='actor_has_completed_task_prerequisites'))
+        facade.subsystems.Authorizer._load_acls()
+        authorizer = facade.subsystems.Authorizer()
+        readable = authorizer.filter_readable(owner_at, learner_surrs, ['session'])
+        self.assertEquals(list(readable.values_list('id', flat=True)), [surrs[0].id])
+        surrs[0].prerequisite_tasks.add(surrs[1])
+        readable = authorizer.filter_readable(owner_at, learner_surrs, ['session'])
+        self.assertEquals(list(readable.values_list('id', flat=True)), [])
+
     def test_session_inherits_session_template(self):
         the_session_template = self.session_template_manager.create(self.admin_token, 'XYZ', 'Ex, Why, Zeee!', '1.0', 'Alphabet nonsense', 100, 1,
             True, 'Generic')
@@ -2037,6 +2504,14 @@ class TestUserManager(TestCase):
             'region' : 'CA', 'locality' : 'Los Angeles', 'postal_code' : '63485'}})
         ret = self.user_manager.get_filtered(the_dudes_auth_token, {'exact' : {'id' : the_dude.id}}, ['shipping_address', 'id'])[0]
         self.assertEquals(ret['shipping_address']['label'], '4379 Mind If I Do A J Dr.')
+        address_id = facade.models.User.objects.get(id=the_dude.id).shipping_address_id
+        # the address is rewritten in place, and attributes left out are reset
+        self.user_manager.update(the_dudes_auth_token, the_dude.id, {'shipping_address' : {'country' : 'US',
+            'label' : '606 Venice Blvd.', 'locality' : 'Venice'}})
+        self.assertEquals(facade.models.User.objects.get(id=the_dude.id).shipping_address_id, address_id)
+        ret = self.user_manager.get_filtered(the_dudes_auth_token, {'exact' : {'id' : the_dude.id}}, ['shipping_address'])[0]
+        self.assertEquals(ret['shipping_address']['label'], '606 Venice Blvd.')
+        self.assertEquals(ret['shipping_address']['region'], '')
 
     def test_authenticate_bad_password(self):
         self.user_manager.create(self.admin_token, 'username2', 'initial_password', 'Mr.', 'first_name', 'last_name',
@@ -2074,6 +2549,49 @@ class TestUserManager(TestCase):
         user_made = facade.models.User.objects.filter(id = res.keys()[0])[0]
         self.assertEquals(user_made.blame.user, self.admin_token.user)
 
+    def test_bulk_create(self):
+        accounts = []
+        for i in range(10):
+            accounts.append({'username' : 'bulk_%d' % i, 'initial_password' : 'rock', 'title' : 'Mr.',
+                'first_name' : 'Bulk', 'last_name' : str(i), 'phone' : '123-455-6789',
+                'email' : 'bulk%d@boot.com' % i, 'status' : 'active',
+                'optional_attributes' : {'middle_name' : 'M'}})
+        res = self.user_manager.bulk_create(self.admin_token, accounts)
+        self.assertEquals(len(res), 10)
+        users = facade.models.User.objects.filter(id__in=res.keys())
+        self.assertEquals(len(set(user.blame_id for user in users)), 1)
+        for user in users:
+            self.assertEquals(user.owner_id, user.id)
+            self.assertEquals(user.middle_name, 'M')
+            self.assertEquals(user.username, 'local:%s' % res[user.id])
+        # the new users can log in
+        self.user_manager.login('bulk_3', 'rock')
+
+        # nothing is created if any account is invalid
+        number_of_users = facade.models.User.objects.count()
+        accounts = [dict(accounts[0], username='bulk_new'), dict(accounts[1]),
+            dict(accounts[2], username='bulk_new')]
+        try:
+            self.user_manager.bulk_create(self.admin_token, accounts, True)
+            self.fail('expected an ImportException')
+        except exceptions.ImportException, e:
+            self.assertEquals(sorted(e.details['messages'].keys()), [0, 1, 2])
+            self.assertTrue('email' in e.details['messages'][0])
+            self.assertTrue('username' in e.details['messages'][1])
+            self.assertTrue('username' in e.details['messages'][2])
+        self.assertEquals(facade.models.User.objects.count(), number_of_users)
+
+        # email addresses are unique regardless of case
+        facade.models.User.objects.filter(email='bulk4@boot.com').update(email='Bulk4@Boot.com')
+        try:
+            self.user_manager.bulk_create(self.admin_token,
+                [dict(accounts[0], username='bulk_upper', email='BULK4@boot.com')], True)
+            self.fail('expected an ImportException')
+        except exceptions.ImportException, e:
+            self.assertEquals(e.details['messages'].keys(), [0])
+            self.assertTrue('email' in e.details['messages'][0])
+        self.assertEquals(facade.models.User.objects.count(), number_of_users)
+
     def test_change_password(self):
         user = self.user_manager.create(self.admin_token, 'ringo', 'password1', 'Mr.', 'Ringo', 'Starr', '124.235.3456',
                             'ringo@starr.com', 'active')
@@ -2082,10 +2600,10 @@ class TestUserManager(TestCase):
                             'password2', 'password3')
         self.user_manager.change_password(auth_token, user.id, 'password2', 'password1')
         da = facade.models.DomainAffiliation.objects.get(username='ringo', domain__name='local')
-        self.assertEquals(facade.subsystems.Utils._hash('password2' + da.password_salt, 'SHA-512'), da.password_hash)
+        self.assertTrue(password_hashing.verify_password('password2', da.password_salt, da.password_hash_type, da.password_hash))
         self.user_manager.change_password('', user.id, 'password3', 'password2')
         da = facade.models.DomainAffiliation.objects.get(id=da.id)
-        self.assertEquals(facade.subsystems.Utils._hash('password3' + da.password_salt, 'SHA-512'), da.password_hash)
+        self.assertTrue(password_hashing.verify_password('password3', da.password_salt, da.password_hash_type, da.password_hash))
 
         # Make sure we raise an exception if the user is set for foreign authentication
         da.domain = facade.models.Domain.objects.get(name='LDAP')
@@ -2109,13 +2627,12 @@ class TestUserManager(TestCase):
         self.assertEquals(new_user.phone, '555.555.5555')
         self.assertEquals(new_user.email, 'foo@bar.org')
         self.assertEquals(new_user.status, 'pending')
-        self.assertEquals(da.password_hash_type, 'SHA-512')
+        self.assertEquals(da.password_hash_type, settings.PASSWORD_HASH_TYPE)
         self.assertEquals(new_user.blame.user, new_user)
         self.assertEquals(new_user.url, 'http://somejunkyandfakeurlthatshouldnotbreakpowerreg.net/')
         self.assertEquals(new_user.alleged_organization, 'Moustache Club of America')
-        s = hashlib.sha512()
-        s.update('initial_password'+da.password_salt)
-        self.assertEquals(da.password_hash, s.hexdigest())
+        self.assertEquals(da.password_hash, password_hashing.get_hasher().encode(
+            'initial_password', da.password_salt))
         optionalEmailUser = self.user_manager.create(self.admin_token, 'ringo', 'myBrain', 'Mr.', 'Ringo', 'Starr',
                            '123.456.7890', 'ringo@starr.com', 'active', 
                            {'email2' : 'ringo2@starr.com'})
@@ -2320,11 +2837,37 @@ class TestUserManager(TestCase):
         self.user_manager.login('username', 'initial_password')
         self.assertRaises(exceptions.AuthenticationFailureException, self.user_manager.login, 'username2', 'wrong_password')
         da = facade.models.DomainAffiliation.objects.get(user__id=ret.id, domain__name='local')
-        new_hash = hashlib.sha512()
         self.assertEquals(len(da.password_salt), 8) # Make sure the user now has a password salt
-        new_hash.update('initial_password' + da.password_salt)
-        self.assertEquals(da.password_hash_type, 'SHA-512') # Make sure the new user's hash type is now SHA-512
-        self.assertEquals(da.password_hash, new_hash.hexdigest())
+        # Make sure the user's hash type is now the configured one
+        self.assertEquals(da.password_hash_type, settings.PASSWORD_HASH_TYPE)
+        self.assertEquals(da.password_hash, password_hashing.get_hasher().encode(
+            'initial_password', da.password_salt))
+
+    def test_rehash_password_with_new_cost(self):
+        settings.PASSWORD_HASH_TYPE = 'PBKDF2'
+        settings.PASSWORD_HASH_COSTS = {'PBKDF2' : 1000}
+        self.user_manager.create(self.admin_token, 'username2', 'initial_password', 'Mr.',
+            'first_name', 'last_name', '555.555.5555', 'foo@bar.org', 'active')
+        da = facade.models.DomainAffiliation.objects.get(username='username2', domain__name='local')
+        self.assertEquals(da.password_hash_type, 'PBKDF2')
+        self.assertTrue(da.password_hash.startswith('1000$'))
+        # logging in with the same cost leaves the hash alone
+        self.user_manager.login('username2', 'initial_password')
+        self.assertEquals(facade.models.DomainAffiliation.objects.get(id=da.id).password_hash,
+            da.password_hash)
+        # raising the cost rehashes on the next successful login only
+        settings.PASSWORD_HASH_COSTS = {'PBKDF2' : 2000}
+        self.assertRaises(exceptions.AuthenticationFailureException, self.user_manager.login,
+            'username2', 'wrong_password')
+        self.assertEquals(facade.models.DomainAffiliation.objects.get(id=da.id).password_hash,
+            da.password_hash)
+        self.user_manager.login('username2', 'initial_password')
+        da = facade.models.DomainAffiliation.objects.get(id=da.id)
+        self.assertTrue(da.password_hash.startswith('2000$'))
+        self.assertTrue(password_hashing.verify_password('initial_password', da.password_salt,
+            da.password_hash_type, da.password_hash))
+        self.assertFalse(password_hashing.verify_password('wrong_password', da.password_salt,
+            da.password_hash_type, da.password_hash))
 
     def test_instructor_can_read_student(self):
         """
@@ -2747,6 +3290,99 @@ class TestUserManager(TestCase):
         self.assertEquals(ret['email'], 'ufakegroup@mcg.edu')
         self.assertEquals(len(ret['groups']), 0)
 
+    def test_sliding_auth_token_expiration(self):
+        settings.AUTH_TOKEN_SLIDING_EXPIRATION = True
+        settings.AUTH_TOKEN_EXPIRATION_INTERVAL = 60
+        settings.AUTH_TOKEN_ACTIVITY_FLUSH_INTERVAL = 60
+        lifetime = timedelta(minutes=60)
+        session_id = self.user_manager.login('username', 'initial_password')['auth_token']
+        issued = facade.models.AuthToken.objects.get(session_id=session_id).time_of_expiration
+        later = issued + timedelta(minutes=10)
+        Utils = facade.subsystems.Utils
+
+        # without memcached, the new expiration is written right away
+        activity = facade.subsystems.AuthTokenActivity(DictMemcacheClient())
+        activity.client.set = lambda key, value, time=0: False
+        activity.record(Utils.get_auth_token_object(session_id, issued), later)
+        self.assertEquals(facade.models.AuthToken.objects.get(
+            session_id=session_id).time_of_expiration, later + lifetime)
+
+        # with memcached, it is written when the flush period is over
+        activity = facade.subsystems.AuthTokenActivity(DictMemcacheClient())
+        even_later = later + timedelta(minutes=30)
+        activity.record(facade.models.AuthToken.objects.get(session_id=session_id), even_later)
+        self.assertEquals(facade.models.AuthToken.objects.get(
+            session_id=session_id).time_of_expiration, later + lifetime)
+        self.assertEquals(activity.expiration(session_id), even_later + lifetime)
+        # within the granularity, the pending expiration isn't extended again
+        token = facade.models.AuthToken.objects.get(session_id=session_id)
+        activity.record(token, even_later + timedelta(seconds=30))
+        self.assertEquals(token.time_of_expiration, even_later + lifetime)
+        self.assertEquals(activity.expiration(session_id), even_later + lifetime)
+        self.assertEquals(activity.flush(even_later), 0)
+        self.assertEquals(activity.flush(even_later + timedelta(minutes=1)), 1)
+        self.assertEquals(facade.models.AuthToken.objects.get(
+            session_id=session_id).time_of_expiration, even_later + lifetime)
+
+        # tokens are removed once they expire
+        activity.remove_expired(even_later + lifetime)
+        self.assertTrue(facade.models.AuthToken.objects.filter(session_id=session_id).exists())
+        activity.remove_expired(even_later + lifetime + timedelta(minutes=5))
+        self.assertFalse(facade.models.AuthToken.objects.filter(session_id=session_id).exists())
+
+    def test_ldap_connection_pool(self):
+        from pr_services.user_system import ldap_pool
+        from pr_services.user_system.fake_ldap import FakeLDAPServer
+
+        settings.LDAP_URL = 'ldap://fake'
+        settings.LDAP_BASE = 'o=Test'
+        settings.LDAP_AUTHENTICATION = True
+        settings.LDAP_CREATE_ON_LOGIN = True
+        settings.LDAP_SEARCH_BIND_DN = 'cn=Anonymous'
+        settings.RECAPTCHA_TEST_MODE = True
+        settings.AUTHENTICATION_FAILURE_DELAY = 0
+        settings.LDAP_SCHEMA = {'User' : {'ldap_object_class' : 'person', 'local_attributes' : {
+            'first_name' : {'query_type' : 'simple', 'ldap_name' : 'givenName'},
+            'last_name' : {'query_type' : 'simple', 'ldap_name' : 'sn'},
+            'groups' : {'query_type' : 'many_to_many', 'ldap_name' : 'groupMembership',
+                'name_mapping' : {'cn=Library,o=Test' : 'library'}},
+        }}}
+        library = self.group_manager.create(self.admin_token, 'library')
+        server = FakeLDAPServer()
+        server.add_entry('cn=jdoe,ou=People,o=Test', {'cn' : ['jdoe'], 'givenName' : ['John'],
+            'sn' : ['Doe'], 'groupMembership' : ['cn=Library,o=Test']}, password='secret')
+        ldap_pool.reset(server.initialize)
+        try:
+            user_manager = facade.managers.UserManager()
+            ret = user_manager.login('jdoe', 'secret', 'LDAP')
+            user = facade.models.User.objects.get(id=ret['id'])
+            self.assertEquals(user.first_name, 'John')
+            self.assertEquals(user.last_name, 'Doe')
+            self.assertEquals([g.id for g in user.groups.all()], [library.id])
+            searches = server.searches
+
+            # later logins reuse the pooled connection and the cached lookups
+            for i in range(3):
+                facade.managers.UserManager().login('jdoe', 'secret', 'LDAP')
+            self.assertEquals(server.connections_opened, 1)
+            self.assertEquals(server.searches, searches)
+            self.assertRaises(exceptions.AuthenticationFailureException,
+                user_manager.login, 'jdoe', 'wrong', 'LDAP')
+
+            # a dead connection is noticed by the health check and replaced
+            ldap_pool.get_pool().health_check_interval = 0
+            for connection, bound_dn, last_used in ldap_pool.get_pool()._idle:
+                connection.closed = True
+            user_manager.login('jdoe', 'secret', 'LDAP')
+            self.assertEquals(server.connections_opened, 2)
+
+            # lookups are repeated once the cache has been cleared
+            ldap_pool.get_cache().clear()
+            user_manager.login('jdoe', 'secret', 'LDAP')
+            self.assertTrue(server.searches > searches)
+        finally:
+            ldap_pool.reset()
+
     def test_self_registered_users_must_be_pending(self):
         # we need to use unique user names because we don't benefit
         # from the RPC layer rolling back transactions in these unit tests
@@ -2821,6 +3457,40 @@ class TestUserModel(TestCase):
         self.assertEquals(ret[0]['default_username_and_domain'],
             {'username': 'admin', 'domain': 'local'})
 
+    def test_denormalized_default_username(self):
+        user = facade.models.User.objects.get(id=self.admin_user.id)
+        self.assertEquals(user.default_username, 'admin')
+        self.assertEquals(user.default_domain, 'local')
+        self.assertEquals(user.username, 'local:admin')
+        da = user.domain_affiliations.get(default=True)
+        da.username = 'administrator'
+        da.save()
+        user = facade.models.User.objects.get(id=self.admin_user.id)
+        self.assertEquals(user.default_username_and_domain,
+            {'username': 'administrator', 'domain': 'local'})
+        da.domain.name = 'local2'
+        da.domain.save()
+        self.assertEquals(facade.models.User.objects.get(id=self.admin_user.id).username,
+            'local2:administrator')
+        da.default = False
+        da.save()
+        user = facade.models.User.objects.get(id=self.admin_user.id)
+        self.assertEquals(user.default_username, None)
+        self.assertEquals(user.default_username_and_domain, None)
+        self.assertEquals(user.username, '(no default username)')
+
+    def test_stale_user_keeps_default_username(self):
+        stale = facade.models.User.objects.get(id=self.admin_user.id)
+        da = stale.domain_affiliations.get(default=True)
+        da.username = 'administrator'
+        da.save()
+        stale.first_name = 'Stale'
+        stale.save()
+        self.assertEquals(stale.default_username, 'administrator')
+        user = facade.models.User.objects.get(id=self.admin_user.id)
+        self.assertEquals(user.first_name, 'Stale')
+        self.assertEquals(user.username, 'local:administrator')
+
 class TestVenueManager(TestCase):
     def test_creation(self):
         region = self.region_manager.create(self.admin_token, 'Southwest')
@@ -2861,6 +3531,64 @@ class TestVenueManager(TestCase):
         self.assertTrue(room1.id in res[0]['rooms'])
         self.assertTrue(room2.id in res[0]['rooms'])
         self.assertEquals(res[0]['id'], venue.id)
+
+    def test_read_cache(self):
+        settings.OBJECT_MANAGER_CACHE_BACKEND = 'locmem://'
+        read_cache.reset()
+        filters = {'exact' : {'id' : self.venue1.id}}
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name', 'region'])
+        self.assertEquals(res[0]['name'], 'Venue 1')
+        self.assertEquals(res[0]['region'], self.region1.id)
+        # changes that bypass save() aren't seen until the generation changes
+        facade.models.Venue.objects.filter(id=self.venue1.id).update(name='Renamed')
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name', 'region'])
+        self.assertEquals(res[0]['name'], 'Venue 1')
+        read_cache.bump(facade.models.Venue)
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name'])
+        self.assertEquals(res[0]['name'], 'Renamed')
+        self.venue_manager.update(self.admin_token, self.venue1.id, {'phone' : '444.444.4444'})
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['phone'])
+        self.assertEquals(res[0]['phone'], '444.444.4444')
+        # saving a model that the query joins invalidates it as well
+        other_region = self.region_manager.create(self.admin_token, 'Other Region')
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['region'])
+        facade.models.Venue.objects.filter(id=self.venue1.id).update(region=other_region)
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['region'])
+        self.assertEquals(res[0]['region'], self.region1.id)
+        self.region_manager.update(self.admin_token, other_region.id, {'name' : 'Renamed Region'})
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['region'])
+        self.assertEquals(res[0]['region'], other_region.id)
+        # models whose reads aren't cached don't have generations
+        self.assertTrue(facade.models.Venue in read_cache.get_cached_models())
+        self.assertFalse(facade.models.User in read_cache.get_cached_models())
+        # nor are queries that use their tables in a subquery
+        venues = facade.models.Venue.objects.filter(
+            Q(id__in=facade.models.User.objects.values('id')) | Q(id=self.venue1.id))
+        self.assertEquals(read_cache._models_in_query(venues.query), None)
+        venues = facade.models.Venue.objects.filter(
+            region__in=facade.models.Region.objects.filter(name='Other Region'))
+        self.assertEquals(set(read_cache._models_in_query(venues.query)),
+            set([facade.models.Venue, facade.models.Region]))
+        # within a request, the generation changes once the transaction has
+        # been committed, and until then the request reads the database
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name'])
+        self.assertEquals(res[0]['name'], 'Renamed')
+        request = django.http.HttpRequest()
+        middleware._thread_locals.request = request
+        try:
+            self.venue_manager.update(self.admin_token, self.venue1.id, {'name' : 'Committed'})
+            res = self.venue_manager.get_filtered(self.admin_token, filters, ['name'])
+            self.assertEquals(res[0]['name'], 'Committed')
+        finally:
+            del middleware._thread_locals.request
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name'])
+        self.assertEquals(res[0]['name'], 'Renamed')
+        middleware.AfterCommit().process_response(request, None)
+        res = self.venue_manager.get_filtered(self.admin_token, filters, ['name'])
+        self.assertEquals(res[0]['name'], 'Committed')
+        # authorization is still checked for every object
+        res = self.venue_manager.get_filtered(self.auth_token, filters, ['phone'])
+        self.assertEquals(res, self.venue_manager.get_filtered(self.auth_token, filters, ['phone']))
         
 class TestCharFieldTruncation(TestCase):
     """
@@ -2875,6 +3603,18 @@ class TestObjectManager(TestCase):
     def setUp(self):
         super(TestObjectManager, self).setUp()
         self.tu = TestUtils()
+
+    def test_iter_filtered(self):
+        self.tu.setup_test_sessions()
+        student, student_at = self.create_student()
+        for auth_token in (self.admin_token, student_at):
+            rows = self.group_manager.iter_filtered(auth_token, {}, ['name', 'users'])
+            self.failIf(isinstance(rows, list))
+            rows = list(rows)
+            self.assertEquals(rows, self.group_manager.get_filtered(auth_token, {}, ['name', 'users']))
+            self.failUnless(rows)
+            for row in rows:
+                self.failUnless(isinstance(row['users'], list))
      
     def test_query_on_related_objects(self):
         self.failUnless(facade.models.ProductLine.objects.count() > 0)
@@ -2999,6 +3739,23 @@ class TestTaskBundles(TestCase):
               'continue_automatically': True},
              {'id': self.exam_3.id, 'presentation_order': 3, 'content_type': 'pr_services.exam',
               'continue_automatically': False}])
+        # associations that didn't change are kept as they are
+        associations = dict(facade.models.TaskBundleTaskAssociation.objects.filter(
+            task_bundle__id=task_bundle.id).values_list('task', 'id'))
+        self.task_bundle_manager.update(self.admin_token, task_bundle.id,
+            {'tasks': [{'id': self.exam_1.id, 'presentation_order': 1},
+                       {'id': self.exam_3.id, 'presentation_order': 2},
+                      ]})
+        self.assertEquals(dict(facade.models.TaskBundleTaskAssociation.objects.filter(
+            task_bundle__id=task_bundle.id).values_list('task', 'id')),
+            {self.exam_1.id: associations[self.exam_1.id],
+             self.exam_3.id: associations[self.exam_3.id]})
+        ret = self.task_bundle_manager.get_filtered(self.admin_token,
+            {'exact': {'id': task_bundle.id}}, ['tasks'])
+        self.assertEquals([(t['id'], t['presentation_order']) for t in ret[0]['tasks']],
+            [(self.exam_1.id, 1), (self.exam_3.id, 2)])
+        self.assertRaises(exceptions.ObjectNotFoundException, self.task_bundle_manager.update,
+            self.admin_token, task_bundle.id, {'tasks': [{'id': 999999, 'presentation_order': 1}]})
 
 
 class TestScormServer(TestCase):
@@ -3156,7 +3913,46 @@ class TestCurriculumManagement(TestCase):
         for user in users:
             self.assertEquals(len(user['completed_curriculum_enrollments']), 1)
             self.assertEquals(len(user['incomplete_curriculum_enrollments']), 0)
-        
+
+    def test_enroll_users_in_bulk(self):
+        learners = [self.user_manager.create(self.admin_token, 'learner_%d' % i, 'password', '', '', '', '', '', 'active')
+            for i in range(4)]
+        curriculum = self.curriculum_manager.create(self.admin_token, 'Curriculum 1')
+        self.curriculum_task_association_manager.create(self.admin_token, curriculum.id, self.exam_1.id,
+            {'days_before_start' : 1, 'days_to_complete' : 2})
+        self.curriculum_task_association_manager.create(self.admin_token, curriculum.id, self.exam_2.id)
+        start = self.right_now.isoformat()
+        end = (self.right_now+self.one_day).isoformat()
+        enrollment = self.curriculum_enrollment_manager.create(self.admin_token, curriculum.id, start, end,
+            [learners[0].id, learners[1].id])
+        self.assertEquals(enrollment.assignments.count(), 4)
+        assignment = enrollment.assignments.get(user__id=learners[0].id, task__id=self.exam_1.id)
+        self.assertEquals(assignment.status, 'assigned')
+        self.assertEquals((assignment.due_date - assignment.effective_date_assigned).days, 2)
+
+        # enrolling again is a no-op for users who are already enrolled, and
+        # large enrollments get handled by the celery task, which is only
+        # queued once the request's transaction has been committed
+        settings.CURRICULUM_ENROLLMENT_ASYNC_THRESHOLD = 1
+        request = django.http.HttpRequest()
+        middleware._thread_locals.request = request
+        try:
+            self.curriculum_enrollment_manager.enroll_users(self.admin_token, enrollment.id,
+                [learner.id for learner in learners])
+        finally:
+            del middleware._thread_locals.request
+        self.assertEquals(enrollment.users.count(), 4)
+        self.assertEquals(enrollment.assignments.count(), 4)
+        middleware.AfterCommit().process_response(request, None)
+        self.assertEquals(enrollment.assignments.count(), 8)
+
+        for assignment in enrollment.assignments.filter(user__id=learners[3].id):
+            self.assignment_manager.update(self.admin_token, assignment.id, {'status' : 'completed'})
+        statuses = enrollment.user_completion_statuses
+        self.assertEquals(len(statuses), 4)
+        self.assertTrue(statuses[learners[3].id])
+        self.assertFalse(statuses[learners[0].id])
+
 
 class TestUtilsManager(TestCase):
     def setUp(self):
@@ -3335,6 +4131,9 @@ class TestAdminPasswordSetup(django.test.TestCase):
 
 class TestManagerGetterSetters(TestCase):
     def test_getters_setters(self):
+        # plugins may extend the Getter and Setter through the facade
+        Getter = facade.subsystems.Getter
+        Setter = facade.subsystems.Setter
         for manager_name in facade.managers.import_map.keys():
             manager = getattr(facade.managers, manager_name)()
             if not isinstance(manager, ObjectManager):
@@ -3425,4 +4224,28 @@ class TestEmailGeneration(TestCase):
         self.assertTrue('CRITICAL Message Logged' in mess.subject)
         self.assertTrue('this is a critical test' in mess.body)
 
+    def test_participant_instances(self):
+        from django.db import connection
+        from pr_messaging.common import Message, Participant
+        users = [self.user_manager.create(self.admin_token, 'recipient%d' % i, 'password', 'Mr.',
+            'Recipient', str(i), '555.555.5555', 'recipient%d@acme-u.com' % i, 'active')
+            for i in range(5)]
+        use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        start = len(connection.queries)
+        try:
+            Message(sender=self.user1.email, recipients=[users[0].email])
+        finally:
+            connection.use_debug_cursor = use_debug_cursor
+        # more recipients don't take more queries
+        with self.assertNumQueries(len(connection.queries) - start):
+            m = Message(sender=self.user1.email, recipients=[u.email for u in users] +
+                ['nobody@acme-u.com'])
+        self.assertEqual(m.sender().instance, self.user1)
+        self.assertEqual([p.instance for p in m.recipients()], users + [None])
+        participants = cPickle.loads(cPickle.dumps(m.participants))
+        with self.assertNumQueries(1):
+            Participant.load_instances(participants)
+            self.assertEqual([p.instance for p in participants[1:-1]], users)
+
 # vim:tabstop=4 shiftwidth=4 expandtab
@@ -14,6 +14,8 @@ class ProductManager(ObjectManager):
     Manage Products in the Power Reg system
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -14,6 +14,8 @@ class RegionManager(ObjectManager):
     Manage Regions in the Power Reg system
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
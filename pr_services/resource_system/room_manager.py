@@ -17,6 +17,8 @@ class RoomManager(ObjectManager):
     This class manages physical addresses.
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -14,6 +14,8 @@ class VenueManager(ObjectManager):
     Manage Venues in the Power Reg system
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -14,6 +14,8 @@ class RoleManager(ObjectManager):
     Manage Roles in the Power Reg system
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -0,0 +1,229 @@
+"""
+Full-text search index
+
+Filters like icontains compile to LIKE '%...%', which can't use an index and
+so scan every row.  The SearchIndex keeps an inverted index of the text
+fields configured in settings.SEARCH_INDEX_FIELDS in SearchIndexEntry rows:
+one row per object and word, weighted by how often the word occurs and in
+which fields.  A search then looks its words up in the indexed term column
+and ranks the objects that contain all of them by their total weight.
+
+The index lives in the database, so it works the same on every supported
+backend, and is updated from the post_save and post_delete signals, either
+right away or, when settings.SEARCH_INDEX_ASYNC is True, by a celery task.
+Changes that don't send those signals, such as QuerySet.update(), are picked
+up the next time the object is saved or the index is rebuilt.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import logging
+import re
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q, Sum
+from django.utils.encoding import force_unicode
+import facade
+
+_logger = logging.getLogger('pr_services.search_index')
+
+class SearchIndex(object):
+    """
+    Maintains and queries the full-text search index.
+    """
+
+    #: what counts as a word; underscores separate words, as in Task names
+    word_pattern = re.compile(r'[^\W_]+', re.UNICODE)
+    #: shorter words are too common to be worth indexing
+    min_word_length = 2
+    #: longer words are truncated to the size of SearchIndexEntry.term
+    max_word_length = 64
+
+    def indexed_models(self):
+        """
+        :return:    list of (model name, model class, dictionary of field
+                    weights) tuples for the installed models named in
+                    settings.SEARCH_INDEX_FIELDS
+        """
+
+        ret = []
+        for model_name, fields in sorted(getattr(settings, 'SEARCH_INDEX_FIELDS', {}).iteritems()):
+            try:
+                model = getattr(facade.models, model_name)
+            except AttributeError:
+                continue
+            ret.append((model_name, model, fields))
+        return ret
+
+    def words(self, text):
+        """ split text into the words that are indexed, in lower case """
+
+        if not text:
+            return []
+        return [word[:self.max_word_length] for word in
+            self.word_pattern.findall(force_unicode(text).lower())
+            if len(word) >= self.min_word_length]
+
+    def index(self, instance):
+        """
+        Bring the entries for an object up to date with its current text.
+        The stored entries are compared with the terms of the text, and only
+        the ones that differ are deleted, reweighted or inserted, so saving an
+        object without changing its indexed fields costs a single query.
+        Objects that aren't of an indexed model are ignored.
+        """
+
+        for model_name, model, fields in self.indexed_models():
+            if isinstance(instance, model):
+                weights = {}
+                for field_name, field_weight in fields.iteritems():
+                    for word in self.words(getattr(instance, field_name, None)):
+                        weights[word] = weights.get(word, 0) + field_weight
+                content_type = ContentType.objects.get_for_model(model)
+                entries = self._entries(content_type, [instance.pk])
+                doomed = []
+                reweighted = {}
+                for entry_id, term, weight in entries.values_list('id', 'term', 'weight'):
+                    # whatever is left in weights afterwards is new
+                    new_weight = weights.pop(term, None)
+                    if new_weight is None:
+                        doomed.append(entry_id)
+                    elif new_weight != weight:
+                        reweighted.setdefault(new_weight, []).append(entry_id)
+                if doomed:
+                    entries.filter(id__in=doomed).delete()
+                for weight, entry_ids in reweighted.iteritems():
+                    entries.filter(id__in=entry_ids).update(weight=weight)
+                self._insert(content_type, [(instance.pk, weights)])
+
+    def remove(self, model, pk):
+        """ delete the entries for an object that no longer exists """
+
+        for model_name, indexed_model, fields in self.indexed_models():
+            if issubclass(model, indexed_model):
+                self._entries(ContentType.objects.get_for_model(indexed_model),
+                    [pk]).delete()
+
+    def rebuild(self, model_names=None):
+        """
+        Build the index for every object of some models from scratch.
+
+        :param model_names: names of the indexed models to rebuild, or None
+                            for all of them
+        """
+
+        Entry = facade.models.SearchIndexEntry
+        for model_name, model, fields in self.indexed_models():
+            if model_names is not None and model_name not in model_names:
+                continue
+            content_type = ContentType.objects.get_for_model(model)
+            Entry.objects.filter(content_type=content_type).delete()
+            batch = []
+            for values in model.objects.values('pk', *fields.keys()).iterator():
+                weights = {}
+                for field_name, field_weight in fields.iteritems():
+                    for word in self.words(values[field_name]):
+                        weights[word] = weights.get(word, 0) + field_weight
+                batch.append((values['pk'], weights))
+                if len(batch) >= 500:
+                    self._insert(content_type, batch)
+                    batch = []
+            self._insert(content_type, batch)
+            _logger.info('rebuilt the search index for %s' % model_name)
+
+    def _entries(self, content_type, pks):
+        return facade.models.SearchIndexEntry.objects.filter(
+            content_type=content_type, object_id__in=pks)
+
+    def _insert(self, content_type, objects):
+        """
+        :param objects: list of (PK, dictionary of term weights) tuples
+        """
+
+        rows = [{'content_type': content_type.id, 'object_id': pk, 'term': term,
+            'weight': weight} for pk, weights in objects
+            for term, weight in weights.iteritems()]
+        if rows:
+            facade.subsystems.Utils.bulk_insert(facade.models.SearchIndexEntry, rows)
+
+    def search(self, auth_token, query, model_names=None, offset=0, limit=20):
+        """
+        Find the objects whose indexed fields contain every word of a query,
+        best matches first.  Only objects on which the actor may read all of
+        the indexed fields are found.
+
+        :param query:       the words to look for
+        :param model_names: names of the indexed models to search, or None for
+                            all of them
+        :param offset:      number of matches to skip
+        :param limit:       maximum number of matches to return
+        :return:            dictionary with the number of matches as 'total'
+                            and a list of the requested matches as 'results',
+                            each a dictionary with the model name as 'type',
+                            the object's 'id' and its 'score'
+        """
+
+        ret = {'total': 0, 'results': []}
+        terms = set(self.words(query))
+        if not terms:
+            return ret
+        entries = facade.models.SearchIndexEntry.objects.filter(term__in=terms).order_by()
+        authorizer = facade.subsystems.Authorizer()
+        type_names = {}
+        condition = None
+        for model_name, model, fields in self.indexed_models():
+            if model_names is not None and model_name not in model_names:
+                continue
+            content_type = ContentType.objects.get_for_model(model)
+            # objects containing every term, as a subquery
+            matching = entries.filter(content_type=content_type).values(
+                'object_id').annotate(term_count=Count('term')).filter(
+                term_count=len(terms)).values('object_id')
+            readable = authorizer.filter_readable(auth_token,
+                model.objects.filter(pk__in=matching), ['id'] + fields.keys())
+            model_condition = Q(content_type=content_type,
+                object_id__in=readable.values('pk'))
+            condition = model_condition if condition is None else condition | model_condition
+            type_names[content_type.id] = model_name
+        if condition is None:
+            return ret
+        ranked = entries.filter(condition).values('content_type', 'object_id').annotate(
+            term_count=Count('term'), score=Sum('weight')).filter(term_count=len(terms))
+        ret['total'] = ranked.count()
+        for row in ranked.order_by('-score', 'content_type', 'object_id')[offset:offset + limit]:
+            ret['results'].append({'type': type_names[row['content_type']],
+                'id': row['object_id'], 'score': row['score']})
+        return ret
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """ post_save handler that indexes the saved object """
+
+    if raw or not _is_indexed(sender):
+        return
+    if getattr(settings, 'SEARCH_INDEX_ASYNC', False):
+        from pr_services.tasks import update_search_index as update_task
+        update_task.delay(sender._meta.app_label, sender._meta.object_name, instance.pk)
+    else:
+        SearchIndex().index(instance)
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """ post_delete handler that takes the deleted object out of the index """
+
+    if not _is_indexed(sender):
+        return
+    if getattr(settings, 'SEARCH_INDEX_ASYNC', False):
+        from pr_services.tasks import update_search_index as update_task
+        update_task.delay(sender._meta.app_label, sender._meta.object_name, instance.pk,
+            deleted=True)
+    else:
+        SearchIndex().remove(sender, instance.pk)
+
+def _is_indexed(model):
+    """ whether objects of a model are indexed under any configured model """
+
+    for model_name in getattr(settings, 'SEARCH_INDEX_FIELDS', {}):
+        if [cls for cls in model.__mro__ if cls.__name__ == model_name]:
+            return True
+    return False
+
+# vim:tabstop=4 shiftwidth=4 expandtab
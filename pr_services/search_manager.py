@@ -0,0 +1,51 @@
+"""
+Full-text search through RPC
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from pr_services.rpc.service import service_method
+import facade
+
+class SearchManager(object):
+    """Searches the text fields that are indexed by the SearchIndex."""
+
+    #: the most results one call may return
+    max_limit = 100
+
+    @service_method
+    def search(self, auth_token, query, model_names=None, offset=0, limit=20):
+        """
+        Find objects whose indexed text fields contain every word of a query,
+        best matches first.  The models and fields that are searched, and how
+        much each field counts toward a match's score, are configured in
+        settings.SEARCH_INDEX_FIELDS.  Objects on which the actor may not
+        read all of the indexed fields are left out.
+
+        Example return value::
+
+            {'total' : 2,
+             'results' : [{'type' : 'Task', 'id' : 12, 'score' : 7},
+                          {'type' : 'ForumPost', 'id' : 3, 'score' : 1}]}
+
+        :param auth_token:  The actor's authentication token
+        :type auth_token:   pr_services.models.AuthToken
+        :param query:       The words to look for
+        :type query:        string
+        :param model_names: Names of the models to search, or None for all
+                            indexed models
+        :type model_names:  list of string
+        :param offset:      Number of matches to skip, for paging
+        :type offset:       int
+        :param limit:       Maximum number of matches to return, at most 100
+        :type limit:        int
+        :return:            A dictionary with the number of matches as 'total'
+                            and the requested page of matches as 'results'
+        """
+
+        offset = max(0, int(offset))
+        limit = min(max(0, int(limit)), self.max_limit)
+        return facade.subsystems.SearchIndex().search(auth_token, query,
+            model_names, offset, limit)
+
+# vim:tabstop=4 shiftwidth=4 expandtab
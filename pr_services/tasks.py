@@ -1,6 +1,10 @@
+from __future__ import with_statement
 from celery.decorators import task
 from datetime import datetime, timedelta
+from django.db.models import get_model
 import facade
+from pr_messaging import batch_messages
+from pr_services import cookiecache
 
 import settings
 if 'ecommerce' in settings.INSTALLED_APPS:
@@ -24,31 +28,60 @@ def expire_old_credentials(*args, **kwargs):
             status='expired')
 
 
+@task(max_retries=5, ignore_result=True)
+def materialize_curriculum_enrollment(curriculum_enrollment_id, user_ids=None, **kwargs):
+    """
+    Creates the Assignments for a large CurriculumEnrollment in bulk.  The
+    enrollment may not be visible yet if the transaction that created it has
+    not been committed, in which case the task is retried.
+    """
+    try:
+        curriculum_enrollment = facade.models.CurriculumEnrollment.objects.get(
+            id=curriculum_enrollment_id)
+    except facade.models.CurriculumEnrollment.DoesNotExist, exc:
+        materialize_curriculum_enrollment.retry(args=[curriculum_enrollment_id,
+            user_ids], exc=exc, kwargs=kwargs)
+    else:
+        facade.subsystems.CurriculumEnrollmentMaterializer(
+            curriculum_enrollment).materialize(user_ids)
+
+
 @task(ignore_result=True)
 def process_completed_sessions(*args, **kwargs):
     """
     Finds Sessions with end date + event.lag_time in the past, and sets their
-    status to 'completed'.
+    status to 'completed' in bulk (see SessionCompleter).
     """
-    right_now = datetime.utcnow()
-    active_past_sessions = facade.models.Session.objects.filter(
-        end__lt=right_now, status='active')
-    for session in active_past_sessions:
-        if (session.event.lag_time is None) or (
-                session.end + session.event.lag_time < right_now):
-            session.status = 'completed'
-            session.save()
+    facade.subsystems.SessionCompleter().complete()
 
 
 @task(ignore_result=True)
 def process_session_reminders(*args, **kwargs):
     """
-    This searches through the database, looking for sessions which
-    require lead time notifications to be sent, sending emails
-    as appropriate and logging its progress via the
-    job, session_reminder_job, and session_reminder_item models
+    Sends reminders to the invitees of Sessions whose lead time has expired.
+    Due Sessions are found and claimed with one indexed query each, so this
+    is cheap to run often.
+    """
+    with batch_messages():
+        facade.managers.SessionManager()._process_session_reminders()
+
+
+@task(ignore_result=True)
+def flush_auth_token_activity(*args, **kwargs):
+    """
+    Writes the sliding expirations of recently used auth tokens to the
+    database
+    """
+    facade.subsystems.AuthTokenActivity().flush()
+
+
+@task(ignore_result=True)
+def persist_cached_cookies(*args, **kwargs):
+    """
+    Copies recently saved cookie cache entries from memcached to the
+    database
     """
-    facade.managers.SessionManager()._process_session_reminders()
+    cookiecache.persist_cached_cookies()
 
 
 @task(ignore_result=True)
@@ -57,6 +90,26 @@ def remove_old_auth_tokens(*args, **kwargs):
     Removes expired auth tokens and used single-use auth tokens from the
     database
     """
-    facade.models.SingleUseAuthToken.objects.filter(used=True).delete()
-    facade.models.AuthToken.objects.filter(
-        time_of_expiration__lte=datetime.utcnow()).delete()
+    facade.subsystems.AuthTokenActivity().remove_expired()
+
+
+@task(max_retries=5, ignore_result=True)
+def update_search_index(app_label, model_name, pk, deleted=False, **kwargs):
+    """
+    Indexes an object that has been saved, or takes one that has been
+    deleted out of the search index.  A saved object may not be visible yet
+    if its transaction has not been committed, in which case the task is
+    retried.
+    """
+    model = get_model(app_label, model_name)
+    search_index = facade.subsystems.SearchIndex()
+    if deleted:
+        search_index.remove(model, pk)
+        return
+    try:
+        instance = model.objects.get(pk=pk)
+    except model.DoesNotExist, exc:
+        update_search_index.retry(args=[app_label, model_name, pk], exc=exc,
+            kwargs=kwargs)
+    else:
+        search_index.index(instance)
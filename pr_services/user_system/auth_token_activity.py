@@ -0,0 +1,171 @@
+"""
+Write-behind tracking of auth token activity
+
+When AUTH_TOKEN_SLIDING_EXPIRATION is enabled, every use of an AuthToken
+pushes its expiration out to AUTH_TOKEN_EXPIRATION_INTERVAL minutes from now.
+Writing that to the database on every RPC call would be expensive, so the new
+expiration is recorded in memcached instead, and the session IDs of tokens
+that were used are appended to a list for the current flush period.  The
+flush_auth_token_activity task periodically reads the lists for periods that
+have ended and updates the tokens with one UPDATE statement per batch.
+
+If memcached can't be reached, the expiration is written to the database
+directly.  Either way, a token is extended at most once every
+AUTH_TOKEN_ACTIVITY_GRANULARITY seconds.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import datetime, timedelta
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from pr_services.utils import memcached
+import facade
+
+_logger = logging.getLogger('pr_services.auth_token_activity')
+
+class AuthTokenActivity(object):
+    """
+    Record and flush sliding expirations of AuthTokens
+    """
+
+    #: prefix for all of our memcached keys
+    key_prefix = 'pr_auth_token_activity'
+    #: how many tokens to update with one statement
+    batch_size = 500
+
+    def __init__(self, client=None):
+        """
+        @param client   memcache.Client to use, or None for the shared one
+        """
+        self.client = client if client is not None else memcached.get_client()
+        self.flush_interval = settings.AUTH_TOKEN_ACTIVITY_FLUSH_INTERVAL
+        self.log = memcached.WriteBehindLog(self.key_prefix, self.flush_interval, self.client)
+        self.granularity = timedelta(seconds=settings.AUTH_TOKEN_ACTIVITY_GRANULARITY)
+        self.lifetime = timedelta(minutes=settings.AUTH_TOKEN_EXPIRATION_INTERVAL)
+
+    def _token_key(self, session_id):
+        return '%s:token:%s' % (self.key_prefix, session_id)
+
+    def record(self, auth_token, now=None):
+        """
+        Note that an AuthToken was used, extending its expiration.  The
+        AuthToken's time_of_expiration attribute is updated, but the database
+        is not, unless memcached is unavailable.
+
+        @param auth_token   AuthToken that was just used
+        @param now          the time of use
+        """
+        if now is None:
+            now = datetime.utcnow()
+        expiration = now + self.lifetime
+        session_id = str(auth_token.session_id)
+        token_key = self._token_key(session_id)
+        previous = self.client.get(token_key)
+        # The token was just loaded from the database, which doesn't have
+        # the expirations that haven't been flushed yet.
+        current = auth_token.time_of_expiration
+        if previous is not None and previous[0] > current:
+            current = previous[0]
+        if expiration - current < self.granularity:
+            auth_token.time_of_expiration = current
+            return
+        auth_token.time_of_expiration = expiration
+        period = self.log.period(now)
+        if not self.client.set(token_key, (expiration, period),
+                time=int(self.lifetime.seconds + self.lifetime.days * 86400)):
+            self._update([(session_id, expiration)])
+            return
+        if previous is None or previous[1] != period:
+            self.log.add(session_id, now)
+
+    def expiration(self, session_id):
+        """
+        @param session_id   session ID of an AuthToken
+        @return             the expiration recorded in memcached that hasn't
+                            been flushed yet, or None
+        """
+        value = self.client.get(self._token_key(str(session_id)))
+        if value is not None:
+            return value[0]
+
+    def flush(self, now=None):
+        """
+        Write the expirations of tokens used during flush periods that have
+        ended to the database.
+
+        @return     the number of tokens updated
+        """
+        updates = []
+        session_ids = list(self.log.drain(now))
+        for i in xrange(0, len(session_ids), self.batch_size):
+            chunk = session_ids[i:i + self.batch_size]
+            found = self.client.get_multi([self._token_key(session_id) for session_id in chunk])
+            updates.extend((session_id, found[self._token_key(session_id)][0])
+                for session_id in chunk if self._token_key(session_id) in found)
+        count = self._update(updates)
+        _logger.debug('flushed activity for %d auth tokens' % count)
+        return count
+
+    def _update(self, updates):
+        """
+        Set the expirations of many AuthTokens with one statement per batch
+
+        @param updates  list of (session ID, expiration) tuples
+        @return         the number of tokens updated
+        """
+        if not updates:
+            return 0
+        meta = facade.models.AuthToken._meta
+        qn = connection.ops.quote_name
+        table = qn(meta.db_table)
+        session_id_column = qn(meta.get_field('session_id').column)
+        expiration_column = qn(meta.get_field('time_of_expiration').column)
+        cursor = connection.cursor()
+        count = 0
+        for i in xrange(0, len(updates), self.batch_size):
+            batch = updates[i:i + self.batch_size]
+            cases = ' '.join(['WHEN %s THEN %s'] * len(batch))
+            placeholders = ', '.join(['%s'] * len(batch))
+            params = []
+            for session_id, expiration in batch:
+                params.extend([session_id, connection.ops.value_to_db_datetime(expiration)])
+            params.extend(session_id for session_id, expiration in batch)
+            cursor.execute('UPDATE %s SET %s = CASE %s %s END WHERE %s IN (%s)' % (
+                table, expiration_column, session_id_column, cases,
+                session_id_column, placeholders), params)
+            count += cursor.rowcount
+        transaction.commit_unless_managed()
+        return count
+
+    def remove_expired(self, now=None):
+        """
+        Flush pending activity, then delete expired AuthTokens and used
+        SingleUseAuthTokens a chunk at a time, so that no single statement
+        holds locks on a large part of the table.
+
+        @return     the number of tokens deleted
+        """
+        if now is None:
+            now = datetime.utcnow()
+        self.flush(now)
+        chunk_size = settings.AUTH_TOKEN_DELETE_CHUNK_SIZE
+        # Extensions recorded during the current and previous flush periods
+        # may not have been flushed yet, so leave recently expired tokens be.
+        cutoff = now - timedelta(seconds=2 * self.flush_interval)
+        count = 0
+        for queryset in (facade.models.SingleUseAuthToken.objects.filter(used=True),
+                facade.models.AuthToken.objects.filter(time_of_expiration__lte=cutoff)):
+            while True:
+                ids = list(queryset.order_by().values_list('id', flat=True)[:chunk_size])
+                if not ids:
+                    break
+                facade.models.AuthToken.objects.filter(id__in=ids).delete()
+                transaction.commit_unless_managed()
+                count += len(ids)
+        return count
+
+# vim:tabstop=4 shiftwidth=4 expandtab
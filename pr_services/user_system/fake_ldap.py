@@ -0,0 +1,140 @@
+"""
+An in-memory stand-in for an LDAP server, for use by unit tests
+
+Install it with::
+
+    server = FakeLDAPServer()
+    server.add_entry('cn=jdoe,ou=people,dc=example,dc=com',
+        {'cn' : ['jdoe'], 'givenName' : ['John']}, password='secret')
+    ldap_pool.reset(server.initialize)
+
+It understands simple binds, equality filters of the form (attribute=value)
+and the three search scopes, and raises the same exceptions as python-ldap.
+
+:copyright: Copyright 2011 American Research Institute, Inc.
+"""
+__docformat__ = "restructuredtext en"
+
+import re
+
+import ldap
+
+_filter_pattern = re.compile(r'^\((?P<attribute>[^=()]+)=(?P<value>[^()]*)\)$')
+
+def _normalize_dn(dn):
+    return ','.join(part.strip().lower() for part in dn.split(','))
+
+class FakeLDAPServer(object):
+    """
+    Holds the directory entries and counts what clients do with them.
+    """
+
+    def __init__(self):
+        #: attribute dictionaries indexed by normalized DN
+        self.entries = {}
+        #: original spelling of each DN, indexed by normalized DN
+        self.dns = {}
+        #: passwords indexed by normalized DN
+        self.passwords = {}
+        #: when True, every operation raises ldap.SERVER_DOWN
+        self.down = False
+        self.connections_opened = 0
+        self.binds = 0
+        self.searches = 0
+
+    def add_entry(self, dn, attributes, password=None):
+        key = _normalize_dn(dn)
+        self.entries[key] = attributes
+        self.dns[key] = dn
+        if password is not None:
+            self.passwords[key] = password
+
+    def initialize(self, url):
+        """ replacement for ldap.initialize() """
+        if self.down:
+            raise ldap.SERVER_DOWN({'desc' : "Can't contact LDAP server"})
+        self.connections_opened += 1
+        return FakeLDAPConnection(self)
+
+
+class FakeLDAPConnection(object):
+    """
+    A connection to a FakeLDAPServer, implementing the parts of
+    ldap.ldapobject.LDAPObject that we use.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.bound_dn = ''
+        self.closed = False
+
+    def _check(self):
+        if self.server.down or self.closed:
+            raise ldap.SERVER_DOWN({'desc' : "Can't contact LDAP server"})
+
+    def simple_bind_s(self, who='', cred=''):
+        self._check()
+        self.server.binds += 1
+        key = _normalize_dn(who or '')
+        if cred:
+            if self.server.passwords.get(key) != cred:
+                self.bound_dn = ''
+                raise ldap.INVALID_CREDENTIALS({'desc' : 'Invalid credentials'})
+        elif key in self.server.passwords:
+            # an empty password with a real DN is an unauthenticated bind
+            self.bound_dn = ''
+            raise ldap.INVALID_CREDENTIALS({'desc' : 'Invalid credentials'})
+        self.bound_dn = who
+        return (97, [])
+
+    def bind_s(self, who, cred, method=ldap.AUTH_SIMPLE):
+        return self.simple_bind_s(who, cred)
+
+    def search_s(self, base, scope, filterstr='(objectClass=*)', attrlist=None, attrsonly=0):
+        self._check()
+        self.server.searches += 1
+        base_key = _normalize_dn(base)
+        if base_key not in self.server.entries and not any(
+                key.endswith(',' + base_key) for key in self.server.entries):
+            raise ldap.NO_SUCH_OBJECT({'desc' : 'No such object', 'matched' : ''})
+        match = _filter_pattern.match(filterstr)
+        if match is None:
+            raise ldap.FILTER_ERROR({'desc' : 'Bad search filter'})
+        attribute = match.group('attribute').lower()
+        value = match.group('value').lower()
+        results = []
+        for key in sorted(self.server.entries):
+            if not self._in_scope(key, base_key, scope):
+                continue
+            attributes = dict((name.lower(), values) for name, values
+                in self.server.entries[key].iteritems())
+            if attribute == 'objectclass' and value == '*':
+                pass
+            elif value not in [v.lower() for v in attributes.get(attribute, [])]:
+                continue
+            entry = self.server.entries[key]
+            if attrlist is not None:
+                wanted = set(name.lower() for name in attrlist)
+                entry = dict((name, values) for name, values in entry.iteritems()
+                    if name.lower() in wanted)
+            results.append((self.server.dns[key], dict(entry)))
+        return results
+
+    def whoami_s(self):
+        self._check()
+        return 'dn:%s' % self.bound_dn if self.bound_dn else ''
+
+    def unbind_s(self):
+        self.closed = True
+
+    @staticmethod
+    def _in_scope(key, base_key, scope):
+        if scope == ldap.SCOPE_BASE:
+            return key == base_key
+        if not (key == base_key or key.endswith(',' + base_key)):
+            return False
+        if scope == ldap.SCOPE_ONELEVEL:
+            return key != base_key and key[:-len(base_key) - 1].count(',') == 0
+        return True
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,99 @@
+"""
+Per-request resolution of users and their default usernames
+
+Users, their usernames and the users behind auth tokens are looked up over and
+over while handling a single request.  This resolver keeps the answers for the
+duration of the request and fetches missing ones in bulk.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import facade
+from pr_services import exceptions, middleware
+
+class IdentityResolver(object):
+    """
+    Resolve users and default usernames, caching the results for the current
+    request.
+    """
+
+    #: namespace used for the per-request cache
+    cache_namespace = 'identity_resolver'
+
+    def __init__(self):
+        cache = middleware.get_request_cache(self.cache_namespace)
+        #: Users, indexed by DomainAffiliation PK
+        self._users = cache.setdefault('users', {})
+        #: dictionaries with 'username' and 'domain' keys (or None), indexed
+        #: by User PK
+        self._usernames = cache.setdefault('usernames', {})
+
+    def user_for_domain_affiliation(self, domain_affiliation_id):
+        """
+        :param domain_affiliation_id:   PK of a DomainAffiliation
+        :return:                        the User that the DomainAffiliation
+                                        belongs to
+        """
+
+        if domain_affiliation_id not in self._users:
+            self._users[domain_affiliation_id] = facade.models.User.objects.get(
+                domain_affiliations__id=domain_affiliation_id)
+        return self._users[domain_affiliation_id]
+
+    def default_usernames_and_domains(self, user_ids):
+        """
+        Look up the default username and domain of many users at once.  The
+        denormalized columns on User are used when they are set; the default
+        DomainAffiliations of the remaining users are fetched with one query.
+
+        :param user_ids:    PKs of the users in question
+        :type user_ids:     iterable
+        :return:            dictionary indexed by User PK.  Each value is a
+                            dictionary with 'username' and 'domain' keys, or
+                            None if the user has no default DomainAffiliation.
+        :raises:            exceptions.InternalErrorException if a user has
+                            more than one default DomainAffiliation
+        """
+
+        user_ids = set(user_ids)
+        missing = user_ids.difference(self._usernames)
+        if missing:
+            for user_id, username, domain in facade.models.User.objects.filter(
+                    id__in=missing).values_list('id', 'default_username', 'default_domain'):
+                if username is not None:
+                    self._usernames[user_id] = {'username': username, 'domain': domain}
+                    missing.discard(user_id)
+        if missing:
+            found = {}
+            for user_id, username, domain in facade.models.DomainAffiliation.objects.filter(
+                    user__id__in=missing, default=True).values_list(
+                    'user', 'username', 'domain__name'):
+                if user_id in found:
+                    raise exceptions.InternalErrorException(
+                        'more than one default domain for user with pk %d' % user_id)
+                found[user_id] = {'username': username, 'domain': domain}
+            for user_id in missing:
+                self._usernames[user_id] = found.get(user_id)
+        return dict((user_id, self._usernames.get(user_id)) for user_id in user_ids)
+
+    def default_username_and_domain(self, user_id):
+        """
+        :param user_id: PK of the user in question
+        :return:        dictionary with 'username' and 'domain' keys, or None
+                        if the user has no default DomainAffiliation
+        """
+
+        return self.default_usernames_and_domains([user_id])[user_id]
+
+    def invalidate_user(self, user_id):
+        """
+        Forget everything cached about a user.  Call this when one of the
+        user's DomainAffiliations changes.
+        """
+
+        self._usernames.pop(user_id, None)
+        for domain_affiliation_id, user in self._users.items():
+            if user.id == user_id:
+                del self._users[domain_affiliation_id]
+
+# vim:tabstop=4 shiftwidth=4 expandtab
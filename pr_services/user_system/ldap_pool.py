@@ -0,0 +1,234 @@
+"""
+Pooled LDAP connections and a short-lived cache of LDAP lookups
+
+Opening a connection and binding for every login saturates the directory
+server when thousands of users log in within a few minutes.  The pool keeps
+connections open between requests, checks connections that have been idle
+for a while before handing them out, and skips binding when a connection is
+already bound as the identity used for searches.  The cache remembers DNs and
+attributes for a few minutes so that repeated logins don't search again.
+
+The connection factory can be replaced, which is how the unit tests run
+against the in-memory server in pr_services.user_system.fake_ldap.
+
+:copyright: Copyright 2011 American Research Institute, Inc.
+"""
+
+from __future__ import with_statement
+
+__docformat__ = "restructuredtext en"
+
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+import ldap
+
+from django.conf import settings
+
+_logger = logging.getLogger('pr_services.ldap_pool')
+
+#: errors after which a connection must not be reused
+CONNECTION_ERRORS = (ldap.SERVER_DOWN, ldap.CONNECT_ERROR, ldap.TIMEOUT)
+
+class PooledConnection(object):
+    """
+    Wraps an LDAP connection checked out of an LDAPConnectionPool, keeping
+    track of the DN it is bound as.
+    """
+
+    def __init__(self, connection, bound_dn=None):
+        self.connection = connection
+        #: DN that the connection is currently bound as, or None if unknown
+        self.bound_dn = bound_dn
+
+    def simple_bind_s(self, who, cred):
+        """ bind, remembering who we are bound as if it works """
+        self.bound_dn = None
+        self.connection.simple_bind_s(who, cred)
+        self.bound_dn = who
+
+    def bind_for_search(self):
+        """
+        Bind as the identity used for searches, unless the connection is
+        already bound that way.
+        """
+        search_dn = getattr(settings, 'LDAP_SEARCH_BIND_DN', 'cn=Anonymous')
+        if self.bound_dn != search_dn:
+            self.simple_bind_s(search_dn, getattr(settings, 'LDAP_SEARCH_BIND_PASSWORD', ''))
+
+    def search_s(self, *args, **kwargs):
+        return self.connection.search_s(*args, **kwargs)
+
+
+class LDAPConnectionPool(object):
+    """
+    A thread-safe pool of connections to one LDAP server.
+    """
+
+    def __init__(self, url, size=10, health_check_interval=30, connection_factory=None):
+        """
+        :param url:                     URL of the LDAP server
+        :param size:                    maximum number of idle connections to keep
+        :param health_check_interval:   connections idle for more than this many
+                                        seconds are checked before being reused
+        :param connection_factory:      callable taking the URL and returning a
+                                        new connection, ldap.initialize by default
+        """
+        self.url = url
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.connection_factory = connection_factory or ldap.initialize
+        #: list of (connection, bound DN, time of last use) tuples
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check a connection out of the pool for the duration of a with block.
+        The connection goes back into the pool afterward, unless the block
+        raised an error indicating that the connection is broken.
+        """
+        pooled = self._checkout()
+        try:
+            yield pooled
+        except CONNECTION_ERRORS:
+            self._discard(pooled.connection)
+            raise
+        except:
+            self._checkin(pooled)
+            raise
+        else:
+            self._checkin(pooled)
+
+    def clear(self):
+        """ close every idle connection """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, bound_dn, last_used in idle:
+            self._discard(connection)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                item = self._idle.pop() if self._idle else None
+            if item is None:
+                _logger.debug('opening new connection to %s' % self.url)
+                return PooledConnection(self.connection_factory(self.url))
+            connection, bound_dn, last_used = item
+            if time.time() - last_used < self.health_check_interval or self._healthy(connection):
+                return PooledConnection(connection, bound_dn)
+            self._discard(connection)
+
+    def _checkin(self, pooled):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((pooled.connection, pooled.bound_dn, time.time()))
+                return
+        self._discard(pooled.connection)
+
+    def _healthy(self, connection):
+        try:
+            connection.whoami_s()
+            return True
+        except ldap.LDAPError:
+            _logger.info('discarding stale connection to %s' % self.url)
+            return False
+
+    def _discard(self, connection):
+        try:
+            connection.unbind_s()
+        except ldap.LDAPError:
+            pass
+
+
+class LDAPLookupCache(object):
+    """
+    A small thread-safe cache whose entries expire after a fixed time.
+    """
+
+    def __init__(self, timeout=300, max_entries=10000):
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[1] < time.time():
+                del self._entries[key]
+                return default
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._cull()
+            self._entries[key] = (value, time.time() + self.timeout)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _cull(self):
+        now = time.time()
+        for key, (value, expires) in self._entries.items():
+            if expires < now:
+                del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+
+_pool = None
+_cache = None
+_connection_factory = None
+_state_lock = threading.Lock()
+
+def get_pool():
+    """
+    :return:    the process-wide LDAPConnectionPool for settings.LDAP_URL
+    """
+    global _pool
+    with _state_lock:
+        if _pool is None or _pool.url != settings.LDAP_URL:
+            if getattr(settings, 'LDAP_CACERT_FILE', None):
+                ldap.set_option(ldap.OPT_X_TLS_CACERTFILE, settings.LDAP_CACERT_FILE)
+            _pool = LDAPConnectionPool(settings.LDAP_URL,
+                getattr(settings, 'LDAP_POOL_SIZE', 10),
+                getattr(settings, 'LDAP_POOL_HEALTH_CHECK_INTERVAL', 30),
+                _connection_factory)
+        return _pool
+
+def get_cache():
+    """
+    :return:    the process-wide cache of LDAP lookups
+    """
+    global _cache
+    with _state_lock:
+        if _cache is None:
+            _cache = LDAPLookupCache(getattr(settings, 'LDAP_LOOKUP_CACHE_TIMEOUT', 300))
+        return _cache
+
+def reset(connection_factory=None):
+    """
+    Throw away the pool and the cache, and optionally use a different
+    connection factory from now on (for instance FakeLDAPServer.initialize).
+    """
+    global _pool, _cache, _connection_factory
+    with _state_lock:
+        if _pool is not None:
+            _pool.clear()
+        _pool = None
+        _cache = None
+        _connection_factory = connection_factory
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -14,6 +14,8 @@ class OrgRoleManager(ObjectManager):
     Manage roles that users can have in organizations in the Power Reg system
     """
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -31,7 +31,9 @@ from pr_services.object_manager import ObjectManager
 from pr_services.rpc.service import service_method
 from pr_services.utils import upload
 from pr_services.utils import Utils
+from pr_services.utils import password_hashing
 from pr_services import middleware
+from pr_services.user_system import ldap_pool
 from pr_messaging import send_message
 import facade
 
@@ -124,9 +126,6 @@ class UserManager(ObjectManager):
         self.user_model_name = self.my_django_model().__class__.__name__
         if hasattr(settings, 'LDAP_SCHEMA'):
             self.ldap_user_model_name = settings.LDAP_SCHEMA[self.user_model_name]['ldap_object_class']
-            if hasattr(settings, 'LDAP_CACERT_FILE') and settings.LDAP_CACERT_FILE:
-                ldap.set_option(ldap.OPT_X_TLS_CACERTFILE, settings.LDAP_CACERT_FILE)
-            self.ldap_connection = ldap.initialize(settings.LDAP_URL)
         self.photo_storage_engine = storage.UserPhotoStorage()
     
     @service_method
@@ -234,8 +233,7 @@ class UserManager(ObjectManager):
         # calculate a cryptographic hash of the User's password
         # for storage in the db
         salt = self._generate_password_salt()
-        password_hash = Utils._hash(initial_password + salt, 'SHA-512')
-        password_hash_type = 'SHA-512'
+        password_hash_type, password_hash = password_hashing.hash_password(initial_password, salt)
 
         u = self.my_django_model(last_name=last_name, first_name=first_name, title=title, phone=phone,
             email=email, status=status)
@@ -408,10 +406,18 @@ class UserManager(ObjectManager):
         """
         
         self.check_password_against_policy(new_password)
-        domain_affiliation.password_hash_type = 'SHA-512'
+        self._set_password_hash(domain_affiliation, new_password)
+
+    def _set_password_hash(self, domain_affiliation, password):
+        """
+        Hash a password with a new salt, using the configured hash type and
+        cost, and save it on a DomainAffiliation.
+        """
+
         salt = self._generate_password_salt()
         domain_affiliation.password_salt = salt
-        domain_affiliation.password_hash = Utils._hash(new_password + salt, 'SHA-512')
+        domain_affiliation.password_hash_type, domain_affiliation.password_hash = \
+            password_hashing.hash_password(password, salt)
         domain_affiliation.save()
 
     @service_method
@@ -526,6 +532,33 @@ class UserManager(ObjectManager):
             o.save()
         return accounts
 
+    @service_method
+    def bulk_create(self, auth_token, account_detail_list, require_unique_email=False):
+        """
+        Create many User accounts at once, for feeds of thousands of accounts.
+
+        Unlike batch_create(), the whole batch is validated before anything is
+        written, passwords are hashed in parallel and the Users, their default
+        DomainAffiliations, default Groups and (if ASSIGN_ORG_ROLES_FROM_EMAIL
+        is set) their organization roles are stored with multi-row inserts.
+        All of the Users share a single Blame.  Only attributes that are plain
+        columns on User may be given, along with 'domain' and 'send_password'.
+
+        :param account_detail_list:   Array of structs containing the arguments taken
+                                      by the create() method indexed by field name
+        :param require_unique_email:  if True, reject accounts whose email address
+                                      is already used by another User
+        :type require_unique_email:   bool
+
+        :return:     Struct of usernames indexed by primary keys for accounts that were created
+
+        :raises: pr_services.exceptions.ImportException with validation messages indexed
+                 by position in account_detail_list, if any account is invalid
+        """
+
+        return facade.subsystems.UserProvisioner(self, auth_token).provision(
+            account_detail_list, require_unique_email)
+
     @service_method
     def login(self, username, password, domain=u'local'):
         """
@@ -794,20 +827,28 @@ class UserManager(ObjectManager):
         gather all the information we are allowed to gather about user, storing that
         information on our local copy.
 
+        The LDAP entry is cached for a few minutes, and it is only copied onto
+        the user the first time it is retrieved, so repeated logins don't
+        rewrite the user each time.
+
         :param user: The user we want to know about
         :type user:  facade.models.User
         """
         try:
-            user = domain_affiliation.user
             self._get_users_ldap_dn(domain_affiliation)
-            ldap_results = self.ldap_connection.search_s(domain_affiliation.ldap_dn, ldap.SCOPE_SUBTREE, '(cn=%s)'%(domain_affiliation.username))
-            # Assert that the length of the LDAP results is 1
-            if len(ldap_results) != 1:
-                if len(ldap_results) == 0:
-                    # The user wasn't found in LDAP
-                    raise exceptions.ForeignObjectNotFoundException('The user %s was not found in the remote directory.'%(domain_affiliation.username))
-                raise exceptions.InternalErrorException('There was more than one record returned by LDAP for username %s'%domain_affiliation.username)
-            ldap_results = ldap_results[0]
+            cache = ldap_pool.get_cache()
+            cache_key = ('attributes', domain_affiliation.ldap_dn)
+            cached = cache.get(cache_key)
+            if cached is None:
+                with ldap_pool.get_pool().connection() as connection:
+                    connection.bind_for_search()
+                    cached = {'entry' : self._search_ldap_entry(connection, domain_affiliation),
+                        'applied' : False}
+                cache.set(cache_key, cached)
+            if cached['applied']:
+                return
+            user = domain_affiliation.user
+            ldap_results = cached['entry']
             user_ldap_schema = settings.LDAP_SCHEMA[self.user_model_name]['local_attributes']
             for user_field in user_ldap_schema.keys():
                 try:
@@ -832,10 +873,29 @@ class UserManager(ObjectManager):
                 except KeyError: # This will happen if the ldap entry doesn't contain one of the attributes we care about
                     continue
             user.save()
+            cached['applied'] = True
         except ldap.NO_SUCH_OBJECT:
             # The user wasn't found in LDAP
             raise exceptions.ForeignObjectNotFoundException('The user %s was not found in the remote directory.'%(domain_affiliation.username))
 
+    def _search_ldap_entry(self, connection, domain_affiliation):
+        """
+        Retrieve a user's LDAP entry.
+
+        :param connection:          bound connection from the LDAP pool
+        :type connection:           ldap_pool.PooledConnection
+        :param domain_affiliation:  DomainAffiliation with an ldap_dn attribute
+        :return:                    (dn, attributes) tuple
+        """
+        ldap_results = connection.search_s(domain_affiliation.ldap_dn, ldap.SCOPE_SUBTREE, '(cn=%s)'%(domain_affiliation.username))
+        # Assert that the length of the LDAP results is 1
+        if len(ldap_results) != 1:
+            if len(ldap_results) == 0:
+                # The user wasn't found in LDAP
+                raise exceptions.ForeignObjectNotFoundException('The user %s was not found in the remote directory.'%(domain_affiliation.username))
+            raise exceptions.InternalErrorException('There was more than one record returned by LDAP for username %s'%domain_affiliation.username)
+        return ldap_results[0]
+
     def _fail_authentication(self, username, domain=u'local'):
         """
         Any time authentication fails, this method gets called as a handler.
@@ -919,8 +979,19 @@ class UserManager(ObjectManager):
         :type actee:    facade.models.User
         """
         self._get_users_ldap_dn(domain_affiliation)
+        cache = ldap_pool.get_cache()
+        cache_key = ('attributes', domain_affiliation.ldap_dn)
         try:
-            self.ldap_connection.bind_s(domain_affiliation.ldap_dn, password, ldap.AUTH_SIMPLE)
+            with ldap_pool.get_pool().connection() as connection:
+                connection.simple_bind_s(domain_affiliation.ldap_dn, password)
+                # While we are bound as the user, fetch the entry that
+                # _collect_ldap_information() will want next.
+                if cache.get(cache_key) is None:
+                    try:
+                        cache.set(cache_key, {'applied' : False,
+                            'entry' : self._search_ldap_entry(connection, domain_affiliation)})
+                    except (ldap.NO_SUCH_OBJECT, exceptions.ForeignObjectNotFoundException):
+                        pass
         except ldap.INVALID_CREDENTIALS:
             self._fail_authentication(domain_affiliation.username, domain_affiliation.domain.name)
         except ldap.OTHER:
@@ -946,9 +1017,10 @@ class UserManager(ObjectManager):
         if not Utils._verify_hash(password, salt, domain_affiliation.password_hash_type, domain_affiliation.password_hash):
             self._fail_authentication(domain_affiliation.username, domain_affiliation.domain.name)
     
-        # If the user isn't using SHA-512, let's go ahead and update them to SHA-512 since they've authenticated
-        if domain_affiliation.password_hash_type != 'SHA-512':
-            self._change_password(domain_affiliation, password)
+        # If the password was hashed with an old hash type or cost, hash it
+        # again with the current one now that we know what it is
+        if password_hashing.needs_rehash(domain_affiliation.password_hash_type, domain_affiliation.password_hash):
+            self._set_password_hash(domain_affiliation, password)
 
     @service_method
     def logout(self, auth_token):
@@ -1029,15 +1101,23 @@ class UserManager(ObjectManager):
     def _get_usernames_ldap_dn(self, username):
         """
         This method will query LDAP for the DN of the user specified by username.
+        DNs that are found are cached for a few minutes.
         """
-        self.ldap_connection.bind_s('cn=Anonymous', '', ldap.AUTH_SIMPLE)
-        ldap_results = self.ldap_connection.search_s(settings.LDAP_BASE, ldap.SCOPE_SUBTREE, '(cn=%s)'%username)
+        cache = ldap_pool.get_cache()
+        ldap_dn = cache.get(('dn', username))
+        if ldap_dn is not None:
+            return ldap_dn
+        with ldap_pool.get_pool().connection() as connection:
+            connection.bind_for_search()
+            ldap_results = connection.search_s(settings.LDAP_BASE, ldap.SCOPE_SUBTREE, '(cn=%s)'%username)
         self.logger.debug('UserManager._get_usernames_ldap_dn(): ldap_results: [%s]' % str(ldap_results))
         if len(ldap_results) != 1:
             if len(ldap_results) == 0:
                 raise exceptions.ObjectNotFoundException(self.my_django_model.__class__.__name__)
             raise exceptions.InternalErrorException('More than one result was returned when querying LDAP for username %s'%username)
-        return ldap_results[0][0]
+        ldap_dn = ldap_results[0][0]
+        cache.set(('dn', username), ldap_dn)
+        return ldap_dn
 
     def _get_users_ldap_dn(self, domain_affiliation):
         """
@@ -0,0 +1,403 @@
+"""
+Bulk provisioning of User accounts
+
+UserManager.create() does a lot of work per account: it validates, hashes the
+password, saves the User several times, creates a Blame and checks
+permissions.  That is fine for self-registration, but far too slow for feeds
+of tens of thousands of accounts.  This module validates a whole batch in
+memory, checks uniqueness with one query per field, hashes passwords in a
+pool of worker processes and writes everything with multi-row inserts.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import date
+import logging
+import multiprocessing
+import random
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.hashcompat import sha_constructor
+from pr_services import exceptions
+from pr_services.utils import Utils
+from pr_services.utils import password_hashing
+from pr_messaging import send_message
+import facade
+
+def _hash_password(args):
+    """
+    Hash one password.  This is a module level function so that it can be
+    handed to a multiprocessing pool.
+
+    @param args     tuple of (password, salt, hash_type, cost)
+    @return         the encoded hash
+    """
+    password, salt, hash_type, cost = args
+    return password_hashing.get_hasher(hash_type, cost).encode(password, salt)
+
+
+class UserProvisioner(object):
+    """
+    Create many Users, with their default DomainAffiliations, default Groups
+    and email-derived organization roles, in a few statements.
+    """
+
+    #: attributes every account must specify, as for UserManager.create()
+    required_fields = ('username', 'initial_password', 'title', 'first_name',
+        'last_name', 'phone', 'email', 'status')
+    #: number of values to put in a single IN clause
+    chunk_size = 500
+
+    def __init__(self, user_manager, auth_token):
+        """
+        @param user_manager the UserManager on whose behalf we are working
+        @param auth_token   the acting user's AuthToken
+        """
+        self.user_manager = user_manager
+        self.auth_token = auth_token
+        self.authorizer = facade.subsystems.Authorizer()
+        self.logger = logging.getLogger('pr_services.user_provisioner')
+        User = facade.models.User
+        concrete_fields = set(f.name for f in User._meta.local_fields)
+        #: optional attributes that are plain columns on User
+        self.optional_fields = set(name for name, setter in user_manager.setters.iteritems()
+            if setter == 'set_general' and name in concrete_fields)
+        self.optional_fields.difference_update(self.required_fields)
+
+    def provision(self, account_detail_list, require_unique_email=False):
+        """
+        Validate and create a batch of accounts.  Nothing is written unless
+        every account in the batch is valid.
+
+        @param account_detail_list  list of dictionaries, each containing the
+                                    arguments taken by UserManager.create()
+                                    indexed by name.  Keys of the
+                                    'optional_attributes' dictionary may also
+                                    be given at the top level.
+        @param require_unique_email if True, reject accounts whose email
+                                    address is already in use
+        @return                     dictionary of usernames indexed by the new
+                                    Users' primary keys
+        @raises                     exceptions.ImportException with messages
+                                    indexed by position in the list if any
+                                    account is invalid
+        """
+        if not isinstance(self.auth_token, facade.models.AuthToken):
+            raise exceptions.NotLoggedInException()
+        errors = {}
+        accounts = []
+        for index, details in enumerate(account_detail_list):
+            account = self._prepare(details, errors.setdefault(index, {}))
+            accounts.append(account)
+        self._load_domains(accounts, errors)
+        for index, account in enumerate(accounts):
+            if not errors[index]:
+                self._validate(account, errors[index])
+        self._check_uniqueness(accounts, errors, require_unique_email)
+        errors = dict((index, messages) for index, messages in errors.iteritems() if messages)
+        if errors:
+            raise exceptions.ImportException(errors)
+        if not accounts:
+            return {}
+
+        for account in accounts:
+            self.authorizer.check_create_permissions(self.auth_token, account['user'])
+            if account['optional']:
+                self.authorizer.check_update_permissions(self.auth_token, account['user'],
+                    account['optional'])
+
+        self._hash_passwords(accounts)
+        blame = facade.managers.BlameManager().create(self.auth_token)
+        user_ids = self._insert_users(accounts, blame)
+        self._insert_domain_affiliations(accounts, user_ids)
+        self._insert_default_groups(user_ids)
+        assign_org_roles = getattr(settings, 'ASSIGN_ORG_ROLES_FROM_EMAIL', False)
+        send_messages = any(account['send_password'] or account['user'].confirmation_code
+            for account in accounts)
+        if assign_org_roles or send_messages:
+            organizations = self._organizations_by_email_domain(accounts)
+            if assign_org_roles:
+                self._insert_org_roles(accounts, user_ids, organizations)
+            if send_messages:
+                self._send_messages(accounts, user_ids, organizations)
+        self.logger.info('provisioned %d users' % len(user_ids))
+        return dict((user_id, account['username'])
+            for user_id, account in zip(user_ids, accounts))
+
+    def _prepare(self, details, messages):
+        """
+        Split one account's details into User attributes and everything else.
+        """
+        details = dict(details)
+        details.pop('auth_token', None)
+        details.update(details.pop('optional_attributes', None) or {})
+        account = {
+            'domain_name': details.pop('domain', u'local'),
+            'send_password': details.pop('send_password', False),
+            'username': details.get('username'),
+            'password': details.get('initial_password'),
+            'optional': {},
+            'user': None,
+        }
+        for field in self.required_fields:
+            if details.get(field) is None:
+                messages.setdefault(field, []).append(u'This field is required.')
+        attributes = {}
+        for field, value in details.iteritems():
+            if field in ('username', 'initial_password'):
+                continue
+            elif field in self.required_fields:
+                attributes[field] = value
+            elif field in self.optional_fields:
+                attributes[field] = value
+                account['optional'][field] = value
+            else:
+                messages.setdefault(field, []).append(
+                    u'This attribute cannot be set when creating users in bulk.')
+        account['attributes'] = attributes
+        return account
+
+    def _load_domains(self, accounts, errors):
+        """ look up all of the Domains named in the batch with one query """
+        names = set(account['domain_name'] for account in accounts)
+        domains = dict((d.name, d) for d in facade.models.Domain.objects.filter(name__in=names))
+        for index, account in enumerate(accounts):
+            account['domain'] = domains.get(account['domain_name'])
+            if account['domain'] is None:
+                errors[index].setdefault('domain', []).append(
+                    u'The domain %s does not exist.' % account['domain_name'])
+
+    def _validate(self, account, messages):
+        """ validate one account without touching the database """
+        def _add(field, message_list):
+            if message_list:
+                messages.setdefault(field, []).extend(message_list)
+
+        if account['domain_name'] != 'LDAP':
+            try:
+                self.user_manager.check_password_against_policy(account['password'])
+            except exceptions.PasswordPolicyViolation, e:
+                _add('initial_password', e.details.get('messages', []))
+        _add('username', facade.models.DomainAffiliation.check_username(
+            account['username'], account['domain_name']))
+        user = facade.models.User(**account['attributes'])
+        user.truncate_charfields()
+        for field, message_list in user.validate().iteritems():
+            _add(field, message_list)
+        if (user.status == 'pending' and user.confirmation_code is None and
+                getattr(settings, 'USER_EMAIL_CONFIRMATION', False)):
+            # the same confirmation code User.save() would generate
+            salt = sha_constructor(str(random.random())).hexdigest()[:5]
+            email = user.email
+            if isinstance(email, unicode):
+                email = email.encode('utf-8')
+            user.confirmation_code = sha_constructor(salt + email).hexdigest()
+        account['user'] = user
+
+    def _check_uniqueness(self, accounts, errors, require_unique_email):
+        """
+        Check usernames, and optionally email addresses, against each other
+        and against the database with one query per field.
+        """
+        usernames = {}
+        emails = {}
+        for index, account in enumerate(accounts):
+            if account['user'] is None:
+                continue
+            key = (account['username'], account['domain'].id)
+            if key in usernames:
+                errors[index].setdefault('username', []).append(
+                    u'The username %s appears more than once.' % account['username'])
+            usernames.setdefault(key, index)
+            if require_unique_email:
+                email = account['user'].email.lower()
+                if email in emails:
+                    errors[index].setdefault('email', []).append(
+                        u'The email address %s appears more than once.' % account['user'].email)
+                emails.setdefault(email, index)
+
+        taken = set()
+        names = list(set(username for username, domain_id in usernames))
+        for chunk in self._chunks(names):
+            taken.update(facade.models.DomainAffiliation.objects.filter(
+                username__in=chunk).values_list('username', 'domain'))
+        for key in taken.intersection(usernames):
+            errors[usernames[key]].setdefault('username', []).append(
+                u'The username %s is already in use.' % key[0])
+
+        if require_unique_email and emails:
+            # email addresses are compared case-insensitively, so the
+            # stored ones have to be lowercased in the query as well
+            User = facade.models.User
+            column = '%s.%s' % (connection.ops.quote_name(User._meta.db_table),
+                connection.ops.quote_name(User._meta.get_field('email').column))
+            taken = set()
+            for chunk in self._chunks(emails.keys()):
+                taken.update(email.lower() for email in User.objects.extra(
+                    where=['LOWER(%s) IN (%s)' % (column, ', '.join(['%s'] * len(chunk)))],
+                    params=chunk).values_list('email', flat=True))
+            for email in taken.intersection(emails):
+                errors[emails[email]].setdefault('email', []).append(
+                    u'The email address %s is already in use.' % email)
+
+    def _hash_passwords(self, accounts):
+        """
+        Generate salts and hash every password, using a pool of worker
+        processes for large batches.
+        """
+        hasher = password_hashing.get_hasher()
+        jobs = []
+        for account in accounts:
+            account['salt'] = self.user_manager._generate_password_salt()
+            jobs.append((account['password'], account['salt'], hasher.name, hasher.cost))
+        processes = getattr(settings, 'USER_BULK_CREATE_HASH_PROCESSES', 0)
+        if processes > 1 and len(jobs) >= getattr(settings, 'USER_BULK_CREATE_POOL_THRESHOLD', 1000):
+            pool = multiprocessing.Pool(processes)
+            try:
+                hashes = pool.map(_hash_password, jobs,
+                    max(1, len(jobs) // (processes * 4)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            hashes = map(_hash_password, jobs)
+        for account, password_hash in zip(accounts, hashes):
+            account['password_hash_type'] = hasher.name
+            account['password_hash'] = password_hash
+
+    def _insert_users(self, accounts, blame):
+        """
+        Insert the Users, all sharing the batch's Blame, and make each one its
+        own owner.
+
+        @return list of new User PKs, in the same order as accounts
+        """
+        User = facade.models.User
+        columns = [f for f in User._meta.local_fields if not f.primary_key]
+
+        def _rows():
+            for account in accounts:
+                user = account['user']
+                # leave out unset bookkeeping fields so bulk_insert fills them in
+                row = dict((f.attname, getattr(user, f.attname)) for f in columns
+                    if f.null or getattr(user, f.attname) is not None)
+                row['blame_id'] = blame.id
+                row['default_username'] = account['username']
+                row['default_domain'] = account['domain_name']
+                yield row
+
+        Utils.bulk_insert(User, _rows())
+        # Each User in the batch is marked with the batch's Blame, and primary
+        # keys are assigned in insertion order.
+        user_ids = list(User.objects.filter(blame__id=blame.id).order_by('id').values_list(
+            'id', flat=True))
+        if len(user_ids) != len(accounts):
+            raise exceptions.InternalErrorException(
+                'expected %d new users but found %d' % (len(accounts), len(user_ids)))
+        opts = User._meta
+        qn = connection.ops.quote_name
+        cursor = connection.cursor()
+        cursor.execute('UPDATE %s SET %s = %s WHERE %s = %%s' % (qn(opts.db_table),
+            qn(opts.get_field('owner').column), qn(opts.pk.column),
+            qn(opts.get_field('blame').column)), [blame.id])
+        transaction.commit_unless_managed()
+        return user_ids
+
+    def _insert_domain_affiliations(self, accounts, user_ids):
+        rows = ({
+            'user': user_id,
+            'domain': account['domain'].id,
+            'username': account['username'],
+            'password_salt': account['salt'],
+            'password_hash': account['password_hash'],
+            'password_hash_type': account['password_hash_type'],
+            'default': True,
+        } for user_id, account in zip(user_ids, accounts))
+        Utils.bulk_insert(facade.models.DomainAffiliation, rows)
+
+    def _insert_default_groups(self, user_ids):
+        group_ids = list(facade.models.Group.objects.filter(default=True).values_list(
+            'id', flat=True))
+        if group_ids:
+            Utils.bulk_insert(facade.models.User.groups.through,
+                ({'user': user_id, 'group': group_id}
+                    for user_id in user_ids for group_id in group_ids))
+
+    def _organizations_by_email_domain(self, accounts):
+        """
+        @return dictionary of lists of (Organization, effective OrgRole)
+                tuples, indexed by email domain
+        """
+        email_domains = set()
+        for account in accounts:
+            email_domains.update(self._email_domains(account['user']))
+        ret = {}
+        if not email_domains:
+            return ret
+        default_role = None
+        for org_email_domain in facade.models.OrgEmailDomain.objects.filter(
+                email_domain__in=email_domains).select_related('organization', 'role'):
+            role = org_email_domain.role
+            if role is None:
+                if default_role is None:
+                    default_role = facade.models.OrgRole.objects.get(default=True)
+                role = default_role
+            ret.setdefault(org_email_domain.email_domain, []).append(
+                (org_email_domain.organization, role))
+        return ret
+
+    def _email_domains(self, user):
+        return [email.split('@', 1)[1] for email in filter(None, (user.email, user.email2))]
+
+    def _insert_org_roles(self, accounts, user_ids, organizations):
+        """
+        Insert the UserOrgRoles that assign_org_roles_from_email() would
+        create, for accounts that are created active.
+        """
+        def _rows():
+            for user_id, account in zip(user_ids, accounts):
+                if account['user'].status != 'active':
+                    continue
+                seen = set()
+                for email_domain in self._email_domains(account['user']):
+                    for organization, role in organizations.get(email_domain, []):
+                        if (organization.id, role.id) not in seen:
+                            seen.add((organization.id, role.id))
+                            yield {'owner': user_id, 'organization': organization.id,
+                                'role': role.id}
+        Utils.bulk_insert(facade.models.UserOrgRole, _rows())
+
+    def _send_messages(self, accounts, user_ids, organizations):
+        """
+        Send the initial password and confirmation messages that
+        UserManager.create() would send.
+        """
+        wanted = dict((user_id, account) for user_id, account in zip(user_ids, accounts)
+            if account['send_password'] or account['user'].confirmation_code)
+        if not wanted:
+            return
+        for user in facade.models.User.objects.filter(id__in=wanted.keys()):
+            account = wanted[user.id]
+            context = {
+                'user': user,
+                'date': date.today(),
+            }
+            for email_domain in self._email_domains(user):
+                if organizations.get(email_domain):
+                    context['organization'] = organizations[email_domain][0][0]
+                    break
+            if account['send_password']:
+                context['initial_password'] = account['password']
+                send_message(message_type='initial-password', recipient=user,
+                    context=context)
+            if user.confirmation_code:
+                context['confirmation_code'] = user.confirmation_code
+                send_message(message_type='user-confirmation', recipient=user,
+                    context=context)
+
+    def _chunks(self, values):
+        values = list(values)
+        for index in xrange(0, len(values), self.chunk_size):
+            yield values[index:index + self.chunk_size]
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -12,8 +12,11 @@ import logging
 import os
 import sys
 import unicodedata
-from django.db import transaction
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection, models, transaction
 from pr_services import exceptions
+from pr_services.utils import password_hashing
 import facade
 
 LOGGER_NAME = 'pr_services.utils'
@@ -175,12 +178,21 @@ class Utils(object):
             at = facade.models.AuthToken.objects.get(session_id__exact=auth_token_session_id)
         except facade.models.AuthToken.DoesNotExist:
             raise exceptions.NotLoggedInException()
+        sliding = settings.AUTH_TOKEN_SLIDING_EXPIRATION
         if at.time_of_expiration < now:
-            raise exceptions.AuthTokenExpiredException()
+            # the token may have been extended without the database knowing yet
+            expiration = None
+            if sliding:
+                expiration = facade.subsystems.AuthTokenActivity().expiration(at.session_id)
+            if expiration is None or expiration < now:
+                raise exceptions.AuthTokenExpiredException()
+            at.time_of_expiration = expiration
         at = at.downcast_completely()
-        if isinstance(at, facade.models.SingleUseAuthToken) and \
-                not _consume_single_use_token(at):
-            raise exceptions.AuthTokenExpiredException()
+        if isinstance(at, facade.models.SingleUseAuthToken):
+            if not _consume_single_use_token(at):
+                raise exceptions.AuthTokenExpiredException()
+        elif sliding:
+            facade.subsystems.AuthTokenActivity().record(at, now)
         return at
 
     @staticmethod
@@ -249,7 +261,8 @@ class Utils(object):
         @type input        string
         @param salt         salt, which may be empty
         @type salt         string
-        @param hash_type    name of hash type used
+        @param hash_type    name of hash type used, as understood by
+                            pr_services.utils.password_hashing
         @type hash_type    string
         @param hash         hash to which we will compare our calculated hash
         @type hash         string
@@ -258,10 +271,123 @@ class Utils(object):
         @rtype              bool
 
         """
-        assert hash_type in ['SHA-1', 'SHA-512'], \
-            "unknown hash type %s" % (hash_type)
-        pw_hash = Utils._hash(input + salt, hash_type)
-        return bool(pw_hash == hash)
+        return password_hashing.verify_password(input, salt, hash_type, hash)
+
+    @staticmethod
+    def bulk_insert(model_class, rows, batch_size=500):
+        """Insert many rows for one model using multi-row INSERT statements.
+
+        This bypasses save(), validate() and any model signals, so the caller
+        is responsible for handing us data that is already valid.  The
+        bookkeeping fields that every PRModel has (final_type,
+        create_timestamp and save_timestamp) are filled in automatically when
+        they are not given.  Models using multi-table inheritance are not
+        supported, since their rows span more than one table.
+
+        @param model_class  a class derived from django.db.models.Model
+        @param rows         iterable of dictionaries mapping field names (or
+                            attnames) to values.  Model instances are accepted
+                            as values for foreign keys.
+        @param batch_size   maximum number of rows per INSERT statement
+        @return             the number of rows inserted
+        @rtype              int
+        """
+        opts = model_class._meta
+        if opts.parents:
+            raise exceptions.InvalidUsageException(
+                'bulk_insert does not support multi-table inheritance (model %s)' %
+                opts.object_name)
+
+        fields = [f for f in opts.local_fields if not isinstance(f, models.AutoField)]
+        defaults = {}
+        now = datetime.datetime.utcnow()
+        for f in fields:
+            if f.name == 'final_type':
+                defaults[f.name] = ContentType.objects.get_for_model(model_class).id
+            elif f.name in ('create_timestamp', 'save_timestamp'):
+                defaults[f.name] = now
+
+        qn = connection.ops.quote_name
+        sql = 'INSERT INTO %s (%s) VALUES ' % (qn(opts.db_table),
+            ', '.join([qn(f.column) for f in fields]))
+        placeholder = '(%s)' % ', '.join(['%s'] * len(fields))
+        # SQLite limits the number of parameters per statement and older
+        # versions lack multi-row VALUES, so let executemany() do the work.
+        single_row = getattr(connection, 'vendor', None) == 'sqlite'
+
+        cursor = connection.cursor()
+        batch = []
+        count = 0
+
+        def _flush(batch):
+            if single_row:
+                cursor.executemany(sql + placeholder, batch)
+            else:
+                params = []
+                for values in batch:
+                    params.extend(values)
+                cursor.execute(sql + ', '.join([placeholder] * len(batch)), params)
+
+        for row in rows:
+            values = []
+            for f in fields:
+                if f.name in row:
+                    value = row[f.name]
+                elif f.attname in row:
+                    value = row[f.attname]
+                elif f.name in defaults:
+                    value = defaults[f.name]
+                elif f.has_default():
+                    value = f.get_default()
+                else:
+                    value = None
+                if isinstance(value, models.Model):
+                    value = value.pk
+                values.append(f.get_db_prep_save(value, connection=connection))
+            batch.append(values)
+            count += 1
+            if len(batch) >= batch_size:
+                _flush(batch)
+                batch = []
+        if batch:
+            _flush(batch)
+        transaction.commit_unless_managed()
+        return count
+
+    @staticmethod
+    def increment_counters(model_class, lookup, increments, defaults=None):
+        """Add to the counters of the row with a unique key, creating the row if
+        there is none.
+
+        The row is updated with F() expressions, and inserted only if the
+        update found nothing.  If another transaction inserts the same key
+        first, our insert fails on the model's unique constraint, so it is
+        rolled back to a savepoint and the update is made instead.  Either
+        way there is exactly one row per key.
+
+        @param model_class  a class derived from django.db.models.Model, with a
+                            unique constraint over the fields in lookup
+        @param lookup       dictionary mapping the names of the key fields to
+                            their values.  Foreign keys are given as PKs.
+        @param increments   dictionary mapping field names to the amounts to
+                            add to them, which are their values in a new row
+        @param defaults     dictionary of the other field values of a new row
+        """
+        updates = dict((name, models.F(name) + amount) for name, amount in increments.iteritems())
+        if model_class.objects.filter(**lookup).update(**updates):
+            return
+        values = {}
+        for fields in (lookup, defaults or {}, increments):
+            for name, value in fields.iteritems():
+                values[model_class._meta.get_field(name).attname] = value
+        sid = transaction.savepoint()
+        try:
+            model_class.objects.create(**values)
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+            model_class.objects.filter(**lookup).update(**updates)
+        else:
+            transaction.savepoint_commit(sid)
 
 class UnicodeCsvWriter(object):
     """A CSV writer which will write rows to CSV file "f",
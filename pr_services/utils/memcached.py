@@ -0,0 +1,105 @@
+"""
+Process-wide memcached clients and write-behind bookkeeping
+
+memcache.Client keeps its sockets open and is thread-local, so a single
+instance per process gives every thread its own persistent connections.
+Creating a client per object, on the other hand, opens new connections for
+each one.  Use get_client() instead of instantiating memcache.Client.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from __future__ import with_statement
+
+import calendar
+from datetime import datetime
+import threading
+
+from django.conf import settings
+import memcache
+
+_clients = {}
+_lock = threading.Lock()
+
+def get_client(servers=None):
+    """
+    @param servers  list of host:port strings, defaulting to
+                    settings.MEMCACHED_ADDRS
+    @return         the shared memcache.Client for those servers
+    """
+    if servers is None:
+        servers = getattr(settings, 'MEMCACHED_ADDRS', [])
+    key = tuple(servers)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = memcache.Client(list(servers))
+        return _clients[key]
+
+
+class WriteBehindLog(object):
+    """
+    Lists of keys that were written during fixed periods of time, stored in
+    memcached.  Writers add keys to the list for the current period; a
+    periodic task drains the lists for periods that have ended and persists
+    whatever the keys refer to.
+    """
+
+    #: how many undrained periods to look back at if we lose track
+    max_backlog = 10
+
+    def __init__(self, name, interval, client=None):
+        """
+        @param name     prefix for the memcached keys we use
+        @param interval length of a period in seconds
+        @param client   memcache.Client, or None for the shared one
+        """
+        self.name = name
+        self.interval = interval
+        self.client = client if client is not None else get_client()
+
+    def period(self, now=None):
+        """
+        @return the number of the period that contains a point in time
+        """
+        if now is None:
+            now = datetime.utcnow()
+        return calendar.timegm(now.utctimetuple()) // self.interval
+
+    def _period_key(self, period):
+        return '%s:period:%d' % (self.name, period)
+
+    def add(self, key, now=None):
+        """
+        Add a key to the list for the current period.
+
+        @return False if memcached could not be reached
+        """
+        period_key = self._period_key(self.period(now))
+        value = '%s ' % key
+        # append() fails if the list doesn't exist yet; add() fails if
+        # another process created it first
+        return bool(self.client.append(period_key, value) or
+            self.client.add(period_key, value, time=self.interval * self.max_backlog) or
+            self.client.append(period_key, value))
+
+    def drain(self, now=None):
+        """
+        Remove and return the keys listed for periods that have ended.
+
+        @return set of keys
+        """
+        current = self.period(now)
+        drained_key = '%s:drained' % self.name
+        first = self.client.get(drained_key)
+        if first is None or first < current - self.max_backlog:
+            first = current - self.max_backlog
+        period_keys = [self._period_key(period) for period in xrange(first, current)]
+        keys = set()
+        if period_keys:
+            for value in self.client.get_multi(period_keys).itervalues():
+                keys.update(value.split())
+            self.client.set(drained_key, current)
+            self.client.delete_multi(period_keys)
+        return keys
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,227 @@
+"""
+Pluggable password hashing
+
+Each hash type stored in DomainAffiliation.password_hash_type names a hasher
+here.  The salted SHA-1 and SHA-512 hashes we have always used are cheap to
+compute, which makes them cheap to attack as well, so new passwords are
+hashed with settings.PASSWORD_HASH_TYPE using the cost (work factor) given
+for it in settings.PASSWORD_HASH_COSTS.  The cost is stored with each hash,
+so it can be raised at any time; hashes made with an old type or cost are
+replaced the next time their owner logs in.
+
+Use the benchmark_password_hashing management command to find the highest
+cost that keeps verification within your login latency budget.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import binascii
+import hashlib
+import hmac
+
+from django.conf import settings
+
+from pr_services import exceptions
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+def _to_bytes(value):
+    # the hash functions need plain byte strings -- they choke on unicode
+    # objects with non-ASCII characters
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value or ''
+
+def _constant_time_compare(a, b):
+    if len(a) != len(b):
+        return False
+    result = 0
+    for x, y in zip(a, b):
+        result |= ord(x) ^ ord(y)
+    return result == 0
+
+def _pbkdf2_sha256(password, salt, iterations, length=32):
+    if hasattr(hashlib, 'pbkdf2_hmac'):
+        return hashlib.pbkdf2_hmac('sha256', password, salt, iterations, length)
+    # pure python version for interpreters older than 2.7.8
+    ret = ''
+    block = 1
+    while len(ret) < length:
+        u = hmac.new(password, salt + binascii.unhexlify('%08x' % block), hashlib.sha256).digest()
+        t = [ord(c) for c in u]
+        for i in xrange(iterations - 1):
+            u = hmac.new(password, u, hashlib.sha256).digest()
+            t = [a ^ ord(b) for a, b in zip(t, u)]
+        ret += ''.join(chr(c) for c in t)
+        block += 1
+    return ret[:length]
+
+
+class PasswordHasher(object):
+    """
+    Base class for password hashers
+
+    @cvar name          value stored in password_hash_type
+    @cvar default_cost  cost to use when settings.PASSWORD_HASH_COSTS doesn't
+                        name one, or None if the algorithm has no cost
+    """
+
+    name = None
+    default_cost = None
+    #: False if a required library is missing
+    available = True
+
+    def __init__(self, cost=None):
+        """
+        @param cost     work factor; defaults to the configured cost
+        """
+        if cost is None and self.default_cost is not None:
+            cost = getattr(settings, 'PASSWORD_HASH_COSTS', {}).get(self.name, self.default_cost)
+        self.cost = cost
+
+    def encode(self, password, salt):
+        """
+        @param password password to hash
+        @param salt     salt, which may be empty
+        @return         the string to store in password_hash
+        """
+        raise NotImplementedError
+
+    def verify(self, password, salt, encoded):
+        """
+        @return True iff the password matches the stored hash
+        """
+        return _constant_time_compare(self._encode_like(password, salt, encoded), encoded)
+
+    def cost_of(self, encoded):
+        """
+        @return the cost with which a stored hash was made
+        """
+        return None
+
+    def needs_rehash(self, encoded):
+        """
+        @return True if a stored hash was made with a different cost than
+                the one configured
+        """
+        return self.cost_of(encoded) != self.cost
+
+    def _encode_like(self, password, salt, encoded):
+        return self.encode(password, salt)
+
+
+class SHA1Hasher(PasswordHasher):
+    """ legacy salted SHA-1, hex encoded """
+
+    name = 'SHA-1'
+
+    def encode(self, password, salt):
+        return hashlib.sha1(_to_bytes(password) + _to_bytes(salt)).hexdigest()
+
+
+class SHA512Hasher(PasswordHasher):
+    """ legacy salted SHA-512, hex encoded """
+
+    name = 'SHA-512'
+
+    def encode(self, password, salt):
+        return hashlib.sha512(_to_bytes(password) + _to_bytes(salt)).hexdigest()
+
+
+class PBKDF2Hasher(PasswordHasher):
+    """
+    PBKDF2 with HMAC-SHA256.  The cost is the number of iterations, and the
+    stored hash looks like '<iterations>$<hex digest>'.
+    """
+
+    name = 'PBKDF2'
+    default_cost = 10000
+
+    def encode(self, password, salt):
+        digest = _pbkdf2_sha256(_to_bytes(password), _to_bytes(salt), self.cost)
+        return '%d$%s' % (self.cost, binascii.hexlify(digest))
+
+    def cost_of(self, encoded):
+        try:
+            return int(encoded.split('$', 1)[0])
+        except ValueError:
+            return None
+
+    def _encode_like(self, password, salt, encoded):
+        return PBKDF2Hasher(self.cost_of(encoded) or self.cost).encode(password, salt)
+
+
+class BCryptHasher(PasswordHasher):
+    """
+    bcrypt, if the bcrypt module is installed.  The cost is the base 2
+    logarithm of the number of rounds.  bcrypt makes its own salt, so the
+    salt we are given is not used.
+    """
+
+    name = 'BCRYPT'
+    default_cost = 12
+    available = bcrypt is not None
+
+    def encode(self, password, salt):
+        return bcrypt.hashpw(_to_bytes(password), bcrypt.gensalt(self.cost))
+
+    def verify(self, password, salt, encoded):
+        encoded = _to_bytes(encoded)
+        return _constant_time_compare(bcrypt.hashpw(_to_bytes(password), encoded), encoded)
+
+    def cost_of(self, encoded):
+        try:
+            return int(encoded.split('$')[2])
+        except (IndexError, ValueError):
+            return None
+
+
+#: hasher classes indexed by name
+HASHERS = dict((hasher.name, hasher) for hasher in
+    (SHA1Hasher, SHA512Hasher, PBKDF2Hasher, BCryptHasher))
+
+def get_hasher(hash_type=None, cost=None):
+    """
+    @param hash_type    name of the hasher; defaults to settings.PASSWORD_HASH_TYPE
+    @param cost         work factor; defaults to the configured cost
+    @return             a PasswordHasher
+    @raises             exceptions.InvalidUsageException for unknown or
+                        unavailable hash types
+    """
+    if hash_type is None:
+        hash_type = getattr(settings, 'PASSWORD_HASH_TYPE', 'SHA-512')
+    hasher_class = HASHERS.get(hash_type)
+    if hasher_class is None or not hasher_class.available:
+        raise exceptions.InvalidUsageException(
+            'The requested hash type %s is not supported.  Please choose from %s.' % (
+            hash_type, ', '.join(sorted(name for name, hasher in HASHERS.iteritems()
+            if hasher.available))))
+    return hasher_class(cost)
+
+def hash_password(password, salt):
+    """
+    Hash a password with the configured hasher and cost.
+
+    @return     tuple of (hash type, encoded hash)
+    """
+    hasher = get_hasher()
+    return hasher.name, hasher.encode(password, salt)
+
+def verify_password(password, salt, hash_type, encoded):
+    """
+    @return     True iff the password matches the stored hash
+    """
+    return get_hasher(hash_type).verify(password, salt, encoded)
+
+def needs_rehash(hash_type, encoded):
+    """
+    @return     True if a stored hash should be replaced because it was made
+                with a different hasher or cost than the configured one
+    """
+    hasher = get_hasher()
+    return hash_type != hasher.name or hasher.needs_rehash(encoded)
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,278 @@
+"""
+Versioned read-through cache for reference data
+
+Some kinds of objects, like venues, rooms, regions, roles and products, are
+read far more often than they change.  ObjectManagers for them set their
+cache_reads attribute to True, and get_filtered() then loads the objects that
+match a filter through this cache instead of querying the database each time.
+
+Each model whose ObjectManager caches reads has a generation counter in the
+cache, which PRModel.save() and PRModel.delete() increment.  Cache entries
+are keyed by the SQL of the query and the generations of every model whose
+table the query touches, so any change to one of those models makes the old
+entries unreachable; they simply expire.  Queries that touch tables of other
+models (such as users, or the tables behind ManyToManyFields), whether
+directly or through a subquery, are never cached, since changes to those
+tables don't increment any generation.
+
+During a request, the increment waits until the request's transaction has
+been committed (see pr_services.middleware.run_after_commit), so that other
+processes can't cache the old state under the new generation, and until then
+the request reads the models it changed from the database.
+
+Only model instances are cached.  The Getter narrows the query to the
+objects the actor may read before evaluating it, so entries are shared by all
+users whose permissions translate to the same conditions; the permissions on
+each object are still applied after it is read from the cache.
+
+Changes that bypass PRModel.save() and PRModel.delete(), such as
+QuerySet.update() and fixture loading, should be followed by a call to
+bump().  Outside of a request (celery tasks, management commands) the
+increment happens right away, so a query that runs after a save but before
+its transaction commits can still cache the old state of an object; the
+timeout of the backend bounds how long such an entry can live.
+
+The backend is given by settings.OBJECT_MANAGER_CACHE_BACKEND, using the
+URI syntax of CACHE_BACKEND, and caching is disabled if it is not set.  Every
+process that changes these models must share the backend, so use
+'memcached://' unless a single process serves all requests, in which case
+'locmem://' will do.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.db.models.sql.query import Query
+from django.db.models.sql.where import ExtraWhere
+from django.db import models
+from pr_services.middleware import get_request_cache, run_after_commit
+
+_logger = logging.getLogger('pr_services.read_cache')
+_backend = None
+_models_by_table = None
+_cached_models = None
+
+#: prefix for all of our cache keys
+KEY_PREFIX = 'pr_read_cache'
+
+def get_backend():
+    """
+    @return the cache backend, or None if caching is disabled
+    """
+    global _backend
+    if _backend is None:
+        uri = getattr(settings, 'OBJECT_MANAGER_CACHE_BACKEND', None)
+        if uri:
+            _backend = get_cache(uri)
+    return _backend
+
+def reset():
+    """
+    Forget the backend, clearing it first, so that the next call to
+    get_backend() reads the setting again.
+    """
+    global _backend
+    if _backend is not None:
+        _backend.clear()
+    _backend = None
+
+def _label(model):
+    return '%s.%s' % (model._meta.app_label, model._meta.object_name.lower())
+
+def _generation_key(model):
+    return '%s:generation:%s' % (KEY_PREFIX, _label(model))
+
+def _ancestors(model):
+    """ the model and every concrete model it inherits from """
+    ret = [model]
+    for parent in model._meta.parents:
+        ret.extend(_ancestors(parent))
+    return ret
+
+def get_cached_models():
+    """
+    @return set of the models whose ObjectManagers cache reads, and of the
+            models they inherit from
+    """
+    global _cached_models
+    if _cached_models is None:
+        # imported here because facade imports pr_models, which imports
+        # this module
+        import facade
+
+        ret = set()
+        for name in facade.managers.import_map:
+            manager_class = getattr(facade.managers, name)
+            if getattr(manager_class, 'cache_reads', False):
+                ret.update(_ancestors(manager_class().my_django_model))
+        _cached_models = ret
+    return _cached_models
+
+def bump(model):
+    """
+    Increment the generation of a model and of the models it inherits from,
+    so that cached queries which involve their tables are not used again.
+    Models whose reads aren't cached are ignored.  During a request, the
+    increment is made once the transaction has been committed.
+
+    @param model    model class
+    """
+    if get_backend() is None:
+        return
+    model_list = _ancestors(model)
+    if not get_cached_models().intersection(model_list):
+        return
+    pending = get_request_cache('read_cache').setdefault('pending', set())
+    if pending.issuperset(model_list):
+        return
+    pending.update(model_list)
+    run_after_commit(_increment, model_list)
+
+def _increment(model_list):
+    backend = get_backend()
+    if backend is None:
+        return
+    for cls in model_list:
+        key = _generation_key(cls)
+        try:
+            backend.incr(key)
+        except ValueError:
+            # Start from the current time rather than from 1, so that we don't
+            # reuse the generations of entries made before the counter was
+            # evicted.
+            backend.add(key, int(time.time() * 1000))
+
+def get_generations(model_list):
+    """
+    @param model_list   list of model classes
+    @return             list of the current generations of those models
+    """
+    backend = get_backend()
+    keys = [_generation_key(model) for model in model_list]
+    found = backend.get_many(keys)
+    ret = []
+    for key in keys:
+        if key not in found:
+            backend.add(key, int(time.time() * 1000))
+            found[key] = backend.get(key)
+        ret.append(found[key])
+    return ret
+
+def _get_models_by_table():
+    global _models_by_table
+    if _models_by_table is None:
+        _models_by_table = dict((model._meta.db_table, model) for model in models.get_models())
+    return _models_by_table
+
+def _nested_queries(node):
+    """
+    @param node     node of the where or having tree of a query
+    @return         list of the queries used as values in the tree, such as
+                    the QuerySet given to an __in lookup, or None if the tree
+                    has raw SQL from extra(), which could use any table
+    """
+    ret = []
+    for child in getattr(node, 'children', ()):
+        if isinstance(child, ExtraWhere):
+            return None
+        if isinstance(child, (list, tuple)):
+            value = child[-1]
+            if hasattr(value, 'query'):
+                value = value.query
+            if isinstance(value, Query):
+                ret.append(value)
+        else:
+            nested = _nested_queries(child)
+            if nested is None:
+                return None
+            ret.extend(nested)
+    return ret
+
+def _models_in_query(query):
+    """
+    @param query    compiled django.db.models.sql.Query
+    @return         list of the models whose tables the query or any of its
+                    subqueries uses, or None if any of them isn't cached or
+                    has been changed by the current request
+    """
+    models_by_table = _get_models_by_table()
+    cached_models = get_cached_models()
+    pending = get_request_cache('read_cache').get('pending', ())
+    ret = []
+    queries = [query]
+    while queries:
+        query = queries.pop()
+        if query.extra_tables:
+            return None
+        for alias in query.tables:
+            model = models_by_table.get(query.alias_map[alias][0])
+            if model not in cached_models or model in pending:
+                return None
+            if model not in ret:
+                ret.append(model)
+        for node in (query.where, query.having):
+            nested = _nested_queries(node)
+            if nested is None:
+                return None
+            queries.extend(nested)
+    return ret
+
+def evaluate(query_set):
+    """
+    Evaluate a QuerySet through the cache.
+
+    @param query_set    QuerySet to evaluate
+    @return             list of model instances
+    """
+    backend = get_backend()
+    if backend is None:
+        return list(query_set)
+    query = query_set.query.clone()
+    try:
+        sql, params = query.get_compiler(using=query_set.db).as_sql()
+    except EmptyResultSet:
+        return []
+    model_list = _models_in_query(query)
+    if model_list is None:
+        return list(query_set)
+    generations = get_generations(model_list)
+    if None in generations:
+        # the backend isn't working
+        return list(query_set)
+    key = '%s:query:%s' % (KEY_PREFIX, hashlib.md5('%s %r %s' % (sql, params,
+        ' '.join('%s=%s' % (_label(model), generation) for model, generation in
+        zip(model_list, generations)))).hexdigest())
+    ret = backend.get(key)
+    if ret is None:
+        ret = list(query_set)
+        backend.set(key, ret)
+    else:
+        _logger.debug('read %d %s objects from the cache' % (len(ret), _label(query_set.model)))
+    return ret
+
+
+class CachedQuerySet(object):
+    """
+    Stands in for a QuerySet that is given to a Getter, evaluating it through
+    the cache
+    """
+
+    def __init__(self, query_set):
+        self.query_set = query_set
+
+    def select_related(self, *fields):
+        return CachedQuerySet(self.query_set.select_related(*fields))
+
+    def __iter__(self):
+        return iter(evaluate(self.query_set))
+
+    def iterator(self):
+        return iter(evaluate(self.query_set))
+
+# vim:tabstop=4 shiftwidth=4 expandtab
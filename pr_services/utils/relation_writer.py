@@ -0,0 +1,297 @@
+"""
+Diff-based writes to many-to-many relationships
+
+Setting a relationship one member at a time costs a few queries per member,
+so editing a large group membership or task bundle gets slow.  RelationWriter
+reads the current rows of the relationship's through table with one query,
+works out which rows have to be added, changed and removed, and writes each
+of those sets together.
+
+Through models that keep to PRModel's save(), delete() and validate() and
+have no unique fields are plain join rows, so their new rows are validated in
+memory and inserted with Utils.bulk_insert(), and their removed rows are
+deleted with one statement.  Rows of other through models, such as
+Assignment, are still saved and deleted one at a time so their own logic
+runs, but without the queries it takes to find them.  Either way m2m_changed
+is sent after rows are added or removed, as the relationship's manager would.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import logging
+from django.db import models
+from django.db.models import signals
+from pr_services import exceptions, pr_models
+from pr_services.utils import read_cache
+import facade
+
+_logger = logging.getLogger('pr_services.utils.relation_writer')
+
+def is_plain(model):
+    """
+    Decide whether rows of a through model can be inserted and deleted in
+    bulk.  Models that aren't PRModels are always plain.
+    """
+
+    if not issubclass(model, pr_models.PRModel):
+        return True
+    for method_name in ('save', 'delete', 'validate'):
+        if getattr(model, method_name).im_func is not getattr(pr_models.PRModel,
+                method_name).im_func:
+            return False
+    if model._meta.unique_together:
+        return False
+    for field in model._meta.fields:
+        if field.unique and not field.primary_key:
+            return False
+    return True
+
+def check_exist(model, pks):
+    """
+    Make sure objects exist, with one query.
+
+    :raises exceptions.ObjectNotFoundException:   for the first PK without an object
+    """
+
+    pks = set(pks)
+    if not pks:
+        return
+    found = set(model.objects.filter(pk__in=pks).values_list('pk', flat=True))
+    for pk in sorted(pks - found):
+        raise exceptions.ObjectNotFoundException(model, pk)
+
+class RelationWriter(object):
+    """
+    Writes the rows of a through table that relate one object to others.
+
+    :param auth_token:          the actor's AuthToken, used to authorize
+                                changes to rows of through models that aren't
+                                auto-created
+    :param manager:             the ManyRelatedManager of the relationship on the
+                                object, such as user.groups
+    :param authorize:           whether to authorize changes to rows of the
+                                through model, when the caller hasn't already
+    """
+
+    def __init__(self, auth_token, manager, authorize=True):
+        self.auth_token = auth_token
+        self.authorizer = facade.subsystems.Authorizer()
+        self.through_model = manager.through
+        self.other_model = manager.model
+        self.instance = manager.instance
+        self.reverse = manager.reverse
+        opts = self.through_model._meta
+        self.source_field_name = manager.source_field_name
+        self.target_field_name = manager.target_field_name
+        self.source_attname = opts.get_field(manager.source_field_name).attname
+        self.target_attname = opts.get_field(manager.target_field_name).attname
+        self.plain = is_plain(self.through_model)
+        # Rows of auto-created through models can't be authorized on their own.
+        self.authorized = authorize and not opts.auto_created
+        # A pair of objects can be related more than once unless the through
+        # model says otherwise, so members already present are only changed
+        # in place when the pair is unique.
+        self.unique_pairs = bool(opts.auto_created) or \
+            self._pair_is_unique(manager.source_field_name, manager.target_field_name)
+
+    def _pair_is_unique(self, source_field_name, target_field_name):
+        unique_together = self.through_model._meta.unique_together
+        if unique_together and not isinstance(unique_together[0], (list, tuple)):
+            unique_together = (unique_together,)
+        for field_names in unique_together:
+            if set(field_names) == set((source_field_name, target_field_name)):
+                return True
+        return False
+
+    def rows(self):
+        """ a QuerySet of the rows that relate our object to others """
+
+        return self.through_model.objects.filter(
+            **{self.source_field_name: self.instance.pk})
+
+    def update(self, add=(), remove=()):
+        """
+        Relate our object to more objects and unrelate it from others.
+        Members to remove that aren't related are ignored, though they must
+        exist unless the through model is auto-created.
+
+        :param add:     list of (PK, extras) tuples for the objects to relate,
+                        where extras is a dictionary of attributes for the
+                        through model's row, or None
+        :param remove:  PKs of the objects to unrelate.  Objects that are also
+                        in add end up unrelated.
+        """
+
+        remove = set(remove)
+        # like adding a member and then removing it
+        add = [(pk, extras) for pk, extras in add if pk not in remove]
+        add_pks = set(pk for pk, extras in add)
+        if not self.through_model._meta.auto_created:
+            check_exist(self.other_model, add_pks | remove)
+        else:
+            check_exist(self.other_model, add_pks)
+        current = {}
+        known_rows = list(self.rows().filter(**{'%s__in' % self.target_field_name:
+                add_pks | remove}))
+        for row in known_rows:
+            current.setdefault(getattr(row, self.target_attname), []).append(row)
+
+        removed = []
+        for pk in remove:
+            if pk in current:
+                removed.extend(current.pop(pk))
+            else:
+                _logger.debug('object %s of model %s is not related to %s' %
+                    (pk, self.other_model.__name__, self.instance))
+        if removed:
+            self._delete(removed)
+
+        new_rows = []
+        pending = {}
+        for pk, extras in add:
+            if self.unique_pairs and pk in current:
+                row = current[pk][0]
+                if extras:
+                    self._apply_extras(row, extras)
+                    row.save()
+            elif self.unique_pairs and pk in pending:
+                row, row_extras = pending[pk]
+                if extras:
+                    self._apply_extras(row, extras)
+                    row_extras.update(extras)
+            else:
+                row = self.through_model(**{self.source_attname: self.instance.pk,
+                    self.target_attname: pk})
+                extras = dict(extras or {})
+                self._apply_extras(row, extras)
+                new_rows.append((row, extras))
+                pending[pk] = (row, extras)
+        if new_rows:
+            self._insert(new_rows, known_rows)
+
+    def replace(self, items):
+        """
+        Relate our object to exactly some objects.  Rows that already relate
+        it to one of them are kept, and saved only if their extra attributes
+        change.
+
+        :param items:   list of (PK, extras) tuples as taken by update().  A PK
+                        may appear more than once if the through model allows it.
+        """
+
+        check_exist(self.other_model, set(pk for pk, extras in items))
+        current = {}
+        known_rows = list(self.rows().order_by('id'))
+        for row in known_rows:
+            current.setdefault(getattr(row, self.target_attname), []).append(row)
+        new_rows = []
+        for pk, extras in items:
+            extras = dict(extras or {})
+            if current.get(pk):
+                row = current[pk].pop(0)
+                fields = row._meta.local_fields
+                before = [getattr(row, f.attname) for f in fields]
+                self._apply_extras(row, extras)
+                if before != [getattr(row, f.attname) for f in fields]:
+                    row.save()
+            else:
+                row = self.through_model(**{self.source_attname: self.instance.pk,
+                    self.target_attname: pk})
+                self._apply_extras(row, extras)
+                new_rows.append((row, extras))
+        removed = [r for rows in current.itervalues() for r in rows]
+        if removed:
+            self._delete(removed)
+        if new_rows:
+            self._insert(new_rows, known_rows)
+
+    def _apply_extras(self, row, extras):
+        """ set the extra attributes of a through model's row, once authorized """
+
+        if not extras:
+            return
+        if self.authorized:
+            self.authorizer.check_update_permissions(self.auth_token, row, extras)
+        for extra_attribute, extra_value in extras.iteritems():
+            if extra_attribute not in dir(row):
+                raise exceptions.AttributeNotFoundException(extra_attribute)
+            field = row._meta.get_field(extra_attribute)
+            # handle the case where we are updating a foreign key relationship and have a primary key
+            if isinstance(field, models.ForeignKey) and isinstance(extra_value, (int, long)):
+                setattr(row, field.attname, extra_value)
+            # This handles most general types of relationships, plus a ForeignKey if the value we have is a Model instance
+            else:
+                setattr(row, extra_attribute, extra_value)
+
+    def _insert(self, new_rows, known_rows):
+        """
+        Save new rows and authorize their creation together.
+
+        :param new_rows:    list of (row, extras) tuples of unsaved through
+                            model instances and the extra attributes set on them
+        :param known_rows:  rows already loaded that relate our object to
+                            others, including every one that relates it to
+                            the objects of new_rows
+        """
+
+        if not self.plain:
+            for row, extras in new_rows:
+                row.save()
+        else:
+            bulk_rows = []
+            for row, extras in new_rows:
+                if isinstance(row, pr_models.PRModel):
+                    row.truncate_charfields()
+                    validation_errors = row.validate()
+                    if validation_errors:
+                        raise pr_models.ModelDataValidationError(validation_errors)
+                values = {self.source_attname: self.instance.pk,
+                    self.target_attname: getattr(row, self.target_attname)}
+                for extra_attribute in extras:
+                    attname = row._meta.get_field(extra_attribute).attname
+                    values[attname] = getattr(row, attname)
+                bulk_rows.append(values)
+            facade.subsystems.Utils.bulk_insert(self.through_model, bulk_rows)
+            self._bump()
+        if self.authorized:
+            if not self.plain:
+                created = self.through_model.objects.filter(
+                    id__in=[row.id for row, extras in new_rows])
+            else:
+                # the bulk insert doesn't give us the new IDs
+                pks = set(getattr(row, self.target_attname) for row, extras in new_rows)
+                created = self.rows().filter(**{'%s__in' % self.target_field_name: pks}
+                    ).exclude(id__in=[row.id for row in known_rows
+                    if getattr(row, self.target_attname) in pks])
+            self.authorizer.check_create_permissions_for_set(self.auth_token, created)
+        self._send_changed('post_add', [row for row, extras in new_rows])
+
+    def _bump(self):
+        """ invalidate cached reads, as PRModel.save() and delete() would """
+
+        if issubclass(self.through_model, pr_models.PRModel):
+            read_cache.bump(self.through_model)
+
+    def _delete(self, rows):
+        """ authorize the deletion of rows together, then delete them """
+
+        doomed = self.through_model.objects.filter(id__in=[row.id for row in rows])
+        if self.authorized:
+            self.authorizer.check_delete_permissions_for_set(self.auth_token, doomed)
+        if self.plain:
+            doomed.delete()
+            self._bump()
+        else:
+            for row in rows:
+                row.delete()
+        self._send_changed('post_remove', rows)
+
+    def _send_changed(self, action, rows):
+        """ send m2m_changed, as the relationship's manager would """
+
+        signals.m2m_changed.send(sender=self.through_model, action=action,
+            instance=self.instance, reverse=self.reverse, model=self.other_model,
+            pk_set=set(getattr(row, self.target_attname) for row in rows),
+            using=self.through_model.objects.db)
+
+# vim:tabstop=4 shiftwidth=4 expandtab
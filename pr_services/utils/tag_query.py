@@ -0,0 +1,145 @@
+"""
+Tag queries expressed in SQL
+
+django-tagging answers tag_union and tag_intersection filters by loading
+every matching object, and reads and writes tags one object and one tag at a
+time.  The functions here build the same filters as subqueries over
+TaggedItem, so the database joins them into the main query, read the tags of
+a whole result set with one query, and apply tag changes to an object as a
+single diff.
+
+As with django-tagging, tags that don't exist are ignored by the filters,
+and tags are attached to the content type of the object's own class.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
+from django.db.models.query import QuerySet
+from tagging import settings as tagging_settings
+from tagging.models import Tag, TaggedItem
+from tagging.utils import get_tag_list, parse_tag_input
+from pr_services import exceptions
+import facade
+
+def _tagged_items(model):
+    """ TaggedItems for objects of a model """
+
+    return TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(model)).order_by()
+
+def _tags(tags):
+    """
+    Resolve tag input in any of the forms get_tag_list() accepts to a Tag
+    QuerySet or a list of Tag PKs.
+    """
+
+    try:
+        tags = get_tag_list(tags)
+    except ValueError, e:
+        raise exceptions.InvalidFilterException(unicode(e))
+    if isinstance(tags, QuerySet):
+        return tags
+    return [tag.id for tag in tags]
+
+def union_query(model, tags):
+    """
+    Build a condition matching the objects that have any of some tags.
+
+    :param model:   the model being filtered
+    :param tags:    tag names or PKs, or a string of tag names
+    :return:        django.db.models.Q using a subquery over TaggedItem
+    """
+
+    return Q(pk__in=_tagged_items(model).filter(tag__in=_tags(tags)).values(
+        'object_id'))
+
+def intersection_query(model, tags):
+    """
+    Build a condition matching the objects that have all of some tags.
+
+    :param model:   the model being filtered
+    :param tags:    tag names or PKs, or a string of tag names
+    :return:        django.db.models.Q using a grouped subquery over TaggedItem
+    """
+
+    tags = _tags(tags)
+    if isinstance(tags, QuerySet):
+        tags = tags.values_list('id', flat=True)
+    tag_ids = set(tags)
+    if not tag_ids:
+        return Q(pk__in=[])
+    items = _tagged_items(model).filter(tag__id__in=tag_ids)
+    if len(tag_ids) > 1:
+        items = items.values('object_id').annotate(tag_count=Count('tag')).filter(
+            tag_count=len(tag_ids))
+    return Q(pk__in=items.values('object_id'))
+
+def tags_for_objects(model, objects):
+    """
+    Read the tag names of many objects with one query.
+
+    :param model:   the model of the objects
+    :param objects: PKs of the objects, or a QuerySet of them, which is used
+                    as a subquery
+    :return:        dictionary of lists of tag names, indexed by object PK.
+                    Objects without tags are omitted.
+    """
+
+    if isinstance(objects, QuerySet):
+        objects = objects.values('pk')
+    ret = {}
+    for object_id, name in _tagged_items(model).filter(
+            object_id__in=objects).order_by('tag__name').values_list(
+            'object_id', 'tag__name'):
+        ret.setdefault(object_id, []).append(name)
+    return ret
+
+def normalize(tag_name):
+    """
+    Clean up a single tag name the way Tag.objects.add_tag() does.  Quotes
+    are added first, so names with spaces stay one tag.
+
+    :raises exceptions.InvalidDataException:  if the name is empty
+    """
+
+    tag_names = parse_tag_input(u'"%s"' % tag_name)
+    if len(tag_names) != 1:
+        raise exceptions.InvalidDataException('invalid tag name "%s"' % tag_name)
+    if tagging_settings.FORCE_LOWERCASE_TAGS:
+        return tag_names[0].lower()
+    return tag_names[0]
+
+def update_tags(obj, add=(), remove=()):
+    """
+    Add and remove tags on an object.  Tags in both lists end up removed.
+    The current tags are read with one query, tags that don't exist yet are
+    created together, the new TaggedItems are inserted together and the
+    removed ones are deleted with one statement.
+
+    :param obj:     the model instance being tagged
+    :param add:     names of tags to add
+    :param remove:  names of tags to remove
+    """
+
+    add = set(normalize(name) for name in add)
+    remove = set(remove) | set(normalize(name) for name in remove if name)
+    items = _tagged_items(obj.__class__).filter(object_id=obj.pk)
+    current = set(items.values_list('tag__name', flat=True))
+    if current & remove:
+        items.filter(tag__name__in=current & remove).delete()
+    add = add - current - remove
+    if not add:
+        return
+    tag_ids = dict(Tag.objects.filter(name__in=add).values_list('name', 'id'))
+    missing = add - set(tag_ids)
+    if missing:
+        facade.subsystems.Utils.bulk_insert(Tag,
+            [{'name': name} for name in missing])
+        tag_ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+    content_type_id = ContentType.objects.get_for_model(obj).id
+    facade.subsystems.Utils.bulk_insert(TaggedItem, [{'tag': tag_ids[name],
+        'content_type': content_type_id, 'object_id': obj.pk} for name in add])
+
+# vim:tabstop=4 shiftwidth=4 expandtab
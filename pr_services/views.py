@@ -9,6 +9,7 @@ from django.utils import simplejson as json
 import utils
 import facade
 from pr_services import exceptions
+from pr_services.cookiecache import get_cached_value
 
 
 _logger = logging.getLogger('pr_services.views')
@@ -22,7 +23,8 @@ def blank_page(request):
 
 def cookiecache(request, auth_token):
     """
-    Look up an entry in the CachedCookie database table.
+    Look up an entry in the cookie cache, falling back to the CachedCookie
+    database table if memcached doesn't have it.
     
     @param request the request
     @type request django.http.HttpRequest
@@ -32,12 +34,11 @@ def cookiecache(request, auth_token):
     
     response = HttpResponse(mimetype='text/plain')
     
-    try:
-        cached_cookie = facade.models.CachedCookie.objects.get(key=auth_token)
-        response.write(cached_cookie.value)
-    except facade.models.CachedCookie.DoesNotExist:
+    value = get_cached_value(auth_token)
+    if value is None:
         logging.info(u'pr_services.views.cookiecache: lookup for non-existent auth token [%s]' % auth_token)
-        response.write('')
+        value = ''
+    response.write(value)
     
     return response
 
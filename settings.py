@@ -50,6 +50,8 @@ MIDDLEWARE_CLASSES = (
     #'django.contrib.sessions.middleware.SessionMiddleware',
     #'django.contrib.auth.middleware.AuthenticationMiddleware',
     #'django.middleware.doc.XViewMiddleware',
+    # must come before TransactionMiddleware, see its docstring
+    'pr_services.middleware.AfterCommit',
     'django.middleware.transaction.TransactionMiddleware',
     'pr_services.middleware.ThreadLocal',
 )
@@ -112,18 +114,30 @@ CELERYBEAT_SCHEDULE = {
         'task' : 'pr_services.tasks.remove_old_auth_tokens',
         'schedule' : timedelta(seconds=(60 * 60)), #every hour
     },
+    'flush_auth_token_activity': {
+        'task' : 'pr_services.tasks.flush_auth_token_activity',
+        'schedule' : timedelta(seconds=60), #every minute
+    },
+    'persist_cached_cookies': {
+        'task' : 'pr_services.tasks.persist_cached_cookies',
+        'schedule' : timedelta(seconds=60), #every minute
+    },
     'process_completed_sessions': {
         'task' : 'pr_services.tasks.process_completed_sessions',
         'schedule' : timedelta(seconds=(60 * 60)), #every hour
     },
+    'process_session_reminders': {
+        'task' : 'pr_services.tasks.process_session_reminders',
+        'schedule' : timedelta(seconds=(60 * 5)), #every 5 minutes
+    },
+    'send_message_digests': {
+        'task' : 'pr_messaging.tasks.send_digests',
+        'schedule' : timedelta(seconds=(60 * 5)), #every 5 minutes
+    },
     #'cleanup_paypal_ec_tokens' : {
     #    'task' : 'pr_services.tasks.cleanup_paypal_ec_tokens',
     #    'schedule' : 'FIXME: there was no schedule in the AsynchronousProcessor',
     #},
-    #'process_session_reminders' : {
-    #    'task' : 'pr_services.tasks.process_session_reminders',
-    #    'schedule' : 'FIXME: there was no schedule in the AsynchronousProcessor',
-    #},
 }
 
 # Define a custom TRACE log level and Logger class with a trace() method.
@@ -187,6 +201,126 @@ AWS_ENCODING_OAI_S3_USER = '1a85ad8fea02b4d948b962948f69972a72da6bed800a7e9ca7d0
 # things we upload should not be readable by others
 AWS_DEFAULT_ACL = 'private'
 
+# Count the views of each video per day in VideoViewCount as they are
+# registered, so that num_views and get_num_views_by_date read one row per day
+# rather than every VideoSession.  Views registered while this is off are
+# missing from the counts until ./manage.py rebuild_video_view_counts is run.
+VOD_INCREMENTAL_VIEW_COUNTS = False
+
+## Bulk processing settings
+
+# Curriculum enrollments with more users than this have their assignments
+# created by a celery task instead of during the RPC call.
+CURRICULUM_ENROLLMENT_ASYNC_THRESHOLD = 200
+
+# When process_completed_sessions completes a Session, also complete the
+# assigned or pending Assignments of the Users whose attendance was recorded
+# with an AssignmentAttempt.  Otherwise only the Session's status changes.
+SESSION_COMPLETION_COMPLETES_ATTENDEES = False
+
+# Number of worker processes UserManager.bulk_create() uses to hash passwords,
+# and the smallest batch for which it starts them.  Fewer than two processes
+# hashes in the calling process.
+USER_BULK_CREATE_HASH_PROCESSES = 0
+USER_BULK_CREATE_POOL_THRESHOLD = 1000
+
+## Password hashing settings
+
+# Hash type for new passwords; see pr_services.utils.password_hashing.
+# Passwords hashed some other way are rehashed when their owners log in.
+PASSWORD_HASH_TYPE = 'PBKDF2'
+# Cost (work factor) for each hash type.  Run
+# ./manage.py benchmark_password_hashing to pick one for your hardware.
+PASSWORD_HASH_COSTS = {
+    'PBKDF2' : 10000,
+    'BCRYPT' : 12,
+}
+
+## Cookie cache settings
+
+# Save cookie cache entries to memcached right away and copy them to the
+# database later, in batches, with the persist_cached_cookies task.
+COOKIECACHE_WRITE_BEHIND = True
+# Entries saved during each period of this many seconds are copied together.
+COOKIECACHE_FLUSH_INTERVAL = 60
+
+## Auth token settings
+
+# Extend an auth token's expiration every time it is used, rather than
+# requiring the user to log in again after AUTH_TOKEN_EXPIRATION_INTERVAL.
+AUTH_TOKEN_SLIDING_EXPIRATION = True
+# A token is extended at most once in this many seconds.
+AUTH_TOKEN_ACTIVITY_GRANULARITY = 60
+# Extensions are kept in memcached and written to the database by the
+# flush_auth_token_activity task once per this many seconds.
+AUTH_TOKEN_ACTIVITY_FLUSH_INTERVAL = 60
+# Number of expired auth tokens the remove_old_auth_tokens task deletes with
+# one statement.
+AUTH_TOKEN_DELETE_CHUNK_SIZE = 1000
+
+## Messaging settings
+
+# Most messages that are sent together are handed to Celery this many at a
+# time.
+MESSAGING_BATCH_SIZE = 100
+# Messages queued during a request or batch are handed to Celery early once
+# this many are waiting.
+MESSAGING_QUEUE_MAX_PENDING = 1000
+# Each process checks whether message types, formats or templates have changed
+# at most once in this many seconds.
+MESSAGING_REGISTRY_CHECK_INTERVAL = 10
+# Messages of types sent as digests are collected for each recipient for this
+# many seconds, starting with the first one, and then sent together by the
+# send_message_digests task.
+MESSAGING_DIGEST_WINDOW = 60 * 60 * 24
+
+## Object manager read cache settings
+
+# Cache backend for reference data such as venues, rooms and products; see
+# pr_services.utils.read_cache.  Every process that serves requests or runs
+# tasks must share it, so set this to something like
+# 'memcached://host:11211/?timeout=300' to enable the cache.
+OBJECT_MANAGER_CACHE_BACKEND = None
+
+## Exam reporting settings
+
+# Build evaluation summaries from the ResponseAggregate tallies that finishing
+# an exam session updates, instead of grouping every Response.  Free-text
+# answers are still read from the responses.  Exam sessions finished while
+# this is off aren't tallied until EvaluationAggregator().rebuild() recounts
+# their exams.
+EXAM_INCREMENTAL_AGGREGATES = False
+
+## Full-text search settings
+
+# Text fields kept in the search index, with the weight of each, indexed by
+# model name as found in facade.models.  Only database fields can be indexed,
+# and only objects on which the actor may read all of a model's indexed fields
+# are found.  Models that aren't installed are
+# skipped, and objects of subclasses are indexed under each configured model
+# they inherit from.  After changing this, rebuild the index with the
+# rebuild_search_index management command.
+SEARCH_INDEX_FIELDS = {
+    'ForumPost': {'body': 1},
+    'ForumTopic': {'name': 3},
+    'Task': {'name': 3, 'title': 3, 'description': 1},
+    'User': {'first_name': 3, 'last_name': 3},
+}
+
+# Update the search index in a celery task after each save or delete rather
+# than while saving.
+SEARCH_INDEX_ASYNC = False
+
+## Forum attachment settings
+
+# How the web server can send attachment downloads itself, once they have been
+# authorized: 'X-Sendfile' for Apache's mod_xsendfile or lighttpd,
+# 'X-Accel-Redirect' for nginx, or None to have Django stream them.
+FORUM_ATTACHMENT_SENDFILE = None
+
+# With X-Accel-Redirect, the internal nginx location that serves MEDIA_ROOT.
+FORUM_ATTACHMENT_ACCEL_REDIRECT_PREFIX = '/protected_media/'
+
 # Include any local settings that override the defaults.
 try:
     local_settings_path = os.path.join(PROJECT_ROOT, 'local_settings.py')
@@ -88,4 +88,9 @@ if 'vod_aws' in settings.INSTALLED_APPS:
         (r'^vod_aws/', include('vod_aws.urls', namespace='vod_aws')),
     )
 
+if 'forum' in settings.INSTALLED_APPS:
+    urlpatterns += patterns('',
+        (r'^forum/', include('forum.urls', namespace='forum')),
+    )
+
 # vim:tabstop=4 shiftwidth=4 expandtab
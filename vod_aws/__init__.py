@@ -13,6 +13,13 @@ facade.models.add_import('VideoCategory', 'vod_aws.models')
 facade.models.add_import('EncodedVideo', 'vod_aws.models')
 facade.models.add_import('Video', 'vod_aws.models')
 facade.models.add_import('VideoSession', 'vod_aws.models')
+facade.models.add_import('VideoViewCount', 'vod_aws.models')
+
+# register our subsystems
+facade.subsystems.add_import('VideoViewStatistics', 'vod_aws.view_statistics')
 
 # register our authorizer, overriding the one currently on the facade
 facade.subsystems.override('Authorizer', 'vod_aws.authorizer')
+
+# register our getter, which reads video statistics for whole result sets
+facade.subsystems.override('Getter', 'vod_aws.getter')
@@ -1,8 +1,15 @@
+from django.db.models import Q
 import facade
 from pr_services import exceptions
 from pr_services.authorizer_decorators import *
 
 class Authorizer(facade.subsystems.Authorizer):
+    query_translators = dict(facade.subsystems.Authorizer.query_translators,
+        actor_is_manager_of_actee_related_category='actor_is_manager_of_actee_related_category_query',
+        actor_is_member_of_actee_related_category_authorized_groups='actor_is_member_of_actee_related_category_authorized_groups_query',
+        assignment_is_not_video='assignment_is_not_video_query',
+    )
+
     def assignment_is_not_video(self, auth_token, actee):
         """Returns True iff the actee is an Assignment the Task in which is not a Video"""
 
@@ -13,6 +20,13 @@ class Authorizer(facade.subsystems.Authorizer):
             return False
         return True
 
+    def assignment_is_not_video_query(self, auth_token, model):
+        """ query translator for assignment_is_not_video() """
+
+        if not issubclass(model, facade.models.Assignment):
+            raise exceptions.InvalidActeeTypeException()
+        return Q(task__video__isnull=True)
+
     def actor_is_manager_of_actee_related_category(self, auth_token, actee):
         """
         Returns True iff the actor is a manager of a category that the
@@ -58,6 +72,19 @@ class Authorizer(facade.subsystems.Authorizer):
                 return True
         return False
 
+    def actor_is_manager_of_actee_related_category_query(self, auth_token, model):
+        """
+        query translator for actor_is_manager_of_actee_related_category(),
+        which has no SQL equivalent but only applies to some types
+        """
+
+        if not issubclass(model, (facade.models.Assignment,
+                facade.models.EncodedVideo, facade.models.Video,
+                facade.models.VideoCategory, facade.models.Category,
+                facade.models.VideoSession, facade.models.User)):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
     def actor_is_member_of_actee_related_category_authorized_groups(self, auth_token, actee):
         """
         Returns true iff the actor is a member of an authorized group on a
@@ -92,6 +119,19 @@ class Authorizer(facade.subsystems.Authorizer):
             return True
         return False
 
+    def actor_is_member_of_actee_related_category_authorized_groups_query(self, auth_token, model):
+        """
+        query translator for
+        actor_is_member_of_actee_related_category_authorized_groups(), which
+        has no SQL equivalent but only applies to some types
+        """
+
+        if not issubclass(model, (facade.models.Assignment,
+                facade.models.EncodedVideo, facade.models.Video,
+                facade.models.Category)):
+            raise exceptions.InvalidActeeTypeException()
+        return None
+
     @does_not_use_actee
     def actor_is_member_of_any_organization(self, auth_token, actee):
         """
@@ -0,0 +1,36 @@
+"""
+Getter with the derived Video attributes that are read for a whole result
+set at once
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+import facade
+from pr_services.gettersetter import is_for_derived_attribute
+
+class Getter(facade.subsystems.Getter):
+
+    @is_for_derived_attribute
+    def get_num_views_from_video(self, result_object, field_name):
+        """
+        Gets the number of times a Video has been viewed.  The views of every
+        Video in the result set are counted with one query the first time.
+        """
+        if 'num_views' not in self.cache:
+            self.cache['num_views'] = facade.subsystems.VideoViewStatistics(
+                ).count_views(self.read_access.query_set)
+        return self.cache['num_views'].get(result_object.id, 0)
+
+    @is_for_derived_attribute
+    def get_users_who_watched_from_video(self, result_object, field_name):
+        """
+        Gets the PKs of the Users who have been assigned a Video.  The users
+        of every Video in the result set are read with one query the first
+        time.
+        """
+        if 'users_who_watched' not in self.cache:
+            self.cache['users_who_watched'] = facade.subsystems.VideoViewStatistics(
+                ).viewers(self.read_access.query_set)
+        return self.cache['users_who_watched'].get(result_object.id, [])
+
+# vim:tabstop=4 shiftwidth=4 expandtab
@@ -0,0 +1,15 @@
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+import facade
+
+class Command(NoArgsCommand):
+    help = ('Recalculates the daily view counts of every video from its '
+        'sessions.  Run it before turning on VOD_INCREMENTAL_VIEW_COUNTS, and '
+        'after changing when existing sessions started.')
+
+    @transaction.commit_on_success
+    def handle_noargs(self, **options):
+        facade.subsystems.VideoViewStatistics().rebuild()
+        print 'Rebuilt the daily view counts of all videos'
+
+# vim:tabstop=4 shiftwidth=4 expandtab
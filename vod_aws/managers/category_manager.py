@@ -14,6 +14,8 @@ from pr_services.utils import Utils
 class CategoryManager(ObjectManager):
     """Manage Categories in the Power Reg system"""
 
+    cache_reads = True
+
     def __init__(self):
         """ constructor """
 
@@ -59,7 +59,7 @@ class VideoManager(TaskManager):
             'length' : 'get_general',
             'live' : 'get_general',
             'name' : 'get_general',
-            'num_views' : 'get_general',
+            'num_views' : 'get_num_views_from_video',
             'owner' : 'get_foreign_key',
             'photo_url' : 'get_general',
             'prerequisite_tasks' : 'get_many_to_many',
@@ -67,7 +67,7 @@ class VideoManager(TaskManager):
             'src_file_size' : 'get_general',
             'status' : 'get_general',
             'tags': 'get_tags',
-            'users_who_watched' : 'get_general',
+            'users_who_watched' : 'get_users_who_watched_from_video',
         })
         self.setters.update({
             'aspect_ratio' : 'set_general',
@@ -173,8 +173,8 @@ class VideoManager(TaskManager):
         a call to get_filtered(), but also adds an attribute 'num_views'.  This attribute
         normally shows the total number of times a video has been viewed, but in
         this special method it can show how many times a video was viewed inside of the
-        specified date range.  This is a bit of an expensive call, because we are taking
-        advantage of code reuse by using get_filtered.
+        specified date range.  The views of all of the videos are counted together, so
+        the number of queries doesn't grow with the number of videos.
 
         :param auth_token:           The authentication token of the acting user
         :type auth_token:            facade.models.AuthToken
@@ -192,19 +192,23 @@ class VideoManager(TaskManager):
             filter = dict()
         if requested_attributes is None:
             requested_attributes = list()
-        elif 'num_views' in requested_attributes:
-            # We're going to come behind get_filtered and get the num_views with the date filters, so
-            # let's not have it fetch that data this time around
-            requested_attributes.remove('num_views')
+        # We're going to come behind get_filtered and get the num_views with the date filters, so
+        # let's not have it fetch that data this time around
+        requested_attributes = [a for a in requested_attributes if a != 'num_views']
         video_dicts = self.get_filtered(auth_token, filter, requested_attributes)
+        if not video_dicts:
+            return video_dicts
+        # Videos on which the actor may not read num_views are left without it
+        read_access = self.authorizer.get_read_access(auth_token,
+            self.my_django_model.objects.filter(id__in=[v['id'] for v in video_dicts]),
+            ['num_views'])
+        readable = set(video.id for video in read_access.query_set
+            if read_access.get_authorized_attributes(video))
+        num_views = facade.subsystems.VideoViewStatistics().count_views(readable,
+            start_date, end_date)
         for video_dict in video_dicts:
-            try:
-                video = self._find_by_id(video_dict['id'])
-                self.authorizer.check_read_permissions(auth_token, video, ['num_views'])
-                video_dict['num_views'] = video._get_num_views(start_date, end_date)
-            except exceptions.PermissionDeniedException:
-                # If we get permission denied, just ignore it and continue
-                pass
+            if video_dict['id'] in readable:
+                video_dict['num_views'] = num_views.get(video_dict['id'], 0)
         return video_dicts
 
     @transaction.commit_manually
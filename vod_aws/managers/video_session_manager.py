@@ -5,6 +5,7 @@ VideoSessionManager class
 """
 
 from datetime import datetime, timedelta
+from django.conf import settings
 from pr_services.credential_system.assignment_attempt_manager import AssignmentAttemptManager
 from pr_services import pr_time
 from pr_services.rpc.service import service_method
@@ -50,6 +51,7 @@ class VideoSessionManager(AssignmentAttemptManager):
         new_video_session = self.my_django_model(assignment=assignment_object)
         new_video_session.save()
         self.authorizer.check_create_permissions(auth_token, new_video_session)
+        self._record_view(new_video_session)
         ret = {}
         ret['id'] = new_video_session.id
         ret['urls'] = list()
@@ -90,8 +92,15 @@ class VideoSessionManager(AssignmentAttemptManager):
         else:
             attempt = self.my_django_model.objects.create(assignment=assignment)
             self.authorizer.check_create_permissions(auth_token, attempt)
+            self._record_view(attempt)
         return {'id':attempt.id}
 
+    def _record_view(self, video_session):
+        """Add a new VideoSession to the daily view counts, if they are kept."""
+
+        if getattr(settings, 'VOD_INCREMENTAL_VIEW_COUNTS', False):
+            facade.subsystems.VideoViewStatistics().record(video_session)
+
     @service_method
     def watcher_report(self, auth_token, videos, start_date=None, end_date=None):
         """
@@ -11,7 +11,6 @@ from pr_services import exceptions
 from pr_services import storage
 from storages.backends.s3boto import S3BotoStorage
 import tagging
-from pr_services import pr_time
 import facade
 
 class Video(pr_models.Task):
@@ -80,16 +79,8 @@ class Video(pr_models.Task):
     def _get_num_views(self, start_date=None, end_date=None):
         """Returns the number of VideoSession objects that are associated with this Video object, optionally filtered by start and end dates."""
 
-        session_filter = {'assignment__task__id__exact' : self.id}
-        if start_date is not None:
-            if pr_time.is_iso8601(start_date):
-                start_date = pr_time.iso8601_to_datetime(start_date)
-            session_filter['date_started__gte'] = start_date
-        if end_date is not None:
-            if pr_time.is_iso8601(end_date):
-                end_date = pr_time.iso8601_to_datetime(end_date)
-            session_filter['date_started__lte'] = end_date
-        return VideoSession.objects.filter(**session_filter).count()
+        return facade.subsystems.VideoViewStatistics().count_views([self.id],
+            start_date, end_date).get(self.id, 0)
     #: The number of times this video has been viewed
     num_views = property(_get_num_views)
 
@@ -98,10 +89,7 @@ class Video(pr_models.Task):
         Returns a list of the primary keys of the User objects that this Video has VideoSession objects for.
         """
 
-        user_keys_list = facade.models.User.objects.filter(assignments__task__id__exact=self.id).values_list('id', flat=True)
-        # Let's use a set to make this list unique
-        user_keys_set = set(user_keys_list)
-        return list(user_keys_set)
+        return facade.subsystems.VideoViewStatistics().viewers([self.id]).get(self.id, [])
 
     #: A list of primary keys of User objects that have watched this Video
     users_who_watched = property(_get_users_who_watched)
@@ -214,3 +202,19 @@ class VideoSession(pr_models.AssignmentAttempt):
         if self.pk == None:
             self.date_completed = datetime.utcnow()
         super(VideoSession, self).save(*args, **kwargs)
+
+class VideoViewCount(models.Model):
+    """Number of VideoSessions started for a Video on one day."""
+
+    # VideoViewStatistics.record() adds each registered view to the row of
+    # its video and the day it started, and rebuild() recounts them.
+
+    class Meta:
+        unique_together = (('video', 'date'),)
+
+    #: The video whose views are counted.
+    video = pr_models.PRForeignKey(Video, related_name='view_counts')
+    #: The day (UTC) on which the counted sessions were started.
+    date = models.DateField()
+    #: Number of sessions counted.
+    count = models.PositiveIntegerField(default=0)
@@ -6,7 +6,7 @@
 """
 from __future__ import with_statement
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.urlresolvers import reverse
 import facade
@@ -228,6 +228,34 @@ We aliens don't mind, however.  All of our videos are imaginary to humans.''',
         self.failUnless(self.video_1.id in pks)
         self.failUnless(self.video_2.id in pks)
 
+        # tags that don't exist are ignored, as django-tagging does
+        ret = self.video_manager.get_filtered(self.admin_token,
+            {'tag_intersection' : ['blah', 'no such tag']}, ['name'])
+        self.assertEquals([v['id'] for v in ret], [self.video_2.id])
+        ret = self.video_manager.get_filtered(self.admin_token,
+            {'tag_union' : ['no such tag']}, ['name'])
+        self.assertEquals(ret, [])
+
+    def test_tags_of_many_objects(self):
+        self.video_manager.update(self.admin_token, self.video_3.id,
+            {'tags' : {'add' : ['Two Words', 'uninteresting'], 'remove' : ['blah']}})
+        ret = self.video_manager.get_filtered(self.admin_token,
+            {'member' : {'id' : [self.video_1.id, self.video_2.id, self.video_3.id]}},
+            ['tags'])
+        tags = dict((v['id'], v['tags']) for v in ret)
+        self.assertEquals(tags, {self.video_1.id : [],
+            self.video_2.id : ['blah', 'uninteresting'],
+            self.video_3.id : ['two words', 'uninteresting']})
+        # a tag both added and removed ends up removed
+        self.video_manager.update(self.admin_token, self.video_2.id,
+            {'tags' : {'add' : ['blah', 'new'], 'remove' : ['blah']}})
+        ret = self.video_manager.get_filtered(self.admin_token,
+            {'tag_intersection' : ['two words', 'uninteresting']}, ['tags'])
+        self.assertEquals([v['id'] for v in ret], [self.video_3.id])
+        ret = self.video_manager.get_filtered(self.admin_token,
+            {'member' : {'id' : [self.video_2.id]}}, ['tags'])
+        self.assertEquals(ret[0]['tags'], ['new', 'uninteresting'])
+
 
 class TestViews(VideoTestCase):
     def setUp(self):
@@ -712,6 +740,76 @@ class TestVideoSystem(VideoTestCase):
             (self.right_now+self.one_day*2).isoformat())[0]
         self.assertEqual(result['num_views'], 0)
 
+    def test_view_counts(self):
+        group = self.group_manager.create(self.admin_token, 'group1')
+        self.category_manager.update(self.admin_token, 1,
+            {'authorized_groups' : [group.id]})
+        student, student_at = self.create_student(group='group1')
+        student2, student2_at = self.create_student(group='group1')
+        videos = []
+        for i in range(3):
+            video = self._upload_video(self.admin_token, '720x480_4.3.mov')
+            self.video_category_manager.update(self.admin_token,
+                video.category_relationships.all()[0].id, {'status' : 'approved'})
+            videos.append(video)
+        video_ids = [v.id for v in videos]
+        old_setting = settings.VOD_INCREMENTAL_VIEW_COUNTS
+        settings.VOD_INCREMENTAL_VIEW_COUNTS = True
+        try:
+            sessions = []
+            for at in (student_at, student2_at):
+                sessions.append(self.video_session_manager.register_video_view(
+                    at, videos[0].id)['id'])
+            sessions.append(self.video_session_manager.register_video_view(
+                student_at, videos[1].id)['id'])
+            # each new view is added to the count of its video and day
+            self.assertEquals(sorted(facade.models.VideoViewCount.objects.values_list(
+                'video', 'date', 'count')), [(videos[0].id, datetime.utcnow().date(), 2),
+                (videos[1].id, datetime.utcnow().date(), 1)])
+            # an old view, counted on the day it now appears to have started
+            the_past = datetime.utcnow().replace(hour=12, minute=0, second=0,
+                microsecond=0) - timedelta(days=3)
+            facade.models.VideoSession.objects.filter(id=sessions[0]).update(
+                date_started=the_past)
+        finally:
+            settings.VOD_INCREMENTAL_VIEW_COUNTS = old_setting
+        # moving a session to another day takes a rebuild
+        statistics = facade.subsystems.VideoViewStatistics()
+        statistics.rebuild()
+        self.assertEquals(facade.models.VideoViewCount.objects.filter(
+            video__id=videos[0].id).count(), 2)
+        ranges = [
+            (None, None, {videos[0].id : 2, videos[1].id : 1}),
+            # whole days
+            (the_past.replace(hour=0), the_past.replace(hour=0) + timedelta(days=1),
+                {videos[0].id : 1}),
+            # partial days at either end
+            (the_past - timedelta(hours=1), the_past + timedelta(hours=1),
+                {videos[0].id : 1}),
+            (the_past + timedelta(hours=1), the_past + timedelta(days=5),
+                {videos[0].id : 1, videos[1].id : 1}),
+            (the_past - timedelta(days=1), the_past - timedelta(hours=1), {}),
+        ]
+        for start_date, end_date, expected in ranges:
+            for use_counts in (False, True):
+                self.assertEquals(statistics.count_views(video_ids, start_date,
+                    end_date, use_counts), expected)
+        # the views of all of the videos are counted together
+        self.assertNumQueries(1, statistics.count_views, video_ids,
+            the_past - timedelta(hours=1), None, False)
+        self.assertNumQueries(2, statistics.count_views, video_ids,
+            the_past - timedelta(hours=1), None, True)
+        viewers = statistics.viewers(video_ids)
+        self.assertEquals(set(viewers[videos[0].id]), set([student.id, student2.id]))
+        self.assertEquals(viewers[videos[1].id], [student.id])
+        self.assertFalse(videos[2].id in viewers)
+        result = self.video_manager.get_num_views_by_date(self.admin_token,
+            {'member' : {'id' : video_ids}}, ['name', 'num_views'],
+            (the_past - timedelta(hours=1)).replace(tzinfo=pr_time.UTC()).isoformat(),
+            (the_past + timedelta(hours=1)).replace(tzinfo=pr_time.UTC()).isoformat())
+        self.assertEquals(dict((v['id'], v['num_views']) for v in result),
+            {videos[0].id : 1, videos[1].id : 0, videos[2].id : 0})
+
     def test_locking_categories(self):
         cat = self.category_manager.create(self.admin_token, 'acat')
         cat2 = self.category_manager.create(self.admin_token, 'anothercat')
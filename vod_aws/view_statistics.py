@@ -0,0 +1,167 @@
+"""
+Grouped view counts for Videos
+
+Every view of a Video is a VideoSession, and counting them one Video at a
+time costs a query per Video, which makes dashboards listing many Videos
+slow.  This module counts the views of any number of Videos, optionally
+within a range of dates, with one grouped query over VideoSession.
+
+When settings.VOD_INCREMENTAL_VIEW_COUNTS is True, the views are also tallied
+per Video and day in VideoViewCount rows, which are updated as each view is
+registered, so counts don't have to scan the sessions at all.  Only the
+partial days at the ends of a date range are then read from the sessions.
+
+@copyright Copyright 2011 American Research Institute, Inc.
+"""
+
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db.models import Count, Q, Sum
+from pr_services import pr_time
+import facade
+
+class VideoViewStatistics(object):
+    """
+    Counts the VideoSessions of Videos and the Users who watched them.
+    Methods that take videos accept a list of Video PKs or a QuerySet of
+    Videos, which is used as a subquery.
+    """
+
+    def count_views(self, videos, start_date=None, end_date=None, use_counts=None):
+        """
+        Count the views of some Videos.
+
+        :param videos:      PKs of the Videos, or a QuerySet of them
+        :param start_date:  only count sessions started at or after this time
+        :type start_date:   datetime or ISO8601 string
+        :param end_date:    only count sessions started at or before this time
+        :type end_date:     datetime or ISO8601 string
+        :param use_counts:  read whole days from the incrementally maintained
+                            VideoViewCount rows instead of the sessions.
+                            Defaults to settings.VOD_INCREMENTAL_VIEW_COUNTS.
+        :return:            dictionary of numbers of views indexed by Video
+                            PK.  Videos without views are omitted.
+        """
+
+        if use_counts is None:
+            use_counts = getattr(settings, 'VOD_INCREMENTAL_VIEW_COUNTS', False)
+        start_date = self._parse_date(start_date)
+        end_date = self._parse_date(end_date)
+        if not use_counts:
+            return self._count_sessions(videos, self._date_range(start_date, end_date))
+        # whole days that fall within the range are tallied; the partial
+        # days at either end have to be counted from the sessions
+        first_day = None
+        if start_date is not None:
+            first_day = start_date.date()
+            if start_date != self._midnight(first_day):
+                first_day += timedelta(days=1)
+        end_day = None if end_date is None else end_date.date()
+        if first_day is not None and end_day is not None and first_day >= end_day:
+            return self._count_sessions(videos, self._date_range(start_date, end_date))
+        tallies = facade.models.VideoViewCount.objects.filter(video__in=videos)
+        if first_day is not None:
+            tallies = tallies.filter(date__gte=first_day)
+        if end_day is not None:
+            tallies = tallies.filter(date__lt=end_day)
+        ret = dict((row['video'], row['views']) for row in
+            tallies.order_by().values('video').annotate(views=Sum('count')))
+        edges = None
+        if first_day is not None and start_date != self._midnight(first_day):
+            edges = self._date_range(start_date, self._midnight(first_day), True)
+        if end_day is not None:
+            edge = self._date_range(self._midnight(end_day), end_date)
+            edges = edge if edges is None else edges | edge
+        if edges is not None:
+            for video_id, views in self._count_sessions(videos, edges).iteritems():
+                ret[video_id] = ret.get(video_id, 0) + views
+        return ret
+
+    def viewers(self, videos):
+        """
+        Find the Users who have been assigned some Videos.
+
+        :param videos:  PKs of the Videos, or a QuerySet of them
+        :return:        dictionary of lists of User PKs indexed by Video PK.
+                        Videos nobody was assigned are omitted.
+        """
+
+        ret = {}
+        for video_id, user_id in facade.models.Assignment.objects.filter(
+                task__in=videos).order_by().values_list('task', 'user').distinct():
+            ret.setdefault(video_id, []).append(user_id)
+        return ret
+
+    def record(self, video_session):
+        """
+        Add a new VideoSession to the VideoViewCount row of its Video and the
+        day it started.  VideoSessionManager calls this as each view is
+        registered, and a session that is recorded again is counted twice.
+
+        :param video_session:   the new VideoSession
+        :type video_session:    facade.models.VideoSession
+        """
+
+        facade.subsystems.Utils.increment_counters(facade.models.VideoViewCount,
+            {'video': video_session.assignment.task_id,
+            'date': video_session.date_started.date()}, {'count': 1})
+
+    def rebuild(self, videos=None):
+        """
+        Recompute the VideoViewCount rows of some Videos from their
+        VideoSessions, reading the sessions once.  Run this after turning on
+        settings.VOD_INCREMENTAL_VIEW_COUNTS, and after changing when existing
+        sessions started.
+
+        :param videos:  PKs of the Videos, or a QuerySet of them.  Defaults
+                        to every Video.
+        """
+
+        VideoViewCount = facade.models.VideoViewCount
+        sessions = facade.models.VideoSession.objects.all()
+        tallies = VideoViewCount.objects.all()
+        if videos is not None:
+            sessions = sessions.filter(assignment__task__in=videos)
+            tallies = tallies.filter(video__in=videos)
+        tallies.delete()
+        counts = {}
+        for video_id, date_started in sessions.order_by().values_list(
+                'assignment__task', 'date_started').iterator():
+            key = (video_id, date_started.date())
+            counts[key] = counts.get(key, 0) + 1
+        facade.subsystems.Utils.bulk_insert(VideoViewCount,
+            ({'video': video_id, 'date': day, 'count': count}
+            for (video_id, day), count in counts.iteritems()))
+
+    def _count_sessions(self, videos, condition=None):
+        """ count the VideoSessions of some Videos with one grouped query """
+
+        sessions = facade.models.VideoSession.objects.filter(assignment__task__in=videos)
+        if condition is not None:
+            sessions = sessions.filter(condition)
+        return dict((row['assignment__task'], row['views']) for row in
+            sessions.order_by().values('assignment__task').annotate(views=Count('id')))
+
+    def _date_range(self, start_date, end_date, exclude_end=False):
+        """ a condition on when sessions were started, or None for any time """
+
+        condition = {}
+        if start_date is not None:
+            condition['date_started__gte'] = start_date
+        if end_date is not None:
+            condition['date_started__lt' if exclude_end else 'date_started__lte'] = end_date
+        return Q(**condition) if condition else None
+
+    def _midnight(self, day):
+        return datetime(day.year, day.month, day.day)
+
+    def _parse_date(self, value):
+        """ a naive UTC datetime, as sessions are stored, or None """
+
+        if isinstance(value, basestring) and pr_time.is_iso8601(value):
+            return pr_time.iso8601_to_datetime(value)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.astimezone(pr_time.UTC()).replace(tzinfo=None)
+        return value
+
+# vim:tabstop=4 shiftwidth=4 expandtab